@@ -0,0 +1,108 @@
+"""
+비동기 저장소 API (FastAPI async 핸들러용).
+storage 모듈(survey/chat/eeg/board/user)의 함수는 모두 블로킹 DB 호출이므로,
+이벤트 루프에서 직접 부르면 느린 쿼리 하나가 같은 워커의 모든 요청을 멈춤.
+여기서는 같은 함수를 전용(크기 제한) 스레드 풀에서 실행하고 await 가능한 형태로 제공.
+
+    from async_storage import survey_store, run_db, run_cpu
+    out = await survey_store.save_survey(email, responses, required)
+    rows = await run_db(some_blocking_function, arg)
+    pdf = await run_cpu(render_report, data)
+
+- 의미(반환값·예외)는 원래 storage 함수와 같음 (예외도 그대로 전달)
+- 스레드 수 = DB_EXECUTOR_WORKERS (기본: DB 연결 풀 크기) → 스레드가 풀 연결을 기다리며 쌓이지 않음
+- DB 를 쓰지 않는 CPU 작업(PDF 렌더링, NumPy 일괄 채점)은 run_cpu → 별도 풀(sbi-cpu, CPU_EXECUTOR_WORKERS,
+  기본 min(4, CPU 수)). 긴 렌더링이 DB 스레드를 잡아 다른 요청의 저장·조회가 밀리지 않도록 run_db 는 DB I/O 전용
+- storage 모듈은 처음 사용할 때 import (원래 핸들러의 지연 import 와 동일)
+"""
+import asyncio
+import functools
+import importlib
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional, TypeVar
+
+T = TypeVar("T")
+
+_executor: Optional[ThreadPoolExecutor] = None
+_cpu_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def _worker_count() -> int:
+    configured = os.environ.get("DB_EXECUTOR_WORKERS")
+    if configured:
+        return max(1, int(configured))
+    pool_size = int(os.environ.get("DB_POOL_SIZE", "5"))
+    return pool_size if pool_size > 0 else 8
+
+
+def get_executor() -> ThreadPoolExecutor:
+    """DB 전용 스레드 풀 (프로세스당 하나, 처음 사용할 때 생성)."""
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(max_workers=_worker_count(), thread_name_prefix="sbi-db")
+    return _executor
+
+
+def _cpu_worker_count() -> int:
+    configured = os.environ.get("CPU_EXECUTOR_WORKERS")
+    if configured:
+        return max(1, int(configured))
+    return min(4, os.cpu_count() or 1)
+
+
+def get_cpu_executor() -> ThreadPoolExecutor:
+    """CPU 작업 전용 스레드 풀 (프로세스당 하나, 처음 사용할 때 생성). DB 스레드 풀과 따로 제한."""
+    global _cpu_executor
+    if _cpu_executor is None:
+        with _executor_lock:
+            if _cpu_executor is None:
+                _cpu_executor = ThreadPoolExecutor(max_workers=_cpu_worker_count(), thread_name_prefix="sbi-cpu")
+    return _cpu_executor
+
+
+async def run_db(fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """블로킹 DB 함수를 DB 스레드 풀에서 실행하고 결과를 기다림."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_executor(), functools.partial(fn, *args, **kwargs))
+
+
+async def run_cpu(fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """DB 를 쓰지 않는 블로킹 CPU 작업을 CPU 스레드 풀에서 실행하고 결과를 기다림."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_cpu_executor(), functools.partial(fn, *args, **kwargs))
+
+
+class AsyncStorage:
+    """storage 모듈의 공개 함수를 같은 이름의 async 함수로 노출하는 프록시."""
+
+    def __init__(self, module_name: str):
+        self._module_name = module_name
+        self._wrappers = {}
+
+    def __getattr__(self, name: str):
+        if name.startswith("_"):
+            raise AttributeError(name)
+        wrapper = self._wrappers.get(name)
+        if wrapper is None:
+            fn = getattr(importlib.import_module(self._module_name), name)
+            if not callable(fn):
+                return fn
+
+            @functools.wraps(fn)
+            async def wrapper(*args, **kwargs):
+                return await run_db(fn, *args, **kwargs)
+
+            self._wrappers[name] = wrapper
+        return wrapper
+
+
+survey_store = AsyncStorage("survey_storage")
+chat_store = AsyncStorage("chat_storage")
+eeg_store = AsyncStorage("eeg_storage")
+board_store = AsyncStorage("board_storage")
+user_store = AsyncStorage("user_storage")
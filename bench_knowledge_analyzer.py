@@ -0,0 +1,105 @@
+"""
+지식 검색 분석기 벤치마크: word(예전) vs particle(조사 떼기) vs char_ngram(2·3글자 조각).
+sbi_knowledge.db (블로그/유튜브 수집 데이터)로 분석기마다 색인을 임시 폴더에 만들어 비교합니다.
+
+    build_s       색인 fit + 저장 시간 (토큰 캐시 비움)
+    rebuild_s     같은 문서로 다시 fit (토큰 캐시 사용, 드리프트·분석기 변경 시 다시 fit 비용)
+    vocab / nnz   어휘 수 / 문서 행렬 0 아닌 값 수
+    index_kb      저장된 색인 파일 크기
+    query_ms      질의 한 건 평균 (search_many 가 아닌 search)
+    inflected     "키워드+조사" 질의의 상위 결과가 "키워드" 질의의 상위 결과와 겹치는 비율 (재현율 대용)
+
+사용법:
+  python bench_knowledge_analyzer.py
+  python bench_knowledge_analyzer.py --db 다른경로/sbi_knowledge.db --top-k 5 --repeat 20
+"""
+import argparse
+import os
+import shutil
+import sqlite3
+import tempfile
+import time
+
+import knowledge_analyzer
+import knowledge_db
+import knowledge_index
+
+# 리포트(report_generator, email_coupon) 역량 키워드
+QUERIES = [
+    "창업", "동기부여", "공감", "자아성찰", "창업생태계", "위기극복", "회복탄력성", "스트레스", "재도전", "위험감수",
+    "뇌", "유연화", "창의성", "뇌교육", "혁신", "주체적", "협업", "사회적 책임", "창업의식",
+]
+PARTICLE_FORMS = ("을", "의", "에서", "으로")
+
+
+def _dir_size(path: str) -> int:
+    return sum(os.path.getsize(os.path.join(path, f)) for f in os.listdir(path))
+
+
+def bench(conn, name: str, top_k: int, repeat: int) -> dict:
+    path = tempfile.mkdtemp(prefix=f"bench_{name}_")
+    try:
+        knowledge_analyzer.token_cache.clear()
+        t0 = time.perf_counter()
+        index = knowledge_index.build(conn, path, analyzer=name)
+        build_s = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        index = knowledge_index.build(conn, path, index.generation, analyzer=name)
+        rebuild_s = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        for _ in range(repeat):
+            for q in QUERIES:
+                index.search(q, top_k)
+        query_ms = (time.perf_counter() - t0) * 1000 / (repeat * len(QUERIES))
+
+        overlap = total = 0
+        for q in QUERIES:
+            base = {row_id for row_id, _ in index.search(q, top_k)}
+            if not base:
+                continue
+            for suffix in PARTICLE_FORMS:
+                total += 1
+                found = {row_id for row_id, _ in index.search(q + suffix, top_k)}
+                overlap += bool(base & found)
+        return {
+            "analyzer": name,
+            "build_s": round(build_s, 3),
+            "rebuild_s": round(rebuild_s, 3),
+            "vocab": len(index.vocabulary),
+            "nnz": int(index.matrix.nnz),
+            "index_kb": round(_dir_size(path) / 1024, 1),
+            "query_ms": round(query_ms, 3),
+            "inflected": round(overlap / total, 3) if total else None,
+        }
+    finally:
+        knowledge_index.clear_cache()
+        shutil.rmtree(path, ignore_errors=True)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="지식 검색 분석기 벤치마크")
+    parser.add_argument("--db", default=knowledge_db.DB_PATH, help="지식 DB 경로 (기본: sbi_knowledge.db)")
+    parser.add_argument("--top-k", type=int, default=5)
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    if not os.path.exists(args.db):
+        raise SystemExit(f"지식 DB 없음: {args.db} (blog_scraper / youtube_transcript 로 먼저 수집)")
+    conn = sqlite3.connect(args.db)
+    try:
+        n_docs = conn.execute("SELECT COUNT(*) FROM knowledge").fetchone()[0]
+        if not n_docs:
+            raise SystemExit("지식 DB 가 비어 있습니다.")
+        print(f"문서 {n_docs}건, 질의 {len(QUERIES)}개 × {args.repeat}회, 상위 {args.top_k}건")
+        columns = ("analyzer", "build_s", "rebuild_s", "vocab", "nnz", "index_kb", "query_ms", "inflected")
+        print("  ".join(f"{c:>10}" for c in columns))
+        for name in knowledge_analyzer.ANALYZERS:
+            result = bench(conn, name, args.top_k, args.repeat)
+            print("  ".join(f"{str(result[c]):>10}" for c in columns))
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
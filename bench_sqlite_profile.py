@@ -0,0 +1,112 @@
+"""
+SQLite 프로필 벤치마크: legacy(예전 기본값) vs production(WAL·busy timeout·mmap·스레드별 연결).
+동시 스레드가 설문 저장(save_survey)과 목록 조회(list_saved)를 섞어 실행하고
+처리량(ops/s)과 "database is locked" 등 오류 수를 비교합니다.
+
+사용법:
+  python bench_sqlite_profile.py
+  python bench_sqlite_profile.py --threads 16 --ops 200 --read-ratio 0.7
+
+프로필마다 별도 프로세스·임시 DB 파일로 실행 (db.py 설정은 import 시점에 결정되므로).
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+_BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def _worker_main(threads: int, ops: int, read_ratio: float) -> dict:
+    """자식 프로세스: 현재 환경변수(SQLITE_PROFILE, DB_NAME)로 부하 실행 후 결과 dict 반환."""
+    import random
+    import survey_storage
+    from db import get_conn
+
+    with get_conn():
+        pass  # 스키마 마이그레이션은 측정에서 제외
+    responses = {seq: 3 for seq in range(1, 97)}
+    required = list(range(1, 97))
+    counts = {"save": 0, "list": 0, "errors": 0, "locked": 0}
+    lock = threading.Lock()
+
+    def run(idx: int) -> None:
+        rng = random.Random(idx)
+        email = f"bench{idx % 8}@example.com"
+        local = {"save": 0, "list": 0, "errors": 0, "locked": 0}
+        for _ in range(ops):
+            try:
+                if rng.random() < read_ratio:
+                    survey_storage.list_saved(email)
+                    local["list"] += 1
+                else:
+                    survey_storage.save_survey(email, responses, required)
+                    local["save"] += 1
+            except Exception as e:
+                local["errors"] += 1
+                if "locked" in str(e).lower():
+                    local["locked"] += 1
+        with lock:
+            for k, v in local.items():
+                counts[k] += v
+
+    workers = [threading.Thread(target=run, args=(i,)) for i in range(threads)]
+    t0 = time.perf_counter()
+    for w in workers:
+        w.start()
+    for w in workers:
+        w.join()
+    elapsed = time.perf_counter() - t0
+    done = counts["save"] + counts["list"]
+    return {**counts, "seconds": round(elapsed, 3), "ops_per_sec": round(done / elapsed, 1) if elapsed else 0.0}
+
+
+def _run_profile(profile: str, args) -> dict:
+    fd, path = tempfile.mkstemp(suffix=".db", prefix=f"bench_{profile}_")
+    os.close(fd)
+    os.remove(path)
+    env = dict(os.environ, DB_ENGINE="sqlite", DB_NAME=path, SQLITE_PROFILE=profile)
+    try:
+        out = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), "--worker",
+             "--threads", str(args.threads), "--ops", str(args.ops), "--read-ratio", str(args.read_ratio)],
+            env=env, cwd=_BASE_DIR, capture_output=True, text=True, check=True,
+        )
+        return json.loads(out.stdout.strip().splitlines()[-1])
+    finally:
+        for suffix in ("", "-wal", "-shm", "-journal"):
+            if os.path.exists(path + suffix):
+                os.remove(path + suffix)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="SQLite legacy vs production 프로필 저장/조회 처리량 비교")
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--ops", type=int, default=100, help="스레드당 작업 수")
+    parser.add_argument("--read-ratio", type=float, default=0.5, help="조회 비율 (0~1)")
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        print(json.dumps(_worker_main(args.threads, args.ops, args.read_ratio)))
+        return
+
+    print(f"스레드 {args.threads}개 × {args.ops}회, 조회 비율 {args.read_ratio:.0%}")
+    results = {}
+    for profile in ("legacy", "production"):
+        r = _run_profile(profile, args)
+        results[profile] = r
+        print(
+            f"  {profile:<10} {r['ops_per_sec']:>9.1f} ops/s  ({r['seconds']}s)  "
+            f"저장 {r['save']}  조회 {r['list']}  오류 {r['errors']} (locked {r['locked']})"
+        )
+    base = results["legacy"]["ops_per_sec"] or 1.0
+    print(f"  production / legacy = {results['production']['ops_per_sec'] / base:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
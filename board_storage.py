@@ -1,54 +1,61 @@
 """
 게시판·자료실 저장. MySQL: board (id, type, title, content, created_at, updated_at)
+검색은 fulltext.py (엔진별 전문 검색 색인, 색인이 없으면 LIKE).
 """
 from datetime import datetime
 from typing import List, Dict, Any, Optional
 
-from db import get_conn, execute_one, execute_all, execute_insert, execute_update_delete
+from db import MAX_PAGE_SIZE, get_conn, execute_one, execute_all, execute_insert, execute_update_delete
+from fulltext import BOARD_SEARCH, search
+
+_COLUMNS = ("id", "type", "title", "content", "created_at", "updated_at")
+
+
+def _to_item(r: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "id": r["id"],
+        "type": r["type"],
+        "title": r["title"],
+        "content": r["content"] or "",
+        "created_at": r["created_at"],
+        "updated_at": r["updated_at"],
+    }
+
+
+def search_items(
+    q: str,
+    type_filter: Optional[str] = None,
+    page: int = 1,
+    page_size: Optional[int] = None,
+) -> Dict[str, Any]:
+    """제목/내용 전문 검색 (순위순 페이지). 반환: { items, page, has_more }."""
+    conditions, args = [], []
+    if type_filter and type_filter in ("board", "resource"):
+        conditions.append("type = %s")
+        args.append(type_filter)
+    with get_conn() as conn:
+        rows, has_more = search(conn, BOARD_SEARCH, q, _COLUMNS, conditions, args, page=page, page_size=page_size)
+    return {"items": [_to_item(r) for r in rows], "page": max(1, page), "has_more": has_more}
 
 
 def list_items(type_filter: Optional[str] = None, q: Optional[str] = None) -> List[Dict[str, Any]]:
-    """목록. type_filter: board | resource, q: 제목/내용 검색."""
+    """목록. type_filter: board | resource, q: 제목/내용 검색 (검색 시 관련도순 상위 MAX_PAGE_SIZE 건)."""
+    if q and q.strip():
+        return search_items(q.strip(), type_filter, page_size=MAX_PAGE_SIZE)["items"]
     with get_conn() as conn:
         if type_filter and type_filter in ("board", "resource"):
-            if q and q.strip():
-                search = f"%{q.strip()}%"
-                rows = execute_all(
-                    conn,
-                    "SELECT id, type, title, content, created_at, updated_at FROM board WHERE type = %s AND (title LIKE %s OR content LIKE %s) ORDER BY updated_at DESC",
-                    (type_filter, search, search),
-                )
-            else:
-                rows = execute_all(
-                    conn,
-                    "SELECT id, type, title, content, created_at, updated_at FROM board WHERE type = %s ORDER BY updated_at DESC",
-                    (type_filter,),
-                )
+            rows = execute_all(
+                conn,
+                "SELECT id, type, title, content, created_at, updated_at FROM board WHERE type = %s ORDER BY updated_at DESC",
+                (type_filter,),
+            )
         else:
-            if q and q.strip():
-                search = f"%{q.strip()}%"
-                rows = execute_all(
-                    conn,
-                    "SELECT id, type, title, content, created_at, updated_at FROM board WHERE title LIKE %s OR content LIKE %s ORDER BY updated_at DESC",
-                    (search, search),
-                )
-            else:
-                rows = execute_all(
-                    conn,
-                    "SELECT id, type, title, content, created_at, updated_at FROM board ORDER BY updated_at DESC",
-                    (),
-                )
-    return [
-        {
-            "id": r["id"],
-            "type": r["type"],
-            "title": r["title"],
-            "content": r["content"] or "",
-            "created_at": r["created_at"],
-            "updated_at": r["updated_at"],
-        }
-        for r in rows
-    ]
+            rows = execute_all(
+                conn,
+                "SELECT id, type, title, content, created_at, updated_at FROM board ORDER BY updated_at DESC",
+                (),
+            )
+    return [_to_item(r) for r in rows]
 
 
 def get_item(item_id: int) -> Optional[Dict[str, Any]]:
@@ -61,14 +68,7 @@ def get_item(item_id: int) -> Optional[Dict[str, Any]]:
         )
     if not row:
         return None
-    return {
-        "id": row["id"],
-        "type": row["type"],
-        "title": row["title"],
-        "content": row["content"] or "",
-        "created_at": row["created_at"],
-        "updated_at": row["updated_at"],
-    }
+    return _to_item(row)
 
 
 def create_item(type_name: str, title: str, content: str = "") -> Dict[str, Any]:
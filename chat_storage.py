@@ -6,7 +6,7 @@ import json
 from datetime import datetime, timedelta
 from typing import List, Dict, Any, Optional
 
-from db import get_conn, execute_one, execute_all, execute_insert
+from db import get_conn, execute_one, execute_all, execute_insert, keyset_page, total_estimate
 
 RETENTION_MONTHS = 6
 
@@ -64,19 +64,33 @@ def list_saved(user_email: str) -> List[Dict[str, Any]]:
     return [{"id": r["id"], "summary_title": r["summary_title"], "saved_at": r["created_at"]} for r in rows]
 
 
-def list_saved_all(limit: int = 500) -> List[Dict[str, Any]]:
-    """전체 사용자 대화 저장 목록 (관리자용). [{ id, user_email, summary_title, saved_at }, ...] 최신순."""
-    cutoff = _retention_cutoff()
+def list_saved_page(
+    after_id: Optional[int] = None,
+    page_size: Optional[int] = None,
+    with_total: bool = True,
+) -> Dict[str, Any]:
+    """전체 사용자 대화 저장 목록 한 페이지 (관리자용, 6개월 이내, id 최신순). 반환: { items, next_after_id, total_estimate, total_exact }."""
+    conditions, args = ["created_at >= %s"], [_retention_cutoff()]
     with get_conn() as conn:
-        rows = execute_all(
-            conn,
-            "SELECT id, user_email, summary_title, created_at FROM chat_saves WHERE created_at >= %s ORDER BY created_at DESC LIMIT %s",
-            (cutoff, limit),
+        rows, next_after_id = keyset_page(
+            conn, "chat_saves", ("id", "user_email", "summary_title", "created_at"),
+            conditions, args, after_id=after_id, page_size=page_size,
         )
-    return [
-        {"id": r["id"], "user_email": r.get("user_email"), "summary_title": r["summary_title"], "saved_at": r["created_at"]}
-        for r in rows
-    ]
+        total, exact = total_estimate(conn, "chat_saves", conditions, args) if with_total else (None, False)
+    return {
+        "items": [
+            {"id": r["id"], "user_email": r.get("user_email"), "summary_title": r["summary_title"], "saved_at": r["created_at"]}
+            for r in rows
+        ],
+        "next_after_id": next_after_id,
+        "total_estimate": total,
+        "total_exact": exact,
+    }
+
+
+def list_saved_all(limit: int = 500) -> List[Dict[str, Any]]:
+    """전체 사용자 대화 저장 목록 첫 페이지 (관리자용). [{ id, user_email, summary_title, saved_at }, ...] 최신순."""
+    return list_saved_page(page_size=limit, with_total=False)["items"]
 
 
 def get_saved(user_email: str, save_id: int, *, skip_user_check: bool = False) -> Optional[Dict[str, Any]]:
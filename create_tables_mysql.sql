@@ -1,6 +1,9 @@
 -- Startup Brain Index - MySQL 테이블 생성 (dothome.co.kr / localhost)
 -- 사용법: MySQL에 DB leejee5 생성 후, 해당 DB에서 본 스크립트 실행.
 -- DB: leejee5, 사용자: leejee5, 비밀번호: sunkim5do#
+-- 참고용 최종 스키마: db_migrations.py 의 마이그레이션을 모두 적용한 결과와 같은 구조.
+-- 앱은 연결 시 db_migrations 로 자동 적용하므로 이 파일은 문서·수동 설치용 (마이그레이션이 이 파일을 읽지 않음).
+-- 스키마를 바꿀 때는 db_migrations.MIGRATIONS 에 새 번호를 추가하고 이 파일도 맞춰 갱신 (test_db_migrations 가 컬럼 비교).
 
 -- 1) 회원 (로그인 정보, 가입 회원 + 프로필)
 CREATE TABLE IF NOT EXISTS users (
@@ -32,12 +35,19 @@ CREATE TABLE IF NOT EXISTS survey_saves (
     responses_json LONGTEXT NOT NULL,
     required_sequences_json TEXT NOT NULL,
     excluded_sequences_json TEXT,
+    responses_packed VARBINARY(1024) DEFAULT NULL,
     created_at VARCHAR(32) NOT NULL,
     KEY idx_survey_user (user_email),
     KEY idx_survey_created (created_at),
     KEY idx_survey_title (title(100))
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
 
+-- 설문 저장 일별 건수 롤업 (관리자 통계, survey_stats.py)
+CREATE TABLE IF NOT EXISTS survey_daily_stats (
+    day VARCHAR(10) NOT NULL PRIMARY KEY,
+    saves INT NOT NULL DEFAULT 0
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
 -- 3) 대화/상담 저장 (생성 콘텐츠)
 CREATE TABLE IF NOT EXISTS chat_saves (
     id INT AUTO_INCREMENT PRIMARY KEY,
@@ -82,3 +92,7 @@ CREATE TABLE IF NOT EXISTS indicator_formulas (
     updated_at VARCHAR(32) NOT NULL,
     KEY idx_sort (sort_order)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+-- 전문 검색 색인 (마이그레이션 4, ngram 파서 있는 MySQL 만. 없으면 fulltext.py 가 LIKE 검색)
+ALTER TABLE board ADD FULLTEXT INDEX ft_board_text (title, content) WITH PARSER ngram;
+ALTER TABLE survey_saves ADD FULLTEXT INDEX ft_survey_title (title) WITH PARSER ngram;
@@ -1,15 +1,36 @@
 """
 CSV 파일 로딩 및 데이터 구조화 모듈
+- CSV는 표준 csv 모듈로 읽습니다 (pandas는 xlsx 원본을 읽을 때만 import).
+- 선택: 파싱 결과를 내용 해시와 함께 JSON 카탈로그로 저장해 두면, 다음 부팅부터 해시가 같을 때 그대로 불러옵니다.
+  python data_loader.py --compile  또는  환경변수 SBI_ITEM_CATALOG_WRITE=1
 """
+import csv
+import hashlib
+import io
+import json
 import os
-import pandas as pd
-from typing import List, Dict
+import threading
+import time
+from types import MappingProxyType
+from typing import List, Dict, Mapping, Optional, Tuple
 from models import SurveyItem, Domain
 
 # 프로젝트 루트 기준 경로 (Render 등 어떤 CWD에서도 동작)
 _ROOT_DIR = os.path.dirname(os.path.abspath(__file__))
 _DEFAULT_CSV = os.path.join(_ROOT_DIR, "survey_items.csv")
 
+# 컴파일된 문항 카탈로그 (원본 경로 + 접미사). SBI_ITEM_CATALOG=0 이면 읽기/쓰기 모두 사용 안 함.
+CATALOG_SUFFIX = ".catalog.json"
+CATALOG_FORMAT = 1
+_CATALOG_ENABLED = os.environ.get("SBI_ITEM_CATALOG", "1").strip().lower() not in ("0", "false", "off", "no")
+_CATALOG_WRITE = os.environ.get("SBI_ITEM_CATALOG_WRITE", "").strip().lower() in ("1", "true", "on", "yes")
+
+# SurveyItem 필드 순서 (카탈로그 직렬화용)
+_ITEM_FIELDS = ("전체순번", "영역", "하위역량", "하위요소", "하위요소순번", "문항보정", "예시문항", "비고")
+
+# 공유 카탈로그: CSV 변경 여부(mtime·크기) 확인 최소 간격(초). 0이면 매 호출 확인.
+SHARED_RELOAD_CHECK_SECONDS = float(os.environ.get("SBI_CATALOG_CHECK_SECONDS", "2"))
+
 
 class SurveyDataLoader:
     """설문 데이터 로더"""
@@ -20,81 +41,194 @@ class SurveyDataLoader:
             csv_path: CSV 파일 경로. None이면 프로젝트 루트의 survey_items.csv
         """
         self.csv_path = csv_path or _DEFAULT_CSV
-        self.df: pd.DataFrame = None
-        self.items: List[SurveyItem] = []
+        self.df = None  # xlsx 원본일 때만 pandas.DataFrame
+        self.source_sha256: Optional[str] = None
+        self.loaded_from_catalog = False
+        self.items: Tuple[SurveyItem, ...] = ()
         self._load_data()
+        self._build_indexes()
     
     def _load_data(self):
-        """CSV 파일 로드 및 구조화"""
+        """CSV(또는 xlsx) 파일 로드 및 구조화. 해시가 같은 컴파일 카탈로그가 있으면 그대로 사용."""
         if not os.path.isfile(self.csv_path):
             raise FileNotFoundError(
                 f"survey_items.csv not found at {self.csv_path!r} (cwd={os.getcwd()!r})"
             )
-        # UTF-8 우선, 실패 시 cp949 (한국어 Windows 저장)
+        with open(self.csv_path, "rb") as f:
+            raw = f.read()
+        self.source_sha256 = hashlib.sha256(raw).hexdigest()
+
+        items = self._load_catalog() if _CATALOG_ENABLED else None
+        if items is not None:
+            self.loaded_from_catalog = True
+        else:
+            if self.csv_path.lower().endswith((".xlsx", ".xls")):
+                header, rows = self._read_rows_xlsx()
+            else:
+                header, rows = self._read_rows_csv(raw)
+            items = self._rows_to_items(header, rows)
+            if _CATALOG_ENABLED and _CATALOG_WRITE:
+                self.write_catalog(items)
+
+        # 전체순번으로 정렬 (공유 캐시에서 재사용되므로 변경 불가 튜플로 보관)
+        items.sort(key=lambda x: x.전체순번)
+        self.items = tuple(items)
+        
+        print(f"총 {len(self.items)}개 문항 로드 완료")
+
+    @staticmethod
+    def _read_rows_csv(raw: bytes) -> Tuple[List[str], List[List[str]]]:
+        """표준 csv 모듈로 파싱. UTF-8 우선, 실패 시 cp949 (한국어 Windows 저장)."""
         try:
-            self.df = pd.read_csv(self.csv_path, encoding='utf-8')
+            text = raw.decode("utf-8-sig")
         except UnicodeDecodeError:
-            self.df = pd.read_csv(self.csv_path, encoding='cp949')
-        
+            text = raw.decode("cp949")
+        reader = csv.reader(io.StringIO(text, newline=""))
+        header = next(reader, [])
+        # 빈 줄은 건너뜀 (pandas skip_blank_lines 와 동일)
+        rows = [row for row in reader if any(cell.strip() for cell in row)]
+        return header, rows
+
+    def _read_rows_xlsx(self) -> Tuple[List[str], List[List]]:
+        """xlsx 원본은 pandas로 읽음 (이 경로에서만 pandas import)."""
+        import pandas as pd
+
+        self.df = pd.read_excel(self.csv_path)
+        header = [str(c) for c in self.df.columns]
+        rows = [
+            [None if pd.isna(v) else v for v in values]
+            for values in self.df.itertuples(index=False, name=None)
+        ]
+        return header, rows
+
+    @staticmethod
+    def _rows_to_items(header: List[str], rows: List[List]) -> List[SurveyItem]:
+        """헤더 + 행 목록 → SurveyItem 리스트."""
         # 컬럼명 정리 (공백 제거)
-        self.df.columns = self.df.columns.str.strip()
-        
+        header = [str(c).strip() for c in header]
+
         # 컬럼 인덱스로 접근 (컬럼명 인코딩 문제 대비)
         # 예상 순서: 영역(0), 하위역량(1), 하위요소(2), 하위요소순번(3), 문항보정(4), 전체순번(5), 문항보정(6), 예시문항(7)
         # 실제 확인 결과: 영역(0), 하위역량(1), 하위요소(2), 하위요소순번(3), 문항보정(4), 전체순번(5), 문항보정(6), 예시문항(7)
-        
-        # SurveyItem 객체 리스트 생성
-        self.items = []
-        has_비고 = '비고' in self.df.columns
-        for idx, row in self.df.iterrows():
+        비고_idx = header.index('비고') if '비고' in header else None
+
+        def text(v) -> str:
+            return "" if v is None else str(v)
+
+        def integer(v) -> int:
+            # 숫자 셀이 "3.0" 처럼 저장된 경우도 허용
+            s = text(v).strip()
+            return int(float(s)) if "." in s else int(s)
+
+        items: List[SurveyItem] = []
+        for idx, row in enumerate(rows):
             try:
                 # 컬럼 인덱스로 접근 (필수 컬럼), 추가 컬럼은 이름으로
                 비고_val = None
-                if has_비고 and ('비고' in row.index) and pd.notna(row.get('비고')) and str(row['비고']).strip():
-                    비고_val = str(row['비고']).strip()
-                item = SurveyItem(
-                    전체순번=int(row.iloc[5]),  # 전체순번 (인덱스 5)
-                    영역=str(row.iloc[0]).strip().replace('\n', ' '),  # 영역 (인덱스 0)
-                    하위역량=str(row.iloc[1]).strip().replace('\n', ' '),  # 하위역량 (인덱스 1)
-                    하위요소=str(row.iloc[2]).strip().replace('\n', ' '),  # 하위요소 (인덱스 2)
-                    하위요소순번=int(row.iloc[3]),  # 하위요소순번 (인덱스 3)
-                    문항보정=str(row.iloc[6]).strip(),  # 문항(보정) (인덱스 6)
-                    예시문항=int(row.iloc[7]),  # 예시문항 (인덱스 7)
+                if 비고_idx is not None and 비고_idx < len(row) and text(row[비고_idx]).strip():
+                    비고_val = text(row[비고_idx]).strip()
+                items.append(SurveyItem(
+                    전체순번=integer(row[5]),  # 전체순번 (인덱스 5)
+                    영역=text(row[0]).strip().replace('\n', ' '),  # 영역 (인덱스 0)
+                    하위역량=text(row[1]).strip().replace('\n', ' '),  # 하위역량 (인덱스 1)
+                    하위요소=text(row[2]).strip().replace('\n', ' '),  # 하위요소 (인덱스 2)
+                    하위요소순번=integer(row[3]),  # 하위요소순번 (인덱스 3)
+                    문항보정=text(row[6]).strip(),  # 문항(보정) (인덱스 6)
+                    예시문항=integer(row[7]),  # 예시문항 (인덱스 7)
                     비고=비고_val
-                )
-                self.items.append(item)
-            except (KeyError, ValueError, IndexError) as e:
+                ))
+            except (ValueError, IndexError) as e:
                 print(f"Warning: Row {idx} 처리 중 오류: {e}")
-                print(f"  Row data: {row.to_dict()}")
+                print(f"  Row data: {row}")
                 continue
-        
-        # 전체순번으로 정렬
-        self.items.sort(key=lambda x: x.전체순번)
-        
-        print(f"총 {len(self.items)}개 문항 로드 완료")
-    
-    def get_item_by_sequence(self, sequence: int) -> SurveyItem:
-        """전체순번으로 문항 조회"""
+        return items
+
+    @property
+    def catalog_path(self) -> str:
+        """컴파일된 카탈로그 경로 (원본 경로 + CATALOG_SUFFIX)."""
+        return self.csv_path + CATALOG_SUFFIX
+
+    def _load_catalog(self) -> Optional[List[SurveyItem]]:
+        """원본 해시가 같은 카탈로그가 있으면 SurveyItem 리스트 반환. 없거나 다르면 None."""
+        try:
+            with open(self.catalog_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("format") != CATALOG_FORMAT or data.get("source_sha256") != self.source_sha256:
+                return None
+            return [SurveyItem(*values) for values in data["items"]]
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+    def write_catalog(self, items: Optional[List[SurveyItem]] = None) -> Optional[str]:
+        """파싱 결과를 원본 해시와 함께 JSON 카탈로그로 저장. 실패(읽기 전용 등) 시 None."""
+        items = self.items if items is None else items
+        payload = {
+            "format": CATALOG_FORMAT,
+            "source_sha256": self.source_sha256,
+            "fields": list(_ITEM_FIELDS),
+            "items": [[getattr(item, name) for name in _ITEM_FIELDS] for item in items],
+        }
+        tmp_path = self.catalog_path + ".tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(payload, f, ensure_ascii=False, separators=(",", ":"))
+            os.replace(tmp_path, self.catalog_path)
+            return self.catalog_path
+        except OSError as e:
+            print(f"Warning: 문항 카탈로그 저장 실패: {e}")
+            return None
+
+    def _build_indexes(self):
+        """문항 조회용 인덱스 구성 (로드 후 한 번). 이후 조회는 모두 dict/튜플 조회."""
+        by_sequence: Dict[int, SurveyItem] = {}
+        by_domain: Dict[str, List[SurveyItem]] = {}
+        by_group: Dict[Tuple[str, str, str], List[SurveyItem]] = {}
+        by_비고: Dict[str, List[int]] = {}
         for item in self.items:
-            if item.전체순번 == sequence:
-                return item
-        return None
+            # 순번 중복 시 기존 선형 탐색과 같이 첫 문항 우선
+            by_sequence.setdefault(item.전체순번, item)
+            by_domain.setdefault(item.영역, []).append(item)
+            by_group.setdefault((item.영역, item.하위역량, item.하위요소), []).append(item)
+            flag = (item.비고 or "").strip()
+            if flag:
+                by_비고.setdefault(flag, []).append(item.전체순번)
+        self._by_sequence = by_sequence
+        self._by_domain = {k: tuple(v) for k, v in by_domain.items()}
+        self._by_group = MappingProxyType({k: tuple(v) for k, v in by_group.items()})
+        self._by_비고 = {k: tuple(v) for k, v in by_비고.items()}
+        self._all_sequences = tuple(item.전체순번 for item in self.items)
+
+    def get_item_by_sequence(self, sequence: int) -> Optional[SurveyItem]:
+        """전체순번으로 문항 조회"""
+        return self._by_sequence.get(sequence)
     
-    def get_items_by_domain(self, domain: str) -> List[SurveyItem]:
-        """영역별 문항 조회"""
-        return [item for item in self.items if item.영역 == domain]
+    def get_items_by_domain(self, domain: str) -> Tuple[SurveyItem, ...]:
+        """영역별 문항 조회 (전체순번 순)"""
+        return self._by_domain.get(domain, ())
+
+    def get_items_by_group(self, 영역: str, 하위역량: str, 하위요소: str) -> Tuple[SurveyItem, ...]:
+        """하위요소 그룹(영역, 하위역량, 하위요소)별 문항 조회 (전체순번 순)"""
+        return self._by_group.get((영역, 하위역량, 하위요소), ())
+
+    def get_groups(self) -> Mapping[Tuple[str, str, str], Tuple[SurveyItem, ...]]:
+        """(영역, 하위역량, 하위요소) → 문항 튜플. 첫 문항의 전체순번 순서로 나열됩니다."""
+        return self._by_group
     
-    def get_all_sequences(self) -> List[int]:
-        """모든 전체순번 리스트 반환"""
-        return [item.전체순번 for item in self.items]
+    def get_all_sequences(self) -> Tuple[int, ...]:
+        """모든 전체순번 반환 (전체순번 순)"""
+        return self._all_sequences
 
-    def get_selected_sequences(self) -> List[int]:
-        """비고가 '선택'인 문항의 전체순번 리스트 (선택 71문항 등)."""
-        return [item.전체순번 for item in self.items if (getattr(item, "비고", None) or "").strip() == "선택"]
+    def get_sequences_by_비고(self, flag: str) -> Tuple[int, ...]:
+        """비고 값(공백 제거)이 flag 인 문항의 전체순번."""
+        return self._by_비고.get((flag or "").strip(), ())
 
-    def get_excluded_sequences(self) -> List[int]:
-        """비고가 '제외'인 문항의 전체순번 리스트."""
-        return [item.전체순번 for item in self.items if (getattr(item, "비고", None) or "").strip() == "제외"]
+    def get_selected_sequences(self) -> Tuple[int, ...]:
+        """비고가 '선택'인 문항의 전체순번 (선택 71문항 등)."""
+        return self.get_sequences_by_비고("선택")
+
+    def get_excluded_sequences(self) -> Tuple[int, ...]:
+        """비고가 '제외'인 문항의 전체순번."""
+        return self.get_sequences_by_비고("제외")
 
     def validate_sequences(self) -> Dict:
         """문항 순번 검증"""
@@ -113,3 +247,62 @@ class SurveyDataLoader:
             "추가된_순번": extra,
             "검증_결과": len(missing) == 0 and len(extra) == 0
         }
+
+
+class _SharedCatalog:
+    """공유 카탈로그 한 건: 로드 당시 파일 시그니처와 로더."""
+
+    __slots__ = ("signature", "loader", "checked_at")
+
+    def __init__(self, signature: Tuple[int, int], loader: SurveyDataLoader, checked_at: float):
+        self.signature = signature
+        self.loader = loader
+        self.checked_at = checked_at
+
+
+_shared_lock = threading.Lock()
+_shared_catalogs: Dict[str, _SharedCatalog] = {}
+
+
+def _file_signature(path: str) -> Tuple[int, int]:
+    st = os.stat(path)
+    return (st.st_mtime_ns, st.st_size)
+
+
+def get_shared_loader(csv_path: Optional[str] = None) -> SurveyDataLoader:
+    """
+    프로세스 공용 SurveyDataLoader 반환 (CSV 경로·mtime 기준 캐시).
+    CSV 파일이 바뀌면 다음 호출에서 새로 로드하고, 그 전까지는 같은 인스턴스를 재사용합니다.
+    반환된 로더의 items 는 공유되므로 수정하지 마세요.
+    """
+    path = os.path.abspath(csv_path or _DEFAULT_CSV)
+    entry = _shared_catalogs.get(path)
+    now = time.monotonic()
+    if entry is not None and now - entry.checked_at < SHARED_RELOAD_CHECK_SECONDS:
+        return entry.loader
+    with _shared_lock:
+        entry = _shared_catalogs.get(path)
+        try:
+            signature = _file_signature(path)
+        except OSError:
+            if entry is not None:
+                # 파일 교체 중 등 일시적으로 없으면 기존 카탈로그 유지
+                entry.checked_at = now
+                return entry.loader
+            raise
+        if entry is not None and entry.signature == signature:
+            entry.checked_at = now
+            return entry.loader
+        loader = SurveyDataLoader(path)
+        _shared_catalogs[path] = _SharedCatalog(signature, loader, now)
+        return loader
+
+
+if __name__ == "__main__":
+    import sys
+
+    loader = SurveyDataLoader(sys.argv[2] if len(sys.argv) > 2 else None)
+    if len(sys.argv) > 1 and sys.argv[1] == "--compile":
+        path = loader.write_catalog()
+        print("카탈로그 저장:", path)
+    print(loader.validate_sequences()["검증_결과"])
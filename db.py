@@ -3,198 +3,23 @@ DB 연결 (MySQL, SQLite, PostgreSQL/Supabase).
 - engine: "mysql"(기본) | "sqlite" | "postgres"
 - MySQL: 환경변수 / db_config.json 의 host, user, password, database 사용.
 - SQLite: MySQL 연결이 불가한 환경에서 사용. database 경로에 .db 파일 생성.
+  SQLITE_PROFILE=production(기본, WAL·스레드별 연결) | legacy (bench_sqlite_profile.py 로 비교)
 - postgres: Supabase 등. 환경변수 DATABASE_URL 또는 SUPABASE_DB_URL (postgresql://...)
 """
 import os
 import json
 import sqlite3
-from typing import Any, List, Tuple, Optional
+import threading
+from typing import Any, List, Tuple, Optional, Sequence, Union
 from contextlib import contextmanager
+from functools import lru_cache
+
+from db_pool import ConnectionPool, ThreadLocalConnections
+from db_migrations import ensure_schema
 
 _CONFIG_DIR = os.path.dirname(os.path.abspath(__file__))
 _CONFIG_FILE = os.path.join(_CONFIG_DIR, "db_config.json")
 
-# SQLite 테이블 생성 (MySQL 스키마와 동일 구조)
-_SQLITE_SCHEMA = """
-CREATE TABLE IF NOT EXISTS users (
-    id INTEGER PRIMARY KEY AUTOINCREMENT,
-    email TEXT NOT NULL UNIQUE,
-    password_hash TEXT NOT NULL,
-    created_at TEXT NOT NULL,
-    name TEXT,
-    gender TEXT,
-    age INTEGER,
-    occupation TEXT,
-    nationality TEXT,
-    sleep_hours TEXT,
-    sleep_hours_label TEXT,
-    sleep_quality TEXT,
-    meal_habit TEXT,
-    bowel_habit TEXT,
-    exercise_habit TEXT
-);
-CREATE INDEX IF NOT EXISTS idx_users_email ON users(email);
-
-CREATE TABLE IF NOT EXISTS survey_saves (
-    id INTEGER PRIMARY KEY AUTOINCREMENT,
-    user_email TEXT NOT NULL,
-    title TEXT NOT NULL,
-    update_count INTEGER NOT NULL DEFAULT 0,
-    responses_json TEXT NOT NULL,
-    required_sequences_json TEXT NOT NULL,
-    excluded_sequences_json TEXT,
-    created_at TEXT NOT NULL
-);
-CREATE INDEX IF NOT EXISTS idx_survey_user ON survey_saves(user_email);
-CREATE INDEX IF NOT EXISTS idx_survey_created ON survey_saves(created_at);
-
-CREATE TABLE IF NOT EXISTS chat_saves (
-    id INTEGER PRIMARY KEY AUTOINCREMENT,
-    user_email TEXT NOT NULL,
-    summary_title TEXT NOT NULL,
-    messages_json TEXT NOT NULL,
-    ai_notes_json TEXT,
-    created_at TEXT NOT NULL
-);
-CREATE INDEX IF NOT EXISTS idx_chat_user ON chat_saves(user_email);
-CREATE INDEX IF NOT EXISTS idx_chat_created ON chat_saves(created_at);
-
-CREATE TABLE IF NOT EXISTS board (
-    id INTEGER PRIMARY KEY AUTOINCREMENT,
-    type TEXT NOT NULL,
-    title TEXT NOT NULL,
-    content TEXT,
-    created_at TEXT NOT NULL,
-    updated_at TEXT NOT NULL
-);
-CREATE INDEX IF NOT EXISTS idx_board_type ON board(type);
-
-CREATE TABLE IF NOT EXISTS eeg_saves (
-    id INTEGER PRIMARY KEY AUTOINCREMENT,
-    user_email TEXT NOT NULL,
-    title TEXT NOT NULL,
-    data_json TEXT NOT NULL,
-    created_at TEXT NOT NULL
-);
-CREATE INDEX IF NOT EXISTS idx_eeg_user ON eeg_saves(user_email);
-CREATE INDEX IF NOT EXISTS idx_eeg_created ON eeg_saves(created_at);
-
-CREATE TABLE IF NOT EXISTS indicator_formulas (
-    id INTEGER PRIMARY KEY AUTOINCREMENT,
-    title TEXT NOT NULL,
-    content TEXT NOT NULL,
-    sort_order INTEGER NOT NULL DEFAULT 0,
-    created_at TEXT NOT NULL,
-    updated_at TEXT NOT NULL
-);
-CREATE INDEX IF NOT EXISTS idx_indicator_sort ON indicator_formulas(sort_order);
-"""
-
-# PostgreSQL 스키마 (재배포 시에도 데이터 유지용 외부 DB)
-_POSTGRES_SCHEMA = """
-CREATE TABLE IF NOT EXISTS users (
-    id SERIAL PRIMARY KEY,
-    email VARCHAR(255) NOT NULL UNIQUE,
-    password_hash TEXT NOT NULL,
-    created_at TIMESTAMP NOT NULL,
-    name TEXT,
-    gender TEXT,
-    age INTEGER,
-    occupation TEXT,
-    nationality TEXT,
-    sleep_hours TEXT,
-    sleep_hours_label TEXT,
-    sleep_quality TEXT,
-    meal_habit TEXT,
-    bowel_habit TEXT,
-    exercise_habit TEXT
-);
-CREATE INDEX IF NOT EXISTS idx_users_email ON users(email);
-
-CREATE TABLE IF NOT EXISTS survey_saves (
-    id SERIAL PRIMARY KEY,
-    user_email VARCHAR(255) NOT NULL,
-    title TEXT NOT NULL,
-    update_count INTEGER NOT NULL DEFAULT 0,
-    responses_json TEXT NOT NULL,
-    required_sequences_json TEXT NOT NULL,
-    excluded_sequences_json TEXT,
-    created_at TIMESTAMP NOT NULL
-);
-CREATE INDEX IF NOT EXISTS idx_survey_user ON survey_saves(user_email);
-CREATE INDEX IF NOT EXISTS idx_survey_created ON survey_saves(created_at);
-
-CREATE TABLE IF NOT EXISTS chat_saves (
-    id SERIAL PRIMARY KEY,
-    user_email VARCHAR(255) NOT NULL,
-    summary_title TEXT NOT NULL,
-    messages_json TEXT NOT NULL,
-    ai_notes_json TEXT,
-    created_at TIMESTAMP NOT NULL
-);
-CREATE INDEX IF NOT EXISTS idx_chat_user ON chat_saves(user_email);
-CREATE INDEX IF NOT EXISTS idx_chat_created ON chat_saves(created_at);
-
-CREATE TABLE IF NOT EXISTS board (
-    id SERIAL PRIMARY KEY,
-    type TEXT NOT NULL,
-    title TEXT NOT NULL,
-    content TEXT,
-    created_at TIMESTAMP NOT NULL,
-    updated_at TIMESTAMP NOT NULL
-);
-CREATE INDEX IF NOT EXISTS idx_board_type ON board(type);
-
-CREATE TABLE IF NOT EXISTS eeg_saves (
-    id SERIAL PRIMARY KEY,
-    user_email VARCHAR(255) NOT NULL,
-    title TEXT NOT NULL,
-    data_json TEXT NOT NULL,
-    created_at TIMESTAMP NOT NULL
-);
-CREATE INDEX IF NOT EXISTS idx_eeg_user ON eeg_saves(user_email);
-CREATE INDEX IF NOT EXISTS idx_eeg_created ON eeg_saves(created_at);
-
-CREATE TABLE IF NOT EXISTS indicator_formulas (
-    id SERIAL PRIMARY KEY,
-    title TEXT NOT NULL,
-    content TEXT NOT NULL,
-    sort_order INTEGER NOT NULL DEFAULT 0,
-    created_at TIMESTAMP NOT NULL,
-    updated_at TIMESTAMP NOT NULL
-);
-CREATE INDEX IF NOT EXISTS idx_indicator_sort ON indicator_formulas(sort_order);
-"""
-
-
-def _init_postgres(conn) -> None:
-    """PostgreSQL 테이블 생성 (없을 때만). 한 번 연결 시 자동 실행."""
-    with conn.cursor() as cur:
-        cur.execute(_POSTGRES_SCHEMA)
-    conn.commit()
-    # users 프로필 컬럼 추가 (기존 DB 호환)
-    with conn.cursor() as cur:
-        cur.execute("""
-            SELECT column_name FROM information_schema.columns
-            WHERE table_name = 'users' AND table_schema = 'public'
-        """)
-        cols = [row["column_name"] for row in cur.fetchall()]
-    for col, ctype in [
-        ("name", "TEXT"), ("gender", "TEXT"), ("age", "INTEGER"), ("occupation", "TEXT"), ("nationality", "TEXT"),
-        ("sleep_hours", "TEXT"), ("sleep_hours_label", "TEXT"), ("sleep_quality", "TEXT"),
-        ("meal_habit", "TEXT"), ("bowel_habit", "TEXT"), ("exercise_habit", "TEXT"),
-    ]:
-        if col not in cols:
-            try:
-                with conn.cursor() as cur:
-                    cur.execute(f"ALTER TABLE users ADD COLUMN IF NOT EXISTS {col} {ctype}")
-                conn.commit()
-            except Exception:
-                try:
-                    conn.rollback()
-                except Exception:
-                    pass
-
 
 def _load_db_config() -> dict:
     """환경변수 우선, 없으면 db_config.json, 없으면 기본값. engine 추가."""
@@ -258,137 +83,356 @@ if DB_ENGINE == "sqlite":
     SQLITE_DB_PATH = _sqlite_path
 
 
-def _init_sqlite(conn: sqlite3.Connection) -> None:
-    conn.executescript(_SQLITE_SCHEMA)
-    # 기존 users 테이블에 프로필 컬럼 추가 (없으면)
-    cur = conn.execute("PRAGMA table_info(users)")
-    cols = [row[1] for row in cur.fetchall()]
-    for col, ctype in [
-        ("name", "TEXT"), ("gender", "TEXT"), ("age", "INTEGER"), ("occupation", "TEXT"), ("nationality", "TEXT"),
-        ("sleep_hours", "TEXT"), ("sleep_hours_label", "TEXT"), ("sleep_quality", "TEXT"), ("meal_habit", "TEXT"), ("bowel_habit", "TEXT"), ("exercise_habit", "TEXT"),
-    ]:
-        if col not in cols:
-            try:
-                conn.execute("ALTER TABLE users ADD COLUMN " + col + " " + ctype)
-            except Exception:
-                pass
-    conn.commit()
-
-
 def _sqlite_row_to_dict(row: sqlite3.Row) -> dict:
     return {k: row[k] for k in row.keys()} if row else None
 
 
+# SQLite 연결 프로필 (환경변수 SQLITE_PROFILE)
+# - production(기본): WAL + synchronous=NORMAL + 캐시/mmap + busy timeout, 스레드별 재사용 연결
+#   WAL 은 읽기와 쓰기가 서로 막지 않아 동시 저장 시 "database is locked" 가 크게 줄어듦
+# - legacy: 예전 기본값 (rollback journal, busy timeout 없음), 연결 풀 사용
+SQLITE_PROFILE = os.environ.get("SQLITE_PROFILE", "production").strip().lower()
+SQLITE_BUSY_TIMEOUT_MS = int(os.environ.get("SQLITE_BUSY_TIMEOUT_MS", "5000"))
+SQLITE_CACHE_KB = int(os.environ.get("SQLITE_CACHE_KB", "16384"))
+SQLITE_MMAP_MB = int(os.environ.get("SQLITE_MMAP_MB", "128"))
+
+
+def _apply_sqlite_profile(conn: sqlite3.Connection) -> None:
+    """production 프로필 PRAGMA. journal_mode=WAL 은 DB 파일에 기록되므로 한 번 바뀌면 유지됨."""
+    conn.execute(f"PRAGMA busy_timeout = {SQLITE_BUSY_TIMEOUT_MS}")
+    conn.execute("PRAGMA journal_mode = WAL")
+    conn.execute("PRAGMA synchronous = NORMAL")
+    conn.execute(f"PRAGMA cache_size = {-SQLITE_CACHE_KB}")  # 음수 = KiB 단위
+    conn.execute(f"PRAGMA mmap_size = {SQLITE_MMAP_MB * 1024 * 1024}")
+    conn.execute("PRAGMA temp_store = MEMORY")
+
+
+def _connect_sqlite() -> sqlite3.Connection:
+    if SQLITE_PROFILE == "legacy":
+        # 풀에서 스레드 간에 넘겨 쓰므로 check_same_thread=False (한 번에 한 스레드만 사용)
+        conn = sqlite3.connect(SQLITE_DB_PATH, check_same_thread=False)
+    else:
+        # 스레드별 연결이므로 check_same_thread 기본값 유지
+        conn = sqlite3.connect(SQLITE_DB_PATH, timeout=SQLITE_BUSY_TIMEOUT_MS / 1000.0)
+        _apply_sqlite_profile(conn)
+    conn.row_factory = sqlite3.Row
+    ensure_schema(conn, "sqlite", SQLITE_DB_PATH)
+    return conn
+
+
+def _connect_postgres():
+    import psycopg2
+    from psycopg2.extras import RealDictCursor
+    url = DATABASE_URL
+    if not url:
+        raise RuntimeError("DB_ENGINE=postgres 이면 DATABASE_URL 또는 SUPABASE_DB_URL 환경 변수가 필요합니다.")
+    if url.startswith("postgres://"):
+        url = "postgresql://" + url[11:]
+    conn = psycopg2.connect(url, cursor_factory=RealDictCursor)
+    ensure_schema(conn, "postgres", url)
+    return conn
+
+
+def _connect_mysql():
+    conn = pymysql.connect(**DB_CONFIG)
+    ensure_schema(conn, "mysql", f"{DB_CONFIG['host']}/{DB_CONFIG['database']}")
+    return conn
+
+
+def _ping_sqlite(conn) -> None:
+    conn.execute("SELECT 1").fetchone()
+
+
+def _ping_postgres(conn) -> None:
+    if conn.closed:
+        raise RuntimeError("connection closed")
+    with conn.cursor() as cur:
+        cur.execute("SELECT 1")
+    conn.rollback()
+
+
+def _ping_mysql(conn) -> None:
+    conn.ping(reconnect=False)
+
+
+# 연결 풀 설정 (환경변수). DB_POOL_SIZE=0 이면 풀 없이 매번 새 연결.
+DB_POOL_SIZE = int(os.environ.get("DB_POOL_SIZE", "5"))
+DB_POOL_MAX_LIFETIME = float(os.environ.get("DB_POOL_MAX_LIFETIME", "1800"))
+DB_POOL_TIMEOUT = float(os.environ.get("DB_POOL_TIMEOUT", "10"))
+DB_POOL_PING_INTERVAL = float(os.environ.get("DB_POOL_PING_INTERVAL", "30"))
+
+_pool: Optional[Union[ConnectionPool, ThreadLocalConnections]] = None
+_pool_lock = threading.Lock()
+
+
+def get_pool() -> Union[ConnectionPool, ThreadLocalConnections]:
+    """현재 엔진용 연결 풀 (프로세스당 하나, 처음 사용할 때 생성). SQLite production 프로필은 스레드별 연결."""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None and DB_ENGINE == "sqlite" and SQLITE_PROFILE != "legacy":
+                _pool = ThreadLocalConnections(_connect_sqlite, name="sqlite")
+            if _pool is None:
+                connect, ping = {
+                    "sqlite": (_connect_sqlite, _ping_sqlite),
+                    "postgres": (_connect_postgres, _ping_postgres),
+                }.get(DB_ENGINE, (_connect_mysql, _ping_mysql))
+                _pool = ConnectionPool(
+                    connect,
+                    ping=ping,
+                    name=DB_ENGINE,
+                    max_size=DB_POOL_SIZE,
+                    max_lifetime=DB_POOL_MAX_LIFETIME,
+                    timeout=DB_POOL_TIMEOUT,
+                    ping_interval=DB_POOL_PING_INTERVAL,
+                )
+    return _pool
+
+
+def pool_stats() -> dict:
+    """연결 풀 현황 (in_use, idle, waits 등). 풀이 아직 없으면 빈 통계."""
+    if _pool is None:
+        return {"name": DB_ENGINE, "max_size": DB_POOL_SIZE, "in_use": 0, "idle": 0, "total": 0, "waits": 0}
+    return _pool.stats()
+
+
 @contextmanager
 def get_conn():
-    """DB 연결 컨텍스트. MySQL, SQLite, 또는 PostgreSQL(Supabase)."""
-    if DB_ENGINE == "sqlite":
-        conn = sqlite3.connect(SQLITE_DB_PATH)
-        conn.row_factory = sqlite3.Row
-        try:
-            _init_sqlite(conn)
-            yield conn
-            conn.commit()
-        except Exception:
-            conn.rollback()
-            raise
-        finally:
-            conn.close()
-    elif DB_ENGINE == "postgres":
-        import psycopg2
-        from psycopg2.extras import RealDictCursor
-        url = DATABASE_URL
-        if not url:
-            raise RuntimeError("DB_ENGINE=postgres 이면 DATABASE_URL 또는 SUPABASE_DB_URL 환경 변수가 필요합니다.")
-        if url.startswith("postgres://"):
-            url = "postgresql://" + url[11:]
-        conn = psycopg2.connect(url, cursor_factory=RealDictCursor)
+    """DB 연결 컨텍스트. MySQL, SQLite, 또는 PostgreSQL(Supabase). 풀에서 빌려 쓰고 반납."""
+    pool = get_pool()
+    entry = pool.acquire()
+    conn = entry.conn
+    discard = False
+    try:
+        yield conn
+        conn.commit()
+    except BaseException:
         try:
-            _init_postgres(conn)
-            yield conn
-            conn.commit()
-        except Exception:
             conn.rollback()
-            raise
-        finally:
-            conn.close()
-    else:
-        conn = pymysql.connect(**DB_CONFIG)
-        try:
-            yield conn
-            conn.commit()
         except Exception:
-            conn.rollback()
-            raise
-        finally:
-            conn.close()
+            # 롤백도 실패하면 연결 상태를 믿을 수 없으므로 풀에 돌려놓지 않음
+            discard = True
+        raise
+    finally:
+        pool.release(entry, discard=discard)
+
+
+# --- 문장(statement) 계층 ---
+# SQL 은 MySQL 형식(%s 플레이스홀더)으로 작성하고, 엔진별 변환 결과는 템플릿당 한 번만 계산해 캐시.
+# 엔진별 실행 함수도 import 시점에 한 번 골라 두어 호출마다 DB_ENGINE 분기를 하지 않음.
+
+@lru_cache(maxsize=1024)
+def compile_sql(sql: str, dialect: str, returning_id: bool = False) -> str:
+    """
+    SQL 템플릿을 dialect 용으로 변환 (결과 캐시).
+    - sqlite: %s → ?
+    - postgres: returning_id=True 인 INSERT 에 RETURNING id 추가 (lastval() 왕복 제거)
+    """
+    if dialect == "sqlite":
+        return sql.replace("%s", "?")
+    if dialect == "postgres" and returning_id and "RETURNING" not in sql.upper():
+        return sql.rstrip().rstrip(";") + " RETURNING id"
+    return sql
 
 
 def _convert_sql_for_sqlite(sql: str) -> str:
     """MySQL %s 플레이스홀더를 SQLite ? 로 변환."""
-    return sql.replace("%s", "?")
+    return compile_sql(sql, "sqlite")
+
+
+def _sqlite_cursor(conn, sql: str, args) -> sqlite3.Cursor:
+    return conn.execute(sql, args)
+
+
+def _dbapi_cursor(conn, sql: str, args):
+    cur = conn.cursor()
+    try:
+        cur.execute(sql, args)
+    except BaseException:
+        cur.close()
+        raise
+    return cur
+
+
+def _sqlite_executemany(conn, sql: str, rows) -> int:
+    return conn.executemany(sql, rows).rowcount
+
+
+def _postgres_executemany(conn, sql: str, rows) -> int:
+    from psycopg2.extras import execute_batch
+    with conn.cursor() as cur:
+        execute_batch(cur, sql, rows, page_size=500)
+        return len(rows)
+
+
+def _mysql_executemany(conn, sql: str, rows) -> int:
+    # pymysql 은 INSERT ... VALUES 를 다중 행 INSERT 한 문장으로 합쳐 전송
+    with conn.cursor() as cur:
+        return cur.executemany(sql, rows) or 0
+
+
+def _insert_id_sqlite_mysql(cur) -> int:
+    return cur.lastrowid
+
+
+def _insert_id_postgres(cur) -> int:
+    row = cur.fetchone()
+    return int(row["id"]) if row else 0
+
+
+_DIALECT = DB_ENGINE
+if DB_ENGINE == "sqlite":
+    _open_cursor, _to_dict, _executemany, _insert_id = _sqlite_cursor, _sqlite_row_to_dict, _sqlite_executemany, _insert_id_sqlite_mysql
+elif DB_ENGINE == "postgres":
+    _open_cursor, _to_dict, _executemany, _insert_id = _dbapi_cursor, (lambda row: row), _postgres_executemany, _insert_id_postgres
+else:
+    _open_cursor, _to_dict, _executemany, _insert_id = _dbapi_cursor, (lambda row: row), _mysql_executemany, _insert_id_sqlite_mysql
+
+# 다중 행 INSERT 한 문장에 넣을 최대 바인드 변수 수 (SQLite 기본 한도 999 이하)
+_MAX_BIND_PARAMS = 900
 
 
 def execute_one(conn, sql: str, args: Optional[Tuple] = None) -> Optional[dict]:
     """SELECT 한 건. dict 반환."""
-    args = args or ()
-    if DB_ENGINE == "sqlite":
-        sql = _convert_sql_for_sqlite(sql)
-        cur = conn.execute(sql, args)
-        row = cur.fetchone()
-        return _sqlite_row_to_dict(row)
-    if DB_ENGINE == "postgres":
-        with conn.cursor() as cur:
-            cur.execute(sql, args)
-            return cur.fetchone()
-    with conn.cursor() as cur:
-        cur.execute(sql, args)
-        return cur.fetchone()
+    cur = _open_cursor(conn, compile_sql(sql, _DIALECT), args or ())
+    try:
+        return _to_dict(cur.fetchone())
+    finally:
+        cur.close()
 
 
 def execute_all(conn, sql: str, args: Optional[Tuple] = None) -> List[dict]:
     """SELECT 여러 건."""
-    args = args or ()
-    if DB_ENGINE == "sqlite":
-        sql = _convert_sql_for_sqlite(sql)
-        cur = conn.execute(sql, args)
-        return [_sqlite_row_to_dict(row) for row in cur.fetchall()]
-    if DB_ENGINE == "postgres":
-        with conn.cursor() as cur:
-            cur.execute(sql, args)
-            return cur.fetchall()
-    with conn.cursor() as cur:
-        cur.execute(sql, args)
-        return cur.fetchall()
+    cur = _open_cursor(conn, compile_sql(sql, _DIALECT), args or ())
+    try:
+        return [_to_dict(row) for row in cur.fetchall()]
+    finally:
+        cur.close()
 
 
 def execute_insert(conn, sql: str, args: Tuple) -> int:
-    """INSERT 후 lastrowid 반환."""
-    if DB_ENGINE == "sqlite":
-        sql = _convert_sql_for_sqlite(sql)
-        cur = conn.execute(sql, args)
-        return cur.lastrowid
-    if DB_ENGINE == "postgres":
-        with conn.cursor() as cur:
-            cur.execute(sql, args)
-            cur.execute("SELECT lastval()")
-            row = cur.fetchone()
-            return int(row["lastval"]) if row else 0
-    with conn.cursor() as cur:
-        cur.execute(sql, args)
-        return cur.lastrowid
+    """INSERT 후 새 id 반환 (PostgreSQL 은 RETURNING id 로 한 번에)."""
+    cur = _open_cursor(conn, compile_sql(sql, _DIALECT, returning_id=True), args)
+    try:
+        return _insert_id(cur)
+    finally:
+        cur.close()
 
 
 def execute_update_delete(conn, sql: str, args: Tuple) -> int:
     """UPDATE/DELETE 후 rowcount 반환."""
-    if DB_ENGINE == "sqlite":
-        sql = _convert_sql_for_sqlite(sql)
-        cur = conn.execute(sql, args)
-        return cur.rowcount
-    if DB_ENGINE == "postgres":
-        with conn.cursor() as cur:
-            cur.execute(sql, args)
-            return cur.rowcount
-    with conn.cursor() as cur:
-        cur.execute(sql, args)
+    cur = _open_cursor(conn, compile_sql(sql, _DIALECT), args)
+    try:
         return cur.rowcount
+    finally:
+        cur.close()
+
+
+def execute_many(conn, sql: str, rows: Sequence[Tuple]) -> int:
+    """
+    같은 문장을 여러 인자 묶음으로 실행 (executemany). 처리한 행 수 반환.
+    SQLite: executemany / PostgreSQL: execute_batch / MySQL: pymysql 다중 행 INSERT.
+    """
+    rows = list(rows)
+    if not rows:
+        return 0
+    return _executemany(conn, compile_sql(sql, _DIALECT), rows)
+
+
+def insert_many(conn, table: str, columns: Sequence[str], rows: Sequence[Tuple], chunk_size: int = 500) -> int:
+    """
+    대량 INSERT: INSERT INTO table (cols) VALUES (...), (...), ... 를 묶음 단위로 실행. 넣은 행 수 반환.
+    세 엔진 모두 다중 행 VALUES 를 지원하므로 왕복 수가 행 수가 아니라 묶음 수만큼만 발생.
+    """
+    rows = list(rows)
+    if not rows:
+        return 0
+    per_stmt = max(1, min(chunk_size, _MAX_BIND_PARAMS // max(1, len(columns))))
+    col_sql = ", ".join(columns)
+    placeholder = "(" + ", ".join(["%s"] * len(columns)) + ")"
+    inserted = 0
+    for start in range(0, len(rows), per_stmt):
+        chunk = rows[start:start + per_stmt]
+        sql = compile_sql(f"INSERT INTO {table} ({col_sql}) VALUES " + ", ".join([placeholder] * len(chunk)), _DIALECT)
+        args = tuple(v for row in chunk for v in row)
+        cur = _open_cursor(conn, sql, args)
+        cur.close()
+        inserted += len(chunk)
+    return inserted
+
+
+# --- 목록 페이지 (keyset) ---
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 500
+
+
+def clamp_page_size(page_size: Optional[int]) -> int:
+    """요청 page_size 를 1~MAX_PAGE_SIZE 로 (없으면 DEFAULT_PAGE_SIZE)."""
+    if not page_size:
+        return DEFAULT_PAGE_SIZE
+    return max(1, min(int(page_size), MAX_PAGE_SIZE))
+
+
+def keyset_page(
+    conn,
+    table: str,
+    columns: Sequence[str],
+    conditions: Sequence[str] = (),
+    args: Sequence = (),
+    after_id: Optional[int] = None,
+    page_size: Optional[int] = None,
+    descending: bool = True,
+    sort_column: Optional[str] = None,
+    after_value: Any = None,
+) -> Tuple[List[dict], Optional[int]]:
+    """
+    커서(keyset) 페이지: OFFSET 없이 마지막으로 받은 id 다음부터 page_size 건. (rows, next_after_id) 반환.
+    next_after_id 가 None 이면 마지막 페이지. columns 에 id 가 반드시 있어야 함.
+    sort_column 이 있으면 (sort_column, id) 순서. 커서는 (after_value, after_id) = 마지막 행의 (sort_column 값, id)
+    로 받음 (columns 에 sort_column 포함): 커서 행이 그 사이 삭제돼도 다음 페이지가 이어짐.
+    """
+    page_size = clamp_page_size(page_size)
+    conds = list(conditions) or ["1=1"]
+    params = list(args)
+    op = "<" if descending else ">"
+    direction = "DESC" if descending else "ASC"
+    if after_id is not None:
+        if sort_column:
+            if after_value is None:
+                raise ValueError(f"{sort_column} 순 커서에는 after_value 가 필요합니다.")
+            conds.append(f"({sort_column} {op} %s OR ({sort_column} = %s AND id {op} %s))")
+            params += [after_value, after_value, after_id]
+        else:
+            conds.append(f"id {op} %s")
+            params.append(after_id)
+    order = f"{sort_column} {direction}, id {direction}" if sort_column else f"id {direction}"
+    sql = f"SELECT {', '.join(columns)} FROM {table} WHERE {' AND '.join(conds)} ORDER BY {order} LIMIT %s"
+    rows = execute_all(conn, sql, tuple(params) + (page_size + 1,))
+    if len(rows) > page_size:
+        return rows[:page_size], rows[page_size - 1]["id"]
+    return rows, None
+
+
+def total_estimate(conn, table: str, conditions: Sequence[str] = (), args: Sequence = ()) -> Tuple[int, bool]:
+    """
+    목록 전체 건수. (건수, 정확 여부) 반환.
+    조건 없는 PostgreSQL/MySQL 테이블은 통계값(pg_class.reltuples / information_schema.TABLES.TABLE_ROWS)을
+    읽어 COUNT(*) 전체 스캔을 피함. 통계가 없거나 조건이 있으면 COUNT(*).
+    SQLite 는 통계가 없어 항상 COUNT(*) (단일 파일·소규모 배포용).
+    """
+    if not conditions:
+        row = None
+        if _DIALECT == "postgres":
+            row = execute_one(conn, "SELECT reltuples::bigint AS n FROM pg_class WHERE relname = %s", (table,))
+        elif _DIALECT == "mysql":
+            row = execute_one(
+                conn,
+                "SELECT TABLE_ROWS AS n FROM information_schema.TABLES WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s",
+                (table,),
+            )
+        # 0 이하: 아직 ANALYZE 전(-1) 이거나 작은 테이블 → 정확히 세도 부담 없음
+        if row and row["n"] is not None and int(row["n"]) > 0:
+            return int(row["n"]), False
+    row = execute_one(conn, f"SELECT COUNT(*) AS n FROM {table} WHERE {' AND '.join(conditions) or '1=1'}", tuple(args))
+    return (int(row["n"]) if row else 0), True
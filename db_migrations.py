@@ -0,0 +1,642 @@
+"""
+DB 스키마 마이그레이션 (SQLite, PostgreSQL, MySQL 공통).
+- schema_version 테이블에 적용한 번호를 기록하고, 번호순으로 아직 적용하지 않은 것만 실행
+- 프로세스당 한 번만 확인 (DB 별 플래그 + lock). 이후 연결은 DDL 왕복 없음
+- 여러 프로세스가 동시에 시작해도 안전하도록 PostgreSQL advisory lock / MySQL GET_LOCK 사용
+  (SQLite 마이그레이션은 모두 IF NOT EXISTS·컬럼 확인 방식이라 중복 실행돼도 무해)
+- 새 스키마 변경은 MIGRATIONS 끝에 번호를 늘려 추가 (이미 배포된 항목은 수정하지 않음)
+- DB_AUTO_MIGRATE=0 이면 자동 적용하지 않음 (python db_migrations.py 로 수동 적용)
+
+사용:
+    python db_migrations.py          # 현재 DB 에 미적용 마이그레이션 적용 후 버전 출력
+    python db_migrations.py --status # 적용 버전만 출력
+"""
+import json
+import logging
+import os
+import sqlite3
+import threading
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+AUTO_MIGRATE = os.environ.get("DB_AUTO_MIGRATE", "1").strip().lower() not in ("0", "false", "off", "no")
+
+# 다른 프로세스와 동시 실행 방지용 잠금 키
+_PG_ADVISORY_KEY = 0x5B1_5C4E  # "SBI schema"
+_MYSQL_LOCK_NAME = "sbi_schema_migrations"
+
+_VERSION_TABLE_SQL = (
+    "CREATE TABLE IF NOT EXISTS schema_version ("
+    "version INTEGER PRIMARY KEY, name VARCHAR(255) NOT NULL, applied_at VARCHAR(32) NOT NULL)"
+)
+
+# SQLite 테이블 생성 (MySQL 스키마와 동일 구조)
+_SQLITE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS users (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    email TEXT NOT NULL UNIQUE,
+    password_hash TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    name TEXT,
+    gender TEXT,
+    age INTEGER,
+    occupation TEXT,
+    nationality TEXT,
+    sleep_hours TEXT,
+    sleep_hours_label TEXT,
+    sleep_quality TEXT,
+    meal_habit TEXT,
+    bowel_habit TEXT,
+    exercise_habit TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_users_email ON users(email);
+
+CREATE TABLE IF NOT EXISTS survey_saves (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_email TEXT NOT NULL,
+    title TEXT NOT NULL,
+    update_count INTEGER NOT NULL DEFAULT 0,
+    responses_json TEXT NOT NULL,
+    required_sequences_json TEXT NOT NULL,
+    excluded_sequences_json TEXT,
+    created_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_survey_user ON survey_saves(user_email);
+CREATE INDEX IF NOT EXISTS idx_survey_created ON survey_saves(created_at);
+
+CREATE TABLE IF NOT EXISTS chat_saves (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_email TEXT NOT NULL,
+    summary_title TEXT NOT NULL,
+    messages_json TEXT NOT NULL,
+    ai_notes_json TEXT,
+    created_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_chat_user ON chat_saves(user_email);
+CREATE INDEX IF NOT EXISTS idx_chat_created ON chat_saves(created_at);
+
+CREATE TABLE IF NOT EXISTS board (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    type TEXT NOT NULL,
+    title TEXT NOT NULL,
+    content TEXT,
+    created_at TEXT NOT NULL,
+    updated_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_board_type ON board(type);
+
+CREATE TABLE IF NOT EXISTS eeg_saves (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_email TEXT NOT NULL,
+    title TEXT NOT NULL,
+    data_json TEXT NOT NULL,
+    created_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_eeg_user ON eeg_saves(user_email);
+CREATE INDEX IF NOT EXISTS idx_eeg_created ON eeg_saves(created_at);
+
+CREATE TABLE IF NOT EXISTS indicator_formulas (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    title TEXT NOT NULL,
+    content TEXT NOT NULL,
+    sort_order INTEGER NOT NULL DEFAULT 0,
+    created_at TEXT NOT NULL,
+    updated_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_indicator_sort ON indicator_formulas(sort_order);
+"""
+
+# PostgreSQL 스키마 (재배포 시에도 데이터 유지용 외부 DB)
+_POSTGRES_SCHEMA = """
+CREATE TABLE IF NOT EXISTS users (
+    id SERIAL PRIMARY KEY,
+    email VARCHAR(255) NOT NULL UNIQUE,
+    password_hash TEXT NOT NULL,
+    created_at TIMESTAMP NOT NULL,
+    name TEXT,
+    gender TEXT,
+    age INTEGER,
+    occupation TEXT,
+    nationality TEXT,
+    sleep_hours TEXT,
+    sleep_hours_label TEXT,
+    sleep_quality TEXT,
+    meal_habit TEXT,
+    bowel_habit TEXT,
+    exercise_habit TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_users_email ON users(email);
+
+CREATE TABLE IF NOT EXISTS survey_saves (
+    id SERIAL PRIMARY KEY,
+    user_email VARCHAR(255) NOT NULL,
+    title TEXT NOT NULL,
+    update_count INTEGER NOT NULL DEFAULT 0,
+    responses_json TEXT NOT NULL,
+    required_sequences_json TEXT NOT NULL,
+    excluded_sequences_json TEXT,
+    created_at TIMESTAMP NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_survey_user ON survey_saves(user_email);
+CREATE INDEX IF NOT EXISTS idx_survey_created ON survey_saves(created_at);
+
+CREATE TABLE IF NOT EXISTS chat_saves (
+    id SERIAL PRIMARY KEY,
+    user_email VARCHAR(255) NOT NULL,
+    summary_title TEXT NOT NULL,
+    messages_json TEXT NOT NULL,
+    ai_notes_json TEXT,
+    created_at TIMESTAMP NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_chat_user ON chat_saves(user_email);
+CREATE INDEX IF NOT EXISTS idx_chat_created ON chat_saves(created_at);
+
+CREATE TABLE IF NOT EXISTS board (
+    id SERIAL PRIMARY KEY,
+    type TEXT NOT NULL,
+    title TEXT NOT NULL,
+    content TEXT,
+    created_at TIMESTAMP NOT NULL,
+    updated_at TIMESTAMP NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_board_type ON board(type);
+
+CREATE TABLE IF NOT EXISTS eeg_saves (
+    id SERIAL PRIMARY KEY,
+    user_email VARCHAR(255) NOT NULL,
+    title TEXT NOT NULL,
+    data_json TEXT NOT NULL,
+    created_at TIMESTAMP NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_eeg_user ON eeg_saves(user_email);
+CREATE INDEX IF NOT EXISTS idx_eeg_created ON eeg_saves(created_at);
+
+CREATE TABLE IF NOT EXISTS indicator_formulas (
+    id SERIAL PRIMARY KEY,
+    title TEXT NOT NULL,
+    content TEXT NOT NULL,
+    sort_order INTEGER NOT NULL DEFAULT 0,
+    created_at TIMESTAMP NOT NULL,
+    updated_at TIMESTAMP NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_indicator_sort ON indicator_formulas(sort_order);
+"""
+
+
+# MySQL 초기 스키마 (마이그레이션 1 당시 create_tables_mysql.sql 내용 그대로 고정).
+# create_tables_mysql.sql 은 이후 마이그레이션까지 반영한 최종 스키마 문서라 여기서 읽지 않음
+_MYSQL_SCHEMA = """
+CREATE TABLE IF NOT EXISTS users (
+    id INT AUTO_INCREMENT PRIMARY KEY,
+    email VARCHAR(255) NOT NULL,
+    password_hash VARCHAR(255) NOT NULL,
+    created_at VARCHAR(32) NOT NULL,
+    name VARCHAR(128) DEFAULT NULL,
+    gender VARCHAR(16) DEFAULT NULL,
+    age INT DEFAULT NULL,
+    occupation VARCHAR(256) DEFAULT NULL,
+    nationality VARCHAR(128) DEFAULT NULL,
+    sleep_hours DECIMAL(4,1) DEFAULT NULL,
+    sleep_hours_label VARCHAR(64) DEFAULT NULL,
+    sleep_quality VARCHAR(32) DEFAULT NULL,
+    meal_habit VARCHAR(32) DEFAULT NULL,
+    bowel_habit VARCHAR(32) DEFAULT NULL,
+    exercise_habit VARCHAR(32) DEFAULT NULL,
+    UNIQUE KEY uk_email (email),
+    KEY idx_email (email)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+CREATE TABLE IF NOT EXISTS survey_saves (
+    id INT AUTO_INCREMENT PRIMARY KEY,
+    user_email VARCHAR(255) NOT NULL,
+    title VARCHAR(512) NOT NULL,
+    update_count INT NOT NULL DEFAULT 0,
+    responses_json LONGTEXT NOT NULL,
+    required_sequences_json TEXT NOT NULL,
+    excluded_sequences_json TEXT,
+    created_at VARCHAR(32) NOT NULL,
+    KEY idx_survey_user (user_email),
+    KEY idx_survey_created (created_at),
+    KEY idx_survey_title (title(100))
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+CREATE TABLE IF NOT EXISTS chat_saves (
+    id INT AUTO_INCREMENT PRIMARY KEY,
+    user_email VARCHAR(255) NOT NULL,
+    summary_title VARCHAR(512) NOT NULL,
+    messages_json LONGTEXT NOT NULL,
+    ai_notes_json TEXT,
+    created_at VARCHAR(32) NOT NULL,
+    KEY idx_chat_user (user_email),
+    KEY idx_chat_created (created_at)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+CREATE TABLE IF NOT EXISTS board (
+    id INT AUTO_INCREMENT PRIMARY KEY,
+    type VARCHAR(32) NOT NULL,
+    title VARCHAR(256) NOT NULL,
+    content TEXT,
+    created_at VARCHAR(32) NOT NULL,
+    updated_at VARCHAR(32) NOT NULL,
+    KEY idx_board_type (type)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+CREATE TABLE IF NOT EXISTS eeg_saves (
+    id INT AUTO_INCREMENT PRIMARY KEY,
+    user_email VARCHAR(255) NOT NULL,
+    title VARCHAR(512) NOT NULL,
+    data_json LONGTEXT NOT NULL,
+    created_at VARCHAR(32) NOT NULL,
+    KEY idx_eeg_user (user_email),
+    KEY idx_eeg_created (created_at)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+CREATE TABLE IF NOT EXISTS indicator_formulas (
+    id INT AUTO_INCREMENT PRIMARY KEY,
+    title VARCHAR(256) NOT NULL,
+    content LONGTEXT NOT NULL,
+    sort_order INT NOT NULL DEFAULT 0,
+    created_at VARCHAR(32) NOT NULL,
+    updated_at VARCHAR(32) NOT NULL,
+    KEY idx_sort (sort_order)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+"""
+
+
+def _split_statements(script: str) -> List[str]:
+    return [stmt.strip() for stmt in script.split(";") if stmt.strip()]
+
+
+# --- 실행 도우미 (엔진별 커서·플레이스홀더 차이 흡수) ---
+
+def _execute(conn, engine: str, sql: str, args: Sequence[Any] = ()) -> List[Any]:
+    if engine == "sqlite":
+        return conn.execute(sql.replace("%s", "?"), tuple(args)).fetchall()
+    with conn.cursor() as cur:
+        cur.execute(sql, tuple(args))
+        return list(cur.fetchall()) if cur.description else []
+
+
+def _execute_script(conn, engine: str, script: Union[str, Sequence[str]]) -> None:
+    if engine == "sqlite":
+        conn.executescript(script if isinstance(script, str) else ";\n".join(script))
+        return
+    statements = [script] if isinstance(script, str) else script
+    with conn.cursor() as cur:
+        for stmt in statements:
+            cur.execute(stmt)
+
+
+def _column_names(conn, engine: str, table: str) -> List[str]:
+    if engine == "sqlite":
+        return [row[1] for row in conn.execute(f"PRAGMA table_info({table})").fetchall()]
+    if engine == "postgres":
+        sql = "SELECT column_name AS c FROM information_schema.columns WHERE table_schema = 'public' AND table_name = %s"
+    else:
+        sql = "SELECT column_name AS c FROM information_schema.columns WHERE table_schema = DATABASE() AND table_name = %s"
+    return [row["c"] for row in _execute(conn, engine, sql, (table,))]
+
+
+def add_missing_columns(conn, engine: str, table: str, columns: Sequence[Tuple[str, Dict[str, str]]]) -> None:
+    """columns: [(컬럼명, {engine: 타입}), ...]. 없는 컬럼만 ALTER TABLE ADD COLUMN."""
+    existing = set(_column_names(conn, engine, table))
+    for col, types in columns:
+        if col not in existing:
+            _execute(conn, engine, f"ALTER TABLE {table} ADD COLUMN {col} {types[engine]}")
+
+
+# --- 마이그레이션 목록 ---
+
+@dataclass(frozen=True)
+class Migration:
+    """version: 1부터 증가하는 번호. steps: engine -> SQL 스크립트(문자열/문장 목록) 또는 callable(conn, engine)."""
+    version: int
+    name: str
+    steps: Dict[str, Union[str, Sequence[str], Callable[[Any, str], None]]]
+
+    def apply(self, conn, engine: str) -> None:
+        step = self.steps.get(engine)
+        if step is None:
+            return
+        if callable(step):
+            step(conn, engine)
+        else:
+            _execute_script(conn, engine, step)
+
+
+def _users_profile_columns(conn, engine: str) -> None:
+    # 프로필 컬럼이 생기기 전에 만든 DB 호환 (migrate_users_profile.sql 과 같은 컬럼)
+    text = {"sqlite": "TEXT", "postgres": "TEXT"}
+    add_missing_columns(conn, engine, "users", [
+        ("name", dict(text, mysql="VARCHAR(128) DEFAULT NULL")),
+        ("gender", dict(text, mysql="VARCHAR(16) DEFAULT NULL")),
+        ("age", {"sqlite": "INTEGER", "postgres": "INTEGER", "mysql": "INT DEFAULT NULL"}),
+        ("occupation", dict(text, mysql="VARCHAR(256) DEFAULT NULL")),
+        ("nationality", dict(text, mysql="VARCHAR(128) DEFAULT NULL")),
+        ("sleep_hours", dict(text, mysql="DECIMAL(4,1) DEFAULT NULL")),
+        ("sleep_hours_label", dict(text, mysql="VARCHAR(64) DEFAULT NULL")),
+        ("sleep_quality", dict(text, mysql="VARCHAR(32) DEFAULT NULL")),
+        ("meal_habit", dict(text, mysql="VARCHAR(32) DEFAULT NULL")),
+        ("bowel_habit", dict(text, mysql="VARCHAR(32) DEFAULT NULL")),
+        ("exercise_habit", dict(text, mysql="VARCHAR(32) DEFAULT NULL")),
+    ])
+
+
+def _pack_v1(responses: Dict[int, int], required: Sequence[int], excluded: Sequence[int]) -> Optional[bytes]:
+    """
+    마이그레이션 3 당시 response_codec.pack (포맷 1) 사본. 코덱이 바뀌어도 이 마이그레이션이 쓰는 값은 고정.
+    표현할 수 없으면 None (점수 1~15 정수, 순번 1~65535, 필수·제외 목록 중복 없음).
+    """
+    for seq, score in responses.items():
+        if type(seq) is not int or type(score) is not int or not 1 <= score <= 0xF:
+            return None
+    for seqs in (required, excluded):
+        if any(type(s) is not int for s in seqs) or len(set(seqs)) != len(seqs):
+            return None
+    all_seqs = [*responses, *required, *excluded]
+    if any(not 1 <= s <= 0xFFFF for s in all_seqs):
+        return None
+    n = max(all_seqs, default=0)
+    nibbles, mask_size = bytearray((n + 1) // 2), (n + 7) // 8
+    for seq, score in responses.items():
+        i = seq - 1
+        nibbles[i >> 1] |= score << 4 if i % 2 == 0 else score
+    masks = []
+    for seqs in (required, excluded):
+        mask = bytearray(mask_size)
+        for seq in seqs:
+            mask[(seq - 1) >> 3] |= 0x80 >> ((seq - 1) & 7)
+        masks.append(bytes(mask))
+    return bytes((1,)) + n.to_bytes(2, "big") + bytes(nibbles) + masks[0] + masks[1]
+
+
+def _survey_packed_responses(conn, engine: str) -> None:
+    # 응답을 이진 포맷 1 컬럼에 기록 (_pack_v1). 디코드 결과가 원래 값과 같은 행만 JSON 세 컬럼을 비움:
+    # 포맷 1 은 필수·제외 순번을 오름차순 집합으로 저장하므로, 두 목록이 이미 오름차순인 행이 그 경우
+    add_missing_columns(conn, engine, "survey_saves", [
+        ("responses_packed", {"sqlite": "BLOB", "postgres": "BYTEA", "mysql": "VARBINARY(1024) DEFAULT NULL"}),
+    ])
+    names = ("id", "responses_json", "required_sequences_json", "excluded_sequences_json")
+    select = (
+        f"SELECT {', '.join(names)} FROM survey_saves "
+        "WHERE responses_packed IS NULL AND id > %s ORDER BY id LIMIT 500"
+    )
+    update = "UPDATE survey_saves SET responses_packed = %s WHERE id = %s"
+    compact = (
+        "UPDATE survey_saves SET responses_packed = %s, responses_json = '', "
+        "required_sequences_json = '', excluded_sequences_json = '' WHERE id = %s"
+    )
+    last_id = 0
+    while True:
+        rows = _execute(conn, engine, select, (last_id,))
+        if not rows:
+            return
+        for row in rows:
+            row_id, responses_json, required_json, excluded_json = (
+                row if isinstance(row, tuple) else [row[n] for n in names]
+            )
+            last_id = row_id
+            try:
+                responses = {int(k): v for k, v in json.loads(responses_json or "{}").items()}
+                required, excluded = json.loads(required_json or "[]"), json.loads(excluded_json or "[]")
+                packed = _pack_v1(responses, required, excluded)
+                exact = packed is not None and required == sorted(required) and excluded == sorted(excluded)
+            except (ValueError, TypeError, AttributeError):
+                packed = None  # 형식이 다른 옛 행은 JSON 그대로 둠
+            if packed is not None:
+                _execute(conn, engine, compact if exact else update, (packed, row_id))
+
+
+# 전문 검색 색인 (fulltext.py 가 사용). SQLite: FTS5 trigram 외부 콘텐츠 테이블 + 동기화 트리거
+_SQLITE_FULLTEXT = """
+CREATE VIRTUAL TABLE IF NOT EXISTS board_fts USING fts5(title, content, content='board', content_rowid='id', tokenize='trigram');
+CREATE TRIGGER IF NOT EXISTS board_fts_ai AFTER INSERT ON board BEGIN
+    INSERT INTO board_fts(rowid, title, content) VALUES (new.id, new.title, new.content);
+END;
+CREATE TRIGGER IF NOT EXISTS board_fts_ad AFTER DELETE ON board BEGIN
+    INSERT INTO board_fts(board_fts, rowid, title, content) VALUES ('delete', old.id, old.title, old.content);
+END;
+CREATE TRIGGER IF NOT EXISTS board_fts_au AFTER UPDATE OF title, content ON board BEGIN
+    INSERT INTO board_fts(board_fts, rowid, title, content) VALUES ('delete', old.id, old.title, old.content);
+    INSERT INTO board_fts(rowid, title, content) VALUES (new.id, new.title, new.content);
+END;
+INSERT INTO board_fts(board_fts) VALUES ('rebuild');
+
+CREATE VIRTUAL TABLE IF NOT EXISTS survey_saves_fts USING fts5(title, content='survey_saves', content_rowid='id', tokenize='trigram');
+CREATE TRIGGER IF NOT EXISTS survey_saves_fts_ai AFTER INSERT ON survey_saves BEGIN
+    INSERT INTO survey_saves_fts(rowid, title) VALUES (new.id, new.title);
+END;
+CREATE TRIGGER IF NOT EXISTS survey_saves_fts_ad AFTER DELETE ON survey_saves BEGIN
+    INSERT INTO survey_saves_fts(survey_saves_fts, rowid, title) VALUES ('delete', old.id, old.title);
+END;
+CREATE TRIGGER IF NOT EXISTS survey_saves_fts_au AFTER UPDATE OF title ON survey_saves BEGIN
+    INSERT INTO survey_saves_fts(survey_saves_fts, rowid, title) VALUES ('delete', old.id, old.title);
+    INSERT INTO survey_saves_fts(rowid, title) VALUES (new.id, new.title);
+END;
+INSERT INTO survey_saves_fts(survey_saves_fts) VALUES ('rebuild');
+"""
+
+
+def _sqlite_fulltext(conn, engine: str) -> None:
+    # FTS5·trigram(SQLite 3.34+) 없는 빌드면 건너뜀 → fulltext.py 는 LIKE 로 검색
+    try:
+        conn.execute("CREATE VIRTUAL TABLE temp._fts5_probe USING fts5(x, tokenize='trigram')")
+        conn.execute("DROP TABLE temp._fts5_probe")
+    except sqlite3.OperationalError:
+        return
+    _execute_script(conn, engine, _SQLITE_FULLTEXT)
+
+
+def _postgres_fulltext(conn, engine: str) -> None:
+    # tsvector 는 생성 컬럼(행과 함께 자동 갱신). pg_trgm 은 권한이 없으면 생략 (tsvector 검색만)
+    _execute_script(conn, engine, [
+        "ALTER TABLE board ADD COLUMN IF NOT EXISTS search_tsv tsvector GENERATED ALWAYS AS "
+        "(to_tsvector('simple', coalesce(title, '') || ' ' || coalesce(content, ''))) STORED",
+        "CREATE INDEX IF NOT EXISTS idx_board_search_tsv ON board USING gin (search_tsv)",
+        "ALTER TABLE survey_saves ADD COLUMN IF NOT EXISTS search_tsv tsvector GENERATED ALWAYS AS "
+        "(to_tsvector('simple', coalesce(title, ''))) STORED",
+        "CREATE INDEX IF NOT EXISTS idx_survey_search_tsv ON survey_saves USING gin (search_tsv)",
+    ])
+    _execute(conn, engine, "SAVEPOINT sbi_pg_trgm")
+    try:
+        _execute(conn, engine, "CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    except Exception:
+        _execute(conn, engine, "ROLLBACK TO SAVEPOINT sbi_pg_trgm")
+        return
+    _execute_script(conn, engine, [
+        "CREATE INDEX IF NOT EXISTS idx_board_text_trgm ON board USING gin "
+        "((coalesce(title, '') || ' ' || coalesce(content, '')) gin_trgm_ops)",
+        "CREATE INDEX IF NOT EXISTS idx_survey_title_trgm ON survey_saves USING gin ((coalesce(title, '')) gin_trgm_ops)",
+        "CREATE INDEX IF NOT EXISTS idx_survey_user_trgm ON survey_saves USING gin (user_email gin_trgm_ops)",
+    ])
+
+
+def _mysql_fulltext(conn, engine: str) -> None:
+    # InnoDB FULLTEXT 는 쓰기와 함께 자동 갱신. ngram 파서: 공백 없는 한국어도 2글자 단위로 색인
+    existing = {
+        row["INDEX_NAME"] for row in _execute(
+            conn, engine,
+            "SELECT INDEX_NAME FROM information_schema.STATISTICS WHERE TABLE_SCHEMA = DATABASE() AND INDEX_NAME LIKE %s",
+            ("ft\\_%",),
+        )
+    }
+    for name, table, columns in (
+        ("ft_board_text", "board", "title, content"),
+        ("ft_survey_title", "survey_saves", "title"),
+    ):
+        if name in existing:
+            continue
+        # ngram 파서 없는 빌드(MariaDB 등)면 색인 없이 통과 → fulltext.py 는 LIKE 로 검색
+        try:
+            _execute(conn, engine, f"ALTER TABLE {table} ADD FULLTEXT INDEX {name} ({columns}) WITH PARSER ngram")
+        except Exception as e:
+            logger.warning("MySQL FULLTEXT 색인 %s 생략 (ngram 파서 없음?): %s", name, e)
+
+
+# 설문 저장 created_at 의 날짜(YYYY-MM-DD) 식 (PostgreSQL 은 TIMESTAMP 컬럼일 수 있음)
+SURVEY_DAY_EXPR = {
+    "sqlite": "substr(created_at, 1, 10)",
+    "postgres": "left(created_at::text, 10)",
+    "mysql": "LEFT(created_at, 10)",
+}
+
+
+def survey_daily_stats_rebuild_sql(engine: str) -> List[str]:
+    """survey_daily_stats 를 survey_saves 에서 다시 계산하는 문장 (survey_stats.rebuild, 업로드 도구도 사용)."""
+    day = SURVEY_DAY_EXPR[engine]
+    return [
+        "DELETE FROM survey_daily_stats",
+        f"INSERT INTO survey_daily_stats (day, saves) SELECT {day}, COUNT(*) FROM survey_saves GROUP BY {day}",
+    ]
+
+
+def _survey_daily_stats(conn, engine: str) -> None:
+    # 일별 설문 저장 건수 롤업 (survey_stats.py 가 저장·수정·삭제 때 함께 갱신)
+    _execute(
+        conn, engine,
+        "CREATE TABLE IF NOT EXISTS survey_daily_stats (day VARCHAR(10) NOT NULL PRIMARY KEY, saves INTEGER NOT NULL DEFAULT 0)",
+    )
+    _execute_script(conn, engine, survey_daily_stats_rebuild_sql(engine))
+
+
+MIGRATIONS: Tuple[Migration, ...] = (
+    Migration(1, "initial schema", {
+        "sqlite": _SQLITE_SCHEMA,
+        "postgres": _POSTGRES_SCHEMA,
+        "mysql": _split_statements(_MYSQL_SCHEMA),
+    }),
+    Migration(2, "users profile columns", {
+        "sqlite": _users_profile_columns,
+        "postgres": _users_profile_columns,
+        "mysql": _users_profile_columns,
+    }),
+    Migration(3, "survey packed responses", {
+        "sqlite": _survey_packed_responses,
+        "postgres": _survey_packed_responses,
+        "mysql": _survey_packed_responses,
+    }),
+    Migration(4, "full-text search indexes", {
+        "sqlite": _sqlite_fulltext,
+        "postgres": _postgres_fulltext,
+        "mysql": _mysql_fulltext,
+    }),
+    Migration(5, "survey daily stats rollup", {
+        "sqlite": _survey_daily_stats,
+        "postgres": _survey_daily_stats,
+        "mysql": _survey_daily_stats,
+    }),
+)
+
+
+# --- 적용 ---
+
+def current_version(conn, engine: str) -> int:
+    """적용된 최고 버전 (schema_version 이 없으면 0)."""
+    _execute(conn, engine, _VERSION_TABLE_SQL)
+    rows = _execute(conn, engine, "SELECT MAX(version) AS v FROM schema_version")
+    value = None
+    if rows:
+        row = rows[0]
+        value = row[0] if isinstance(row, tuple) else row["v"]
+    return int(value or 0)
+
+
+def _acquire_lock(conn, engine: str) -> None:
+    if engine == "postgres":
+        _execute(conn, engine, "SELECT pg_advisory_lock(%s)", (_PG_ADVISORY_KEY,))
+    elif engine == "mysql":
+        _execute(conn, engine, "SELECT GET_LOCK(%s, 60)", (_MYSQL_LOCK_NAME,))
+
+
+def _release_lock(conn, engine: str) -> None:
+    try:
+        if engine == "postgres":
+            _execute(conn, engine, "SELECT pg_advisory_unlock(%s)", (_PG_ADVISORY_KEY,))
+        elif engine == "mysql":
+            _execute(conn, engine, "SELECT RELEASE_LOCK(%s)", (_MYSQL_LOCK_NAME,))
+        conn.commit()
+    except Exception:
+        pass
+
+
+def migrate(conn, engine: str, migrations: Sequence[Migration] = MIGRATIONS) -> List[int]:
+    """미적용 마이그레이션을 번호순으로 적용. 각 마이그레이션은 버전 기록과 함께 커밋. 적용한 번호 목록 반환."""
+    applied: List[int] = []
+    _acquire_lock(conn, engine)
+    try:
+        version = current_version(conn, engine)
+        conn.commit()
+        for m in sorted(migrations, key=lambda m: m.version):
+            if m.version <= version:
+                continue
+            try:
+                m.apply(conn, engine)
+                _execute(
+                    conn, engine,
+                    "INSERT INTO schema_version (version, name, applied_at) VALUES (%s, %s, %s)",
+                    (m.version, m.name, datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S")),
+                )
+                conn.commit()
+            except Exception as e:
+                try:
+                    conn.rollback()
+                except Exception:
+                    pass
+                raise RuntimeError(f"스키마 마이그레이션 {m.version} ({m.name}) 실패: {e}") from e
+            applied.append(m.version)
+    finally:
+        _release_lock(conn, engine)
+    return applied
+
+
+_migrated: set = set()
+_migrate_lock = threading.Lock()
+
+
+def ensure_schema(conn, engine: str, target: str) -> None:
+    """
+    프로세스에서 target(DB 경로/URL)당 한 번만 마이그레이션 확인·적용.
+    DB_AUTO_MIGRATE=0 이면 아무것도 하지 않음.
+    """
+    if not AUTO_MIGRATE or target in _migrated:
+        return
+    with _migrate_lock:
+        if target in _migrated:
+            return
+        migrate(conn, engine)
+        _migrated.add(target)
+
+
+if __name__ == "__main__":
+    import sys
+    from db import DB_ENGINE, get_conn
+
+    # get_conn() 이 첫 연결에서 ensure_schema 를 호출하므로, 자동 적용이 꺼진 경우에만 여기서 적용
+    with get_conn() as conn:
+        if "--status" not in sys.argv[1:] and not AUTO_MIGRATE:
+            done = migrate(conn, DB_ENGINE)
+            print("적용:", done or "없음")
+        print(f"{DB_ENGINE} schema_version = {current_version(conn, DB_ENGINE)} (최신 {MIGRATIONS[-1].version})")
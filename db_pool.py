@@ -0,0 +1,255 @@
+"""
+DB 연결 풀 (엔진 무관, 스레드 안전).
+- 최대 연결 수 제한: 모두 사용 중이면 timeout 초까지 대기 후 PoolTimeout
+- 최대 수명(max_lifetime) 지난 연결은 반납·대여 시 닫고 새로 연결 (서버 측 wait_timeout 대비)
+- 일정 시간(ping_interval) 이상 놀던 연결은 대여 전에 ping 으로 상태 확인, 실패 시 교체
+- fork 후(gunicorn/uvicorn workers) 부모 프로세스의 연결은 쓰지 않음
+- stats(): in_use, idle, waits, wait_timeouts, created, recycled, health_check_failures
+"""
+import os
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Optional
+
+
+class PoolTimeout(RuntimeError):
+    """timeout 안에 연결을 빌리지 못함."""
+
+
+class _Entry:
+    __slots__ = ("conn", "created_at", "last_used")
+
+    def __init__(self, conn: Any):
+        self.conn = conn
+        self.created_at = time.monotonic()
+        self.last_used = self.created_at
+
+
+def _close_quietly(conn: Any) -> None:
+    try:
+        conn.close()
+    except Exception:
+        pass
+
+
+class ConnectionPool:
+    """
+    connect: 새 연결을 만드는 함수 (초기화 포함)
+    ping: 연결 상태 확인 함수 (예외 발생 시 죽은 연결로 보고 교체). None 이면 확인 생략.
+    max_size <= 0 이면 풀링하지 않음 (대여마다 새 연결, 반납 시 닫음).
+    """
+
+    def __init__(
+        self,
+        connect: Callable[[], Any],
+        ping: Optional[Callable[[Any], None]] = None,
+        name: str = "db",
+        max_size: int = 5,
+        max_lifetime: float = 1800.0,
+        timeout: float = 10.0,
+        ping_interval: float = 30.0,
+    ):
+        self.name = name
+        self.max_size = max_size
+        self.max_lifetime = max_lifetime
+        self.timeout = timeout
+        self.ping_interval = ping_interval
+        self._connect = connect
+        self._ping = ping
+        self._cond = threading.Condition(threading.Lock())
+        self._idle: Deque[_Entry] = deque()
+        self._total = 0
+        self._in_use = 0
+        self._pid = os.getpid()
+        self._waits = 0
+        self._wait_timeouts = 0
+        self._created = 0
+        self._recycled = 0
+        self._health_failures = 0
+
+    def _expired(self, entry: _Entry, now: float) -> bool:
+        return self.max_lifetime > 0 and now - entry.created_at >= self.max_lifetime
+
+    def _check_fork(self) -> None:
+        """fork 된 자식에서는 부모의 연결(소켓 공유)을 버리고 빈 풀로 시작. lock 안에서 호출."""
+        pid = os.getpid()
+        if pid != self._pid:
+            self._pid = pid
+            self._idle.clear()
+            self._total = 0
+            self._in_use = 0
+
+    def _new_entry(self) -> _Entry:
+        entry = _Entry(self._connect())
+        with self._cond:
+            self._created += 1
+        return entry
+
+    def acquire(self) -> _Entry:
+        """연결 대여. 반드시 release() 로 반납."""
+        deadline = time.monotonic() + self.timeout
+        waited = False
+        with self._cond:
+            self._check_fork()
+            while True:
+                if self._idle:
+                    entry = self._idle.pop()  # LIFO: 최근 사용한 연결이 살아 있을 확률이 높음
+                    break
+                if self.max_size <= 0 or self._total < self.max_size:
+                    self._total += 1
+                    entry = None
+                    break
+                if not waited:
+                    self._waits += 1
+                    waited = True
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._wait_timeouts += 1
+                    raise PoolTimeout(
+                        f"DB 연결 풀({self.name})이 가득 찼습니다: {self.max_size}개 사용 중, {self.timeout}초 대기 초과"
+                    )
+                self._cond.wait(remaining)
+            self._in_use += 1
+
+        # 연결 생성·ping 은 lock 밖에서 (느린 네트워크가 다른 스레드를 막지 않도록)
+        try:
+            if entry is not None:
+                now = time.monotonic()
+                if self._expired(entry, now):
+                    _close_quietly(entry.conn)
+                    with self._cond:
+                        self._recycled += 1
+                    entry = None
+                elif self._ping is not None and now - entry.last_used >= self.ping_interval:
+                    try:
+                        self._ping(entry.conn)
+                    except Exception:
+                        _close_quietly(entry.conn)
+                        with self._cond:
+                            self._health_failures += 1
+                        entry = None
+            if entry is None:
+                entry = self._new_entry()
+        except BaseException:
+            with self._cond:
+                self._total -= 1
+                self._in_use -= 1
+                self._cond.notify()
+            raise
+        return entry
+
+    def release(self, entry: _Entry, discard: bool = False) -> None:
+        """반납. discard=True(오류로 상태를 믿을 수 없음) 또는 수명 초과면 닫고 버림."""
+        now = time.monotonic()
+        with self._cond:
+            if os.getpid() != self._pid:
+                return
+            self._in_use -= 1
+            keep = not discard and self.max_size > 0 and not self._expired(entry, now)
+            if keep:
+                entry.last_used = now
+                self._idle.append(entry)
+            else:
+                self._total -= 1
+                if not discard and self.max_size > 0:
+                    self._recycled += 1
+            self._cond.notify()
+        if not keep:
+            _close_quietly(entry.conn)
+
+    def close_all(self) -> None:
+        """놀고 있는 연결을 모두 닫음 (사용 중인 연결은 반납 시 정상 처리)."""
+        with self._cond:
+            idle = list(self._idle)
+            self._idle.clear()
+            self._total -= len(idle)
+            self._cond.notify_all()
+        for entry in idle:
+            _close_quietly(entry.conn)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._cond:
+            return {
+                "name": self.name,
+                "max_size": self.max_size,
+                "in_use": self._in_use,
+                "idle": len(self._idle),
+                "total": self._total,
+                "waits": self._waits,
+                "wait_timeouts": self._wait_timeouts,
+                "created": self._created,
+                "recycled": self._recycled,
+                "health_check_failures": self._health_failures,
+            }
+
+
+class ThreadLocalConnections:
+    """
+    스레드별 재사용 연결 (SQLite 용). ConnectionPool 과 같은 acquire/release/stats 인터페이스.
+    - 스레드마다 연결 하나를 만들어 계속 재사용 (check_same_thread 기본값 그대로 사용 가능)
+    - 같은 스레드에서 get_conn() 이 중첩되면 바깥 트랜잭션과 섞이지 않도록 임시 연결을 따로 열고 반납 시 닫음
+    - 스레드가 끝나면 그 스레드의 연결은 참조가 사라져 함께 닫힘. fork 된 자식은 새로 연결
+    """
+
+    def __init__(self, connect: Callable[[], Any], name: str = "db"):
+        self.name = name
+        self._connect = connect
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._created = 0
+        self._in_use = 0
+        self._temporary = 0
+
+    def _own_entry(self) -> Optional[_Entry]:
+        if getattr(self._local, "pid", None) != os.getpid():
+            return None
+        return getattr(self._local, "entry", None)
+
+    def acquire(self) -> _Entry:
+        entry = self._own_entry()
+        nested = entry is not None and self._local.busy
+        if entry is None or nested:
+            new_entry = _Entry(self._connect())
+            with self._lock:
+                self._created += 1
+                self._temporary += int(nested)
+            if not nested:
+                self._local.entry = new_entry
+                self._local.pid = os.getpid()
+            entry = new_entry
+        if not nested:
+            self._local.busy = True
+        with self._lock:
+            self._in_use += 1
+        return entry
+
+    def release(self, entry: _Entry, discard: bool = False) -> None:
+        with self._lock:
+            self._in_use -= 1
+        if entry is not self._own_entry():
+            _close_quietly(entry.conn)  # 중첩 사용으로 따로 연 임시 연결
+            return
+        self._local.busy = False
+        entry.last_used = time.monotonic()
+        if discard:
+            self._local.entry = None
+            _close_quietly(entry.conn)
+
+    def close_all(self) -> None:
+        """현재 스레드의 연결을 닫음 (다른 스레드의 연결은 그 스레드가 끝날 때 정리)."""
+        entry = self._own_entry()
+        if entry is not None and not self._local.busy:
+            self._local.entry = None
+            _close_quietly(entry.conn)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "name": self.name,
+                "mode": "per-thread",
+                "in_use": self._in_use,
+                "created": self._created,
+                "temporary": self._temporary,
+                "waits": 0,
+            }
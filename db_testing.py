@@ -0,0 +1,43 @@
+"""
+테스트 공용: 메모리 SQLite 연결로 db 모듈 실행 함수를 돌리는 unittest 기반 클래스.
+"""
+import sqlite3
+import unittest
+from contextlib import contextmanager
+from unittest import mock
+
+import db
+from db_migrations import migrate
+
+
+class SqliteDbTestCase(unittest.TestCase):
+    """
+    self.conn: 메모리 SQLite (row_factory = sqlite3.Row). migrated=True 면 마이그레이션 적용.
+    db 모듈의 엔진별 실행 함수를 SQLite 것으로 바꿔 둠. use_conn(module) 로 그 모듈의 get_conn() 도 self.conn 으로.
+    any_thread=True 면 다른 스레드(예: async 핸들러의 DB 스레드 풀)에서도 self.conn 사용 가능 (한 번에 한 스레드).
+    """
+
+    migrated = True
+    any_thread = False
+
+    def setUp(self):
+        self.conn = sqlite3.connect(":memory:", check_same_thread=not self.any_thread)
+        self.conn.row_factory = sqlite3.Row
+        self.addCleanup(self.conn.close)
+        if self.migrated:
+            migrate(self.conn, "sqlite")
+        patcher = mock.patch.multiple(
+            db, DB_ENGINE="sqlite", _DIALECT="sqlite", _open_cursor=db._sqlite_cursor, _to_dict=db._sqlite_row_to_dict,
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def use_conn(self, module) -> None:
+        @contextmanager
+        def get_conn():
+            yield self.conn
+            self.conn.commit()
+
+        patcher = mock.patch.object(module, "get_conn", get_conn)
+        patcher.start()
+        self.addCleanup(patcher.stop)
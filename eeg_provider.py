@@ -2,10 +2,26 @@
 Step 2: 가상 뇌파(EEG) 데이터 인터페이스
 실제 업체 API 확정 전 Mock 데이터를 반환하는 MockEEGProvider
 """
+import hashlib
 import random
 from typing import Optional
 from models import EEGDomainMetrics
 
+# 지표별 가상 값 범위 (get_metrics / get_metrics_batch 공통, 열 순서 = METRIC_NAMES)
+METRIC_RANGES = {
+    "motivation": (30.0, 95.0),       # 전두엽 비대칭 지수
+    "resilience": (35.0, 90.0),       # 알파파 회복 속도
+    "innovation": (40.0, 92.0),       # SMR/Beta 코히어런스
+    "responsibility": (25.0, 88.0),   # 전전두엽 안정도
+}
+METRIC_NAMES = tuple(METRIC_RANGES)
+
+
+def session_seed(user: str, session: str) -> int:
+    """(사용자, 세션) → 고정 시드. 같은 사용자·세션이면 프로세스·서버가 달라도 같은 값."""
+    digest = hashlib.sha256(f"{user}\x00{session}".encode("utf-8")).digest()
+    return int.from_bytes(digest[:8], "big")
+
 
 class MockEEGProvider:
     """
@@ -16,23 +32,41 @@ class MockEEGProvider:
     - Innovation: SMR/Beta 코히어런스 (창업두뇌활용 및 계발)
     - Responsibility: 전전두엽 안정도 (주체적책임 및 창업의식)
     모든 값은 0~100 스케일로 반환.
+    인스턴스마다 별도 random.Random 을 사용 (전역 random 상태를 바꾸지 않음).
+    같은 seed → 같은 지표 순서열.
     """
 
     def __init__(self, seed: Optional[int] = None):
-        if seed is not None:
-            random.seed(seed)
+        self.seed = seed
+        self._rng = random.Random(seed)
+
+    @classmethod
+    def for_session(cls, user: str, session: str) -> "MockEEGProvider":
+        """(사용자, 세션)에서 유도한 시드로 생성 — 같은 세션은 항상 같은 가상 뇌파."""
+        return cls(seed=session_seed(user, session))
 
     def get_metrics(self) -> EEGDomainMetrics:
         """
         가상의 4대 역량 뇌파 지표를 반환합니다.
         실제 API 연동 시 이 메서드만 교체하면 됩니다.
         """
-        return EEGDomainMetrics(
-            motivation=round(random.uniform(30.0, 95.0), 2),      # 전두엽 비대칭 지수
-            resilience=round(random.uniform(35.0, 90.0), 2),     # 알파파 회복 속도
-            innovation=round(random.uniform(40.0, 92.0), 2),     # SMR/Beta 코히어런스
-            responsibility=round(random.uniform(25.0, 88.0), 2), # 전전두엽 안정도
-        )
+        uniform = self._rng.uniform
+        return EEGDomainMetrics(**{
+            name: round(uniform(low, high), 2) for name, (low, high) in METRIC_RANGES.items()
+        })
+
+    def get_metrics_batch(self, n: int):
+        """
+        시뮬레이션용: n명분 지표를 한 번에 생성.
+        반환: (n, 4) float64 numpy 배열, 열 순서 = METRIC_NAMES, 소수 둘째 자리 반올림.
+        인스턴스 RNG 에서 시드를 뽑으므로 같은 seed 의 provider 는 같은 배열을 반환.
+        """
+        import numpy as np
+
+        rng = np.random.default_rng(self._rng.getrandbits(64))
+        lows = np.array([low for low, _ in METRIC_RANGES.values()])
+        highs = np.array([high for _, high in METRIC_RANGES.values()])
+        return np.round(rng.uniform(lows, highs, size=(int(n), len(METRIC_NAMES))), 2)
 
     def get_metrics_fixed(self, motivation: float, resilience: float, innovation: float, responsibility: float) -> EEGDomainMetrics:
         """테스트용: 고정값 반환."""
@@ -5,7 +5,7 @@ import json
 from datetime import datetime
 from typing import List, Dict, Any, Optional
 
-from db import get_conn, execute_one, execute_all, execute_insert
+from db import get_conn, execute_one, execute_all, execute_insert, keyset_page, total_estimate
 
 
 def save_eeg(user_email: str, data: Dict[str, Any], title: Optional[str] = None) -> Dict[str, Any]:
@@ -35,18 +35,31 @@ def list_saved(user_email: str) -> List[Dict[str, Any]]:
     return [{"id": r["id"], "title": r["title"], "saved_at": r["created_at"]} for r in rows]
 
 
-def list_saved_all(limit: int = 500) -> List[Dict[str, Any]]:
-    """전체 사용자 뇌파 저장 목록 (관리자용). [{ id, user_email, title, saved_at }, ...] 최신순."""
+def list_saved_page(
+    after_id: Optional[int] = None,
+    page_size: Optional[int] = None,
+    with_total: bool = True,
+) -> Dict[str, Any]:
+    """전체 사용자 뇌파 저장 목록 한 페이지 (관리자용, id 최신순). 반환: { items, next_after_id, total_estimate, total_exact }."""
     with get_conn() as conn:
-        rows = execute_all(
-            conn,
-            "SELECT id, user_email, title, created_at FROM eeg_saves ORDER BY created_at DESC LIMIT %s",
-            (limit,),
+        rows, next_after_id = keyset_page(
+            conn, "eeg_saves", ("id", "user_email", "title", "created_at"), after_id=after_id, page_size=page_size,
         )
-    return [
-        {"id": r["id"], "user_email": r.get("user_email"), "title": r["title"], "saved_at": r["created_at"]}
-        for r in rows
-    ]
+        total, exact = total_estimate(conn, "eeg_saves") if with_total else (None, False)
+    return {
+        "items": [
+            {"id": r["id"], "user_email": r.get("user_email"), "title": r["title"], "saved_at": r["created_at"]}
+            for r in rows
+        ],
+        "next_after_id": next_after_id,
+        "total_estimate": total,
+        "total_exact": exact,
+    }
+
+
+def list_saved_all(limit: int = 500) -> List[Dict[str, Any]]:
+    """전체 사용자 뇌파 저장 목록 첫 페이지 (관리자용). [{ id, user_email, title, saved_at }, ...] 최신순."""
+    return list_saved_page(page_size=limit, with_total=False)["items"]
 
 
 def get_saved(user_email: str, save_id: int, *, skip_user_check: bool = False) -> Optional[Dict[str, Any]]:
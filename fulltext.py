@@ -0,0 +1,199 @@
+"""
+전문 검색 (게시판 제목·내용, 설문 저장 제목). LIKE '%q%' 전체 스캔 대신 엔진별 색인 사용.
+- SQLite: FTS5 trigram 외부 콘텐츠 테이블 (board_fts, survey_saves_fts) + 트리거로 동기화, bm25 순위
+- PostgreSQL: 생성 컬럼 search_tsv(tsvector, 'simple') GIN + pg_trgm GIN (부분 문자열·한국어), ts_rank + similarity 순위
+- MySQL: FULLTEXT ... WITH PARSER ngram (InnoDB 가 자동 동기화), MATCH ... AGAINST 점수 순위
+색인·트리거는 db_migrations (마이그레이션 4) 가 생성. 색인이 없거나(예: FTS5 미지원 SQLite) 검색어가
+색인 최소 길이보다 짧으면(trigram 3자, ngram 2자) 예전처럼 LIKE 로 찾고 id 최신순.
+결과는 순위순 페이지 (page 1부터). 순위는 데이터가 바뀌면 달라지므로 keyset 대신 OFFSET 사용.
+match_condition(): 같은 검색 조건을 WHERE 절 하나로 (건수·통계·배치 조회가 목록과 같은 행을 세도록).
+"""
+import threading
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import db
+from db import clamp_page_size, execute_all, execute_one
+
+
+@dataclass(frozen=True)
+class SearchSpec:
+    """table 의 text_columns 를 검색. fts_table: SQLite FTS5 테이블, fulltext_index: MySQL FULLTEXT 색인 이름."""
+    table: str
+    text_columns: Tuple[str, ...]
+    fts_table: str
+    fulltext_index: str
+    weights: Tuple[float, ...] = ()  # SQLite bm25 컬럼 가중치 (text_columns 순서)
+
+
+BOARD_SEARCH = SearchSpec("board", ("title", "content"), "board_fts", "ft_board_text", (2.0, 1.0))
+SURVEY_TITLE_SEARCH = SearchSpec("survey_saves", ("title",), "survey_saves_fts", "ft_survey_title")
+
+# 색인이 쓸 수 있는 검색어 최소 길이 (단어마다)
+_MIN_TERM_CHARS = {"sqlite": 3, "postgres": 1, "mysql": 2}
+
+_available: Dict[Tuple[str, str], bool] = {}
+_available_lock = threading.Lock()
+
+
+def _index_exists(conn, engine: str, spec: SearchSpec) -> bool:
+    if engine == "sqlite":
+        row = execute_one(conn, "SELECT 1 AS ok FROM sqlite_master WHERE type = 'table' AND name = %s", (spec.fts_table,))
+    elif engine == "postgres":
+        row = execute_one(
+            conn,
+            "SELECT 1 AS ok FROM information_schema.columns WHERE table_schema = 'public' AND table_name = %s AND column_name = 'search_tsv'",
+            (spec.table,),
+        )
+    else:
+        row = execute_one(
+            conn,
+            "SELECT 1 AS ok FROM information_schema.STATISTICS WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s AND INDEX_NAME = %s LIMIT 1",
+            (spec.table, spec.fulltext_index),
+        )
+    return row is not None
+
+
+def _pg_trgm_installed(conn) -> bool:
+    return execute_one(conn, "SELECT 1 AS ok FROM pg_extension WHERE extname = 'pg_trgm'", ()) is not None
+
+
+def _cached(key: Tuple[str, str], probe) -> bool:
+    """색인 존재 여부는 프로세스당 한 번만 확인 (스키마는 마이그레이션으로만 바뀜)."""
+    if key not in _available:
+        value = probe()
+        with _available_lock:
+            _available[key] = value
+    return _available[key]
+
+
+def reset_cache() -> None:
+    with _available_lock:
+        _available.clear()
+
+
+def split_terms(q: str) -> List[str]:
+    return [t for t in (q or "").split() if t]
+
+
+def _like_pattern(text: str) -> str:
+    # LIKE 특수문자는 그대로 문자로 (ESCAPE '!')
+    return "%" + text.replace("!", "!!").replace("%", "!%").replace("_", "!_") + "%"
+
+
+def _sqlite_match(terms: Sequence[str]) -> str:
+    # 단어마다 따옴표로 감싼 구(phrase), 공백 = AND
+    return " ".join('"' + t.replace('"', '""') + '"' for t in terms)
+
+
+def _mysql_boolean(terms: Sequence[str]) -> str:
+    return " ".join('+"' + t.replace('"', " ") + '"' for t in terms)
+
+
+def _use_index(conn, engine: str, spec: SearchSpec, terms: Sequence[str]) -> bool:
+    return bool(
+        terms
+        and min(len(t) for t in terms) >= _MIN_TERM_CHARS[engine]
+        and _cached((engine, spec.table), lambda: _index_exists(conn, engine, spec))
+    )
+
+
+def _predicate(engine: str, spec: SearchSpec, q: str, terms: Sequence[str], use_index: bool, prefix: str = "") -> Tuple[str, List[Any]]:
+    """검색어 조건 (sql, params). prefix: 컬럼 앞에 붙일 테이블 별칭 ('t.' 등)."""
+    if use_index and engine == "sqlite":
+        return f"{prefix}id IN (SELECT rowid FROM {spec.fts_table} WHERE {spec.fts_table} MATCH %s)", [_sqlite_match(terms)]
+    if use_index and engine == "postgres":
+        text_expr = " || ' ' || ".join(f"coalesce({prefix}{c}, '')" for c in spec.text_columns)
+        # 단어 일치(tsvector) 또는 부분 문자열(pg_trgm 색인) — 조사가 붙은 한국어 단어도 찾도록
+        return (
+            f"({prefix}search_tsv @@ plainto_tsquery('simple', %s) OR ({text_expr}) ILIKE %s ESCAPE '!')",
+            [q, _like_pattern(q.strip())],
+        )
+    if use_index and engine == "mysql":
+        cols = ", ".join(f"{prefix}{c}" for c in spec.text_columns)
+        return f"MATCH({cols}) AGAINST (%s IN BOOLEAN MODE)", [_mysql_boolean(terms)]
+    # 색인 없음 / 짧은 검색어: 단어마다 어느 텍스트 컬럼이든 포함
+    like_conds = []
+    like_params: List[Any] = []
+    for term in terms or [""]:
+        like_conds.append("(" + " OR ".join(f"{prefix}{c} LIKE %s ESCAPE '!'" for c in spec.text_columns) + ")")
+        like_params += [_like_pattern(term)] * len(spec.text_columns)
+    return " AND ".join(like_conds), like_params
+
+
+def match_condition(conn, spec: SearchSpec, q: str) -> Tuple[str, List[Any]]:
+    """search() 가 찾는 행과 같은 집합의 WHERE 조건 (sql, params). 별칭 없이 spec.table 컬럼 기준."""
+    engine = db.DB_ENGINE
+    terms = split_terms(q)
+    return _predicate(engine, spec, q, terms, _use_index(conn, engine, spec, terms))
+
+
+def search(
+    conn,
+    spec: SearchSpec,
+    q: str,
+    columns: Sequence[str],
+    conditions: Sequence[str] = (),
+    args: Sequence[Any] = (),
+    page: int = 1,
+    page_size: Optional[int] = None,
+) -> Tuple[List[dict], bool]:
+    """
+    q 로 spec 테이블 검색 (conditions 는 테이블 컬럼만 사용, 별칭 없이). (rows, 다음 페이지 있음) 반환.
+    columns 는 별칭 없이 테이블 컬럼 이름 (결과 dict 키). 색인을 쓰면 순위순, LIKE 로 찾으면 id 최신순.
+    """
+    engine = db.DB_ENGINE
+    page_size = clamp_page_size(page_size)
+    page = max(1, int(page or 1))
+    terms = split_terms(q)
+    params: List[Any] = list(args)
+    select = ", ".join(f"t.{c}" for c in columns)
+    use_index = _use_index(conn, engine, spec, terms)
+    where_extra = " AND ".join(f"({c})" for c in conditions)
+
+    if use_index and engine == "sqlite":
+        weights = ", ".join(str(w) for w in spec.weights) if spec.weights else ""
+        rank = f"bm25({spec.fts_table}{', ' + weights if weights else ''})"
+        sql = (
+            f"SELECT {select} FROM {spec.table} t "
+            f"JOIN (SELECT rowid AS fts_id, {rank} AS fts_rank FROM {spec.fts_table} WHERE {spec.fts_table} MATCH %s) m "
+            f"ON m.fts_id = t.id"
+            + (f" WHERE {where_extra}" if where_extra else "")
+            + " ORDER BY m.fts_rank, t.id DESC LIMIT %s OFFSET %s"
+        )
+        params = [_sqlite_match(terms)] + params
+    elif use_index and engine == "postgres":
+        has_trgm = _cached(("postgres", "pg_trgm"), lambda: _pg_trgm_installed(conn))
+        rank = "ts_rank(t.search_tsv, plainto_tsquery('simple', %s))"
+        rank_params: List[Any] = [q]
+        if has_trgm:
+            rank += f" + similarity(t.{spec.text_columns[0]}, %s)"
+            rank_params.append(q)
+        match, match_params = _predicate(engine, spec, q, terms, True, "t.")
+        sql = (
+            f"SELECT {select}, {rank} AS fts_rank FROM {spec.table} t WHERE {match}"
+            + (f" AND {where_extra}" if where_extra else "")
+            + " ORDER BY fts_rank DESC, t.id DESC LIMIT %s OFFSET %s"
+        )
+        params = rank_params + match_params + params
+    elif use_index and engine == "mysql":
+        match, match_params = _predicate(engine, spec, q, terms, True, "t.")
+        sql = (
+            f"SELECT {select}, {match} AS fts_rank FROM {spec.table} t WHERE {match}"
+            + (f" AND {where_extra}" if where_extra else "")
+            + " ORDER BY fts_rank DESC, t.id DESC LIMIT %s OFFSET %s"
+        )
+        params = match_params * 2 + params
+    else:
+        match, match_params = _predicate(engine, spec, q, terms, False, "t.")
+        sql = (
+            f"SELECT {select} FROM {spec.table} t WHERE {match}"
+            + (f" AND {where_extra}" if where_extra else "")
+            + " ORDER BY t.id DESC LIMIT %s OFFSET %s"
+        )
+        params = match_params + params
+
+    rows = execute_all(conn, sql, tuple(params) + (page_size + 1, (page - 1) * page_size))
+    for r in rows:
+        r.pop("fts_rank", None)
+    return rows[:page_size], len(rows) > page_size
@@ -0,0 +1,161 @@
+"""
+/items 응답용 문항 카탈로그 사전 계산 (카탈로그 로드 시 한 번).
+- 번호순 전체 목록: 미리 직렬화한 JSON bytes
+- 역량별 랜덤: 문항별로 미리 직렬화한 JSON 조각을 섞어 이어 붙임
+- 간편 설문: 하위요소 그룹 표를 미리 만들어 두고, 시드 기반 추첨 (같은 시드 → 같은 문항)
+- /health 준비 상태(readiness) 응답도 카탈로그 로드 시 한 번 검증·직렬화 (강한 ETag 포함)
+"""
+import hashlib
+import json
+import random
+import threading
+from typing import Dict, List, Optional, Tuple
+
+from data_loader import SurveyDataLoader, get_shared_loader
+from models import SurveyItem
+
+# 간편 설문: 하위요소(영역+하위역량+하위요소)당 추첨 문항 수
+SHORT_ITEMS_PER_GROUP = 2
+# 클라이언트에 돌려주는 시드 범위 (JS Number 로 안전하게 표현되는 범위)
+SEED_MAX = 2 ** 31 - 1
+
+_system_random = random.SystemRandom()
+
+
+def item_to_dict(item: SurveyItem) -> dict:
+    return {
+        "전체순번": item.전체순번,
+        "영역": item.영역,
+        "하위역량": item.하위역량,
+        "하위요소": item.하위요소,
+        "문항보정": item.문항보정,
+        "예시문항": item.예시문항,
+    }
+
+
+def _dumps(obj) -> bytes:
+    """FastAPI JSONResponse 와 같은 형식 (ensure_ascii=False, 공백 없음)."""
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def make_etag(body: bytes) -> str:
+    """본문 해시 기반 강한 ETag."""
+    return '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match 헤더가 etag 와 일치하는지 (여러 값, W/ 접두, * 허용)."""
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*":
+            return True
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
+
+
+def new_seed() -> int:
+    """추첨 시드 생성 (전역 random 상태를 건드리지 않음)."""
+    return _system_random.randint(0, SEED_MAX)
+
+
+class ItemPayloads:
+    """한 카탈로그(SurveyDataLoader)에 대한 /items 응답 사전 계산 결과."""
+
+    def __init__(self, loader: SurveyDataLoader):
+        self.loader = loader
+        items = sorted(loader.items, key=lambda x: x.전체순번)
+        self._fragments: Dict[int, bytes] = {item.전체순번: _dumps(item_to_dict(item)) for item in items}
+
+        # 번호순 전체 목록
+        self.full_order_json = self._render(items)
+        self.full_order_etag = make_etag(self.full_order_json)
+
+        # /health 준비 상태: 순번 검증은 카탈로그당 한 번만
+        validation = loader.validate_sequences()
+        self.health_json = _dumps({
+            "status": "healthy",
+            "total_items": len(loader.items),
+            "validation": validation,
+        })
+        self.health_etag = make_etag(self.health_json)
+
+        # 역량별 랜덤용: 영역(없으면 '기타') → 문항, 처음 등장 순
+        by_domain: Dict[str, List[SurveyItem]] = {}
+        for item in loader.items:
+            by_domain.setdefault(item.영역 or "기타", []).append(item)
+        self._domains: Tuple[Tuple[SurveyItem, ...], ...] = tuple(tuple(v) for v in by_domain.values())
+
+        # 간편 설문용 하위요소 그룹 표, 결과 정렬 순위 (영역, 하위역량, 하위요소, 전체순번)
+        self.groups: Tuple[Tuple[SurveyItem, ...], ...] = tuple(loader.get_groups().values())
+        ordered = sorted(loader.items, key=lambda x: (x.영역, x.하위역량, x.하위요소, x.전체순번))
+        self._short_rank = {id(item): i for i, item in enumerate(ordered)}
+
+    def _render(self, items, **extra) -> bytes:
+        body = b",".join(self._fragments[item.전체순번] for item in items)
+        head = b'{"total_items":%d,"items":[' % len(items)
+        tail = b"]"
+        for key, value in extra.items():
+            tail += b"," + _dumps(key) + b":" + _dumps(value)
+        return head + body + tail + b"}"
+
+    def draw_short(self, seed: int) -> List[SurveyItem]:
+        """간편 설문 문항 추첨. 같은 시드·같은 카탈로그면 항상 같은 문항 (저장된 required_sequences 재현용)."""
+        rng = random.Random(seed)
+        chosen: List[SurveyItem] = []
+        for group in self.groups:
+            if len(group) <= SHORT_ITEMS_PER_GROUP:
+                chosen.extend(group)
+            else:
+                chosen.extend(rng.sample(group, SHORT_ITEMS_PER_GROUP))
+        chosen.sort(key=lambda x: self._short_rank[id(x)])
+        return chosen
+
+    def short_sequences(self, seed: int) -> List[int]:
+        """시드로 간편 설문 required_sequences 재계산."""
+        return [item.전체순번 for item in self.draw_short(seed)]
+
+    def short_json(self, seed: Optional[int] = None) -> bytes:
+        """간편 설문 응답 JSON (total_items, items, required_sequences, seed)."""
+        if seed is None:
+            seed = new_seed()
+        chosen = self.draw_short(seed)
+        return self._render(
+            chosen,
+            required_sequences=[item.전체순번 for item in chosen],
+            seed=seed,
+        )
+
+    def random_domain_json(self, seed: Optional[int] = None) -> bytes:
+        """역량별 랜덤 순서 응답 JSON (영역 순서·영역 내 문항 순서 모두 섞음)."""
+        rng = random.Random(seed if seed is not None else new_seed())
+        domains = list(self._domains)
+        rng.shuffle(domains)
+        out: List[SurveyItem] = []
+        for group in domains:
+            lst = list(group)
+            rng.shuffle(lst)
+            out.extend(lst)
+        return self._render(out)
+
+
+_payloads_lock = threading.Lock()
+_payloads: Dict[str, ItemPayloads] = {}
+
+
+def get_item_payloads(csv_path: Optional[str] = None) -> ItemPayloads:
+    """공유 카탈로그에 대한 ItemPayloads (카탈로그가 다시 로드되면 새로 계산)."""
+    loader = get_shared_loader(csv_path)
+    payloads = _payloads.get(loader.csv_path)
+    if payloads is not None and payloads.loader is loader:
+        return payloads
+    with _payloads_lock:
+        payloads = _payloads.get(loader.csv_path)
+        if payloads is None or payloads.loader is not loader:
+            payloads = ItemPayloads(loader)
+            _payloads[loader.csv_path] = payloads
+        return payloads
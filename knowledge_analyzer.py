@@ -0,0 +1,125 @@
+"""
+지식 검색용 토큰 분석기 (knowledge_index 의 TF-IDF 어휘). 외부 형태소 분석기·서비스 없이 동작.
+
+- word:       예전 방식. 소문자화 + \\b\\w+\\b 단어 ("회복탄력성을" 과 "회복탄력성" 은 다른 단어)
+- particle:   word + 한글 단어 끝의 조사·어미를 가장 긴 것부터 하나 떼어 냄 ("회복탄력성을" → "회복탄력성").
+              남는 어간이 2자 미만이면 떼지 않음 ("아이" 는 그대로). 기본값.
+- char_ngram: 한글 단어를 2·3글자 조각으로 (어형이 달라도 조각 대부분이 겹침). 재현율 높고 어휘·행렬은 큼.
+
+KNOWLEDGE_ANALYZER 환경변수로 고름. 색인 meta 에 분석기 이름을 기록하므로 바꾸면 다음 검색 때 다시 fit.
+문서 토큰은 TokenCache 에 문서 내용 해시로 기억 (다시 fit·증분 추가 때 같은 문서를 다시 분석하지 않음).
+"""
+import hashlib
+import os
+import re
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, List, Tuple
+
+DEFAULT_ANALYZER = "particle"
+
+_WORD = re.compile(r"(?u)\b\w+\b")
+_HANGUL = re.compile(r"[가-힣]")
+
+# 자주 쓰는 조사·어미 (긴 것부터 확인)
+PARTICLES = tuple(sorted({
+    "이", "가", "을", "를", "은", "는", "의", "에", "도", "만", "로", "와", "과", "나", "랑",
+    "으로", "에서", "에게", "께서", "한테", "까지", "부터", "보다", "처럼", "마다", "이나", "이랑", "하고",
+    "에서는", "에서도", "으로는", "으로도", "에게는", "까지는", "부터는", "이라는", "라는", "이다", "입니다",
+    "하다", "한다", "하는", "하고", "하여", "해서", "했다", "합니다", "하며", "하면", "되는", "된다", "적인", "적으로",
+}, key=len, reverse=True))
+MIN_STEM = 2
+
+
+def words(text: str) -> List[str]:
+    return _WORD.findall(text.lower())
+
+
+def strip_particle(word: str) -> str:
+    """한글 단어 끝의 조사·어미 하나를 뗌 (어간이 MIN_STEM 자 이상 남을 때만)."""
+    if not _HANGUL.search(word[-1:]):
+        return word
+    for suffix in PARTICLES:
+        if word.endswith(suffix) and len(word) - len(suffix) >= MIN_STEM:
+            return word[: -len(suffix)]
+    return word
+
+
+def analyze_word(text: str) -> List[str]:
+    return words(text)
+
+
+def analyze_particle(text: str) -> List[str]:
+    return [strip_particle(w) for w in words(text)]
+
+
+def analyze_char_ngram(text: str) -> List[str]:
+    out: List[str] = []
+    for w in words(text):
+        if len(w) <= 2 or not _HANGUL.search(w):
+            out.append(w)
+            continue
+        out.extend(w[i:i + 2] for i in range(len(w) - 1))
+        out.extend(w[i:i + 3] for i in range(len(w) - 2))
+    return out
+
+
+ANALYZERS: Dict[str, Callable[[str], List[str]]] = {
+    "word": analyze_word,
+    "particle": analyze_particle,
+    "char_ngram": analyze_char_ngram,
+}
+
+
+def configured_name() -> str:
+    name = (os.environ.get("KNOWLEDGE_ANALYZER") or DEFAULT_ANALYZER).strip().lower()
+    return name if name in ANALYZERS else DEFAULT_ANALYZER
+
+
+class TokenCache:
+    """(분석기, 문서 해시) → 토큰 튜플. 토큰 수 합이 max_tokens 를 넘으면 오래 안 쓴 문서부터 버림."""
+
+    def __init__(self, max_tokens: int = 2_000_000):
+        self.max_tokens = max_tokens
+        self._items: "OrderedDict[Tuple[str, bytes], Tuple[str, ...]]" = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def tokens(self, name: str, text: str) -> Tuple[str, ...]:
+        key = (name, hashlib.sha1(text.encode("utf-8")).digest())
+        with self._lock:
+            cached = self._items.get(key)
+            if cached is not None:
+                self._items.move_to_end(key)
+                self.hits += 1
+                return cached
+        tokens = tuple(ANALYZERS[name](text))
+        with self._lock:
+            self.misses += 1
+            if len(tokens) <= self.max_tokens and key not in self._items:
+                self._items[key] = tokens
+                self._size += len(tokens)
+                while self._size > self.max_tokens:
+                    _, dropped = self._items.popitem(last=False)
+                    self._size -= len(dropped)
+        return tokens
+
+    def clear(self) -> None:
+        with self._lock:
+            self._items.clear()
+            self._size = 0
+            self.hits = self.misses = 0
+
+
+token_cache = TokenCache()
+
+
+def get_analyzer(name: str, cache: bool = True) -> Callable[[str], List[str]]:
+    """scikit-learn 벡터라이저 analyzer= 에 넘길 함수. cache=True 면 문서 토큰을 token_cache 에 기억."""
+    if name not in ANALYZERS:
+        raise ValueError(f"알 수 없는 분석기: {name}")
+    if not cache:
+        return ANALYZERS[name]
+    return lambda text: token_cache.tokens(name, text)
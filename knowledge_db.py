@@ -2,15 +2,37 @@
 Step 3-1: 로컬 지식 DB (SQLite) — 블로그/유튜브 수집 데이터 저장 및 키워드·TF-IDF 검색
 테이블: id(PK), source_type(블로그/유튜브), title, content, url, created_at
 중복: url 기준으로 중복 저장 방지.
+TF-IDF 검색은 DB 옆에 저장한 색인(knowledge_index, sbi_knowledge_index/)을 사용. 일괄 삽입(insert_many) 뒤나 다음 검색 때 새 행만 색인에 추가.
+전문 색인: knowledge_fts (FTS5 외부 콘텐츠 테이블, 트리거로 knowledge 와 동기화, unicode61 + 접두어 검색).
+- 키워드 검색(search_keyword)은 FTS5 bm25 순위 + 본문 발췌(snippet). FTS5 가 없는 SQLite 는 예전처럼 LIKE.
+- TF-IDF 검색은 FTS5 후보 상위 RERANK_CANDIDATES 건만 점수 계산 (검색어 단어 중 하나라도 포함한 문서).
+  후보가 요청 건수보다 적으면 그 질의만 전체 문서로 계산.
+- 한국어 조사는 떼고 접두어로 찾음 ("회복탄력성을" → 회복탄력성* → "회복탄력성", "회복탄력성이" 등).
+  trigram 토크나이저는 3자 미만 단어("뇌", "창업")를 찾지 못하고 500KB 본문에 색인이 커서 쓰지 않음.
+상담(search_knowledge)은 어휘 + 임베딩(knowledge_embedding, sbi_knowledge_embed/) 하이브리드 검색.
 """
 import os
 import sqlite3
-from typing import List, Tuple, Optional
-from dataclasses import dataclass
+from typing import Dict, List, Tuple, Optional
+from dataclasses import dataclass, replace
+
+import numpy as np
+
+import knowledge_analyzer
+import knowledge_embedding
+import knowledge_index
 
 DB_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "sbi_knowledge.db")
 SOURCE_BLOG = "블로그"
 SOURCE_YOUTUBE = "유튜브"
+FTS_TABLE = "knowledge_fts"
+RERANK_CANDIDATES = 200
+# 하이브리드 검색: 점수 = α × TF-IDF 코사인 + (1 - α) × 임베딩 코사인, 각 방식에서 limit × HYBRID_POOL 건씩 후보
+HYBRID_ALPHA = float(os.environ.get("KNOWLEDGE_HYBRID_ALPHA", "0.5"))
+HYBRID_POOL = 4
+# bm25 가중치 (title, content)
+_BM25 = "bm25(knowledge_fts, 2.0, 1.0)"
+_SNIPPET_TOKENS = 32
 # 하위 호환용
 DEFAULT_CATEGORY_BLOG = SOURCE_BLOG
 DEFAULT_CATEGORY_YOUTUBE = SOURCE_YOUTUBE
@@ -24,6 +46,7 @@ class KnowledgeRow:
     url: str
     row_id: Optional[int] = None
     created_at: Optional[str] = None
+    snippet: Optional[str] = None  # 전문 검색 시 본문 중 검색어 주변 발췌
 
     @property
     def category(self) -> str:
@@ -72,9 +95,78 @@ def init_db():
     conn.execute("CREATE INDEX IF NOT EXISTS idx_source_type ON knowledge(source_type)")
     conn.execute("CREATE INDEX IF NOT EXISTS idx_url ON knowledge(url)")
     conn.commit()
+    _init_fts(conn)
     conn.close()
 
 
+_FTS_TRIGGERS = (
+    """CREATE TRIGGER IF NOT EXISTS knowledge_fts_ai AFTER INSERT ON knowledge BEGIN
+        INSERT INTO knowledge_fts(rowid, title, content) VALUES (new.id, new.title, new.content);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS knowledge_fts_ad AFTER DELETE ON knowledge BEGIN
+        INSERT INTO knowledge_fts(knowledge_fts, rowid, title, content) VALUES ('delete', old.id, old.title, old.content);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS knowledge_fts_au AFTER UPDATE ON knowledge BEGIN
+        INSERT INTO knowledge_fts(knowledge_fts, rowid, title, content) VALUES ('delete', old.id, old.title, old.content);
+        INSERT INTO knowledge_fts(rowid, title, content) VALUES (new.id, new.title, new.content);
+    END""",
+)
+
+
+def _init_fts(conn) -> None:
+    """knowledge_fts 와 동기화 트리거 생성 후 기존 행으로 채움. 이미 있거나 FTS5 미지원이면 그대로."""
+    if _has_fts(conn):
+        return
+    try:
+        conn.execute(
+            "CREATE VIRTUAL TABLE knowledge_fts USING fts5(title, content, content='knowledge', content_rowid='id', "
+            "tokenize='unicode61', prefix='2 3')"
+        )
+    except sqlite3.OperationalError:
+        return  # FTS5 없는 SQLite: LIKE 검색 유지
+    for sql in _FTS_TRIGGERS:
+        conn.execute(sql)
+    conn.execute("INSERT INTO knowledge_fts(knowledge_fts) VALUES ('rebuild')")
+    conn.commit()
+
+
+def _has_fts(conn) -> bool:
+    return conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (FTS_TABLE,)).fetchone() is not None
+
+
+def _fts_query(text: str, any_term: bool = False) -> str:
+    """검색어 → FTS5 MATCH 식. 단어마다 조사 떼고 접두어 구("어간"*). any_term=False 면 모든 단어(AND). 단어 없으면 ''."""
+    terms = dict.fromkeys(knowledge_analyzer.strip_particle(w) for w in knowledge_analyzer.words(text))
+    return (" OR " if any_term else " ").join('"' + t.replace('"', '""') + '"*' for t in terms)
+
+
+def _fts_candidates(conn, text: str, limit: int) -> List[int]:
+    """검색어 단어 중 하나라도 포함한 문서 id, bm25 순 상위 limit 건 (본문은 읽지 않음)."""
+    match = _fts_query(text, any_term=True)
+    if not match:
+        return []
+    cur = conn.execute(
+        f"SELECT rowid FROM knowledge_fts WHERE knowledge_fts MATCH ? ORDER BY {_BM25} LIMIT ?", (match, limit),
+    )
+    return [r[0] for r in cur.fetchall()]
+
+
+def _attach_snippets(conn, text: str, rows: List[KnowledgeRow]) -> None:
+    """rows 에 검색어 주변 본문 발췌를 채움 (결과 행에 대해서만 계산)."""
+    match = _fts_query(text, any_term=True)
+    if not match or not rows:
+        return
+    placeholders = ", ".join("?" * len(rows))
+    cur = conn.execute(
+        f"SELECT rowid, snippet(knowledge_fts, 1, '', '', '…', {_SNIPPET_TOKENS}) FROM knowledge_fts "
+        f"WHERE knowledge_fts MATCH ? AND rowid IN ({placeholders})",
+        (match, *[r.row_id for r in rows]),
+    )
+    snippets = dict(cur.fetchall())
+    for r in rows:
+        r.snippet = snippets.get(r.row_id) or None
+
+
 def insert(source_type: str, title: str, content: str, url: str) -> Tuple[int, bool]:
     """
     한 건 삽입. url이 이미 있으면 중복 저장하지 않음.
@@ -87,8 +179,7 @@ def insert(source_type: str, title: str, content: str, url: str) -> Tuple[int, b
             (source_type, title, (content or "")[:500000], url),
         )
         conn.commit()
-        rid = cur.lastrowid or 0
-        return (rid, True)
+        return (cur.lastrowid or 0, True)
     except sqlite3.IntegrityError:
         conn.rollback()
         return (0, False)
@@ -110,6 +201,8 @@ def insert_many(rows: List[Tuple[str, str, str, str]]) -> int:
         except sqlite3.IntegrityError:
             pass
     conn.commit()
+    if inserted:
+        _refresh_index(conn)
     conn.close()
     return inserted
 
@@ -123,16 +216,35 @@ def count() -> int:
 
 
 def search_keyword(keyword: str, limit: int = 10) -> List[KnowledgeRow]:
-    """단순 키워드 매칭: 제목/본문에 keyword 포함된 행 반환"""
+    """
+    키워드 검색: 제목/본문에 keyword 의 모든 단어가 있는 행을 bm25 순으로 (snippet 포함).
+    FTS5 색인이 없으면 단순 LIKE 매칭 (최신순).
+    """
     conn = get_connection()
-    q = "%" + keyword.replace("%", "%%") + "%"
-    cur = conn.execute(
-        "SELECT id, source_type, title, content, url, created_at FROM knowledge WHERE title LIKE ? OR content LIKE ? ORDER BY id DESC LIMIT ?",
-        (q, q, limit),
-    )
-    rows = [_row_from_tuple(r) for r in cur.fetchall()]
-    conn.close()
-    return rows
+    try:
+        match = _fts_query(keyword)
+        if match and _has_fts(conn):
+            cur = conn.execute(
+                "SELECT k.id, k.source_type, k.title, k.content, k.url, k.created_at, "
+                f"snippet(knowledge_fts, 1, '', '', '…', {_SNIPPET_TOKENS}) "
+                f"FROM knowledge_fts JOIN knowledge k ON k.id = knowledge_fts.rowid "
+                f"WHERE knowledge_fts MATCH ? ORDER BY {_BM25} LIMIT ?",
+                (match, limit),
+            )
+            rows = []
+            for r in cur.fetchall():
+                row = _row_from_tuple(r[:6])
+                row.snippet = r[6] or None
+                rows.append(row)
+            return rows
+        q = "%" + keyword.replace("%", "%%") + "%"
+        cur = conn.execute(
+            "SELECT id, source_type, title, content, url, created_at FROM knowledge WHERE title LIKE ? OR content LIKE ? ORDER BY id DESC LIMIT ?",
+            (q, q, limit),
+        )
+        return [_row_from_tuple(r) for r in cur.fetchall()]
+    finally:
+        conn.close()
 
 
 def _row_from_tuple(r: tuple) -> KnowledgeRow:
@@ -146,65 +258,164 @@ def _row_from_tuple(r: tuple) -> KnowledgeRow:
     )
 
 
-def search_tfidf(query: str, limit: int = 10) -> List[KnowledgeRow]:
-    """TfidfVectorizer로 유사 문서 검색. DB가 비어있으면 빈 리스트."""
+def _refresh_index(conn) -> None:
+    """
+    insert_many 뒤 이미 만든 TF-IDF 색인에 새 행을 한 번에 추가. 실패해도 삽입은 유지 (다음 검색 때 다시 맞춤).
+    한 건 insert 와 임베딩 색인은 여기서 맞추지 않음 — 행마다 전체 배열을 새 세대로 쓰거나 삽입 중에 임베딩
+    모델을 읽지 않도록, 다음 검색의 current() 가 그때까지 쌓인 새 행을 한 번에 붙임.
+    """
     try:
-        from sklearn.feature_extraction.text import TfidfVectorizer
-        from sklearn.metrics.pairwise import cosine_similarity
-    except ImportError:
-        return search_keyword(query, limit=limit)
+        knowledge_index.current(conn, DB_PATH, build_missing=False)
+    except Exception:
+        pass
 
-    conn = get_connection()
-    cur = conn.execute("SELECT id, source_type, title, content, url, created_at FROM knowledge")
-    all_rows = cur.fetchall()
-    conn.close()
 
-    if not all_rows:
+def _rows_by_ids(conn, ids: List[int]) -> List[KnowledgeRow]:
+    """ids 순서대로 행 조회 (그 사이 삭제된 행은 빠짐)."""
+    if not ids:
         return []
+    placeholders = ", ".join("?" * len(ids))
+    cur = conn.execute(
+        f"SELECT id, source_type, title, content, url, created_at FROM knowledge WHERE id IN ({placeholders})",
+        tuple(ids),
+    )
+    by_id = {r[0]: r for r in cur.fetchall()}
+    return [_row_from_tuple(by_id[i]) for i in ids if i in by_id]
+
+
+def search_tfidf(query: str, limit: int = 10) -> List[KnowledgeRow]:
+    """저장된 TF-IDF 색인으로 유사 문서 검색 (코사인 유사도 > 0). DB가 비어있으면 빈 리스트."""
+    return search_many([query], limit=limit)[0]
+
 
-    documents = [(r[2] or "") + " " + (r[3] or "") for r in all_rows]
-    vectorizer = TfidfVectorizer(max_features=5000, token_pattern=r"(?u)\b\w+\b")
+def search_many(queries: List[str], limit: int = 10, snippets: bool = False) -> List[List[KnowledgeRow]]:
+    """
+    여러 질의를 한 번에 검색. 질의마다 search_tfidf 와 같은 결과 목록.
+    FTS5 색인이 있으면 질의마다 후보(bm25 상위 RERANK_CANDIDATES 건)만 TF-IDF 점수로 다시 정렬
+    (TF-IDF 어휘 밖 단어로만 일치한 후보는 점수 0, bm25 순으로 뒤에). 후보가 limit 보다 적은 질의와
+    FTS5 가 없을 때는 전체 문서 행렬 곱 한 번.
+    행 조회는 한 번. 색인을 쓸 수 없으면 질의마다 키워드 검색. snippets=True 면 본문 발췌 포함.
+    """
+    conn = get_connection()
     try:
-        X = vectorizer.fit_transform(documents)
-    except Exception:
-        return search_keyword(query, limit=limit)
+        try:
+            index = knowledge_index.current(conn, DB_PATH)
+        except Exception:
+            # scikit-learn 없음, 어휘가 빈 문서뿐 등: 키워드 검색
+            return [search_keyword(q, limit=limit) for q in queries]
+        if index is None:
+            return [[] for _ in queries]
+        hits = _lexical_hits(conn, index, queries, limit)
+        ids = list(dict.fromkeys(row_id for per_query in hits for row_id, _ in per_query))
+        by_id = {r.row_id: r for r in _rows_by_ids(conn, ids)}
+        results = []
+        for query, per_query in zip(queries, hits):
+            rows = [by_id[row_id] for row_id, _ in per_query if row_id in by_id]
+            if snippets and _has_fts(conn):
+                rows = [replace(r) for r in rows]  # 질의마다 발췌가 다름
+                _attach_snippets(conn, query, rows)
+            results.append(rows)
+        return results
+    finally:
+        conn.close()
 
-    q_vec = vectorizer.transform([query])
-    sims = cosine_similarity(q_vec, X).flatten()
-    top_indices = sims.argsort()[::-1][:limit]
 
-    return [
-        _row_from_tuple(all_rows[i])
-        for i in top_indices
-        if sims[i] > 0
-    ]
+def _lexical_hits(conn, index, queries: List[str], limit: int, fill_short: bool = True) -> List[List[Tuple[int, float]]]:
+    """
+    질의마다 [(id, TF-IDF 코사인 > 0), ...]: FTS5 후보 재정렬, 점수 있는 후보가 limit 보다 적으면 전체 행렬 곱
+    (fill_short=False 면 후보만 — 하이브리드 검색은 임베딩 쪽 후보가 재현율을 보완).
+    """
+    hits: List[List[Tuple[int, float]]] = [[] for _ in queries]
+    scan = list(range(len(queries)))
+    if _has_fts(conn):
+        candidates = [_fts_candidates(conn, q, max(limit, RERANK_CANDIDATES)) for q in queries]
+        for j, per_query in enumerate(index.rerank(queries, candidates, limit)):
+            hits[j] = per_query
+        # 점수 있는 후보가 limit 보다 적으면 (단어 중간 일치 등 접두어 검색이 못 찾는 경우) 그 질의만 전체 행렬 곱
+        scan = [j for j, h in enumerate(hits) if fill_short and len(h) < limit]
+    if scan:
+        for j, per_query in zip(scan, index.search_many([queries[j] for j in scan], limit)):
+            hits[j] = per_query
+    return hits
+
+
+def search_hybrid(query: str, limit: int = 5, alpha: Optional[float] = None, snippets: bool = True) -> List[KnowledgeRow]:
+    """
+    어휘(TF-IDF) + 의미(임베딩, knowledge_embedding) 하이브리드 검색.
+    두 방식의 후보(각 limit × HYBRID_POOL 건)를 합쳐 둘 다 점수 계산 후 α 가중합 순 (임베딩 음수 유사도는 0).
+    임베딩 색인을 쓸 수 없으면 search_many 와 같은 어휘 검색. 임베딩 색인이 아직 없으면 이 요청에서 만들지 않고
+    백그라운드에서 만들기 시작 (블로킹 함수: async 핸들러에서는 run_db 로 호출).
+    """
+    alpha = HYBRID_ALPHA if alpha is None else alpha
+    conn = get_connection()
+    try:
+        try:
+            lexical = knowledge_index.current(conn, DB_PATH)
+            dense = knowledge_embedding.current(conn, DB_PATH, build_missing=False)
+            if dense is None and lexical is not None:
+                knowledge_embedding.build_in_background(DB_PATH)
+        except Exception:
+            lexical = dense = None
+        if lexical is not None and dense is not None:
+            return _hybrid_rows(conn, lexical, dense, query, limit, alpha, snippets)
+    finally:
+        conn.close()
+    return search_many([query], limit=limit, snippets=snippets)[0]
+
+
+def _hybrid_rows(conn, lexical, dense, query: str, limit: int, alpha: float, snippets: bool) -> List[KnowledgeRow]:
+    pool = limit * HYBRID_POOL
+    lexical_hits = _lexical_hits(conn, lexical, [query], pool, fill_short=False)[0]
+    ids = list(dict.fromkeys([i for i, _ in lexical_hits] + [i for i, _ in dense.search(query, pool)]))
+    if not ids:
+        return []
+    lexical_scores = dict(lexical.rerank([query], [ids], len(ids))[0])
+    dense_scores = np.maximum(dense.score(query, ids), 0)
+    combined = [alpha * lexical_scores.get(i, 0.0) + (1 - alpha) * float(d) for i, d in zip(ids, dense_scores)]
+    order = sorted(range(len(ids)), key=lambda j: -combined[j])
+    rows = _rows_by_ids(conn, [ids[j] for j in order if combined[j] > 0][:limit])
+    if snippets and _has_fts(conn):
+        _attach_snippets(conn, query, rows)
+    return rows
 
 
 def search_knowledge(keyword: str, top_k: int = 3) -> List[KnowledgeRow]:
     """
-    역량 키워드(예: '뇌 유연화', '위기극복')로 DB 검색해 관련성 높은 상위 top_k개 반환.
-    TfidfVectorizer 사용, 실패 시 단순 키워드 매칭.
+    역량 키워드(예: '뇌 유연화', '위기극복')나 상담 질문으로 DB 검색해 관련성 높은 상위 top_k개 반환 (snippet 포함).
+    어휘(FTS5 후보 → TF-IDF) + 임베딩 하이브리드, 실패 시 어휘 검색 → 키워드 검색. 블로킹 (DB·색인 파일).
     """
-    return search_tfidf(keyword, limit=top_k)
+    return search_hybrid(keyword, limit=top_k)
+
+
+REPORT_SOURCES = {"blog": SOURCE_BLOG, "youtube": SOURCE_YOUTUBE}
 
 
-def search_for_report(keywords: List[str], limit_per_source: int = 3) -> dict:
+def search_for_report(
+    keywords: List[str],
+    limit_per_source: int = 3,
+    quotas: Optional[Dict[str, int]] = None,
+) -> dict:
     """
     리포트용: 키워드 리스트로 검색해 블로그/유튜브 구분해 반환.
+    키워드 전체를 search_many 로 한 번에 검색한 뒤 키워드 순서대로 출처별 할당량까지 채움 (url 중복 제외).
+    quotas: 출처별 개수 {"blog": n, "youtube": m} (없는 키는 limit_per_source).
     반환: { "blog": [KnowledgeRow,...], "youtube": [KnowledgeRow,...] }
     """
-    blog, youtube = [], []
-    for kw in keywords:
-        for row in search_tfidf(kw, limit=limit_per_source * 2):
-            if row.source_type == SOURCE_YOUTUBE and len(youtube) < limit_per_source:
-                if not any(r.url == row.url for r in youtube):
-                    youtube.append(row)
-            elif row.source_type == SOURCE_BLOG and len(blog) < limit_per_source:
-                if not any(r.url == row.url for r in blog):
-                    blog.append(row)
-        if len(blog) >= limit_per_source and len(youtube) >= limit_per_source:
+    quotas = {key: (quotas or {}).get(key, limit_per_source) for key in REPORT_SOURCES}
+    key_of = {source: key for key, source in REPORT_SOURCES.items()}
+    picked: Dict[str, List[KnowledgeRow]] = {key: [] for key in REPORT_SOURCES}
+    seen_urls: Dict[str, set] = {key: set() for key in REPORT_SOURCES}
+    per_keyword = max(quotas.values(), default=0) * 2
+    for rows in search_many(list(keywords), limit=per_keyword) if per_keyword else []:
+        for row in rows:
+            key = key_of.get(row.source_type)
+            if key is None or len(picked[key]) >= quotas[key] or row.url in seen_urls[key]:
+                continue
+            picked[key].append(row)
+            seen_urls[key].add(row.url)
+        if all(len(picked[key]) >= quotas[key] for key in REPORT_SOURCES):
             break
-    return {"blog": blog[:limit_per_source], "youtube": youtube[:limit_per_source]}
+    return picked
 
 
 if __name__ == "__main__":
@@ -0,0 +1,318 @@
+"""
+지식 DB 의미 검색용 밀집 벡터 색인 (/api/consult RAG 의 하이브리드 검색). GPU·네트워크 없이 CPU 에서 동작.
+
+- 임베딩
+  · KNOWLEDGE_EMBED_MODEL 이 로컬 sentence-transformers 모델 폴더이고 패키지가 설치돼 있으면 그 모델
+    (HF_HUB_OFFLINE=1 로 로드, 질의 시 네트워크 사용 안 함).
+  · 아니면 해시 특성 임베딩: 조사 뗀 단어 + 한글 2·3글자 조각을 부호 있는 해시(crc32)로 HASH_DIM 차원에 모아
+    log(1+tf) 후 L2 정규화. 어형·띄어쓰기가 달라도 글자 조각이 겹치면 가까움 ("회복력" ↔ "회복탄력성").
+  문서는 제목 + 본문 앞 EMBED_CHARS 자. meta 에 임베딩 이름을 기록하므로 설정을 바꾸면 다음 검색 때 다시 만듦.
+- 저장: DB 옆 sbi_knowledge_embed/ (knowledge_index 와 같은 세대 파일 방식)
+    g{N}_vectors.npy     문서 벡터 float16 (N × dim, 메모리 맵)
+    g{N}_row_ids.npy     행 → knowledge.id
+    g{N}_centroids.npy   IVF 중심 float32 (nlist × dim)
+    g{N}_assign.npy      행별 중심 번호 (불러올 때 중심별 행 목록으로 묶음)
+- IVF: 구면 k-means (NumPy, 코사인), nlist ≈ √N. 질의는 가까운 중심 NPROBE 개의 목록만 점수 계산.
+  문서가 IVF_MIN_DOCS 미만이면 중심 하나 (전체 비교).
+- 다음 검색 때 (삽입 중에는 모델을 읽지 않음) 새 행만 임베딩해 가장 가까운 중심에 배정. k-means 학습 시점보다 RETRAIN_GROWTH 배 넘게
+  늘었거나 행이 삭제됐으면 다시 만듦.
+- 처음 만들기는 검색 요청 안에서 하지 않음: 미리 `python knowledge_embedding.py` 로 만들어 두거나,
+  없으면 knowledge_db.search_hybrid 가 build_in_background 로 백그라운드에서 만들고 그동안 어휘 검색만 사용.
+"""
+import logging
+import os
+import sqlite3
+import threading
+import zlib
+from collections import Counter
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+import knowledge_analyzer
+import knowledge_index
+
+INDEX_DIRNAME = "sbi_knowledge_embed"
+FORMAT_VERSION = 1
+HASH_DIM = 512
+EMBED_CHARS = 4000
+IVF_MIN_DOCS = 1000
+NPROBE = 8
+KMEANS_ITERS = 10
+RETRAIN_GROWTH = 0.5
+
+_ARRAYS = ("vectors", "row_ids", "centroids", "assign")
+
+logger = logging.getLogger(__name__)
+
+_lock = threading.Lock()
+_cache: Dict[str, "EmbeddingIndex"] = {}
+_building_lock = threading.Lock()
+_building: Dict[str, threading.Thread] = {}
+_models: Dict[str, object] = {}
+
+
+def index_dir(db_path: str) -> str:
+    return os.path.join(os.path.dirname(os.path.abspath(db_path)), INDEX_DIRNAME)
+
+
+def _normalize(x: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(x, axis=-1, keepdims=True)
+    return x / np.where(norms > 0, norms, 1)
+
+
+def hash_embed(texts: Sequence[str], dim: int = HASH_DIM) -> np.ndarray:
+    """해시 특성 임베딩 (N × dim float32, 행 L2 정규화)."""
+    out = np.zeros((len(texts), dim), dtype=np.float32)
+    particle = knowledge_analyzer.get_analyzer("particle")
+    ngram = knowledge_analyzer.get_analyzer("char_ngram")
+    for row, text in enumerate(texts):
+        counts = Counter(particle(text))
+        counts.update(ngram(text))
+        for token, tf in counts.items():
+            h = zlib.crc32(token.encode("utf-8"))
+            out[row, h % dim] += (1.0 if h & 0x80000000 else -1.0) * np.log1p(tf)
+    return _normalize(out)
+
+
+def configured_embedder() -> str:
+    """사용할 임베딩 이름: 'st:<모델 폴더>' 또는 'hash-<차원>'."""
+    model = (os.environ.get("KNOWLEDGE_EMBED_MODEL") or "").strip()
+    if model and os.path.isdir(model):
+        try:
+            import sentence_transformers  # noqa: F401
+        except ImportError:
+            pass
+        else:
+            return "st:" + os.path.abspath(model)
+    return f"hash-{HASH_DIM}"
+
+
+def embed(name: str, texts: Sequence[str]) -> np.ndarray:
+    """이름의 임베딩으로 텍스트들 → (N × dim float32, L2 정규화)."""
+    if name.startswith("st:"):
+        model = _models.get(name)
+        if model is None:
+            os.environ.setdefault("HF_HUB_OFFLINE", "1")
+            from sentence_transformers import SentenceTransformer
+
+            model = _models[name] = SentenceTransformer(name[3:], device="cpu")
+        vectors = model.encode(list(texts), convert_to_numpy=True, show_progress_bar=False)
+        return _normalize(np.asarray(vectors, dtype=np.float32))
+    return hash_embed(texts, int(name.split("-", 1)[1]))
+
+
+def kmeans(x: np.ndarray, k: int, iters: int = KMEANS_ITERS, seed: int = 0) -> Tuple[np.ndarray, np.ndarray]:
+    """구면 k-means (x 는 L2 정규화 행). (중심 k × dim, 행별 중심 번호)."""
+    rng = np.random.default_rng(seed)
+    centroids = x[rng.choice(len(x), size=k, replace=False)].astype(np.float32)
+    assign = np.zeros(len(x), dtype=np.int32)
+    for _ in range(iters):
+        assign = nearest(x, centroids)
+        # 중심별 합: 배정 순으로 정렬해 구간 합 (빈 중심은 임의의 행으로 다시 시작)
+        order = np.argsort(assign, kind="stable")
+        counts = np.bincount(assign, minlength=k)
+        starts = np.concatenate([[0], np.cumsum(counts)[:-1]])
+        sums = np.zeros_like(centroids)
+        nonempty = counts > 0
+        sums[nonempty] = np.add.reduceat(x[order], starts[nonempty], axis=0)
+        sums[~nonempty] = x[rng.choice(len(x), size=int((~nonempty).sum()))]
+        centroids = _normalize(sums)
+    return centroids, nearest(x, centroids)
+
+
+def nearest(x: np.ndarray, centroids: np.ndarray, chunk: int = 8192) -> np.ndarray:
+    """행마다 내적이 가장 큰 중심 번호 (행 묶음 단위로 계산해 메모리 제한)."""
+    out = np.empty(len(x), dtype=np.int32)
+    for start in range(0, len(x), chunk):
+        block = np.asarray(x[start:start + chunk], dtype=np.float32)
+        out[start:start + chunk] = np.argmax(block @ centroids.T, axis=1)
+    return out
+
+
+class EmbeddingIndex:
+    """메모리 맵 벡터 색인 한 세대 + IVF 역색인 (중심별 행 목록)."""
+
+    def __init__(self, path: str, meta: dict, arrays: Dict[str, np.ndarray]):
+        self.path = path
+        self.meta = meta
+        self.vectors = arrays["vectors"]
+        self.row_ids = arrays["row_ids"]
+        self.centroids = np.asarray(arrays["centroids"], dtype=np.float32)
+        self.assign = np.asarray(arrays["assign"])
+        self._list_rows = np.argsort(self.assign, kind="stable")
+        self._list_offsets = np.searchsorted(self.assign[self._list_rows], np.arange(len(self.centroids) + 1))
+
+    @property
+    def generation(self) -> int:
+        return self.meta["generation"]
+
+    @property
+    def last_id(self) -> int:
+        return self.meta["last_id"]
+
+    @property
+    def embedder(self) -> str:
+        return self.meta["embedder"]
+
+    def _positions(self, ids: Sequence[int]) -> Tuple[np.ndarray, np.ndarray]:
+        """knowledge.id → (행 번호, 색인에 있는지). row_ids 는 id 오름차순."""
+        ids = np.asarray(ids, dtype=np.int64)
+        if not len(self.row_ids):
+            return np.zeros(len(ids), dtype=np.int64), np.zeros(len(ids), dtype=bool)
+        pos = np.minimum(np.searchsorted(self.row_ids, ids), len(self.row_ids) - 1)
+        return pos, self.row_ids[pos] == ids
+
+    def embed_query(self, query: str) -> np.ndarray:
+        return embed(self.embedder, [query])[0]
+
+    def search(self, query: str, limit: int, nprobe: int = NPROBE) -> List[Tuple[int, float]]:
+        """[(knowledge.id, 코사인 유사도), ...] 내림차순. 가까운 중심 nprobe 개의 목록만 비교 (근사)."""
+        if limit <= 0 or not len(self.row_ids):
+            return []
+        q = self.embed_query(query)
+        probe = np.argsort(-(self.centroids @ q))[:nprobe]
+        rows = np.concatenate([self._list_rows[self._list_offsets[c]:self._list_offsets[c + 1]] for c in probe])
+        rows.sort()  # 메모리 맵을 앞에서부터 읽도록
+        scores = np.asarray(self.vectors[rows], dtype=np.float32) @ q
+        top = np.argsort(-scores, kind="stable")[:limit]
+        return [(int(self.row_ids[rows[i]]), float(scores[i])) for i in top]
+
+    def score(self, query: str, ids: Sequence[int], q: Optional[np.ndarray] = None) -> np.ndarray:
+        """ids 각각의 코사인 유사도 (색인에 없는 id 는 0)."""
+        q = self.embed_query(query) if q is None else q
+        pos, found = self._positions(ids)
+        scores = np.zeros(len(pos), dtype=np.float32)
+        if found.any():
+            scores[found] = np.asarray(self.vectors[pos[found]], dtype=np.float32) @ q
+        return scores
+
+
+def load(path: str) -> Optional[EmbeddingIndex]:
+    stored = knowledge_index.read_generation(path, _ARRAYS, FORMAT_VERSION)
+    return EmbeddingIndex(path, *stored) if stored else None
+
+
+def _write(path: str, meta: dict, arrays: Dict[str, np.ndarray]) -> EmbeddingIndex:
+    knowledge_index.write_generation(path, meta, arrays)
+    return load(path)
+
+
+def _texts(texts: Sequence[str]) -> List[str]:
+    return [t[:EMBED_CHARS] for t in texts]
+
+
+def build(conn, path: str, generation: int = 0, embedder: Optional[str] = None) -> Optional[EmbeddingIndex]:
+    """knowledge 전체를 임베딩하고 IVF 학습 후 새 세대로 저장. 문서가 없으면 None."""
+    ids, texts = knowledge_index.fetch_documents(conn)
+    if not ids:
+        return None
+    embedder = embedder or configured_embedder()
+    vectors = embed(embedder, _texts(texts))
+    if len(ids) < IVF_MIN_DOCS:
+        centroids = _normalize(vectors.mean(axis=0, keepdims=True))
+        assign = np.zeros(len(ids), dtype=np.int32)
+    else:
+        centroids, assign = kmeans(vectors, int(np.sqrt(len(ids))))
+    meta = {
+        "version": FORMAT_VERSION,
+        "generation": generation + 1,
+        "embedder": embedder,
+        "dim": int(vectors.shape[1]),
+        "last_id": ids[-1],
+        "trained_docs": len(ids),
+    }
+    arrays = {
+        "vectors": vectors.astype(np.float16),
+        "row_ids": np.asarray(ids, dtype=np.int64),
+        "centroids": centroids.astype(np.float32),
+        "assign": assign,
+    }
+    return _write(path, meta, arrays)
+
+
+def append(conn, index: EmbeddingIndex, ids: List[int], texts: List[str]) -> EmbeddingIndex:
+    """새 행을 임베딩해 가장 가까운 중심에 배정한 새 세대 저장 (많이 늘었으면 k-means 부터 다시)."""
+    n_docs = len(index.row_ids) + len(ids)
+    trained = index.meta["trained_docs"]
+    if n_docs - trained > trained * RETRAIN_GROWTH or (trained < IVF_MIN_DOCS <= n_docs):
+        return build(conn, index.path, index.generation, index.embedder)
+    vectors = embed(index.embedder, _texts(texts))
+    meta = {**index.meta, "generation": index.generation + 1, "last_id": ids[-1]}
+    arrays = {
+        "vectors": np.concatenate([np.asarray(index.vectors), vectors.astype(np.float16)]),
+        "row_ids": np.concatenate([index.row_ids, np.asarray(ids, dtype=np.int64)]),
+        "centroids": index.centroids,
+        "assign": np.concatenate([index.assign, nearest(vectors, index.centroids)]),
+    }
+    return _write(index.path, meta, arrays)
+
+
+def current(conn, db_path: str, build_missing: bool = True) -> Optional[EmbeddingIndex]:
+    """
+    knowledge 테이블과 맞춘 벡터 색인. 새 행은 증분 추가, 삭제가 있었거나 임베딩 설정이 바뀌었으면 다시 만듦.
+    색인이 없으면 build_missing=True 일 때만 만듦. 문서가 없으면 None.
+    """
+    with _lock:
+        return knowledge_index.sync_generation(
+            conn, index_dir(db_path), _cache, load, build, append,
+            lambda index: index.embedder != configured_embedder(), build_missing,
+        )
+
+
+def build_in_background(db_path: str) -> Optional[threading.Thread]:
+    """
+    색인이 없을 때 검색 요청이 전체 문서 임베딩(모델이면 수 분)을 기다리지 않도록 데몬 스레드에서 만듦
+    (스레드가 db_path 로 자기 연결을 엶). 이미 만드는 중이면 None.
+    """
+    path = index_dir(db_path)
+
+    def run() -> None:
+        try:
+            conn = sqlite3.connect(db_path)
+            try:
+                current(conn, db_path)
+            finally:
+                conn.close()
+        except Exception as e:
+            logger.warning("임베딩 색인 생성 실패 (%s): %s", path, e)
+        finally:
+            with _building_lock:
+                _building.pop(path, None)
+
+    with _building_lock:
+        if path in _building:
+            return None
+        thread = _building[path] = threading.Thread(target=run, name="knowledge-embed-build", daemon=True)
+    thread.start()
+    return thread
+
+
+def wait_for_builds(timeout: Optional[float] = None) -> None:
+    """진행 중인 백그라운드 색인 생성이 끝날 때까지 기다림 (테스트·종료 시)."""
+    with _building_lock:
+        threads = list(_building.values())
+    for thread in threads:
+        thread.join(timeout)
+
+
+def clear_cache() -> None:
+    with _lock:
+        _cache.clear()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="지식 DB 임베딩 색인 만들기·갱신 (배포 전 오프라인 실행)")
+    parser.add_argument("--db", default=os.path.join(os.path.dirname(os.path.abspath(__file__)), "sbi_knowledge.db"))
+    opts = parser.parse_args()
+    db_conn = sqlite3.connect(opts.db)
+    try:
+        built = current(db_conn, opts.db)
+    finally:
+        db_conn.close()
+    if built is None:
+        print("지식 DB 가 비어 있습니다.")
+    else:
+        print(f"{index_dir(opts.db)}: 문서 {len(built.row_ids)}건, 세대 {built.generation}, {built.embedder}, 중심 {len(built.centroids)}개")
@@ -0,0 +1,374 @@
+"""
+지식 DB(sbi_knowledge.db) TF-IDF 검색 색인. 검색할 때마다 전체 문서로 TfidfVectorizer 를 다시 fit 하지 않도록
+미리 만든 색인을 DB 옆 sbi_knowledge_index/ 에 저장해 두고 메모리 맵으로 읽음.
+
+    meta.json            세대(generation), 분석기 이름, 어휘(term → 열), 마지막 id, fit 시점 문서 수, 추가 문서의 어휘 밖 토큰 수
+    g{N}_idf.npy         열별 idf (float32)
+    g{N}_data.npy, g{N}_indices.npy, g{N}_indptr.npy
+                         문서 행렬 CSR (행 = L2 정규화 tf-idf, float32 / int32)
+    g{N}_row_ids.npy     행 → knowledge.id
+
+- 질의 = 질의 문자열 변환 한 번 + 희소 행렬 × 벡터 한 번 (코사인 유사도, 문서 행은 이미 정규화).
+  질의 여러 개(search_many)는 질의 행렬로 한 번에 변환해 행렬 곱 한 번.
+- insert_many 뒤나 (insert 한 건은 색인을 건드리지 않으므로) 다음 검색 때 새 행(id > 마지막 id)만 fit 때의
+  어휘·idf 로 변환해 행렬 뒤에 붙임 (증분).
+- 붙인 문서가 fit 시점 문서 수의 REFIT_GROWTH 배를 넘거나, 붙인 문서의 어휘 밖 토큰 비율이 REFIT_OOV_RATIO 를
+  넘으면 (어휘·idf 가 실제 문서와 멀어짐) 전체 다시 fit. 행이 삭제된 경우도 다시 fit.
+- 파일은 새 세대로 모두 쓴 뒤 meta.json 을 원자적으로 교체. 이전 세대 파일은 지울 수 있을 때 삭제
+  (Windows 에서 다른 프로세스가 메모리 맵 중이면 다음 쓰기 때 다시 시도).
+- 맞추기(세대 확인 → 쓰기)는 색인 폴더 옆 잠금 파일(<폴더>.lock)을 잡고 함. 워커 프로세스 여럿이 같은
+  g{N+1} 을 동시에 쓰지 않고, 나중 프로세스는 먼저 쓴 세대를 읽어 이어 감.
+- 토큰 분석은 knowledge_analyzer (기본 조사 떼기). 설정한 분석기가 색인의 것과 다르면 다시 fit.
+- scikit-learn 은 색인을 만들거나 질의를 변환할 때만 import. 없으면 ImportError (knowledge_db 가 키워드 검색으로 대체).
+"""
+import glob
+import json
+import os
+import threading
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+import knowledge_analyzer
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+INDEX_DIRNAME = "sbi_knowledge_index"
+FORMAT_VERSION = 2
+MAX_FEATURES = 5000
+REFIT_GROWTH = 0.25
+REFIT_OOV_RATIO = 0.4
+
+_ARRAYS = ("idf", "data", "indices", "indptr", "row_ids")
+
+_lock = threading.Lock()
+_cache: Dict[str, "TfidfIndex"] = {}
+
+
+def index_dir(db_path: str) -> str:
+    return os.path.join(os.path.dirname(os.path.abspath(db_path)), INDEX_DIRNAME)
+
+
+def document_text(title: Optional[str], content: Optional[str]) -> str:
+    return (title or "") + " " + (content or "")
+
+
+class TfidfIndex:
+    """메모리 맵 색인 한 세대. vocabulary 는 term → 열 번호."""
+
+    def __init__(self, path: str, meta: dict, arrays: Dict[str, np.ndarray]):
+        from scipy.sparse import csr_matrix
+
+        self.path = path
+        self.meta = meta
+        self.vocabulary: Dict[str, int] = meta["vocabulary"]
+        self.idf = arrays["idf"]
+        self.row_ids = arrays["row_ids"]
+        self.matrix = csr_matrix(
+            (arrays["data"], arrays["indices"], arrays["indptr"]),
+            shape=(len(self.row_ids), len(self.vocabulary)),
+            copy=False,
+        )
+
+    @property
+    def generation(self) -> int:
+        return self.meta["generation"]
+
+    @property
+    def last_id(self) -> int:
+        return self.meta["last_id"]
+
+    @property
+    def analyzer(self) -> str:
+        return self.meta["analyzer"]
+
+    def transform(self, texts: Sequence[str], cache: bool = True):
+        """문자열들 → L2 정규화 tf-idf CSR (fit 때의 분석기·어휘·idf). 질의는 cache=False (토큰 캐시는 문서용)."""
+        from sklearn.feature_extraction.text import CountVectorizer
+        from sklearn.preprocessing import normalize
+
+        counter = CountVectorizer(
+            vocabulary=self.vocabulary, analyzer=knowledge_analyzer.get_analyzer(self.analyzer, cache), dtype=np.float32,
+        )
+        counts = counter.transform(texts)
+        return normalize(counts.multiply(self.idf).tocsr(), norm="l2", copy=False)
+
+    def oov_tokens(self, texts: Sequence[str]) -> Tuple[int, int]:
+        """(전체 토큰 수, 어휘 밖 토큰 수)."""
+        analyze = knowledge_analyzer.get_analyzer(self.analyzer)
+        total = oov = 0
+        for text in texts:
+            tokens = analyze(text)
+            total += len(tokens)
+            oov += sum(1 for t in tokens if t not in self.vocabulary)
+        return total, oov
+
+    def search(self, query: str, limit: int) -> List[Tuple[int, float]]:
+        """[(knowledge.id, 코사인 유사도), ...] 유사도 내림차순, 0 인 문서 제외."""
+        return self.search_many([query], limit)[0]
+
+    def search_many(self, queries: Sequence[str], limit: int) -> List[List[Tuple[int, float]]]:
+        """
+        질의 여러 개를 한 번에: 질의 행렬 변환 한 번 + 문서 행렬 × 질의 행렬 곱 한 번.
+        질의마다 [(knowledge.id, 코사인 유사도), ...] (search 와 같은 순서·조건).
+        """
+        if limit <= 0 or not len(self.row_ids) or not queries:
+            return [[] for _ in queries]
+        q = self.transform(list(queries), cache=False)
+        scores = np.asarray(self.matrix.dot(q.T.tocsc()).todense())
+        return [self._top(scores[:, j], limit) for j in range(len(queries))]
+
+    def rerank(
+        self, queries: Sequence[str], candidates: Sequence[Sequence[int]], limit: int,
+    ) -> List[List[Tuple[int, float]]]:
+        """
+        질의마다 후보 id(knowledge.id, 앞쪽이 우선)만 점수 계산해 상위 limit 건. 후보 행만 행렬에서 골라 곱함.
+        점수 내림차순, 같은 점수는 후보 순서 유지. search 와 같이 0 인 후보(색인에 없는 후보 포함)는 제외
+        (FTS 접두어로만 걸린 후보 등: 후보는 범위를 좁힐 뿐 결과를 늘리지 않음).
+        """
+        if limit <= 0 or not queries:
+            return [[] for _ in queries]
+        q = self.transform(list(queries), cache=False)
+        out = []
+        for j, cand in enumerate(candidates):
+            cand = np.asarray(cand, dtype=np.int64)
+            scores = np.zeros(len(cand), dtype=np.float32)
+            if len(cand) and len(self.row_ids):
+                pos = np.minimum(np.searchsorted(self.row_ids, cand), len(self.row_ids) - 1)
+                found = self.row_ids[pos] == cand  # row_ids 는 id 오름차순
+                if found.any():
+                    scores[found] = np.asarray(self.matrix[pos[found]].dot(q[j].T).todense()).ravel()
+            order = np.lexsort((np.arange(len(cand)), -scores))[:limit]
+            out.append([(int(cand[i]), float(scores[i])) for i in order if scores[i] > 0])
+        return out
+
+    def _top(self, scores: np.ndarray, limit: int) -> List[Tuple[int, float]]:
+        if limit < len(scores):
+            top = np.argpartition(-scores, limit - 1)[:limit]
+        else:
+            top = np.arange(len(scores))
+        top = top[np.lexsort((-self.row_ids[top], -scores[top]))]
+        return [(int(self.row_ids[i]), float(scores[i])) for i in top if scores[i] > 0]
+
+
+def _file(path: str, generation: int, name: str) -> str:
+    return os.path.join(path, f"g{generation}_{name}.npy")
+
+
+def read_generation(path: str, names: Sequence[str], version: int) -> Optional[Tuple[dict, Dict[str, np.ndarray]]]:
+    """path 의 meta.json 과 현재 세대 배열들(메모리 맵). 없거나 포맷 버전이 다르면 None."""
+    try:
+        with open(os.path.join(path, "meta.json"), encoding="utf-8") as f:
+            meta = json.load(f)
+        if meta.get("version") != version:
+            return None
+        arrays = {name: np.load(_file(path, meta["generation"], name), mmap_mode="r") for name in names}
+    except (OSError, ValueError, KeyError):
+        return None
+    return meta, arrays
+
+
+def write_generation(path: str, meta: dict, arrays: Dict[str, np.ndarray]) -> None:
+    """배열들을 meta["generation"] 세대 파일로 쓰고 meta.json 을 원자적으로 교체, 이전 세대 파일은 지울 수 있으면 삭제."""
+    os.makedirs(path, exist_ok=True)
+    generation = meta["generation"]
+    for name, array in arrays.items():
+        np.save(_file(path, generation, name), array)
+    tmp = os.path.join(path, f"meta.json.{os.getpid()}.tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(meta, f, ensure_ascii=False)
+    os.replace(tmp, os.path.join(path, "meta.json"))
+    keep = {os.path.basename(_file(path, generation, name)) for name in arrays}
+    for old in glob.glob(os.path.join(path, "g*_*.npy")):
+        if os.path.basename(old) not in keep:
+            try:
+                os.remove(old)
+            except OSError:
+                pass
+
+
+@contextmanager
+def _generation_lock(path: str):
+    """path 색인의 프로세스 간 잠금 (path + ".lock" 파일). 같은 프로세스 안의 스레드는 모듈 _lock 으로 따로 막음."""
+    with open(path + ".lock", "a+b") as f:
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        else:
+            f.seek(0)
+            while True:
+                try:
+                    msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:  # LK_LOCK 은 10초 동안만 재시도
+                    pass
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+            else:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def stored_generation(path: str) -> Optional[int]:
+    """meta.json 의 현재 세대 (없으면 None). 다른 프로세스가 새 세대를 썼는지 확인용."""
+    try:
+        with open(os.path.join(path, "meta.json"), encoding="utf-8") as f:
+            return json.load(f).get("generation")
+    except (OSError, ValueError):
+        return None
+
+
+def load(path: str) -> Optional[TfidfIndex]:
+    """path 의 현재 세대를 메모리 맵으로 읽음. 없거나 포맷이 다르면 None."""
+    stored = read_generation(path, _ARRAYS, FORMAT_VERSION)
+    return TfidfIndex(path, *stored) if stored else None
+
+
+def _write(path: str, meta: dict, arrays: Dict[str, np.ndarray]) -> TfidfIndex:
+    write_generation(path, meta, arrays)
+    return load(path)
+
+
+def _csr_arrays(matrix) -> Dict[str, np.ndarray]:
+    return {
+        "data": matrix.data.astype(np.float32, copy=False),
+        "indices": matrix.indices.astype(np.int32, copy=False),
+        "indptr": matrix.indptr.astype(np.int32, copy=False),
+    }
+
+
+def fetch_documents(conn, after_id: int = 0) -> Tuple[List[int], List[str]]:
+    """id > after_id 인 knowledge 행의 (id 목록, 문서 텍스트 목록), id 오름차순."""
+    cur = conn.execute("SELECT id, title, content FROM knowledge WHERE id > ? ORDER BY id", (after_id,))
+    ids, texts = [], []
+    for row_id, title, content in cur:
+        ids.append(row_id)
+        texts.append(document_text(title, content))
+    return ids, texts
+
+
+def build(conn, path: str, generation: int = 0, analyzer: Optional[str] = None) -> Optional[TfidfIndex]:
+    """
+    knowledge 전체로 fit 해 새 세대로 저장. analyzer 없으면 설정값(KNOWLEDGE_ANALYZER).
+    문서가 없으면 None (어휘가 비면 sklearn ValueError).
+    """
+    from sklearn.feature_extraction.text import TfidfVectorizer
+
+    ids, texts = fetch_documents(conn)
+    if not ids:
+        return None
+    analyzer = analyzer or knowledge_analyzer.configured_name()
+    vectorizer = TfidfVectorizer(
+        max_features=MAX_FEATURES, analyzer=knowledge_analyzer.get_analyzer(analyzer), dtype=np.float32,
+    )
+    matrix = vectorizer.fit_transform(texts).tocsr()
+    meta = {
+        "version": FORMAT_VERSION,
+        "generation": generation + 1,
+        "analyzer": analyzer,
+        "vocabulary": {term: int(col) for term, col in vectorizer.vocabulary_.items()},
+        "last_id": ids[-1],
+        "fitted_docs": len(ids),
+        "appended_tokens": 0,
+        "appended_oov": 0,
+    }
+    arrays = {
+        "idf": vectorizer.idf_.astype(np.float32),
+        "row_ids": np.asarray(ids, dtype=np.int64),
+        **_csr_arrays(matrix),
+    }
+    return _write(path, meta, arrays)
+
+
+def _needs_refit(index: TfidfIndex, n_docs: int, tokens: int, oov: int) -> bool:
+    meta = index.meta
+    if n_docs - meta["fitted_docs"] > meta["fitted_docs"] * REFIT_GROWTH:
+        return True
+    return tokens > 0 and oov / tokens > REFIT_OOV_RATIO
+
+
+def append(conn, index: TfidfIndex, ids: List[int], texts: List[str]) -> TfidfIndex:
+    """새 문서 행을 기존 어휘·idf 로 변환해 붙인 새 세대 저장 (어휘가 많이 벗어났으면 전체 다시 fit)."""
+    from scipy.sparse import vstack
+
+    tokens, oov = index.oov_tokens(texts)
+    tokens += index.meta["appended_tokens"]
+    oov += index.meta["appended_oov"]
+    if _needs_refit(index, len(index.row_ids) + len(ids), tokens, oov):
+        return build(conn, index.path, index.generation)
+    matrix = vstack([index.matrix, index.transform(texts)], format="csr")
+    meta = {**index.meta, "generation": index.generation + 1, "last_id": ids[-1], "appended_tokens": tokens, "appended_oov": oov}
+    arrays = {
+        "idf": np.asarray(index.idf),
+        "row_ids": np.concatenate([index.row_ids, np.asarray(ids, dtype=np.int64)]),
+        **_csr_arrays(matrix),
+    }
+    return _write(index.path, meta, arrays)
+
+
+def sync_generation(
+    conn,
+    path: str,
+    cache: Dict[str, Any],
+    load: Callable[[str], Any],
+    build: Callable[..., Any],
+    append: Callable[..., Any],
+    outdated: Callable[[Any], bool],
+    build_missing: bool = True,
+):
+    """
+    세대 파일 색인을 knowledge 테이블과 맞춤 (TF-IDF·임베딩 색인 공용, 호출한 모듈이 자기 lock 을 잡고 호출).
+    - cache: 프로세스 캐시 {path: 색인}. 다른 프로세스가 새 세대를 썼으면 load(path) 로 다시 읽음
+    - 새 행만 있으면 append(conn, index, ids, texts), 행이 삭제됐거나 outdated(index) 면 build(conn, path, 세대)
+    - 색인이 없으면 build_missing=True 일 때만 build(conn, path). 문서가 없으면 None
+    - 세대 확인부터 쓰기까지 _generation_lock(path) 안에서 (다른 프로세스가 같은 세대를 쓰지 않도록)
+    """
+    with _generation_lock(path):
+        return _sync_locked(conn, path, cache, load, build, append, outdated, build_missing)
+
+
+def _sync_locked(conn, path, cache, load, build, append, outdated, build_missing):
+    index = cache.get(path)
+    generation = stored_generation(path)
+    if generation is None:
+        index = None
+    elif index is None or index.generation != generation:
+        index = load(path)
+    if index is None:
+        index = build(conn, path) if build_missing else None
+    else:
+        ids, texts = fetch_documents(conn, index.last_id)
+        total = conn.execute("SELECT COUNT(*) FROM knowledge").fetchone()[0]
+        if total != len(index.row_ids) + len(ids) or outdated(index):
+            index = build(conn, path, index.generation)
+        elif ids:
+            index = append(conn, index, ids, texts)
+    if index is None:
+        cache.pop(path, None)
+    else:
+        cache[path] = index
+    return index
+
+
+def current(conn, db_path: str, build_missing: bool = True) -> Optional[TfidfIndex]:
+    """
+    knowledge 테이블과 맞춘 색인. 새 행은 증분 추가, 삭제가 있었거나 분석기 설정이 바뀌었으면 다시 fit.
+    색인이 없으면 build_missing=True 일 때만 만듦. 문서가 없으면 None.
+    """
+    with _lock:
+        return sync_generation(
+            conn, index_dir(db_path), _cache, load, build, append,
+            lambda index: index.analyzer != knowledge_analyzer.configured_name(), build_missing,
+        )
+
+
+def clear_cache() -> None:
+    with _lock:
+        _cache.clear()
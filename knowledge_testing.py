@@ -0,0 +1,34 @@
+"""
+테스트 공용: 임시 디렉터리의 지식 DB(sbi_knowledge.db)로 검색·색인을 돌리는 unittest 기반 클래스.
+"""
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import knowledge_db
+import knowledge_embedding
+import knowledge_index
+
+
+class KnowledgeDbTestCase(unittest.TestCase):
+    """
+    knowledge_db.DB_PATH 를 임시 디렉터리로 바꾸고 init_db() 후 rows 를 넣어 둠.
+    TF-IDF·임베딩 색인 캐시는 앞뒤로 비우고, 끝날 때 백그라운드 임베딩 빌드를 기다린 뒤 디렉터리 삭제.
+    """
+
+    rows = ()  # (source, title, content, url)
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        patcher = mock.patch.object(knowledge_db, "DB_PATH", os.path.join(tmp.name, "sbi_knowledge.db"))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        for module in (knowledge_index, knowledge_embedding):
+            self.addCleanup(module.clear_cache)
+            module.clear_cache()
+        self.addCleanup(knowledge_embedding.wait_for_builds)
+        knowledge_db.init_db()
+        if self.rows:
+            knowledge_db.insert_many(self.rows)
@@ -3,19 +3,23 @@ FastAPI 메인 애플리케이션
 """
 import os
 import secrets
-import random
 from fastapi import FastAPI, HTTPException, Request, Depends, Form
-from fastapi.responses import FileResponse, RedirectResponse, JSONResponse
+from fastapi.responses import FileResponse, RedirectResponse, JSONResponse, Response
 from pydantic import BaseModel, Field, field_validator
 from typing import Dict, List, Optional, Any
 from starlette.middleware.sessions import SessionMiddleware
 from starlette.staticfiles import StaticFiles
-from data_loader import SurveyDataLoader
-from scoring import ScoringEngine
-from analysis_engine import run_combined_analysis, calculate_combined_sbi
+from data_loader import get_shared_loader
+from scoring import get_shared_engine
+from item_payloads import get_item_payloads, etag_matches
+from analysis_engine import run_combined_analysis
 from models import BrainWaveMetrics
-from eeg_provider import MockEEGProvider
-from report_generator import generate_report, report_to_dict
+from eeg_provider import MockEEGProvider, session_seed
+from report_generator import report_to_dict
+from async_storage import run_cpu, run_db, survey_store, chat_store, eeg_store, board_store, user_store
+from result_cache import (
+    cached_detailed_score, cached_combined_sbi, cached_report, combined_key, combined_cache, cache_stats,
+)
 from email_coupon import build_coupon_email_for_result, COUPON_EMAIL_THRESHOLD
 
 # 세션 비밀키 (배포 시 환경변수로 설정 권장)
@@ -41,9 +45,11 @@ async def allow_mobile_and_all_devices(request: Request, call_next):
 static_dir = os.path.join(os.path.dirname(__file__), "static")
 app.mount("/static", StaticFiles(directory=static_dir), name="static")
 
-# 전역 데이터 로더 및 채점 엔진 초기화
-data_loader = SurveyDataLoader()
-scoring_engine = ScoringEngine(data_loader)
+# 전역 데이터 로더 및 채점 엔진 초기화 (프로세스 공용 캐시를 미리 채움).
+# 요청 처리 시에는 get_shared_loader()/get_shared_engine()으로 받아 CSV 변경 시 자동 반영.
+data_loader = get_shared_loader()
+scoring_engine = get_shared_engine()
+get_item_payloads()
 
 
 def get_current_user(request: Request) -> Optional[Dict]:
@@ -86,6 +92,36 @@ class SurveyResponse(BaseModel):
         return v
 
 
+# 배치 채점 한 번에 받을 수 있는 최대 행 수
+SURVEY_BATCH_MAX_ROWS = 10000
+
+
+class SurveyBatchRequest(BaseModel):
+    """
+    여러 응답자 일괄 채점 요청. responses(N×96 응답 행렬)를 보내거나,
+    생략하면 저장된 설문진단 중 조건(date_from/date_to/q/user_email, 관리자 목록과 같은 조건)에 맞는 행을 서버에서 채점.
+    """
+    responses: Optional[List[List[int]]] = Field(
+        default=None,
+        description="행 = 응답자, 열 j = 전체순번 j+1 의 점수. 1~5 밖의 값(0 등)은 미응답 (없으면 저장된 설문진단)",
+    )
+    excluded_sequences: Optional[List[List[int]]] = Field(
+        default=None,
+        description="행별 제외 순번 리스트 (없으면 제외 없음, 있으면 responses 와 같은 행 수)",
+    )
+    date_from: Optional[str] = Field(default=None, description="저장된 설문진단 채점 시 시작일 (YYYY-MM-DD)")
+    date_to: Optional[str] = Field(default=None, description="저장된 설문진단 채점 시 종료일 (YYYY-MM-DD)")
+    q: Optional[str] = Field(default=None, description="저장된 설문진단 채점 시 제목 검색어")
+    user_email: Optional[str] = Field(default=None, description="저장된 설문진단 채점 시 이메일 (전체 또는 일부)")
+
+    @field_validator('responses')
+    @classmethod
+    def validate_rows(cls, v):
+        if v is not None and len(v) > SURVEY_BATCH_MAX_ROWS:
+            raise ValueError(f"한 번에 최대 {SURVEY_BATCH_MAX_ROWS}행까지 채점할 수 있습니다.")
+        return v
+
+
 class SurveyResultResponse(BaseModel):
     """설문 결과 응답 모델"""
     전체평균: float
@@ -144,6 +180,8 @@ class AnalyzeSBIRequest(BaseModel):
     responses: Dict[int, int] = Field(..., description="설문 응답 {전체순번: 1~5점}")
     excluded_sequences: Optional[List[int]] = Field(default=[], description="제외 문항 순번")
     customer_name: Optional[str] = Field(default="고객", description="할인권 이메일 수신자 이름 (점수 이하 시 자동 발송용)")
+    eeg_seed: Optional[int] = Field(default=None, description="가상 뇌파 시드 (지정 시 같은 뇌파 값 → 결과 캐시 사용)")
+    eeg_session: Optional[str] = Field(default=None, description="측정 세션 ID (eeg_seed 미지정 시 로그인 사용자+세션으로 시드 유도)")
 
     @field_validator("responses", mode="before")
     @classmethod
@@ -210,8 +248,7 @@ class RegisterRequest(BaseModel):
 async def api_check_email(email: Optional[str] = None):
     """가입 전 이메일 검사. 항상 200 + valid/available/message (404·Not Found 미반환)."""
     try:
-        from user_storage import check_email_for_register
-        result = check_email_for_register(email or "")
+        result = await user_store.check_email_for_register(email or "")
         return result
     except Exception as e:
         return {
@@ -226,8 +263,7 @@ async def api_check_email(email: Optional[str] = None):
 async def api_register(body: RegisterRequest):
     """회원 가입. 이메일 중복 시 400. DB 연결 실패 시 503 및 안내 문구. 프로필 필드 포함."""
     try:
-        from user_storage import register
-        out = register(
+        out = await user_store.register(
             body.email.strip(),
             body.password,
             name=body.name,
@@ -255,8 +291,7 @@ async def api_login(request: Request, body: LoginRequest):
     pw = USERS_DEMO.get(email)
     if pw is None:
         try:
-            from user_storage import verify_password
-            if not verify_password(email, body.password):
+            if not await user_store.verify_password(email, body.password):
                 raise HTTPException(status_code=401, detail="이메일 또는 비밀번호가 올바르지 않습니다.")
         except ImportError:
             raise HTTPException(status_code=401, detail="이메일 또는 비밀번호가 올바르지 않습니다.")
@@ -323,8 +358,7 @@ async def login_submit(
     pw = USERS_DEMO.get(email)
     if pw is None:
         try:
-            from user_storage import verify_password
-            if not email or not verify_password(email, password or ""):
+            if not email or not await user_store.verify_password(email, password or ""):
                 return RedirectResponse(url="/login?error=1", status_code=302)
         except ImportError:
             return RedirectResponse(url="/login?error=1", status_code=302)
@@ -381,10 +415,10 @@ async def api_admin_users(request: Request):
         for e in USERS_DEMO
     ]
     try:
-        from user_storage import list_users
+        users = await user_store.list_users()
         registered = [
             {"id": u["id"], "email": u["email"], "created_at": u.get("created_at") or "-", "remarks": "가입회원", "is_demo": False}
-            for u in list_users()
+            for u in users
         ]
     except Exception:
         registered = []
@@ -414,8 +448,7 @@ async def api_admin_user_detail(request: Request, email: Optional[str] = None):
             "sleep_hours": "-", "sleep_quality": "-", "meal_habit": "-", "bowel_habit": "-", "exercise_habit": "-",
         }
     try:
-        from user_storage import get_user_detail_for_admin
-        detail = get_user_detail_for_admin(email)
+        detail = await user_store.get_user_detail_for_admin(email)
         if not detail:
             raise HTTPException(status_code=404, detail="Not Found")
         detail.setdefault("password_type", "해시(복호화 불가)")
@@ -441,8 +474,7 @@ async def api_admin_delete_user(request: Request, body: AdminDeleteUserRequest):
     if email in USERS_DEMO:
         raise HTTPException(status_code=400, detail="데모 계정은 삭제할 수 없습니다.")
     try:
-        from user_storage import delete_user
-        if not delete_user(email):
+        if not await user_store.delete_user(email):
             raise HTTPException(status_code=404, detail="해당 회원을 찾을 수 없습니다.")
         return {"ok": True}
     except HTTPException:
@@ -467,8 +499,7 @@ async def api_admin_reset_password(request: Request, body: AdminResetPasswordReq
     if len(pw) < 4:
         raise HTTPException(status_code=400, detail="비밀번호는 4자 이상이어야 합니다.")
     try:
-        from user_storage import update_password
-        if not update_password(email, pw):
+        if not await user_store.update_password(email, pw):
             raise HTTPException(status_code=404, detail="해당 회원을 찾을 수 없습니다.")
         return {"ok": True}
     except ValueError as e:
@@ -490,32 +521,77 @@ def _admin_only(request: Request):
     return user
 
 
+@app.get("/api/admin/cache-stats")
+async def api_admin_cache_stats(request: Request):
+    """관리자: 분석 결과 캐시(채점·통합 SBI·리포트) 적중/미적중/퇴출 현황"""
+    _admin_only(request)
+    return cache_stats()
+
+
+@app.get("/api/admin/db-pool-stats")
+async def api_admin_db_pool_stats(request: Request):
+    """관리자: DB 연결 풀 현황 (in_use, idle, waits, 재연결 횟수)"""
+    _admin_only(request)
+    from db import pool_stats
+    return pool_stats()
+
+
+# 관리자 테이블 목록 컬럼 (본문 등 큰 컬럼은 빼고, 지표 산출식은 미리보기만)
+ADMIN_TABLE_LIST_COLUMNS = {
+    "survey_saves": ("id", "user_email", "title", "update_count", "created_at"),
+    "chat_saves": ("id", "user_email", "summary_title", "created_at"),
+    "board": ("id", "type", "title", "created_at", "updated_at"),
+    "eeg_saves": ("id", "user_email", "title", "created_at"),
+    "indicator_formulas": ("id", "title", "SUBSTR(content, 1, 100) AS content_preview", "sort_order", "created_at", "updated_at"),
+}
+
+
 @app.get("/api/admin/tables/{table_name}")
-async def api_admin_table_list(request: Request, table_name: str):
-    """관리자: 테이블 전체 목록 (survey_saves, chat_saves, board, eeg_saves, indicator_formulas). DB 미연결 시 200 + 빈 목록 + 안내 메시지."""
+async def api_admin_table_list(
+    request: Request,
+    table_name: str,
+    after_id: Optional[int] = None,
+    page_size: Optional[int] = None,
+    after_value: Optional[int] = None,
+):
+    """
+    관리자: 테이블 목록 한 페이지 (survey_saves, chat_saves, board, eeg_saves, indicator_formulas).
+    id 최신순(지표 산출식은 sort_order 순) keyset 페이지: 다음 페이지는 after_id=next_after_id
+    (지표 산출식은 after_value=next_after_value 도 함께).
+    total_estimate 는 첫 페이지에서만 계산. DB 미연결 시 200 + 빈 목록 + 안내 메시지.
+    """
     _admin_only(request)
     if table_name not in ALLOWED_ADMIN_TABLES:
         raise HTTPException(status_code=400, detail="허용된 테이블이 아닙니다.")
     try:
-        from db import get_conn, execute_all
-        with get_conn() as conn:
-            if table_name == "survey_saves":
-                rows = execute_all(conn, "SELECT id, user_email, title, update_count, created_at FROM survey_saves ORDER BY id DESC LIMIT 500", ())
-            elif table_name == "chat_saves":
-                rows = execute_all(conn, "SELECT id, user_email, summary_title, created_at FROM chat_saves ORDER BY id DESC LIMIT 500", ())
-            elif table_name == "board":
-                rows = execute_all(conn, "SELECT id, type, title, content, created_at, updated_at FROM board ORDER BY id DESC LIMIT 500", ())
-            elif table_name == "eeg_saves":
-                rows = execute_all(conn, "SELECT id, user_email, title, created_at FROM eeg_saves ORDER BY id DESC LIMIT 500", ())
-            elif table_name == "indicator_formulas":
-                rows = execute_all(conn, "SELECT id, title, content, sort_order, created_at, updated_at FROM indicator_formulas ORDER BY sort_order, id LIMIT 500", ())
-            else:
-                rows = []
-        return {"items": rows or [], "table": table_name}
+        from db import get_conn, keyset_page, total_estimate
+
+        def _list_rows():
+            with get_conn() as conn:
+                next_after_value = None
+                if table_name == "indicator_formulas":
+                    rows, next_after_id = keyset_page(
+                        conn, table_name, ADMIN_TABLE_LIST_COLUMNS[table_name], after_id=after_id,
+                        page_size=page_size, descending=False, sort_column="sort_order", after_value=after_value,
+                    )
+                    if next_after_id is not None:
+                        next_after_value = rows[-1]["sort_order"]
+                else:
+                    rows, next_after_id = keyset_page(
+                        conn, table_name, ADMIN_TABLE_LIST_COLUMNS[table_name], after_id=after_id, page_size=page_size,
+                    )
+                total, exact = total_estimate(conn, table_name) if after_id is None else (None, False)
+            return {
+                "items": rows, "next_after_id": next_after_id, "next_after_value": next_after_value,
+                "total_estimate": total, "total_exact": exact,
+            }
+
+        page = await run_db(_list_rows)
+        return {"table": table_name, **page}
     except Exception as e:
         return JSONResponse(
             status_code=200,
-            content={"items": [], "table": table_name, "message": _db_error_message(e)},
+            content={"items": [], "table": table_name, "next_after_id": None, "message": _db_error_message(e)},
         )
 
 
@@ -527,8 +603,13 @@ async def api_admin_table_delete(request: Request, table_name: str, item_id: int
         raise HTTPException(status_code=400, detail="허용된 테이블이 아닙니다.")
     try:
         from db import get_conn, execute_update_delete
-        with get_conn() as conn:
-            n = execute_update_delete(conn, f"DELETE FROM {table_name} WHERE id = %s", (item_id,))
+
+        def _run():
+            with get_conn() as conn:
+                return execute_update_delete(conn, f"DELETE FROM {table_name} WHERE id = %s", (item_id,))
+
+        # 설문 저장은 일별 통계 롤업도 함께 갱신
+        n = await survey_store.delete_saved(item_id) if table_name == "survey_saves" else await run_db(_run)
         if n == 0:
             raise HTTPException(status_code=404, detail="항목을 찾을 수 없습니다.")
         return {"ok": True}
@@ -560,8 +641,12 @@ async def api_admin_survey_update(request: Request, item_id: int, body: AdminTit
         raise HTTPException(status_code=400, detail="title이 필요합니다.")
     try:
         from db import get_conn, execute_update_delete
-        with get_conn() as conn:
-            n = execute_update_delete(conn, "UPDATE survey_saves SET title = %s WHERE id = %s", (body.title.strip()[:512], item_id))
+
+        def _run():
+            with get_conn() as conn:
+                return execute_update_delete(conn, "UPDATE survey_saves SET title = %s WHERE id = %s", (body.title.strip()[:512], item_id))
+
+        n = await run_db(_run)
         if n == 0:
             raise HTTPException(status_code=404, detail="항목을 찾을 수 없습니다.")
         return {"ok": True, "title": body.title.strip()}
@@ -579,8 +664,12 @@ async def api_admin_chat_update(request: Request, item_id: int, body: AdminChatT
         raise HTTPException(status_code=400, detail="summary_title이 필요합니다.")
     try:
         from db import get_conn, execute_update_delete
-        with get_conn() as conn:
-            n = execute_update_delete(conn, "UPDATE chat_saves SET summary_title = %s WHERE id = %s", (body.summary_title.strip()[:512], item_id))
+
+        def _run():
+            with get_conn() as conn:
+                return execute_update_delete(conn, "UPDATE chat_saves SET summary_title = %s WHERE id = %s", (body.summary_title.strip()[:512], item_id))
+
+        n = await run_db(_run)
         if n == 0:
             raise HTTPException(status_code=404, detail="항목을 찾을 수 없습니다.")
         return {"ok": True, "summary_title": body.summary_title.strip()}
@@ -598,8 +687,12 @@ async def api_admin_eeg_update(request: Request, item_id: int, body: AdminTitleU
         raise HTTPException(status_code=400, detail="title이 필요합니다.")
     try:
         from db import get_conn, execute_update_delete
-        with get_conn() as conn:
-            n = execute_update_delete(conn, "UPDATE eeg_saves SET title = %s WHERE id = %s", (body.title.strip()[:512], item_id))
+
+        def _run():
+            with get_conn() as conn:
+                return execute_update_delete(conn, "UPDATE eeg_saves SET title = %s WHERE id = %s", (body.title.strip()[:512], item_id))
+
+        n = await run_db(_run)
         if n == 0:
             raise HTTPException(status_code=404, detail="항목을 찾을 수 없습니다.")
         return {"ok": True, "title": body.title.strip()}
@@ -614,11 +707,10 @@ async def api_admin_board_update(request: Request, item_id: int, body: AdminBoar
     """관리자: 게시판 항목 수정 저장."""
     _admin_only(request)
     try:
-        import board_storage
-        item = board_storage.get_item(item_id)
+        item = await board_store.get_item(item_id)
         if not item:
             raise HTTPException(status_code=404, detail="항목을 찾을 수 없습니다.")
-        updated = board_storage.update_item(item_id, title=body.title, content=body.content)
+        updated = await board_store.update_item(item_id, title=body.title, content=body.content)
         return updated
     except HTTPException:
         raise
@@ -639,8 +731,12 @@ async def api_admin_indicator_formula_get(request: Request, item_id: int):
     _admin_only(request)
     try:
         from db import get_conn, execute_one
-        with get_conn() as conn:
-            row = execute_one(conn, "SELECT id, title, content, sort_order, created_at, updated_at FROM indicator_formulas WHERE id = %s", (item_id,))
+
+        def _run():
+            with get_conn() as conn:
+                return execute_one(conn, "SELECT id, title, content, sort_order, created_at, updated_at FROM indicator_formulas WHERE id = %s", (item_id,))
+
+        row = await run_db(_run)
         if not row:
             raise HTTPException(status_code=404, detail="항목을 찾을 수 없습니다.")
         return row
@@ -663,8 +759,12 @@ async def api_admin_indicator_formula_create(request: Request, body: AdminIndica
         from datetime import datetime
         now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
         sort_order = body.sort_order if body.sort_order is not None else 0
-        with get_conn() as conn:
-            lid = execute_insert(conn, "INSERT INTO indicator_formulas (title, content, sort_order, created_at, updated_at) VALUES (%s, %s, %s, %s, %s)", (title[:256], content, sort_order, now, now))
+
+        def _insert():
+            with get_conn() as conn:
+                return execute_insert(conn, "INSERT INTO indicator_formulas (title, content, sort_order, created_at, updated_at) VALUES (%s, %s, %s, %s, %s)", (title[:256], content, sort_order, now, now))
+
+        lid = await run_db(_insert)
         return {"ok": True, "id": lid}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -700,15 +800,28 @@ async def api_admin_survey_diagnosis_list(
     date_from: Optional[str] = None,
     date_to: Optional[str] = None,
     q: Optional[str] = None,
+    user_email: Optional[str] = None,
+    after_id: Optional[int] = None,
+    page_size: Optional[int] = None,
+    page: int = 1,
 ):
-    """관리자: 설문 저장 목록 연월일 검색 조회. DB 미연결 시 200 + 빈 목록 + 안내 메시지."""
+    """
+    관리자: 설문 저장 목록 연월일·사용자 검색 조회 (keyset 페이지, q 제목 검색은 관련도순 page). DB 미연결 시 200 + 빈 목록 + 안내 메시지.
+    첫 페이지에는 통계도 포함: total_count, last_7_days_count, daily (survey_stats).
+    """
     _admin_only(request)
     try:
-        from survey_storage import list_saved_all
-        items = list_saved_all(date_from=date_from, date_to=date_to, q=q)
-        return {"items": items}
+        first_page = after_id is None and page <= 1
+        result = await survey_store.list_saved_page(
+            date_from=date_from, date_to=date_to, q=q, user_email=user_email,
+            after_id=after_id, page_size=page_size, with_total=False, page=page,
+        )
+        if first_page:
+            stats = await survey_store.get_survey_diagnosis_stats(date_from=date_from, date_to=date_to, q=q, user_email=user_email)
+            result.update(stats, total_estimate=stats["total_count"], total_exact=True)
+        return result
     except Exception as e:
-        return JSONResponse(status_code=200, content={"items": [], "message": _db_error_message(e)})
+        return JSONResponse(status_code=200, content={"items": [], "next_after_id": None, "message": _db_error_message(e)})
 
 
 @app.post("/api/admin/indicator-formulas/seed")
@@ -718,17 +831,21 @@ async def api_admin_indicator_formula_seed(request: Request):
     try:
         from db import get_conn, execute_one, execute_insert
         from datetime import datetime
-        with get_conn() as conn:
-            row = execute_one(conn, "SELECT id FROM indicator_formulas LIMIT 1", ())
-            if row:
-                return {"ok": True, "message": "이미 항목이 있습니다.", "id": row["id"]}
-            now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            lid = execute_insert(
-                conn,
-                "INSERT INTO indicator_formulas (title, content, sort_order, created_at, updated_at) VALUES (%s, %s, 0, %s, %s)",
-                ("지표 산출식 (기본)", INDICATOR_FORMULA_DEFAULT, now, now),
-            )
-        return {"ok": True, "id": lid, "message": "기본 내용이 삽입되었습니다."}
+
+        def _seed():
+            with get_conn() as conn:
+                row = execute_one(conn, "SELECT id FROM indicator_formulas LIMIT 1", ())
+                if row:
+                    return {"ok": True, "message": "이미 항목이 있습니다.", "id": row["id"]}
+                now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+                lid = execute_insert(
+                    conn,
+                    "INSERT INTO indicator_formulas (title, content, sort_order, created_at, updated_at) VALUES (%s, %s, 0, %s, %s)",
+                    ("지표 산출식 (기본)", INDICATOR_FORMULA_DEFAULT, now, now),
+                )
+            return {"ok": True, "id": lid, "message": "기본 내용이 삽입되었습니다."}
+
+        return await run_db(_seed)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -743,15 +860,19 @@ async def api_admin_indicator_formula_update(request: Request, item_id: int, bod
     try:
         from db import get_conn, execute_one, execute_update_delete
         from datetime import datetime
-        with get_conn() as conn:
-            row = execute_one(conn, "SELECT id, title, content, sort_order FROM indicator_formulas WHERE id = %s", (item_id,))
-            if not row:
-                raise HTTPException(status_code=404, detail="항목을 찾을 수 없습니다.")
-            now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            t = title if title is not None else (row.get("title") or "")
-            c = content if content is not None else (row.get("content") or "")
-            so = sort_order if sort_order is not None else (row.get("sort_order") or 0)
-            execute_update_delete(conn, "UPDATE indicator_formulas SET title = %s, content = %s, sort_order = %s, updated_at = %s WHERE id = %s", (t[:256], c, so, now, item_id))
+
+        def _update():
+            with get_conn() as conn:
+                row = execute_one(conn, "SELECT id, title, content, sort_order FROM indicator_formulas WHERE id = %s", (item_id,))
+                if not row:
+                    raise HTTPException(status_code=404, detail="항목을 찾을 수 없습니다.")
+                now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+                t = title if title is not None else (row.get("title") or "")
+                c = content if content is not None else (row.get("content") or "")
+                so = sort_order if sort_order is not None else (row.get("sort_order") or 0)
+                execute_update_delete(conn, "UPDATE indicator_formulas SET title = %s, content = %s, sort_order = %s, updated_at = %s WHERE id = %s", (t[:256], c, so, now, item_id))
+
+        await run_db(_update)
         return {"ok": True}
     except HTTPException:
         raise
@@ -763,6 +884,7 @@ class GeneratePdfRequest(BaseModel):
     responses: Dict[int, int]
     excluded_sequences: Optional[List[int]] = []
     ai_consultation_notes: Optional[List[str]] = None
+    eeg_seed: Optional[int] = None
 
 
 @app.post("/api/generate-pdf")
@@ -771,11 +893,14 @@ async def api_generate_pdf(body: GeneratePdfRequest):
     try:
         from pipeline import run_full_pipeline
         import time
-        result = run_full_pipeline(
+        # 채점·PDF 렌더링·파일 쓰기는 블로킹 CPU 작업이므로 CPU 스레드 풀에서 (DB 스레드를 잡지 않도록)
+        result = await run_cpu(
+            run_full_pipeline,
             responses=body.responses,
             exclude_sequences=body.excluded_sequences or [],
             output_pdf_name=f"sbi_report_{int(time.time())}.pdf",
             ai_consultation_notes=body.ai_consultation_notes,
+            eeg_seed=body.eeg_seed,
         )
         if not result.success or not result.pdf_path or not os.path.isfile(result.pdf_path):
             raise HTTPException(status_code=500, detail=result.error or "PDF 생성 실패")
@@ -797,13 +922,17 @@ async def api_consult(body: ConsultRequest):
     """질문 추천 선택 또는 자유 질문에 대한 RAG 기반 응답. 지식 DB 검색 + 진단 결과 컨텍스트로 답변 생성."""
     try:
         from knowledge_db import init_db, search_knowledge
-        init_db()
         query = (body.question or "").strip()
         if not query:
             raise HTTPException(status_code=400, detail="질문을 입력해 주세요.")
 
-        # RAG: 질문으로 지식 DB 검색 (TF-IDF 기반)
-        retrieved = search_knowledge(query, top_k=5)
+        # RAG: 질문으로 지식 DB 검색 (TF-IDF + 임베딩 하이브리드, 검색어 주변 발췌 포함).
+        # DB·색인 파일 접근은 블로킹이므로 DB 스레드 풀에서 (임베딩 색인이 없으면 백그라운드에서 만들고 어휘 검색만)
+        def _retrieve():
+            init_db()
+            return search_knowledge(query, top_k=5)
+
+        retrieved = await run_db(_retrieve)
         report = (body.report_context or {}).get("리포트") or {}
         domains = (body.report_context or {}).get("영역별_통합점수") or []
 
@@ -828,7 +957,7 @@ async def api_consult(body: ConsultRequest):
         if retrieved:
             parts.append("【참고 자료 기반 안내】")
             for i, row in enumerate(retrieved[:4], 1):
-                snippet = (row.content or "")[:280].replace("\n", " ")
+                snippet = (row.snippet or row.content or "")[:280].replace("\n", " ")
                 if snippet:
                     parts.append(f"{i}. {row.title or '제목 없음'}: {snippet}…")
             parts.append("아래 역량·뇌파 시각화 패널에서 통계와 도표를 함께 보시면 이해에 도움이 됩니다. 추가로 궁금한 점이 있으시면 편하게 질문해 주세요.")
@@ -844,7 +973,7 @@ async def api_consult(body: ConsultRequest):
 
         parts.append("앞으로도 창의·혁신·개방·공생의 마음으로 성장하시길 응원합니다.")
         answer = "\n\n".join(parts)
-        sources = [{"title": r.title, "url": r.url, "snippet": (r.content or "")[:200]} for r in retrieved[:5]]
+        sources = [{"title": r.title, "url": r.url, "snippet": (r.snippet or r.content or "")[:200]} for r in retrieved[:5]]
         return {"answer": answer, "sources": sources}
     except HTTPException:
         raise
@@ -866,8 +995,7 @@ async def api_chat_save(request: Request, body: ChatSaveRequest):
     if not user:
         raise HTTPException(status_code=401, detail="로그인이 필요합니다.")
     try:
-        from chat_storage import save_chat
-        out = save_chat(
+        out = await chat_store.save_chat(
             user_email=user.get("email", ""),
             messages=body.messages,
             ai_consultation_notes=body.ai_consultation_notes,
@@ -879,17 +1007,21 @@ async def api_chat_save(request: Request, body: ChatSaveRequest):
 
 
 @app.get("/api/chat-saved-list")
-async def api_chat_saved_list(request: Request, all_users: Optional[str] = None):
-    """저장된 요약 목록 (6개월 이내). DB 미연결 시 200 + 빈 목록 + 안내 메시지."""
+async def api_chat_saved_list(
+    request: Request,
+    all_users: Optional[str] = None,
+    after_id: Optional[int] = None,
+    page_size: Optional[int] = None,
+):
+    """저장된 요약 목록 (6개월 이내). 관리자 전체 목록은 keyset 페이지. DB 미연결 시 200 + 빈 목록 + 안내 메시지."""
     user = get_current_user(request)
     if not user:
         raise HTTPException(status_code=401, detail="로그인이 필요합니다.")
     try:
-        from chat_storage import list_saved, list_saved_all
         if is_admin(user) and all_users == "1":
-            items = list_saved_all()
-            return {"items": items, "retention_months": 6}
-        items = list_saved(user.get("email", ""))
+            page = await chat_store.list_saved_page(after_id=after_id, page_size=page_size, with_total=after_id is None)
+            return {**page, "retention_months": 6}
+        items = await chat_store.list_saved(user.get("email", ""))
         return {"items": items, "retention_months": 6}
     except Exception as e:
         return JSONResponse(
@@ -905,8 +1037,7 @@ async def api_chat_saved_get(request: Request, save_id: int):
     if not user:
         raise HTTPException(status_code=401, detail="로그인이 필요합니다.")
     try:
-        from chat_storage import get_saved
-        data = get_saved(
+        data = await chat_store.get_saved(
             user.get("email", ""),
             save_id,
             skip_user_check=is_admin(user),
@@ -940,8 +1071,7 @@ async def api_survey_save(request: Request, body: SurveySaveRequest):
         email = user.get("email", "")
         excluded = body.excluded_sequences or []
         if body.save_id:
-            from survey_storage import update_survey
-            out = update_survey(
+            out = await survey_store.update_survey(
                 save_id=body.save_id,
                 user_email=email,
                 responses=body.responses,
@@ -950,8 +1080,7 @@ async def api_survey_save(request: Request, body: SurveySaveRequest):
             )
             return {"saved_ok": True, **out}
         else:
-            from survey_storage import save_survey
-            out = save_survey(
+            out = await survey_store.save_survey(
                 user_email=email,
                 responses=body.responses,
                 required_sequences=body.required_sequences,
@@ -973,18 +1102,23 @@ async def api_survey_saved_list(
     all_users: Optional[str] = None,
     date_from: Optional[str] = None,
     date_to: Optional[str] = None,
+    after_id: Optional[int] = None,
+    page_size: Optional[int] = None,
+    page: int = 1,
 ):
-    """저장된 설문 목록 (6개월 이내). DB 미연결 시 200 + 빈 목록 + 안내 메시지."""
+    """저장된 설문 목록 (6개월 이내). 관리자 전체 목록은 keyset 페이지 (q 검색은 관련도순 page). DB 미연결 시 200 + 빈 목록 + 안내 메시지."""
     user = get_current_user(request)
     if not user:
         raise HTTPException(status_code=401, detail="로그인이 필요합니다.")
     try:
-        from survey_storage import list_saved, list_saved_all
         email = user.get("email", "")
         if is_admin(user) and (all_users == "1" or date_from or date_to):
-            items = list_saved_all(date_from=date_from, date_to=date_to, q=q)
-            return {"items": items, "retention_months": 6}
-        items = list_saved(email, q=q)
+            page = await survey_store.list_saved_page(
+                date_from=date_from, date_to=date_to, q=q,
+                after_id=after_id, page_size=page_size, with_total=after_id is None, page=page,
+            )
+            return {**page, "retention_months": 6}
+        items = await survey_store.list_saved(email, q=q)
         return {"items": items, "retention_months": 6}
     except Exception as e:
         return JSONResponse(
@@ -1000,8 +1134,7 @@ async def api_survey_saved_get(request: Request, save_id: int):
     if not user:
         raise HTTPException(status_code=401, detail="로그인이 필요합니다.")
     try:
-        from survey_storage import get_saved
-        data = get_saved(
+        data = await survey_store.get_saved(
             user.get("email", ""),
             save_id,
             skip_user_check=is_admin(user),
@@ -1029,25 +1162,27 @@ async def api_eeg_save(request: Request, body: EegSaveRequest):
     if not user:
         raise HTTPException(status_code=401, detail="로그인이 필요합니다.")
     try:
-        from eeg_storage import save_eeg
-        out = save_eeg(user.get("email", ""), body.data, title=body.title)
+        out = await eeg_store.save_eeg(user.get("email", ""), body.data, title=body.title)
         return {"saved_ok": True, **out}
     except Exception as e:
         raise HTTPException(status_code=503, detail=_db_error_message(e))
 
 
 @app.get("/api/eeg-saved-list")
-async def api_eeg_saved_list(request: Request, all_users: Optional[str] = None):
-    """저장된 뇌파 목록. DB 미연결 시 200 + 빈 목록 + 안내 메시지."""
+async def api_eeg_saved_list(
+    request: Request,
+    all_users: Optional[str] = None,
+    after_id: Optional[int] = None,
+    page_size: Optional[int] = None,
+):
+    """저장된 뇌파 목록. 관리자 전체 목록은 keyset 페이지. DB 미연결 시 200 + 빈 목록 + 안내 메시지."""
     user = get_current_user(request)
     if not user:
         raise HTTPException(status_code=401, detail="로그인이 필요합니다.")
     try:
-        from eeg_storage import list_saved, list_saved_all
         if is_admin(user) and all_users == "1":
-            items = list_saved_all()
-            return {"items": items}
-        items = list_saved(user.get("email", ""))
+            return await eeg_store.list_saved_page(after_id=after_id, page_size=page_size, with_total=after_id is None)
+        items = await eeg_store.list_saved(user.get("email", ""))
         return {"items": items}
     except Exception as e:
         return JSONResponse(status_code=200, content={"items": [], "message": _db_error_message(e)})
@@ -1060,8 +1195,7 @@ async def api_eeg_saved_get(request: Request, save_id: int):
     if not user:
         raise HTTPException(status_code=401, detail="로그인이 필요합니다.")
     try:
-        from eeg_storage import get_saved
-        data = get_saved(
+        data = await eeg_store.get_saved(
             user.get("email", ""),
             save_id,
             skip_user_check=is_admin(user),
@@ -1076,7 +1210,6 @@ async def api_eeg_saved_get(request: Request, save_id: int):
 
 
 # --- 게시판 및 자료실 (MySQL board 테이블, 로그인 필요) ---
-import board_storage
 
 
 def _db_error_message(e: Exception) -> str:
@@ -1107,12 +1240,20 @@ class BoardItemUpdate(BaseModel):
 
 
 @app.get("/api/board-list")
-async def api_board_list(request: Request, type: Optional[str] = None, q: Optional[str] = None):
-    """게시판·자료실 목록. DB 미연결 시 200 + 빈 목록 + 안내 메시지."""
+async def api_board_list(
+    request: Request,
+    type: Optional[str] = None,
+    q: Optional[str] = None,
+    page: int = 1,
+    page_size: Optional[int] = None,
+):
+    """게시판·자료실 목록. q 가 있으면 전문 검색 관련도순 페이지 (page, has_more). DB 미연결 시 200 + 빈 목록 + 안내 메시지."""
     if not get_current_user(request):
         raise HTTPException(status_code=401, detail="로그인이 필요합니다.")
     try:
-        items = board_storage.list_items(type_filter=type, q=q)
+        if q and q.strip():
+            return await board_store.search_items(q.strip(), type_filter=type, page=page, page_size=page_size)
+        items = await board_store.list_items(type_filter=type)
         return {"items": items}
     except Exception as e:
         return JSONResponse(status_code=200, content={"items": [], "message": _db_error_message(e)})
@@ -1124,7 +1265,7 @@ async def api_board_get(request: Request, item_id: int):
     if not get_current_user(request):
         raise HTTPException(status_code=401, detail="로그인이 필요합니다.")
     try:
-        item = board_storage.get_item(item_id)
+        item = await board_store.get_item(item_id)
     except Exception as e:
         raise HTTPException(status_code=503, detail=_db_error_message(e))
     if not item:
@@ -1140,7 +1281,7 @@ async def api_board_create(request: Request, body: BoardItemCreate):
     if body.type not in ("board", "resource"):
         raise HTTPException(status_code=400, detail="type은 board 또는 resource여야 합니다.")
     try:
-        item = board_storage.create_item(body.type, body.title, body.content or "")
+        item = await board_store.create_item(body.type, body.title, body.content or "")
         return item
     except Exception as e:
         raise HTTPException(status_code=503, detail=_db_error_message(e))
@@ -1152,7 +1293,7 @@ async def api_board_update(request: Request, item_id: int, body: BoardItemUpdate
     if not get_current_user(request):
         raise HTTPException(status_code=401, detail="로그인이 필요합니다.")
     try:
-        item = board_storage.update_item(item_id, title=body.title, content=body.content)
+        item = await board_store.update_item(item_id, title=body.title, content=body.content)
     except Exception as e:
         raise HTTPException(status_code=503, detail=_db_error_message(e))
     if not item:
@@ -1166,7 +1307,7 @@ async def api_board_delete(request: Request, item_id: int):
     if not get_current_user(request):
         raise HTTPException(status_code=401, detail="로그인이 필요합니다.")
     try:
-        ok = board_storage.delete_item(item_id)
+        ok = await board_store.delete_item(item_id)
     except Exception as e:
         raise HTTPException(status_code=503, detail=_db_error_message(e))
     if not ok:
@@ -1183,80 +1324,53 @@ async def survey_page():
     return FileResponse(path, media_type="text/html")
 
 
-@app.get("/health")
-async def health_check():
-    """시스템 상태 확인"""
-    validation = data_loader.validate_sequences()
-    return {
-        "status": "healthy",
-        "total_items": len(data_loader.items),
-        "validation": validation
-    }
+# 생존 확인(liveness) 응답: 카탈로그·DB를 전혀 건드리지 않음
+_LIVENESS_JSON = b'{"status":"ok"}'
 
 
-def _item_to_dict(item) -> dict:
-    return {
-        "전체순번": item.전체순번,
-        "영역": item.영역,
-        "하위역량": item.하위역량,
-        "하위요소": item.하위요소,
-        "문항보정": item.문항보정,
-        "예시문항": item.예시문항,
-    }
+def _cached_json(request: Request, body: bytes, etag: str) -> Response:
+    """미리 직렬화한 JSON 응답. If-None-Match 가 ETag 와 같으면 304 (본문 없음)."""
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+@app.get("/health/live")
+async def health_live():
+    """생존 확인 (프로세스 응답 여부만). 로드밸런서·모니터링 폴링용."""
+    return Response(content=_LIVENESS_JSON, media_type="application/json")
+
+
+@app.get("/health/ready")
+async def health_ready(request: Request):
+    """준비 상태 확인: 문항 카탈로그 로드·순번 검증 결과 (카탈로그 로드 시 계산해 둔 응답, ETag 지원)."""
+    payloads = get_item_payloads()
+    return _cached_json(request, payloads.health_json, payloads.health_etag)
+
+
+@app.get("/health")
+async def health_check(request: Request):
+    """시스템 상태 확인 (/health/ready 와 동일 응답)"""
+    return await health_ready(request)
 
 
 @app.get("/items")
-async def get_items(order: Optional[str] = "sequence", short: Optional[int] = 0):
+async def get_items(request: Request, order: Optional[str] = "sequence", short: Optional[int] = 0, seed: Optional[int] = None):
     """
     문항 목록 조회.
     - order: sequence(번호순, 기본) | random_domain(역량별 랜덤)
     - short: 0(전체) | 1(간편 설문: 하위요소당 2문항 랜덤)
+    - seed: 랜덤 추첨 시드 (간편 설문 응답에 seed 포함, 같은 seed로 같은 문항 재현)
+    번호순 전체 목록은 ETag 를 붙여 If-None-Match 일치 시 304 로 응답합니다.
     """
-    raw = list(data_loader.items)
+    payloads = get_item_payloads()
     if short == 1:
-        # 하위요소(영역+하위역량+하위요소)별로 그룹, 그룹당 2문항 랜덤
-        key_fn = lambda i: (i.영역, i.하위역량, i.하위요소)
-        groups: Dict[tuple, List] = {}
-        for item in raw:
-            k = key_fn(item)
-            if k not in groups:
-                groups[k] = []
-            groups[k].append(item)
-        chosen = []
-        for group_items in groups.values():
-            if len(group_items) <= 2:
-                chosen.extend(group_items)
-            else:
-                chosen.extend(random.sample(group_items, 2))
-        chosen.sort(key=lambda x: (x.영역, x.하위역량, x.하위요소, x.전체순번))
-        items_data = [_item_to_dict(i) for i in chosen]
-        required_sequences = [i["전체순번"] for i in items_data]
-        return {
-            "total_items": len(items_data),
-            "items": items_data,
-            "required_sequences": required_sequences,
-        }
+        # 하위요소(영역+하위역량+하위요소)별 그룹 표는 카탈로그 로드 시 미리 계산
+        return Response(content=payloads.short_json(seed), media_type="application/json")
     if order == "random_domain":
-        by_domain: Dict[str, List] = {}
-        for item in raw:
-            d = item.영역 or "기타"
-            if d not in by_domain:
-                by_domain[d] = []
-            by_domain[d].append(item)
-        domains = list(by_domain.keys())
-        random.shuffle(domains)
-        out = []
-        for d in domains:
-            lst = list(by_domain[d])
-            random.shuffle(lst)
-            out.extend(lst)
-        items_data = [_item_to_dict(i) for i in out]
-    else:
-        items_data = [_item_to_dict(i) for i in sorted(raw, key=lambda x: x.전체순번)]
-    return {
-        "total_items": len(items_data),
-        "items": items_data,
-    }
+        return Response(content=payloads.random_domain_json(seed), media_type="application/json")
+    return _cached_json(request, payloads.full_order_json, payloads.full_order_etag)
 
 
 @app.post("/submit-survey", response_model=SurveyResultResponse)
@@ -1268,11 +1382,11 @@ async def submit_survey(survey_response: SurveyResponse):
     - excluded_sequences: 제외할 문항 순번 리스트 (선택사항)
     """
     try:
-        # 점수 계산
-        result = scoring_engine.calculate_score(
-            responses=survey_response.responses,
-            excluded_sequences=survey_response.excluded_sequences
+        # 점수 계산 (같은 응답·제외 조합이면 캐시된 결과 사용)
+        _, detailed = cached_detailed_score(
+            get_shared_engine(), survey_response.responses, survey_response.excluded_sequences
         )
+        result = detailed.survey
         
         # 응답 형식 변환
         domain_scores_dict = []
@@ -1296,6 +1410,72 @@ async def submit_survey(survey_response: SurveyResponse):
         raise HTTPException(status_code=400, detail=f"점수 계산 중 오류 발생: {str(e)}")
 
 
+@app.post("/submit-survey/batch")
+async def submit_survey_batch(request: Request, body: SurveyBatchRequest):
+    """
+    여러 응답자의 설문을 한 번에 채점 (관리자 코호트 재분석용, 관리자만)
+
+    - responses: N×96 응답 행렬 (미응답 0, 최대 SURVEY_BATCH_MAX_ROWS 행)
+    - excluded_sequences: 행별 제외 순번 리스트 (선택사항)
+    - responses 를 생략하면 저장된 설문진단 중 date_from/date_to/q/user_email 조건에 맞는 행을 최신순으로
+      최대 SURVEY_BATCH_MAX_ROWS 건 채점 (행렬을 주고받지 않음). 응답에 저장 id 목록과 잘림 여부 포함
+    """
+    _admin_only(request)
+    engine = get_shared_engine()
+    plan = engine.plan
+    saved_ids = None
+    truncated = False
+    if body.responses is None:
+        if body.excluded_sequences is not None:
+            raise HTTPException(status_code=400, detail="저장된 설문진단 채점에는 excluded_sequences 를 쓸 수 없습니다 (저장된 제외 순번 사용).")
+        try:
+            saved_ids, matrix, excluded_mask, truncated = await survey_store.load_response_matrix(
+                plan.n_columns,
+                date_from=body.date_from, date_to=body.date_to, q=body.q, user_email=body.user_email,
+                limit=SURVEY_BATCH_MAX_ROWS,
+            )
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=f"저장된 설문진단 조회 중 오류 발생: {str(e)}")
+        n_rows = len(saved_ids)
+    else:
+        n_rows = len(body.responses)
+        if any(len(row) != plan.n_columns for row in body.responses):
+            raise HTTPException(status_code=400, detail=f"각 행은 {plan.n_columns}개 점수여야 합니다.")
+        if body.excluded_sequences is not None and len(body.excluded_sequences) != n_rows:
+            raise HTTPException(status_code=400, detail="excluded_sequences 행 수가 responses 와 다릅니다.")
+        matrix = excluded_mask = None
+    try:
+        import numpy as np
+
+        def _score():
+            if saved_ids is not None:
+                return engine.calculate_batch(matrix, excluded_mask)
+            raw = np.array(body.responses, dtype=np.int64).reshape(n_rows, plan.n_columns)
+            mask = plan.exclusion_mask(body.excluded_sequences) if body.excluded_sequences else None
+            return engine.calculate_batch(raw, mask)
+
+        # 행렬 변환·채점은 CPU 작업이므로 이벤트 루프 밖(CPU 스레드 풀)에서
+        result = await run_cpu(_score)
+        means = np.where(np.isnan(result.domain_means), None, result.domain_means)
+        out = {
+            "영역명": list(result.domain_names),
+            "영역별_평균점수": means.tolist(),
+            "영역별_문항수": result.item_counts.tolist(),
+            "전체평균": result.overall_means.tolist(),
+            "사용된_문항수": result.used_counts.tolist(),
+            "행수": n_rows,
+            "메시지": f"총 {n_rows}명 응답 일괄 채점 완료",
+        }
+        if saved_ids is not None:
+            out["저장_id"] = saved_ids
+            out["잘림"] = truncated
+            if truncated:
+                out["메시지"] += f" (조건에 맞는 행이 더 있어 최신 {n_rows}건만 채점)"
+        return out
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=f"일괄 채점 중 오류 발생: {str(e)}")
+
+
 @app.post("/analyze-combined", response_model=CombinedAnalysisResponse)
 async def analyze_combined(body: CombinedAnalysisRequest):
     """
@@ -1303,10 +1483,10 @@ async def analyze_combined(body: CombinedAnalysisRequest):
     brainwave를 생략하면 설문 점수만으로 종합 지수(0~100)를 반환합니다.
     """
     try:
-        survey_result = scoring_engine.calculate_score(
-            responses=body.responses,
-            excluded_sequences=body.excluded_sequences or [],
+        survey_key, detailed = cached_detailed_score(
+            get_shared_engine(), body.responses, body.excluded_sequences or []
         )
+        survey_result = detailed.survey
         brainwave = None
         if body.brainwave:
             brainwave = BrainWaveMetrics(
@@ -1317,11 +1497,15 @@ async def analyze_combined(body: CombinedAnalysisRequest):
                 engagement=body.brainwave.engagement,
                 focus=body.brainwave.focus,
             )
-        combined = run_combined_analysis(
-            survey_result,
-            brainwave=brainwave,
-            survey_weight=body.survey_weight,
-            eeg_weight=body.eeg_weight,
+        # 뇌파 입력은 요청에 직접 들어오므로 (가상 뇌파 아님) 항상 캐시 가능
+        combined = combined_cache.get_or_compute(
+            combined_key(survey_key, brainwave, survey_weight=body.survey_weight, eeg_weight=body.eeg_weight),
+            lambda: run_combined_analysis(
+                survey_result,
+                brainwave=brainwave,
+                survey_weight=body.survey_weight,
+                eeg_weight=body.eeg_weight,
+            ),
         )
         domain_dicts = [
             {
@@ -1348,19 +1532,26 @@ async def analyze_combined(body: CombinedAnalysisRequest):
 
 
 @app.post("/analyze-sbi", response_model=AnalyzeSBIResponse)
-async def analyze_sbi(body: AnalyzeSBIRequest):
+async def analyze_sbi(request: Request, body: AnalyzeSBIRequest):
     """
     설문 응답을 받으면 즉시 가상 뇌파 데이터를 매칭해
     영역별 가중치(S·E) 적용 통합 결과(JSON)를 반환합니다.
     설문-뇌파 차이 20% 이상 역량이 있으면 inconsistency_flag=True.
     """
     try:
-        survey_result = scoring_engine.calculate_score(
-            responses=body.responses,
-            excluded_sequences=body.excluded_sequences or [],
+        # 영역·하위역량 점수를 채점 엔진에서 한 번에 계산 (하위역량은 파일 순서)
+        survey_key, detailed = cached_detailed_score(
+            get_shared_engine(), body.responses, body.excluded_sequences or []
         )
-        eeg_metrics = MockEEGProvider().get_metrics()
-        combined = calculate_combined_sbi(survey_result, eeg_metrics)
+        survey_result = detailed.survey
+        # 가상 뇌파는 시드를 지정한 경우에만 재현 가능 → 그때만 통합·리포트 결과 캐시
+        eeg_seed = body.eeg_seed
+        if eeg_seed is None and body.eeg_session:
+            user = get_current_user(request) or {}
+            eeg_seed = session_seed(user.get("email") or "", body.eeg_session)
+        seeded = eeg_seed is not None
+        eeg_metrics = MockEEGProvider(seed=eeg_seed).get_metrics()
+        combined_key_, combined = cached_combined_sbi(survey_key, survey_result, eeg_metrics, cacheable=seeded)
 
         eeg_dict = {
             "motivation": eeg_metrics.motivation,
@@ -1368,25 +1559,10 @@ async def analyze_sbi(body: AnalyzeSBIRequest):
             "innovation": eeg_metrics.innovation,
             "responsibility": eeg_metrics.responsibility,
         }
-        excluded_set = set(body.excluded_sequences or [])
-        all_items = sorted(data_loader.items, key=lambda x: x.전체순번)
-        seen_sub = {}
-        order_sub = []
-        for it in all_items:
-            key = (it.하위역량 or "").strip()
-            if key and key not in seen_sub:
-                seen_sub[key] = True
-                order_sub.append(key)
-        하위역량별_점수 = []
-        for sub_name in order_sub:
-            group_items = [it for it in all_items if (it.하위역량 or "").strip() == sub_name and it.전체순번 not in excluded_set]
-            scores = [body.responses[it.전체순번] for it in group_items if it.전체순번 in body.responses and 1 <= body.responses[it.전체순번] <= 5]
-            if scores:
-                avg = sum(scores) / len(scores)
-                점수_0_100 = round((avg - 1) / 4 * 100, 1)
-            else:
-                점수_0_100 = None
-            하위역량별_점수.append({"하위역량": sub_name, "점수_0_100": 점수_0_100})
+        하위역량별_점수 = [
+            {"하위역량": sub.하위역량, "점수_0_100": sub.점수_0_100}
+            for sub in detailed.하위역량별점수
+        ]
         domain_dtos = [
             DomainCombinedScoreDto(
                 영역명=d.영역명,
@@ -1402,7 +1578,7 @@ async def analyze_sbi(body: AnalyzeSBIRequest):
         ]
 
         # concept.md 기반 리포트 생성 (지수 해석, 뇌교육 단계·BOS 처방, 불일치 해석)
-        report = generate_report(combined.영역별_통합점수, combined.inconsistency_flag)
+        report = cached_report(combined_key_, combined, cacheable=seeded)
         report_dict = report_to_dict(report)
 
         # 진단 점수 이하 시 1:1 상담 할인권 이메일 템플릿 생성 (블로그/유튜브 추천 + 할인코드)
@@ -1,6 +1,6 @@
 -- 회원 프로필 컬럼 추가 (기존 MySQL DB 적용용)
 -- 사용법: 이미 생성된 DB에서 실행. 컬럼이 이미 있으면 오류 나므로 한 번만 실행.
--- SQLite는 db.py 초기화 시 자동 반영됨.
+-- 서버는 첫 DB 연결 시 db_migrations.py 가 자동 반영함 (SQLite·PostgreSQL·MySQL 공통).
 
 ALTER TABLE users ADD COLUMN name VARCHAR(128) DEFAULT NULL;
 ALTER TABLE users ADD COLUMN gender VARCHAR(16) DEFAULT NULL;
@@ -6,9 +6,9 @@ from dataclasses import dataclass
 from typing import List, Dict, Optional
 
 
-@dataclass
+@dataclass(frozen=True)
 class SurveyItem:
-    """개별 설문 문항 데이터"""
+    """개별 설문 문항 데이터 (공유 카탈로그에서 재사용되므로 변경 불가)"""
     전체순번: int
     영역: str
     하위역량: str
@@ -37,6 +37,34 @@ class SurveyResult:
     제외된_순번: List[int]
 
 
+@dataclass
+class SubCompetencyScore:
+    """하위역량별 점수 (응답 문항이 없으면 점수는 None)"""
+    하위역량: str
+    평균점수: Optional[float]   # 1~5
+    점수_0_100: Optional[float]
+    문항수: int
+
+
+@dataclass
+class SubElementScore:
+    """하위요소(영역+하위역량+하위요소)별 점수 (응답 문항이 없으면 점수는 None)"""
+    영역: str
+    하위역량: str
+    하위요소: str
+    평균점수: Optional[float]   # 1~5
+    점수_0_100: Optional[float]
+    문항수: int
+
+
+@dataclass
+class DetailedSurveyResult:
+    """영역·하위역량·하위요소 점수를 한 번에 계산한 결과"""
+    survey: SurveyResult
+    하위역량별점수: List[SubCompetencyScore]   # 파일(전체순번) 순
+    하위요소별점수: List[SubElementScore]      # 파일(전체순번) 순
+
+
 class Domain:
     """4대 영역 클래스"""
     
@@ -315,6 +315,36 @@ def generate_sbi_pdf(
             ("ROWBACKGROUNDS", (0, 1), (-1, -1), [colors.white, colors.HexColor(_PURPLE_BG)]),
         ]))
         story.append(t)
+
+    # 하위역량별 점수 (채점 엔진에서 영역 점수와 함께 계산, 파일 순서)
+    sub_scores = combined_result.get("하위역량별_점수") or []
+    sub_data = [["하위역량", "점수(0~100)"]]
+    for sub in sub_scores:
+        if not sub or not sub.get("하위역량"):
+            continue
+        sc = sub.get("점수_0_100")
+        sub_data.append([str(sub["하위역량"])[:35], f"{sc:.1f}" if isinstance(sc, (int, float)) else "-"])
+    if len(sub_data) > 1:
+        story.append(Spacer(1, 6*mm))
+        story.append(Paragraph("하위역량별 설문 점수", heading_style))
+        st = Table(sub_data, colWidths=[105*mm, 40*mm])
+        st.setStyle(TableStyle([
+            ("BACKGROUND", (0, 0), (-1, 0), colors.HexColor(_PURPLE_DARK)),
+            ("TEXTCOLOR", (0, 0), (-1, 0), colors.white),
+            ("FONTNAME", (0, 0), (-1, -1), font_name),
+            ("FONTSIZE", (0, 0), (-1, 0), _TABLE_HEADER_FONTSIZE),
+            ("FONTSIZE", (0, 1), (-1, -1), _TABLE_BODY_FONTSIZE),
+            ("LEFTPADDING", (0, 0), (-1, -1), _TABLE_PADDING),
+            ("RIGHTPADDING", (0, 0), (-1, -1), _TABLE_PADDING),
+            ("TOPPADDING", (0, 0), (-1, -1), _TABLE_PADDING),
+            ("BOTTOMPADDING", (0, 0), (-1, -1), _TABLE_PADDING),
+            ("GRID", (0, 0), (-1, -1), 0.5, colors.HexColor(_PURPLE_LIGHT)),
+            ("VALIGN", (0, 0), (-1, -1), "MIDDLE"),
+            ("ALIGN", (0, 0), (0, -1), "LEFT"),
+            ("ALIGN", (1, 0), (1, -1), "CENTER"),
+            ("ROWBACKGROUNDS", (0, 1), (-1, -1), [colors.white, colors.HexColor(_PURPLE_BG)]),
+        ]))
+        story.append(st)
     story.append(Spacer(1, 8*mm))
     story.append(Paragraph("【AI 기반 역량 점수 시각화】 역량별 점수 막대 그래프", heading_style))
     story.append(Spacer(1, 4*mm))
@@ -26,20 +26,21 @@ def run_full_pipeline(
     output_pdf_name: Optional[str] = None,
     ai_consultation_notes: Optional[List[str]] = None,
     user_profile: Optional[Dict[str, Any]] = None,
+    eeg_seed: Optional[int] = None,
 ) -> PipelineResult:
     """
     설문 응답 -> 채점 -> 가상 뇌파 -> 통합 SBI -> 리포트 생성 -> DB 검색 -> PDF 생성.
     각 구간별 소요 시간(ms)과 에러를 기록해 반환.
+    eeg_seed: 가상 뇌파 시드. 지정하면 같은 입력의 통합 SBI·리포트 결과를 캐시에서 재사용.
     """
     out = PipelineResult(success=False, timings_ms={})
     t0 = time.perf_counter()
 
     try:
-        from data_loader import SurveyDataLoader
-        from scoring import ScoringEngine
+        from scoring import get_shared_engine
         from eeg_provider import MockEEGProvider
-        from analysis_engine import calculate_combined_sbi
-        from report_generator import generate_report, report_to_dict, _domain_to_key, augment_report_with_knowledge
+        from result_cache import cached_detailed_score, cached_combined_sbi, cached_report
+        from report_generator import report_to_dict, _domain_to_key, augment_report_with_knowledge
         from email_coupon import DOMAIN_SEARCH_KEYWORDS
         from knowledge_db import init_db, search_for_report, count
         from pdf_report import generate_sbi_pdf
@@ -52,9 +53,11 @@ def run_full_pipeline(
     # --- 1. 설문 채점 ---
     t1 = time.perf_counter()
     try:
-        loader = SurveyDataLoader()
-        scoring = ScoringEngine(loader)
-        survey_result = scoring.calculate_score(responses, excluded_sequences=exclude_sequences)
+        # 프로세스 공용 카탈로그·채점 엔진 재사용 (CSV 변경 시에만 다시 로드)
+        scoring = get_shared_engine()
+        loader = scoring.data_loader
+        survey_key, detailed = cached_detailed_score(scoring, responses, exclude_sequences)
+        survey_result = detailed.survey
     except Exception as e:
         out.error = f"Step 1 (설문 채점) 실패: {e}"
         out.timings_ms["1_survey_scoring"] = (time.perf_counter() - t1) * 1000
@@ -64,7 +67,7 @@ def run_full_pipeline(
     # --- 2. 가상 뇌파 생성 ---
     t2 = time.perf_counter()
     try:
-        eeg_metrics = MockEEGProvider().get_metrics()
+        eeg_metrics = MockEEGProvider(seed=eeg_seed).get_metrics()
     except Exception as e:
         out.error = f"Step 2 (가상 뇌파) 실패: {e}"
         out.timings_ms["2_mock_eeg"] = (time.perf_counter() - t2) * 1000
@@ -74,8 +77,11 @@ def run_full_pipeline(
     # --- 3. 통합 SBI + 리포트 ---
     t3 = time.perf_counter()
     try:
-        combined = calculate_combined_sbi(survey_result, eeg_metrics)
-        report = generate_report(combined.영역별_통합점수, combined.inconsistency_flag, user_profile=user_profile)
+        # 시드 없는 가상 뇌파는 매번 값이 달라 캐시하지 않음
+        seeded = eeg_seed is not None
+        combined_key, combined = cached_combined_sbi(survey_key, survey_result, eeg_metrics, cacheable=seeded)
+        report = cached_report(combined_key, combined, user_profile=user_profile, cacheable=seeded)
+        # report_to_dict 는 매번 새 dict 를 만들므로 아래 augment(in-place)가 캐시를 오염시키지 않음
         report_dict = report_to_dict(report)
     except Exception as e:
         out.error = f"Step 3 (통합 SBI/리포트) 실패: {e}"
@@ -104,6 +110,10 @@ def run_full_pipeline(
             for d in combined.영역별_통합점수
         ],
         "eeg_영역별": eeg_dict,
+        "하위역량별_점수": [
+            {"하위역량": sub.하위역량, "점수_0_100": sub.점수_0_100}
+            for sub in detailed.하위역량별점수
+        ],
     }
     out.combined_result = combined_result
     out.report_dict = report_dict
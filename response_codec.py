@@ -0,0 +1,159 @@
+"""
+설문 응답 이진 포맷 (survey_saves.responses_packed).
+JSON 문자열(responses_json 등 세 컬럼, 96문항 기준 약 1KB) 대신 한 컬럼에 75바이트로 저장.
+
+    [0]      포맷 버전 (1)
+    [1:3]    n: 순번 칸 수 (uint16 big-endian) = 응답·필수·제외 순번 중 최댓값
+    니블     ceil(n/2) 바이트. 순번 s 의 점수는 (s-1) 번째 니블 (짝수 = 상위 4비트), 0 = 미응답
+    필수     ceil(n/8) 바이트 비트마스크 (순번 s = 비트 s-1, 바이트 안에서는 상위 비트부터)
+    제외     ceil(n/8) 바이트 비트마스크
+
+- pack() 은 원래 값을 되돌릴 수 있을 때만 bytes, 아니면 None (JSON 저장 유지)
+  (점수 1~15 정수, 순번 1~65535, 필수·제외 목록에 중복 없음)
+- 필수·제외 순번은 집합으로 저장하므로 디코드하면 오름차순 (간편 설문의 영역별 순서는 유지하지 않음)
+  → survey_saves 는 JSON 컬럼을 함께 두고, roundtrips() 가 참인 행만 JSON 을 비움
+- PackedSurvey: 필요한 부분만 처음 접근할 때 디코드
+- decode_matrix(): 여러 행을 NumPy 로 한 번에 풀어 ScoringPlan.score_matrix 입력 행렬·제외 마스크로
+"""
+from functools import cached_property
+from typing import Dict, List, Optional, Sequence, Tuple
+
+FORMAT_VERSION = 1
+_HEADER = 3
+_MAX_SEQUENCE = 0xFFFF
+_MAX_SCORE = 0xF
+
+
+def _sections(n: int) -> Tuple[int, int]:
+    """(니블 구간 바이트 수, 비트마스크 구간 바이트 수)."""
+    return (n + 1) // 2, (n + 7) // 8
+
+
+def _is_unique(values: Sequence[int]) -> bool:
+    return len(set(values)) == len(values)
+
+
+def _bitmask(sequences: Sequence[int], size: int) -> bytearray:
+    mask = bytearray(size)
+    for seq in sequences:
+        mask[(seq - 1) >> 3] |= 0x80 >> ((seq - 1) & 7)
+    return mask
+
+
+def _from_bitmask(mask: bytes) -> List[int]:
+    return [i * 8 + bit + 1 for i, byte in enumerate(mask) if byte for bit in range(8) if byte & (0x80 >> bit)]
+
+
+def pack(
+    responses: Dict[int, int],
+    required_sequences: Sequence[int],
+    excluded_sequences: Optional[Sequence[int]] = None,
+) -> Optional[bytes]:
+    """응답·필수·제외 순번 → bytes. 손실 없이 표현할 수 없으면 None."""
+    excluded_sequences = list(excluded_sequences or [])
+    required_sequences = list(required_sequences)
+    for seq, score in responses.items():
+        if type(seq) is not int or type(score) is not int or not 1 <= score <= _MAX_SCORE:
+            return None
+    for seqs in (required_sequences, excluded_sequences):
+        if any(type(s) is not int for s in seqs) or not _is_unique(seqs):
+            return None
+    all_seqs = [*responses, *required_sequences, *excluded_sequences]
+    if any(not 1 <= s <= _MAX_SEQUENCE for s in all_seqs):
+        return None
+    n = max(all_seqs, default=0)
+    nibble_bytes, mask_bytes = _sections(n)
+    nibbles = bytearray(nibble_bytes)
+    for seq, score in responses.items():
+        i = seq - 1
+        nibbles[i >> 1] |= score << 4 if i % 2 == 0 else score
+    return (
+        bytes((FORMAT_VERSION,)) + n.to_bytes(2, "big") + bytes(nibbles)
+        + bytes(_bitmask(required_sequences, mask_bytes)) + bytes(_bitmask(excluded_sequences, mask_bytes))
+    )
+
+
+def _check(blob: bytes) -> int:
+    if len(blob) < _HEADER or blob[0] != FORMAT_VERSION:
+        raise ValueError(f"알 수 없는 응답 포맷: {bytes(blob[:1])!r}")
+    n = int.from_bytes(blob[1:3], "big")
+    nibble_bytes, mask_bytes = _sections(n)
+    if len(blob) != _HEADER + nibble_bytes + 2 * mask_bytes:
+        raise ValueError(f"응답 포맷 길이 불일치: {len(blob)}바이트 (n={n})")
+    return n
+
+
+class PackedSurvey:
+    """packed bytes 를 들고 있다가 responses / required_sequences / excluded_sequences 를 접근 시 디코드."""
+
+    def __init__(self, blob: bytes):
+        self.blob = bytes(blob)  # psycopg2 bytea 는 memoryview
+        self.n = _check(self.blob)
+
+    def _slice(self, section: int) -> bytes:
+        nibble_bytes, mask_bytes = _sections(self.n)
+        start = _HEADER + (0, nibble_bytes, nibble_bytes + mask_bytes)[section]
+        return self.blob[start:start + (nibble_bytes, mask_bytes, mask_bytes)[section]]
+
+    @cached_property
+    def responses(self) -> Dict[int, int]:
+        out: Dict[int, int] = {}
+        for i, byte in enumerate(self._slice(0)):
+            if byte >> 4:
+                out[2 * i + 1] = byte >> 4
+            if byte & 0xF:
+                out[2 * i + 2] = byte & 0xF
+        return out
+
+    @cached_property
+    def required_sequences(self) -> List[int]:
+        return _from_bitmask(self._slice(1))
+
+    @cached_property
+    def excluded_sequences(self) -> List[int]:
+        return _from_bitmask(self._slice(2))
+
+
+def unpack(blob: bytes) -> Tuple[Dict[int, int], List[int], List[int]]:
+    """bytes → (responses, required_sequences, excluded_sequences)."""
+    p = PackedSurvey(blob)
+    return p.responses, p.required_sequences, p.excluded_sequences
+
+
+def roundtrips(
+    blob: bytes,
+    responses: Dict[int, int],
+    required_sequences: Sequence[int],
+    excluded_sequences: Optional[Sequence[int]] = None,
+) -> bool:
+    """blob 을 디코드하면 순서까지 원래 값과 같은지 (JSON 컬럼을 비워도 되는지)."""
+    p = PackedSurvey(blob)
+    return (
+        p.responses == responses
+        and p.required_sequences == list(required_sequences)
+        and p.excluded_sequences == list(excluded_sequences or [])
+    )
+
+
+def decode_matrix(blobs: Sequence[bytes], n_columns: int):
+    """
+    여러 packed 행 → (N×n_columns int16 응답 행렬, N×n_columns bool 제외 마스크).
+    열 j = 전체순번 j+1, 미응답 0 (scoring.MISSING_SCORE). n_columns 를 넘는 순번은 버림.
+    """
+    import numpy as np
+
+    matrix = np.zeros((len(blobs), n_columns), dtype=np.int16)
+    excluded = np.zeros((len(blobs), n_columns), dtype=bool)
+    for row, blob in enumerate(blobs):
+        blob = bytes(blob)
+        n = _check(blob)
+        nibble_bytes, mask_bytes = _sections(n)
+        raw = np.frombuffer(blob, dtype=np.uint8, count=nibble_bytes, offset=_HEADER)
+        width = min(n, n_columns)
+        scores = np.empty(nibble_bytes * 2, dtype=np.int16)
+        scores[0::2] = raw >> 4
+        scores[1::2] = raw & 0xF
+        matrix[row, :width] = scores[:width]
+        ex = np.frombuffer(blob, dtype=np.uint8, count=mask_bytes, offset=_HEADER + nibble_bytes + mask_bytes)
+        excluded[row, :width] = np.unpackbits(ex)[:width].astype(bool)
+    return matrix, excluded
@@ -0,0 +1,188 @@
+"""
+분석 결과 메모이제이션 (같은 응답을 대시보드 탭마다 다시 보내는 경우 재계산 생략).
+- 키: 응답·제외 문항·가중치·뇌파 입력을 정렬한 JSON 의 sha256 (canonical fingerprint)
+- 크기 제한 LRU + TTL, 적중/미적중/퇴출 카운터
+- 채점(DetailedSurveyResult), calculate_combined_sbi, generate_report 결과를 각각 캐시
+- 가상 뇌파(MockEEGProvider)를 쓰는 요청은 시드를 명시했을 때만 통합·리포트 결과를 캐시
+  (시드가 없으면 매번 다른 뇌파 값이 나오므로 캐시해도 적중하지 않음)
+"""
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import asdict, is_dataclass, replace
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+# 캐시별 최대 항목 수 / 유효 시간(초). 0 이하이면 캐시 비활성화.
+RESULT_CACHE_SIZE = int(os.environ.get("SBI_RESULT_CACHE_SIZE", "512"))
+RESULT_CACHE_TTL_SECONDS = float(os.environ.get("SBI_RESULT_CACHE_TTL", "600"))
+
+_MISSING = object()
+
+
+def _canonical(value: Any) -> Any:
+    """fingerprint 용 정규화: dict 는 키 정렬 쌍 목록, dataclass 는 dict, 집합은 정렬 목록."""
+    if is_dataclass(value) and not isinstance(value, type):
+        return _canonical(asdict(value))
+    if isinstance(value, dict):
+        pairs = [(str(k) if not isinstance(k, int) else k, _canonical(v)) for k, v in value.items()]
+        return [[k, v] for k, v in sorted(pairs, key=lambda kv: (isinstance(kv[0], str), kv[0]))]
+    if isinstance(value, (set, frozenset)):
+        return sorted(_canonical(v) for v in value)
+    if isinstance(value, (list, tuple)):
+        return [_canonical(v) for v in value]
+    if isinstance(value, float) and value.is_integer():
+        # 5.0 과 5 를 같은 입력으로 취급 (JSON 에서 정수/실수가 섞여 들어옴)
+        return int(value)
+    return value
+
+
+def fingerprint(*parts: Any) -> str:
+    """입력 조합의 canonical 해시. 같은 의미의 입력이면 dict 순서·정수/실수 표기와 무관하게 같은 값."""
+    payload = json.dumps(_canonical(list(parts)), ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def normalize_exclusions(excluded: Optional[Iterable[int]]) -> Tuple[int, ...]:
+    """제외 순번: 중복 제거 후 정렬 (순서·중복이 달라도 같은 키)."""
+    return tuple(sorted(set(int(s) for s in (excluded or ()))))
+
+
+class ResultCache:
+    """스레드 안전 LRU + TTL 캐시."""
+
+    def __init__(self, name: str, maxsize: int = RESULT_CACHE_SIZE, ttl_seconds: float = RESULT_CACHE_TTL_SECONDS):
+        self.name = name
+        self.maxsize = maxsize
+        self.ttl_seconds = ttl_seconds
+        self._data: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.maxsize > 0 and self.ttl_seconds > 0
+
+    def get(self, key: str, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None:
+                expires_at, value = entry
+                if expires_at > time.monotonic():
+                    self._data.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._data[key]
+            self.misses += 1
+            return default
+
+    def put(self, key: str, value: Any) -> None:
+        if not self.enabled:
+            return
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl_seconds, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def get_or_compute(self, key: str, compute: Callable[[], Any], cacheable: bool = True) -> Any:
+        """캐시에 있으면 반환, 없으면 compute() 후 저장. cacheable=False 이면 조회·저장 없이 계산만."""
+        if not cacheable or not self.enabled:
+            return compute()
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            value = compute()
+            self.put(key, value)
+        return value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "name": self.name,
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": round(self.hits / total, 4) if total else 0.0,
+            }
+
+
+# 결과는 호출자가 읽기만 함 (응답 변환 시 새 dict 생성). 캐시된 객체를 직접 수정하지 말 것.
+score_cache = ResultCache("survey_score")
+combined_cache = ResultCache("combined_sbi")
+report_cache = ResultCache("report")
+
+ALL_CACHES = (score_cache, combined_cache, report_cache)
+
+
+def survey_key(engine, responses: Dict[int, int], excluded: Optional[Iterable[int]] = None) -> str:
+    """채점 키: 카탈로그(CSV 해시) + 응답 + 제외 순번. CSV 가 바뀌면 키도 바뀜."""
+    loader = engine.data_loader
+    catalog = getattr(loader, "source_sha256", None) or loader.csv_path
+    return fingerprint("survey", catalog, {int(k): v for k, v in responses.items()}, normalize_exclusions(excluded))
+
+
+def cached_detailed_score(engine, responses: Dict[int, int], excluded: Optional[Iterable[int]] = None):
+    """
+    (survey_key, DetailedSurveyResult). 같은 응답·제외 조합이면 재채점 생략.
+    키·캐시 값은 정규화한 제외 목록으로 만들고, 결과의 제외_순번은 호출자 목록을 정렬한 값 (캐시 없을 때와 같은 응답).
+    """
+    excluded = list(excluded or [])
+    normalized = normalize_exclusions(excluded)
+    key = survey_key(engine, responses, normalized)
+    detailed = score_cache.get_or_compute(
+        key, lambda: engine.calculate_detailed(responses, excluded_sequences=list(normalized))
+    )
+    requested = sorted(excluded)
+    if detailed.survey.제외된_순번 != requested:
+        # 점수는 같고 표시용 목록만 다름 (중복 순번 등): 캐시 값은 그대로 두고 얕은 복사본으로
+        detailed = replace(detailed, survey=replace(detailed.survey, 제외된_순번=requested))
+    return key, detailed
+
+
+def combined_key(survey_key_: str, eeg_inputs: Any, **weights: Any) -> str:
+    return fingerprint("combined", survey_key_, eeg_inputs, weights)
+
+
+def cached_combined_sbi(survey_key_: str, survey_result, eeg_metrics, cacheable: bool = True):
+    """(combined_key, CombinedSBIResult). cacheable=False 이면 (시드 없는 가상 뇌파) 매번 계산."""
+    from analysis_engine import calculate_combined_sbi
+
+    key = combined_key(survey_key_, eeg_metrics)
+    combined = combined_cache.get_or_compute(
+        key, lambda: calculate_combined_sbi(survey_result, eeg_metrics), cacheable=cacheable
+    )
+    return key, combined
+
+
+def cached_report(combined_key_: str, combined, user_profile: Optional[Dict[str, Any]] = None, cacheable: bool = True):
+    """SBIReport. 같은 통합 결과 + 사용자 프로필이면 리포트 재생성 생략."""
+    from report_generator import generate_report
+
+    key = fingerprint("report", combined_key_, user_profile or {})
+    return report_cache.get_or_compute(
+        key,
+        lambda: generate_report(combined.영역별_통합점수, combined.inconsistency_flag, user_profile=user_profile),
+        cacheable=cacheable,
+    )
+
+
+def cache_stats() -> Dict[str, Any]:
+    return {c.name: c.stats() for c in ALL_CACHES}
+
+
+def clear_all() -> None:
+    for c in ALL_CACHES:
+        c.clear()
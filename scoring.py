@@ -2,9 +2,15 @@
 채점 로직 모듈
 결과는 파일의 영역 순(창업공감 → 위기감수 → 두뇌활용 → 주체적)으로 정렬해 반환합니다.
 """
-from typing import List, Dict, Optional
-from models import SurveyItem, DomainScore, SurveyResult, Domain
-from data_loader import SurveyDataLoader
+from dataclasses import dataclass
+from functools import cached_property
+from typing import Any, List, Dict, Optional, Sequence, Tuple
+from models import (
+    SurveyItem, DomainScore, SurveyResult, Domain,
+    SubCompetencyScore, SubElementScore, DetailedSurveyResult,
+)
+import threading
+from data_loader import SurveyDataLoader, get_shared_loader
 
 # 영역 제시 순서 (리포트·PDF와 동일)
 DOMAIN_ORDER = [
@@ -14,6 +20,9 @@ DOMAIN_ORDER = [
     "주체적책임 및 창업의식 역량",
 ]
 
+# 배치 채점 응답 행렬의 미응답 표시값 (1~5 범위 밖의 값은 모두 미응답으로 처리)
+MISSING_SCORE = 0
+
 
 def _domain_sort_key(영역명: str) -> int:
     """영역명에 해당하는 DOMAIN_ORDER 인덱스 반환 (정렬용)."""
@@ -32,6 +41,255 @@ def _domain_sort_key(영역명: str) -> int:
     return 999
 
 
+def _avg_and_0_100(total: int, count: int) -> Tuple[Optional[float], Optional[float]]:
+    """합·개수 → (평균 1~5 소수 2자리, 0~100 정규화 소수 1자리). 개수 0이면 (None, None)."""
+    if not count:
+        return None, None
+    avg = total / count
+    return round(avg, 2), round((avg - 1) / 4 * 100, 1)
+
+
+@dataclass(frozen=True)
+class ScoringPlan:
+    """
+    문항 목록에서 한 번만 만들어 두는 채점 계획.
+    요청마다 영역 목록·필터 리스트를 다시 만들지 않고, 응답 딕셔너리를 한 번 훑어 점수를 계산합니다.
+    """
+    domain_names: Tuple[str, ...]                 # 결과 제시 순서의 영역명
+    item_sequences: Tuple[int, ...]               # 문항 순서(전체순번 순)의 전체순번
+    item_domain_idx: Tuple[int, ...]              # item_sequences 와 같은 순서의 영역 인덱스
+    seq_to_domain: Tuple[int, ...]                # 전체순번 → 영역 인덱스 (-1: 해당 문항 없음)
+    domain_sequences: Tuple[Tuple[int, ...], ...]  # 영역별 전체순번 (영역 인덱스 순)
+    sub_names: Tuple[str, ...] = ()               # 하위역량명 (전체순번 기준 첫 등장 순)
+    item_sub_idx: Tuple[int, ...] = ()            # item_sequences 와 같은 순서의 하위역량 인덱스 (-1: 없음)
+    element_keys: Tuple[Tuple[str, str, str], ...] = ()  # (영역, 하위역량, 하위요소) 첫 등장 순
+    item_element_idx: Tuple[int, ...] = ()        # item_sequences 와 같은 순서의 하위요소 인덱스
+
+    @classmethod
+    def from_items(cls, items: Sequence[SurveyItem]) -> "ScoringPlan":
+        """SurveyDataLoader.items 로부터 채점 계획 생성."""
+        # 기존 로직과 동일: 영역명 정렬 후 DOMAIN_ORDER 기준 안정 정렬
+        names = sorted(set(item.영역 for item in items))
+        names.sort(key=_domain_sort_key)
+        index_of = {name: i for i, name in enumerate(names)}
+
+        item_sequences = tuple(item.전체순번 for item in items)
+        item_domain_idx = tuple(index_of[item.영역] for item in items)
+
+        max_seq = max(item_sequences) if item_sequences else 0
+        seq_to_domain = [-1] * (max_seq + 1)
+        domain_sequences: List[List[int]] = [[] for _ in names]
+        for seq, d in zip(item_sequences, item_domain_idx):
+            if seq >= 0:
+                seq_to_domain[seq] = d
+            domain_sequences[d].append(seq)
+
+        # 하위역량·하위요소: 전체순번 순으로 처음 등장하는 순서
+        sub_index: Dict[str, int] = {}
+        element_index: Dict[Tuple[str, str, str], int] = {}
+        for item in sorted(items, key=lambda x: x.전체순번):
+            sub = (item.하위역량 or "").strip()
+            if sub and sub not in sub_index:
+                sub_index[sub] = len(sub_index)
+            key = (item.영역, item.하위역량, item.하위요소)
+            if key not in element_index:
+                element_index[key] = len(element_index)
+        item_sub_idx = tuple(sub_index.get((item.하위역량 or "").strip(), -1) for item in items)
+        item_element_idx = tuple(element_index[(item.영역, item.하위역량, item.하위요소)] for item in items)
+
+        return cls(
+            domain_names=tuple(names),
+            item_sequences=item_sequences,
+            item_domain_idx=item_domain_idx,
+            seq_to_domain=tuple(seq_to_domain),
+            domain_sequences=tuple(tuple(seqs) for seqs in domain_sequences),
+            sub_names=tuple(sub_index),
+            item_sub_idx=item_sub_idx,
+            element_keys=tuple(element_index),
+            item_element_idx=item_element_idx,
+        )
+
+    def _score_items(
+        self,
+        responses: Dict[int, int],
+        excluded_sequences: Optional[List[int]],
+        details: Optional[Tuple[List[int], List[int], List[int], List[int]]] = None,
+    ) -> SurveyResult:
+        """
+        score()·score_detailed() 공용: 문항 순서대로 한 번 훑어 SurveyResult 산출.
+        details=(하위역량 합, 하위역량 개수, 하위요소 합, 하위요소 개수) 를 주면 같은 순회에서 함께 누적.
+        """
+        if excluded_sequences is None:
+            excluded_sequences = []
+        excluded_set = set(excluded_sequences)
+
+        n_domains = len(self.domain_names)
+        sums = [0] * n_domains
+        included: List[List[int]] = [[] for _ in range(n_domains)]
+        total = 0
+        used = 0
+        if details is not None:
+            sub_sums, sub_counts, el_sums, el_counts = details
+
+        for i, (seq, d) in enumerate(zip(self.item_sequences, self.item_domain_idx)):
+            if seq in excluded_set:
+                continue
+            score = responses.get(seq)
+            if score is None:
+                continue
+            # 1~5점 범위 검증
+            if 1 <= score <= 5:
+                sums[d] += score
+                included[d].append(seq)
+                total += score
+                used += 1
+                if details is not None:
+                    sub = self.item_sub_idx[i]
+                    if sub >= 0:
+                        sub_sums[sub] += score
+                        sub_counts[sub] += 1
+                    el = self.item_element_idx[i]
+                    el_sums[el] += score
+                    el_counts[el] += 1
+
+        domain_scores = [
+            DomainScore(
+                영역명=self.domain_names[d],
+                평균점수=round(sums[d] / len(included[d]), 2),
+                문항수=len(included[d]),
+                포함된_순번=included[d],
+            )
+            for d in range(n_domains)
+            if included[d]
+        ]
+
+        return SurveyResult(
+            전체평균=round(total / used, 2) if used else 0.0,
+            영역별점수=domain_scores,
+            사용된_문항수=used,
+            제외된_순번=sorted(excluded_sequences),
+        )
+
+    def score(
+        self,
+        responses: Dict[int, int],
+        excluded_sequences: Optional[List[int]] = None,
+    ) -> SurveyResult:
+        """응답 딕셔너리 한 건을 문항 순서대로 한 번 훑어 SurveyResult 산출."""
+        return self._score_items(responses, excluded_sequences)
+
+    def score_detailed(
+        self,
+        responses: Dict[int, int],
+        excluded_sequences: Optional[List[int]] = None,
+    ) -> DetailedSurveyResult:
+        """영역·하위역량·하위요소 점수를 문항 한 번 순회로 함께 산출 (영역 점수는 score() 와 같은 경로)."""
+        sub_sums = [0] * len(self.sub_names)
+        sub_counts = [0] * len(self.sub_names)
+        el_sums = [0] * len(self.element_keys)
+        el_counts = [0] * len(self.element_keys)
+        survey = self._score_items(responses, excluded_sequences, (sub_sums, sub_counts, el_sums, el_counts))
+        subs = []
+        for i, name in enumerate(self.sub_names):
+            avg, norm = _avg_and_0_100(sub_sums[i], sub_counts[i])
+            subs.append(SubCompetencyScore(하위역량=name, 평균점수=avg, 점수_0_100=norm, 문항수=sub_counts[i]))
+        elements = []
+        for i, (영역, 하위역량, 하위요소) in enumerate(self.element_keys):
+            avg, norm = _avg_and_0_100(el_sums[i], el_counts[i])
+            elements.append(SubElementScore(
+                영역=영역, 하위역량=하위역량, 하위요소=하위요소,
+                평균점수=avg, 점수_0_100=norm, 문항수=el_counts[i],
+            ))
+        return DetailedSurveyResult(survey=survey, 하위역량별점수=subs, 하위요소별점수=elements)
+
+    @property
+    def n_columns(self) -> int:
+        """배치 응답 행렬의 열 수 (열 j = 전체순번 j+1)."""
+        return len(self.seq_to_domain) - 1
+
+    @cached_property
+    def _batch_arrays(self):
+        """배치 채점용 NumPy 배열 (문항→열 인덱스, 문항×영역 원핫, 반올림 표)."""
+        import numpy as np
+
+        item_cols = np.array([seq - 1 for seq in self.item_sequences], dtype=np.intp)
+        onehot = np.zeros((len(self.item_sequences), len(self.domain_names)), dtype=np.int64)
+        onehot[np.arange(len(self.item_domain_idx)), list(self.item_domain_idx)] = 1
+        # round(합/개수, 2) 를 (개수, 합) 표로 미리 계산: np.round 는 파이썬 round 와 결과가 다를 수 있음
+        max_count = len(self.item_sequences)
+        table = np.full((max_count + 1, 5 * max_count + 1), np.nan)
+        for c in range(1, max_count + 1):
+            for total in range(c, 5 * c + 1):
+                table[c, total] = round(total / c, 2)
+        return item_cols, onehot, table
+
+    def to_matrix(self, responses_list: Sequence[Dict[int, int]]):
+        """응답 딕셔너리 리스트 → N×n_columns 응답 행렬 (미응답 MISSING_SCORE)."""
+        import numpy as np
+
+        matrix = np.full((len(responses_list), self.n_columns), MISSING_SCORE, dtype=np.int16)
+        for i, responses in enumerate(responses_list):
+            for seq, score in responses.items():
+                if 1 <= seq <= self.n_columns and 1 <= score <= 5:
+                    matrix[i, seq - 1] = score
+        return matrix
+
+    def exclusion_mask(self, excluded_list: Sequence[Optional[Sequence[int]]]):
+        """행별 제외 순번 리스트 → N×n_columns bool 마스크 (True: 제외)."""
+        import numpy as np
+
+        mask = np.zeros((len(excluded_list), self.n_columns), dtype=bool)
+        for i, excluded in enumerate(excluded_list):
+            cols = [seq - 1 for seq in (excluded or []) if 1 <= seq <= self.n_columns]
+            mask[i, cols] = True
+        return mask
+
+    def score_matrix(self, matrix, excluded_mask=None) -> "BatchScoreResult":
+        """
+        N×n_columns 응답 행렬을 한 번에 채점 (행별 score() 와 동일한 결과).
+
+        Args:
+            matrix: 정수 응답 행렬. 열 j = 전체순번 j+1, 1~5 밖의 값(MISSING_SCORE 등)은 미응답
+            excluded_mask: 같은 모양의 bool 마스크 (True: 해당 행에서 제외). None이면 제외 없음
+        """
+        import numpy as np
+
+        item_cols, onehot, table = self._batch_arrays
+        m = np.asarray(matrix)
+        if m.ndim != 2 or m.shape[1] != self.n_columns:
+            raise ValueError(f"응답 행렬은 N×{self.n_columns} 이어야 합니다: {m.shape}")
+        values = m[:, item_cols].astype(np.int64)
+        valid = (values >= 1) & (values <= 5)
+        if excluded_mask is not None:
+            mask = np.asarray(excluded_mask, dtype=bool)
+            if mask.shape != m.shape:
+                raise ValueError(f"제외 마스크 모양이 응답 행렬과 다릅니다: {mask.shape} != {m.shape}")
+            valid &= ~mask[:, item_cols]
+
+        counts = valid.astype(np.int64) @ onehot
+        sums = np.where(valid, values, 0) @ onehot
+        used = counts.sum(axis=1)
+        overall = table[used, sums.sum(axis=1)]
+        overall[used == 0] = 0.0
+        return BatchScoreResult(
+            domain_names=self.domain_names,
+            domain_means=table[counts, sums],
+            item_counts=counts,
+            overall_means=overall,
+            used_counts=used,
+        )
+
+
+@dataclass
+class BatchScoreResult:
+    """배치 채점 결과 (행 = 응답자, 열 = domain_names 순서의 영역)"""
+    domain_names: Tuple[str, ...]
+    domain_means: Any      # N×영역 float 배열, 응답 문항이 없는 영역은 NaN
+    item_counts: Any       # N×영역 int 배열
+    overall_means: Any     # N float 배열 (응답 없음: 0.0)
+    used_counts: Any       # N int 배열 (사용된 문항수)
+
+
 class ScoringEngine:
     """채점 엔진"""
     
@@ -41,6 +299,7 @@ class ScoringEngine:
             data_loader: SurveyDataLoader 인스턴스
         """
         self.data_loader = data_loader
+        self.plan = ScoringPlan.from_items(data_loader.items)
     
     def calculate_score(
         self, 
@@ -57,65 +316,7 @@ class ScoringEngine:
         Returns:
             SurveyResult: 계산된 점수 결과
         """
-        if excluded_sequences is None:
-            excluded_sequences = []
-        
-        # 제외할 순번 집합
-        excluded_set = set(excluded_sequences)
-        
-        # 필터링된 문항들
-        filtered_items = [
-            item for item in self.data_loader.items
-            if item.전체순번 not in excluded_set
-        ]
-        
-        # 각 영역별 점수 계산
-        domain_scores = []
-        all_scores = []
-        
-        # 실제 데이터에서 영역명 가져오기 (동적)
-        actual_domains = sorted(set(item.영역 for item in filtered_items))
-        
-        for domain_name in actual_domains:
-            domain_items = [
-                item for item in filtered_items
-                if item.영역 == domain_name
-            ]
-            
-            domain_item_scores = []
-            included_sequences = []
-            
-            for item in domain_items:
-                if item.전체순번 in responses:
-                    score = responses[item.전체순번]
-                    # 1~5점 범위 검증
-                    if 1 <= score <= 5:
-                        domain_item_scores.append(score)
-                        included_sequences.append(item.전체순번)
-                        all_scores.append(score)
-            
-            if len(domain_item_scores) > 0:
-                avg_score = sum(domain_item_scores) / len(domain_item_scores)
-                domain_score = DomainScore(
-                    영역명=domain_name,
-                    평균점수=round(avg_score, 2),
-                    문항수=len(domain_item_scores),
-                    포함된_순번=included_sequences
-                )
-                domain_scores.append(domain_score)
-
-        # 파일의 영역 순으로 정렬
-        domain_scores.sort(key=lambda d: _domain_sort_key(d.영역명))
-        
-        # 전체 평균 계산
-        overall_avg = round(sum(all_scores) / len(all_scores), 2) if all_scores else 0.0
-        
-        return SurveyResult(
-            전체평균=overall_avg,
-            영역별점수=domain_scores,
-            사용된_문항수=len(all_scores),
-            제외된_순번=sorted(excluded_sequences)
-        )
+        return self.plan.score(responses, excluded_sequences)
     
     def get_filtered_score(
         self,
@@ -133,6 +334,36 @@ class ScoringEngine:
             SurveyResult: 계산된 점수 결과
         """
         return self.calculate_score(responses, excluded_sequences=excluded_sequences)
+
+    def calculate_detailed(
+        self,
+        responses: Dict[int, int],
+        excluded_sequences: Optional[List[int]] = None,
+    ) -> DetailedSurveyResult:
+        """
+        영역·하위역량·하위요소 점수를 함께 계산
+
+        Args:
+            responses: {전체순번: 점수(1~5)} 형태의 응답 딕셔너리
+            excluded_sequences: 제외할 문항 순번 리스트 (None이면 전체 사용)
+
+        Returns:
+            DetailedSurveyResult: survey(calculate_score 와 동일), 하위역량별·하위요소별 점수
+        """
+        return self.plan.score_detailed(responses, excluded_sequences)
+
+    def calculate_batch(self, matrix, excluded_mask=None) -> BatchScoreResult:
+        """
+        여러 응답자를 한 번에 채점 (코호트 재분석용)
+
+        Args:
+            matrix: N×96 응답 행렬 (열 j = 전체순번 j+1, 미응답 MISSING_SCORE)
+            excluded_mask: N×96 bool 제외 마스크 (None이면 제외 없음)
+
+        Returns:
+            BatchScoreResult: 영역별 평균·문항수, 전체 평균
+        """
+        return self.plan.score_matrix(matrix, excluded_mask)
     
     def calculate_with_test_data(
         self,
@@ -154,3 +385,25 @@ class ScoringEngine:
         }
         
         return self.calculate_score(responses, excluded_sequences)
+
+
+_shared_engine_lock = threading.Lock()
+_shared_engines: Dict[str, ScoringEngine] = {}
+
+
+def get_shared_engine(csv_path: Optional[str] = None) -> ScoringEngine:
+    """
+    공유 카탈로그(get_shared_loader)에 묶인 프로세스 공용 ScoringEngine 반환.
+    CSV가 바뀌어 카탈로그가 다시 로드되면 채점 계획도 새로 만듭니다.
+    """
+    loader = get_shared_loader(csv_path)
+    key = loader.csv_path
+    engine = _shared_engines.get(key)
+    if engine is not None and engine.data_loader is loader:
+        return engine
+    with _shared_engine_lock:
+        engine = _shared_engines.get(key)
+        if engine is None or engine.data_loader is not loader:
+            engine = ScoringEngine(loader)
+            _shared_engines[key] = engine
+        return engine
@@ -1,5 +1,8 @@
 -- Startup Brain Index - PostgreSQL (Supabase) 테이블
 -- 사용법: Supabase Dashboard → SQL Editor에서 본 스크립트 실행
+-- 참고용 최종 스키마: db_migrations.py 의 마이그레이션을 모두 적용한 결과와 같은 구조.
+-- 앱은 연결 시 db_migrations 로 자동 적용하므로 이 파일은 문서·수동 설치용.
+-- 스키마를 바꿀 때는 db_migrations.MIGRATIONS 에 새 번호를 추가하고 이 파일도 맞춰 갱신 (test_db_migrations 가 컬럼 비교).
 
 -- 1) 회원
 CREATE TABLE IF NOT EXISTS users (
@@ -30,12 +33,19 @@ CREATE TABLE IF NOT EXISTS survey_saves (
     responses_json TEXT NOT NULL,
     required_sequences_json TEXT NOT NULL,
     excluded_sequences_json TEXT,
+    responses_packed BYTEA,
     created_at VARCHAR(32) NOT NULL
 );
 CREATE INDEX IF NOT EXISTS idx_survey_user ON survey_saves(user_email);
 CREATE INDEX IF NOT EXISTS idx_survey_created ON survey_saves(created_at);
 CREATE INDEX IF NOT EXISTS idx_survey_title ON survey_saves(title);
 
+-- 설문 저장 일별 건수 롤업 (관리자 통계, survey_stats.py)
+CREATE TABLE IF NOT EXISTS survey_daily_stats (
+    day VARCHAR(10) NOT NULL PRIMARY KEY,
+    saves INTEGER NOT NULL DEFAULT 0
+);
+
 -- 3) 대화/상담 저장
 CREATE TABLE IF NOT EXISTS chat_saves (
     id SERIAL PRIMARY KEY,
@@ -80,3 +90,15 @@ CREATE TABLE IF NOT EXISTS indicator_formulas (
     updated_at VARCHAR(32) NOT NULL
 );
 CREATE INDEX IF NOT EXISTS idx_indicator_sort ON indicator_formulas(sort_order);
+
+-- 전문 검색 (마이그레이션 4): tsvector 생성 컬럼 + GIN, pg_trgm 은 권한이 있을 때만
+ALTER TABLE board ADD COLUMN IF NOT EXISTS search_tsv tsvector GENERATED ALWAYS AS
+    (to_tsvector('simple', coalesce(title, '') || ' ' || coalesce(content, ''))) STORED;
+CREATE INDEX IF NOT EXISTS idx_board_search_tsv ON board USING gin (search_tsv);
+ALTER TABLE survey_saves ADD COLUMN IF NOT EXISTS search_tsv tsvector GENERATED ALWAYS AS
+    (to_tsvector('simple', coalesce(title, ''))) STORED;
+CREATE INDEX IF NOT EXISTS idx_survey_search_tsv ON survey_saves USING gin (search_tsv);
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+CREATE INDEX IF NOT EXISTS idx_board_text_trgm ON board USING gin ((coalesce(title, '') || ' ' || coalesce(content, '')) gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_survey_title_trgm ON survey_saves USING gin ((coalesce(title, '')) gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_survey_user_trgm ON survey_saves USING gin (user_email gin_trgm_ops);
@@ -0,0 +1,106 @@
+"""
+설문진단 대시보드 통계: 현재 조건 총 건수, 최근 7일 건수, 일별 건수(히스토그램).
+- survey_daily_stats (day 'YYYY-MM-DD', saves): 저장일(created_at 날짜)별 설문 저장 건수 롤업.
+  survey_storage 의 저장·수정·삭제가 같은 트랜잭션에서 bump() 로 갱신. 마이그레이션 5 가 기존 행으로 채움.
+  다른 경로로 survey_saves 에 행을 넣었다면 `python survey_stats.py --rebuild` (upload_sqlite_to_remote.py 는 전송 후 자동).
+- 조건이 날짜뿐이면 롤업만 읽음 (일 수에 비례, survey_saves 는 읽지 않음).
+- 제목·사용자 조건이 있으면 survey_saves 를 날짜별 GROUP BY 쿼리 한 번으로 집계.
+- 최근 7일 = 오늘(UTC) 포함 7일 (날짜 단위, 두 경로 모두 같은 정의).
+"""
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Sequence
+
+import db
+from db import execute_all, execute_update_delete
+from db_migrations import SURVEY_DAY_EXPR, survey_daily_stats_rebuild_sql
+
+RECENT_DAYS = 7
+
+_BUMP_SQL = {
+    "sqlite": "INSERT INTO survey_daily_stats (day, saves) VALUES (%s, %s) ON CONFLICT (day) DO UPDATE SET saves = survey_daily_stats.saves + excluded.saves",
+    "postgres": "INSERT INTO survey_daily_stats (day, saves) VALUES (%s, %s) ON CONFLICT (day) DO UPDATE SET saves = survey_daily_stats.saves + EXCLUDED.saves",
+    "mysql": "INSERT INTO survey_daily_stats (day, saves) VALUES (%s, %s) ON DUPLICATE KEY UPDATE saves = saves + VALUES(saves)",
+}
+
+
+def day_of(created_at: Any) -> str:
+    """created_at ('YYYY-MM-DD HH:MM:SS' 문자열 또는 datetime) → 'YYYY-MM-DD'."""
+    return str(created_at)[:10]
+
+
+def bump(conn, created_at: Any, delta: int) -> None:
+    """created_at 날짜의 저장 건수에 delta 더함. 호출한 쪽의 트랜잭션 안에서 실행."""
+    if delta:
+        execute_update_delete(conn, _BUMP_SQL[db.DB_ENGINE], (day_of(created_at), delta))
+
+
+def rebuild(conn) -> int:
+    """롤업을 survey_saves 에서 다시 계산. 반환: 날짜 수."""
+    delete, insert = survey_daily_stats_rebuild_sql(db.DB_ENGINE)
+    execute_update_delete(conn, delete, ())
+    return execute_update_delete(conn, insert, ())
+
+
+def _summarize(daily: List[Dict[str, Any]]) -> Dict[str, Any]:
+    recent_from = (datetime.utcnow() - timedelta(days=RECENT_DAYS - 1)).strftime("%Y-%m-%d")
+    return {
+        "total_count": sum(d["count"] for d in daily),
+        "last_7_days_count": sum(d["count"] for d in daily if d["day"] >= recent_from),
+        "daily": daily,
+    }
+
+
+def _from_rollup(conn, date_from: Optional[str], date_to: Optional[str]) -> List[Dict[str, Any]]:
+    conditions, args = ["saves > 0"], []
+    if date_from:
+        conditions.append("day >= %s")
+        args.append(date_from)
+    if date_to:
+        conditions.append("day <= %s")
+        args.append(date_to)
+    rows = execute_all(
+        conn, f"SELECT day, saves FROM survey_daily_stats WHERE {' AND '.join(conditions)} ORDER BY day", tuple(args),
+    )
+    return [{"day": r["day"], "count": int(r["saves"])} for r in rows]
+
+
+def _from_rows(conn, conditions: Sequence[str], args: Sequence[Any]) -> List[Dict[str, Any]]:
+    day = SURVEY_DAY_EXPR[db.DB_ENGINE]
+    rows = execute_all(
+        conn,
+        f"SELECT {day} AS day, COUNT(*) AS cnt FROM survey_saves WHERE {' AND '.join(conditions)} GROUP BY {day} ORDER BY day",
+        tuple(args),
+    )
+    return [{"day": r["day"], "count": int(r["cnt"])} for r in rows]
+
+
+def diagnosis_stats(
+    conn,
+    date_from: Optional[str] = None,
+    date_to: Optional[str] = None,
+    q: Optional[str] = None,
+    user_email: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    반환: { total_count, last_7_days_count, daily: [{ day, count }, ...] (날짜순), source: 'rollup' | 'scan' }.
+    date_from, date_to: 'YYYY-MM-DD'. q, user_email 은 survey_storage 목록 조회와 같은 조건.
+    """
+    if not (q and q.strip()) and not (user_email and user_email.strip()):
+        return {**_summarize(_from_rollup(conn, date_from, date_to)), "source": "rollup"}
+    from survey_storage import _survey_diagnosis_conditions
+
+    conditions, args = _survey_diagnosis_conditions(date_from, date_to, q, user_email, conn)
+    return {**_summarize(_from_rows(conn, conditions, args)), "source": "scan"}
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="설문 저장 일별 통계 롤업 (survey_daily_stats)")
+    parser.add_argument("--rebuild", action="store_true", help="survey_saves 에서 롤업 다시 계산")
+    opts = parser.parse_args()
+    with db.get_conn() as conn:
+        if opts.rebuild:
+            print(f"롤업 다시 계산: {rebuild(conn)}일")
+        stats = diagnosis_stats(conn)
+    print(f"총 {stats['total_count']}건 · 최근 {RECENT_DAYS}일 {stats['last_7_days_count']}건 · {len(stats['daily'])}일")
@@ -1,12 +1,20 @@
 """
 설문 응답 저장 및 시계열 불러오기. 저장 기간 6개월 한정.
-MySQL: survey_saves (id, user_email, title, update_count, responses_json, ...)
+MySQL: survey_saves (id, user_email, title, update_count, responses_json, ..., responses_packed)
+응답은 response_codec 이진 포맷(responses_packed)에 저장하고, 디코드 결과가 원래 값과 같으면(roundtrips) JSON 세 컬럼은 비움.
+packed 는 필수·제외 순번 순서를 잃으므로 순서가 있는 간편 설문은 JSON 도 함께, 표현할 수 없는 응답(점수 범위 밖 등)은 JSON 만.
+JSON 을 함께 남겨 두던 때 저장된 행은 compact_json_columns() 로 같은 기준으로 비움.
+
+    python survey_storage.py --compact-json
 """
 import json
 from datetime import datetime, timedelta
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 
-from db import get_conn, execute_one, execute_all, execute_insert, execute_update_delete
+from db import get_conn, execute_one, execute_all, execute_insert, execute_update_delete, keyset_page, total_estimate
+from fulltext import SURVEY_TITLE_SEARCH, match_condition, search
+from response_codec import PackedSurvey, decode_matrix, pack, roundtrips
+import survey_stats
 
 RETENTION_MONTHS = 6
 
@@ -21,6 +29,42 @@ def _retention_cutoff() -> str:
     return t.strftime("%Y-%m-%d %H:%M:%S")
 
 
+def _encode_columns(
+    responses: Dict[int, int],
+    required_sequences: List[int],
+    excluded_sequences: Optional[List[int]],
+) -> Tuple[str, str, str, Optional[bytes]]:
+    """(responses_json, required_sequences_json, excluded_sequences_json, responses_packed). packed 만으로 되살릴 수 있으면 JSON 은 빈 문자열."""
+    packed = pack(responses, required_sequences, excluded_sequences)
+    if packed is not None and roundtrips(packed, responses, required_sequences, excluded_sequences):
+        return "", "", "", packed
+    return (
+        json.dumps({str(k): v for k, v in responses.items()}, ensure_ascii=False),
+        json.dumps(required_sequences, ensure_ascii=False),
+        json.dumps(excluded_sequences or [], ensure_ascii=False),
+        packed,
+    )
+
+
+def _decode_columns(row: Dict[str, Any]) -> Tuple[Dict[int, int], List[int], List[int]]:
+    """
+    저장 행 → (responses, required_sequences, excluded_sequences).
+    응답은 packed 우선. 순번 목록은 순서가 남아 있는 JSON 우선 (비운 행은 packed).
+    """
+    packed = row.get("responses_packed")
+    p = PackedSurvey(packed) if packed is not None else None
+    if p is not None and not row["responses_json"] and not row["required_sequences_json"]:
+        return p.responses, p.required_sequences, p.excluded_sequences
+    if p is not None:
+        responses = p.responses
+    else:
+        responses_raw = json.loads(row["responses_json"]) if row["responses_json"] else {}
+        responses = {int(k): v for k, v in responses_raw.items()}
+    required_sequences = json.loads(row["required_sequences_json"]) if row["required_sequences_json"] else []
+    excluded_sequences = json.loads(row["excluded_sequences_json"]) if row["excluded_sequences_json"] else []
+    return responses, required_sequences, excluded_sequences
+
+
 def save_survey(
     user_email: str,
     responses: Dict[int, int],
@@ -36,18 +80,19 @@ def save_survey(
         title = f"{prefix}{user_email.strip().lower()} {now}"
     else:
         title = title.strip()
-    responses_json = json.dumps({str(k): v for k, v in responses.items()}, ensure_ascii=False)
-    required_sequences_json = json.dumps(required_sequences, ensure_ascii=False)
-    excluded_sequences_json = json.dumps(excluded_sequences or [], ensure_ascii=False)
+    responses_json, required_sequences_json, excluded_sequences_json, packed = _encode_columns(
+        responses, required_sequences, excluded_sequences
+    )
     user = user_email.strip().lower()
 
     with get_conn() as conn:
         row_id = execute_insert(
             conn,
-            """INSERT INTO survey_saves (user_email, title, update_count, responses_json, required_sequences_json, excluded_sequences_json, created_at)
-               VALUES (%s, %s, 0, %s, %s, %s, %s)""",
-            (user, title, responses_json, required_sequences_json, excluded_sequences_json, now),
+            """INSERT INTO survey_saves (user_email, title, update_count, responses_json, required_sequences_json, excluded_sequences_json, responses_packed, created_at)
+               VALUES (%s, %s, 0, %s, %s, %s, %s, %s)""",
+            (user, title, responses_json, required_sequences_json, excluded_sequences_json, packed, now),
         )
+        survey_stats.bump(conn, now, 1)
     return {"id": row_id, "saved_at": now, "title": title}
 
 
@@ -60,30 +105,32 @@ def update_survey(
 ) -> Dict[str, Any]:
     """불러온 설문 수정 후 저장. 제목에 수정일시 + (자동순번) 추가. 반환: { id, saved_at, title }"""
     user_email = user_email.strip().lower()
+    responses_json, required_sequences_json, excluded_sequences_json, packed = _encode_columns(
+        responses, required_sequences, excluded_sequences
+    )
+    # 조회와 수정을 한 연결·한 트랜잭션에서 처리
     with get_conn() as conn:
         row = execute_one(
             conn,
-            "SELECT title, update_count FROM survey_saves WHERE id = %s AND user_email = %s",
+            "SELECT title, update_count, created_at FROM survey_saves WHERE id = %s AND user_email = %s",
             (save_id, user_email),
         )
         if not row:
             raise ValueError("해당 저장 항목을 찾을 수 없거나 권한이 없습니다.")
         old_title = (row["title"] or "").strip()
         update_count = (row["update_count"] or 0) + 1
-
-    now = datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S")
-    new_title = f"{old_title} [수정 {now}] ({update_count})"
-    responses_json = json.dumps({str(k): v for k, v in responses.items()}, ensure_ascii=False)
-    required_sequences_json = json.dumps(required_sequences, ensure_ascii=False)
-    excluded_sequences_json = json.dumps(excluded_sequences or [], ensure_ascii=False)
-
-    with get_conn() as conn:
+        now = datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S")
+        new_title = f"{old_title} [수정 {now}] ({update_count})"
         execute_update_delete(
             conn,
-            """UPDATE survey_saves SET title = %s, update_count = %s, responses_json = %s, required_sequences_json = %s, excluded_sequences_json = %s, created_at = %s
+            """UPDATE survey_saves SET title = %s, update_count = %s, responses_json = %s, required_sequences_json = %s, excluded_sequences_json = %s, responses_packed = %s, created_at = %s
                WHERE id = %s AND user_email = %s""",
-            (new_title, update_count, responses_json, required_sequences_json, excluded_sequences_json, now, save_id, user_email),
+            (new_title, update_count, responses_json, required_sequences_json, excluded_sequences_json, packed, now, save_id, user_email),
         )
+        # 수정하면 저장일이 바뀌므로 일별 통계도 옮김
+        if survey_stats.day_of(row["created_at"]) != survey_stats.day_of(now):
+            survey_stats.bump(conn, row["created_at"], -1)
+            survey_stats.bump(conn, now, 1)
     return {"id": save_id, "saved_at": now, "title": new_title}
 
 
@@ -113,8 +160,13 @@ def _survey_diagnosis_conditions(
     date_to: Optional[str] = None,
     q: Optional[str] = None,
     user_email: Optional[str] = None,
+    conn=None,
 ) -> tuple:
-    """설문진단 조회 공통 조건. (conditions 리스트, args 리스트) 반환."""
+    """
+    설문진단 조회 공통 조건. (conditions 리스트, args 리스트) 반환.
+    q 는 목록 검색(fulltext.search)과 같은 조건이라 색인 여부 확인용 conn 이 필요.
+    user_email 부분 일치(LIKE '%x%')는 PostgreSQL 만 pg_trgm 색인(idx_survey_user_trgm), SQLite·MySQL 은 전체 스캔.
+    """
     conditions = ["1=1"]
     args: List[Any] = []
     if date_from:
@@ -124,14 +176,57 @@ def _survey_diagnosis_conditions(
         conditions.append("created_at <= %s")
         args.append(date_to + " 23:59:59")
     if q and q.strip():
-        conditions.append("title LIKE %s")
-        args.append(f"%{q.strip()}%")
+        match, match_args = match_condition(conn, SURVEY_TITLE_SEARCH, q.strip())
+        conditions.append(match)
+        args += match_args
     if user_email and user_email.strip():
-        conditions.append("user_email LIKE %s")
-        args.append(f"%{user_email.strip()}%")
+        if "@" in user_email:
+            # 전체 이메일: idx_survey_user 로 바로 찾음
+            conditions.append("user_email = %s")
+            args.append(user_email.strip().lower())
+        else:
+            conditions.append("user_email LIKE %s")
+            args.append(f"%{user_email.strip()}%")
     return conditions, args
 
 
+def list_saved_page(
+    date_from: Optional[str] = None,
+    date_to: Optional[str] = None,
+    q: Optional[str] = None,
+    user_email: Optional[str] = None,
+    after_id: Optional[int] = None,
+    page_size: Optional[int] = None,
+    with_total: bool = True,
+    page: int = 1,
+) -> Dict[str, Any]:
+    """
+    전체 사용자 설문 저장 목록 한 페이지 (관리자용, id 최신순 keyset).
+    반환: { items, next_after_id, total_estimate, total_exact }. 다음 페이지는 after_id=next_after_id 로 요청.
+    with_total=False 이면 건수 조회 생략 (total_estimate=None).
+    q(제목 검색)가 있으면 전문 검색 관련도순: { items, page, has_more, next_after_id=None } — 다음 페이지는 page+1.
+    """
+    columns = ("id", "user_email", "title", "created_at")
+    conditions, args = _survey_diagnosis_conditions(date_from, date_to, None, user_email)
+    with get_conn() as conn:
+        if q and q.strip():
+            rows, has_more = search(conn, SURVEY_TITLE_SEARCH, q.strip(), columns, conditions[1:], args, page=page, page_size=page_size)
+            extra = {"next_after_id": None, "page": max(1, page), "has_more": has_more, "total_estimate": None, "total_exact": False}
+        else:
+            rows, next_after_id = keyset_page(
+                conn, "survey_saves", columns, conditions, args, after_id=after_id, page_size=page_size,
+            )
+            total, exact = total_estimate(conn, "survey_saves", conditions[1:], args) if with_total else (None, False)
+            extra = {"next_after_id": next_after_id, "total_estimate": total, "total_exact": exact}
+    return {
+        "items": [
+            {"id": r["id"], "user_email": r.get("user_email"), "title": (r.get("title") or "").strip(), "created_at": r.get("created_at")}
+            for r in rows
+        ],
+        **extra,
+    }
+
+
 def list_saved_all(
     date_from: Optional[str] = None,
     date_to: Optional[str] = None,
@@ -139,17 +234,8 @@ def list_saved_all(
     user_email: Optional[str] = None,
     limit: int = 500,
 ) -> List[Dict[str, Any]]:
-    """전체 사용자 설문 저장 목록 (관리자용). date_from, date_to: 'YYYY-MM-DD' 형식. user_email: 사용자 아이디(이메일) 필터."""
-    conditions, args = _survey_diagnosis_conditions(date_from, date_to, q, user_email)
-    args.append(limit)
-    with get_conn() as conn:
-        sql = f"""SELECT id, user_email, title, created_at FROM survey_saves
-                  WHERE {' AND '.join(conditions)} ORDER BY created_at DESC LIMIT %s"""
-        rows = execute_all(conn, sql, tuple(args))
-    return [
-        {"id": r["id"], "user_email": r.get("user_email"), "title": (r.get("title") or "").strip(), "created_at": r.get("created_at")}
-        for r in rows
-    ]
+    """전체 사용자 설문 저장 목록 첫 페이지 (관리자용). date_from, date_to: 'YYYY-MM-DD' 형식. user_email: 사용자 아이디(이메일) 필터."""
+    return list_saved_page(date_from, date_to, q, user_email, page_size=limit, with_total=False)["items"]
 
 
 def get_survey_diagnosis_stats(
@@ -157,22 +243,21 @@ def get_survey_diagnosis_stats(
     date_to: Optional[str] = None,
     q: Optional[str] = None,
     user_email: Optional[str] = None,
-) -> Dict[str, int]:
-    """설문진단 통계: 현재 조건 총 건수, 최근 7일 진단 건수. 반환: { total_count, last_7_days_count }."""
-    from datetime import datetime, timedelta
-    conditions, args = _survey_diagnosis_conditions(date_from, date_to, q, user_email)
-    cutoff_7 = (datetime.utcnow() - timedelta(days=7)).strftime("%Y-%m-%d %H:%M:%S")
+) -> Dict[str, Any]:
+    """설문진단 통계: 현재 조건 총 건수, 최근 7일 진단 건수, 일별 건수. 반환: { total_count, last_7_days_count, daily, source }."""
     with get_conn() as conn:
-        sql_total = f"SELECT COUNT(*) AS cnt FROM survey_saves WHERE {' AND '.join(conditions)}"
-        row_total = execute_one(conn, sql_total, tuple(args))
-        conditions_7 = conditions + ["created_at >= %s"]
-        args_7 = args + [cutoff_7]
-        sql_7 = f"SELECT COUNT(*) AS cnt FROM survey_saves WHERE {' AND '.join(conditions_7)}"
-        row_7 = execute_one(conn, sql_7, tuple(args_7))
-    return {
-        "total_count": row_total["cnt"] if row_total else 0,
-        "last_7_days_count": row_7["cnt"] if row_7 else 0,
-    }
+        return survey_stats.diagnosis_stats(conn, date_from, date_to, q, user_email)
+
+
+def delete_saved(save_id: int) -> int:
+    """한 건 삭제 (관리자용). 일별 통계도 같은 트랜잭션에서 줄임. 반환: 삭제 건수."""
+    with get_conn() as conn:
+        row = execute_one(conn, "SELECT created_at FROM survey_saves WHERE id = %s", (save_id,))
+        if not row:
+            return 0
+        n = execute_update_delete(conn, "DELETE FROM survey_saves WHERE id = %s", (save_id,))
+        survey_stats.bump(conn, row["created_at"], -n)
+    return n
 
 
 def get_saved(user_email: str, save_id: int, *, skip_user_check: bool = False) -> Optional[Dict[str, Any]]:
@@ -184,22 +269,19 @@ def get_saved(user_email: str, save_id: int, *, skip_user_check: bool = False) -
         if skip_user_check:
             row = execute_one(
                 conn,
-                "SELECT responses_json, required_sequences_json, excluded_sequences_json, created_at, title FROM survey_saves WHERE id = %s AND created_at >= %s",
+                "SELECT responses_json, required_sequences_json, excluded_sequences_json, responses_packed, created_at, title FROM survey_saves WHERE id = %s AND created_at >= %s",
                 (save_id, cutoff),
             )
         else:
             row = execute_one(
                 conn,
-                "SELECT responses_json, required_sequences_json, excluded_sequences_json, created_at, title FROM survey_saves WHERE id = %s AND user_email = %s AND created_at >= %s",
+                "SELECT responses_json, required_sequences_json, excluded_sequences_json, responses_packed, created_at, title FROM survey_saves WHERE id = %s AND user_email = %s AND created_at >= %s",
                 (save_id, user, cutoff),
             )
     if not row:
         return None
     try:
-        responses_raw = json.loads(row["responses_json"]) if row["responses_json"] else {}
-        responses = {int(k): v for k, v in responses_raw.items()}
-        required_sequences = json.loads(row["required_sequences_json"]) if row["required_sequences_json"] else []
-        excluded_sequences = json.loads(row["excluded_sequences_json"]) if row["excluded_sequences_json"] else []
+        responses, required_sequences, excluded_sequences = _decode_columns(row)
     except Exception:
         responses = {}
         required_sequences = []
@@ -212,3 +294,96 @@ def get_saved(user_email: str, save_id: int, *, skip_user_check: bool = False) -
         "saved_at": row["created_at"],
         "title": title,
     }
+
+
+def load_response_matrix(
+    n_columns: int,
+    date_from: Optional[str] = None,
+    date_to: Optional[str] = None,
+    q: Optional[str] = None,
+    user_email: Optional[str] = None,
+    limit: int = 5000,
+) -> Tuple[List[int], Any, Any, bool]:
+    """
+    조건에 맞는 저장 응답을 배치 채점 입력으로 (관리자 집단 분석용, 관리자 목록과 같은 최신순).
+    반환: (id 목록, N×n_columns 응답 행렬, 제외 마스크, truncated) → ScoringEngine.calculate_batch(matrix, mask)
+    truncated: 조건에 맞는 행이 limit 보다 많아 최신 limit 건만 담았는지.
+    packed 행은 dict 를 만들지 않고 바로 행렬로 디코드, JSON 행만 파싱.
+    """
+    import numpy as np
+
+    with get_conn() as conn:
+        conditions, args = _survey_diagnosis_conditions(date_from, date_to, q, user_email, conn)
+        args.append(limit + 1)
+        rows = execute_all(
+            conn,
+            f"""SELECT id, responses_packed, responses_json, required_sequences_json, excluded_sequences_json FROM survey_saves
+                WHERE {' AND '.join(conditions)} ORDER BY id DESC LIMIT %s""",
+            tuple(args),
+        )
+    truncated = len(rows) > limit
+    rows = rows[:limit]
+    ids = [r["id"] for r in rows]
+    packed_idx = [i for i, r in enumerate(rows) if r.get("responses_packed") is not None]
+    matrix = np.zeros((len(rows), n_columns), dtype=np.int16)
+    mask = np.zeros((len(rows), n_columns), dtype=bool)
+    if packed_idx:
+        matrix[packed_idx], mask[packed_idx] = decode_matrix([rows[i]["responses_packed"] for i in packed_idx], n_columns)
+    for i, r in enumerate(rows):
+        if r.get("responses_packed") is not None:
+            continue
+        try:
+            responses, _, excluded = _decode_columns(r)
+        except Exception:
+            continue
+        for seq, score in responses.items():
+            if 1 <= seq <= n_columns and isinstance(score, int) and 1 <= score <= 5:
+                matrix[i, seq - 1] = score
+        mask[i, [seq - 1 for seq in excluded if isinstance(seq, int) and 1 <= seq <= n_columns]] = True
+    return ids, matrix, mask, truncated
+
+
+def compact_json_columns(batch: int = 500) -> int:
+    """
+    packed 와 JSON 이 순서까지 같은 행(roundtrips)만 JSON 세 컬럼을 빈 문자열로 비움. 비운 행 수 반환.
+    새 저장·마이그레이션 3 은 처음부터 같은 기준으로 비우므로, JSON 을 함께 남기던 때 저장·이관된 행 정리용.
+    """
+    done = 0
+    last_id = 0
+    while True:
+        with get_conn() as conn:
+            rows = execute_all(
+                conn,
+                """SELECT id, responses_json, required_sequences_json, excluded_sequences_json, responses_packed FROM survey_saves
+                   WHERE responses_packed IS NOT NULL AND responses_json <> '' AND id > %s ORDER BY id LIMIT %s""",
+                (last_id, batch),
+            )
+            if not rows:
+                return done
+            for r in rows:
+                last_id = r["id"]
+                try:
+                    responses = {int(k): v for k, v in json.loads(r["responses_json"]).items()}
+                    required = json.loads(r["required_sequences_json"] or "[]")
+                    excluded = json.loads(r["excluded_sequences_json"] or "[]")
+                    exact = roundtrips(r["responses_packed"], responses, required, excluded)
+                except (ValueError, TypeError, AttributeError):
+                    exact = False
+                if exact:
+                    done += execute_update_delete(
+                        conn,
+                        "UPDATE survey_saves SET responses_json = '', required_sequences_json = '', excluded_sequences_json = '' WHERE id = %s",
+                        (r["id"],),
+                    )
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="설문 저장 응답 컬럼 정리")
+    parser.add_argument("--compact-json", action="store_true", help="packed 와 왕복이 정확한 행의 JSON 세 컬럼 비우기")
+    opts = parser.parse_args()
+    if opts.compact_json:
+        print(f"JSON 비운 행: {compact_json_columns()}건")
+    else:
+        parser.print_help()
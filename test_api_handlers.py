@@ -0,0 +1,157 @@
+"""
+유닛 테스트: async 핸들러의 블로킹 작업이 이벤트 루프 밖에서 실행되는지
+(PDF 생성·일괄 채점은 CPU 스레드 풀 sbi-cpu-*, AI 상담 RAG 검색은 DB 스레드 풀 sbi-db-*)
++ 일괄 채점의 관리자 제한·행 수 제한, 저장된 설문진단을 조건으로 골라 서버에서 채점
+"""
+import os
+import tempfile
+import threading
+import unittest
+from unittest import mock
+
+from fastapi.testclient import TestClient
+
+import knowledge_db
+import main
+import pipeline
+import survey_storage
+from db_testing import SqliteDbTestCase
+from scoring import ScoringEngine
+
+
+def _on_db_thread() -> bool:
+    return threading.current_thread().name.startswith("sbi-db")
+
+
+def _on_cpu_thread() -> bool:
+    return threading.current_thread().name.startswith("sbi-cpu")
+
+
+class TestBlockingHandlersOffLoop(unittest.TestCase):
+    def setUp(self):
+        self.client = TestClient(main.app)
+        self.threads = []
+
+    def test_generate_pdf_runs_pipeline_on_executor(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        pdf_path = os.path.join(tmp.name, "r.pdf")
+        with open(pdf_path, "wb") as f:
+            f.write(b"%PDF-1.4")
+
+        def fake_pipeline(**kwargs):
+            self.threads.append(_on_cpu_thread())
+            return pipeline.PipelineResult(success=True, pdf_path=pdf_path)
+
+        with mock.patch.object(pipeline, "run_full_pipeline", side_effect=fake_pipeline) as run:
+            res = self.client.post("/api/generate-pdf", json={"responses": {"1": 5}, "excluded_sequences": [3]})
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(res.content, b"%PDF-1.4")
+        self.assertEqual(self.threads, [True])
+        self.assertEqual(run.call_args.kwargs["exclude_sequences"], [3])
+
+    def test_consult_runs_retrieval_on_executor(self):
+        def record(*args, **kwargs):
+            self.threads.append(_on_db_thread())
+            return []
+
+        with mock.patch.object(knowledge_db, "init_db", side_effect=record), \
+                mock.patch.object(knowledge_db, "search_knowledge", side_effect=record) as search:
+            res = self.client.post("/api/consult", json={"question": "회복탄력성"})
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(self.threads, [True, True])
+        search.assert_called_once_with("회복탄력성", top_k=5)
+
+
+class TestSurveyBatchEndpoint(unittest.TestCase):
+    def setUp(self):
+        self.client = TestClient(main.app)
+        self.rows = [[5] * 96, [1, 2, 3, 4, 0] * 19 + [3]]
+
+    def _as(self, email):
+        patcher = mock.patch.object(main, "get_current_user", return_value={"email": email} if email else None)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_admin_only(self):
+        self._as(None)
+        self.assertEqual(self.client.post("/submit-survey/batch", json={"responses": self.rows}).status_code, 403)
+        self._as("user@test.com")
+        self.assertEqual(self.client.post("/submit-survey/batch", json={"responses": self.rows}).status_code, 403)
+
+    def test_row_limit(self):
+        self._as("admin@test.com")
+        with mock.patch.object(main, "SURVEY_BATCH_MAX_ROWS", 1):
+            res = self.client.post("/submit-survey/batch", json={"responses": self.rows})
+        self.assertEqual(res.status_code, 422)
+
+    def test_scores_on_executor(self):
+        self._as("admin@test.com")
+        engine = main.get_shared_engine()
+        threads = []
+
+        def calculate_batch(*args):
+            threads.append(_on_cpu_thread())
+            return ScoringEngine.calculate_batch(engine, *args)
+
+        with mock.patch.object(engine, "calculate_batch", side_effect=calculate_batch):
+            res = self.client.post("/submit-survey/batch", json={"responses": self.rows, "excluded_sequences": [[], [1]]})
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(threads, [True])
+        body = res.json()
+        self.assertEqual(body["행수"], 2)
+        single = engine.calculate_score({i + 1: v for i, v in enumerate(self.rows[1]) if v}, excluded_sequences=[1])
+        self.assertEqual(body["전체평균"][1], single.전체평균)
+
+
+class TestSurveyBatchSaved(SqliteDbTestCase):
+    any_thread = True
+
+    def setUp(self):
+        super().setUp()
+        self.use_conn(survey_storage)
+        self.client = TestClient(main.app)
+        patcher = mock.patch.object(main, "get_current_user", return_value={"email": "admin@test.com"})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.engine = main.get_shared_engine()
+        self.cases = [
+            ("a@x.com", {seq: 5 for seq in range(1, 97)}, []),
+            ("b@x.com", {seq: seq % 5 + 1 for seq in range(1, 97)}, [1, 40]),
+            ("a@x.com", {1: 3, 2: 4, 50: 2}, [2]),
+        ]
+        for email, responses, excluded in self.cases:
+            survey_storage.save_survey(email, responses, sorted(responses), excluded)
+
+    def test_scores_saved_rows_by_filter(self):
+        threads = []
+        calculate_batch = self.engine.calculate_batch
+
+        def record(*args):
+            threads.append(_on_cpu_thread())
+            return calculate_batch(*args)
+
+        with mock.patch.object(self.engine, "calculate_batch", side_effect=record):
+            res = self.client.post("/submit-survey/batch", json={"user_email": "a@x.com"})
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(threads, [True])
+        body = res.json()
+        self.assertEqual(body["행수"], 2)
+        self.assertFalse(body["잘림"])
+        self.assertEqual(body["저장_id"], sorted(body["저장_id"], reverse=True))
+        for row, (_, responses, excluded) in enumerate(reversed([c for c in self.cases if c[0] == "a@x.com"])):
+            expected = self.engine.calculate_score(responses, excluded_sequences=excluded)
+            self.assertAlmostEqual(body["전체평균"][row], expected.전체평균)
+            self.assertEqual(body["사용된_문항수"][row], expected.사용된_문항수)
+
+    def test_saved_rows_capped_at_row_limit(self):
+        with mock.patch.object(main, "SURVEY_BATCH_MAX_ROWS", 2):
+            body = self.client.post("/submit-survey/batch", json={}).json()
+        self.assertEqual(body["행수"], 2)
+        self.assertTrue(body["잘림"])
+        res = self.client.post("/submit-survey/batch", json={"excluded_sequences": [[1]]})
+        self.assertEqual(res.status_code, 400)
+
+
+if __name__ == "__main__":
+    unittest.main()
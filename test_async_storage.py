@@ -0,0 +1,30 @@
+"""
+유닛 테스트: 비동기 저장소 API (DB 스레드 풀 실행, 반환값·예외 전달)
+"""
+import asyncio
+import threading
+import unittest
+from async_storage import AsyncStorage, run_db
+
+
+class TestAsyncStorage(unittest.TestCase):
+    def test_run_db_runs_off_event_loop(self):
+        async def main():
+            loop_thread = threading.get_ident()
+            worker_thread = await run_db(threading.get_ident)
+            return loop_thread, worker_thread
+
+        loop_thread, worker_thread = asyncio.run(main())
+        self.assertNotEqual(loop_thread, worker_thread)
+
+    def test_proxy_keeps_semantics(self):
+        """같은 이름·인자·반환값, 예외도 그대로 전달"""
+        store = AsyncStorage("json")
+        self.assertEqual(asyncio.run(store.dumps({"a": 1}, sort_keys=True)), '{"a": 1}')
+        with self.assertRaises(ValueError):
+            asyncio.run(store.loads("{"))
+        self.assertIs(store.dumps, store.dumps)
+
+
+if __name__ == "__main__":
+    unittest.main()
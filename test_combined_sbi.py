@@ -131,6 +131,31 @@ class TestCombinedSBIWeights(unittest.TestCase):
         self.assertGreaterEqual(m.responsibility, 0)
         self.assertLessEqual(m.responsibility, 100)
 
+    def test_mock_eeg_provider_seed_is_isolated(self):
+        """같은 시드 → 같은 지표, 전역 random 상태는 바뀌지 않음"""
+        import random
+        random.seed(1)
+        expected_global = random.random()
+        random.seed(1)
+        a = MockEEGProvider(seed=42).get_metrics()
+        b = MockEEGProvider(seed=42).get_metrics()
+        self.assertEqual(a, b)
+        self.assertEqual(random.random(), expected_global)
+        self.assertEqual(
+            MockEEGProvider.for_session("user@test.com", "s1").get_metrics(),
+            MockEEGProvider.for_session("user@test.com", "s1").get_metrics(),
+        )
+
+    def test_mock_eeg_provider_batch(self):
+        """get_metrics_batch: (n, 4) 배열, 지표별 범위 안, 같은 시드 → 같은 배열"""
+        from eeg_provider import METRIC_RANGES
+        batch = MockEEGProvider(seed=3).get_metrics_batch(500)
+        self.assertEqual(batch.shape, (500, 4))
+        for col, (low, high) in enumerate(METRIC_RANGES.values()):
+            self.assertGreaterEqual(batch[:, col].min(), low)
+            self.assertLessEqual(batch[:, col].max(), high)
+        self.assertTrue((batch == MockEEGProvider(seed=3).get_metrics_batch(500)).all())
+
     def test_real_survey_plus_mock_eeg_integration(self):
         """실제 설문(예시문항) + Mock 뇌파로 통합 지수 산출 통합 테스트"""
         responses = {item.전체순번: item.예시문항 for item in self.loader.items}
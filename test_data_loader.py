@@ -0,0 +1,93 @@
+"""
+유닛 테스트: 문항 로딩 (cp949/UTF-8 CSV, JSON 카탈로그 저장·재사용, 원본이 바뀐 카탈로그 무시, 공유 로더 재로드)
+"""
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+import data_loader
+from data_loader import SurveyDataLoader, get_shared_loader
+
+
+class TestSurveyDataLoader(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.dir = tmp.name
+        self.csv_path = os.path.join(self.dir, "survey_items.csv")
+        shutil.copyfile(data_loader._DEFAULT_CSV, self.csv_path)
+        for name, value in (("_CATALOG_ENABLED", True), ("_CATALOG_WRITE", False)):
+            patcher = mock.patch.object(data_loader, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def _rewrite_csv(self, transform) -> None:
+        with open(self.csv_path, "rb") as f:
+            text = f.read().decode("cp949")
+        with open(self.csv_path, "wb") as f:
+            f.write(transform(text))
+
+    def test_cp949_and_utf8_csv_parse_the_same(self):
+        cp949 = SurveyDataLoader(self.csv_path)
+        self.assertEqual(len(cp949.items), 96)
+        self.assertTrue(cp949.validate_sequences()["검증_결과"])
+        self.assertIn("창업", cp949.items[0].영역)
+
+        self._rewrite_csv(lambda text: text.encode("utf-8-sig"))
+        utf8 = SurveyDataLoader(self.csv_path)
+        self.assertEqual(utf8.items, cp949.items)
+        self.assertNotEqual(utf8.source_sha256, cp949.source_sha256)
+
+    def test_catalog_write_then_reload(self):
+        parsed = SurveyDataLoader(self.csv_path)
+        self.assertFalse(parsed.loaded_from_catalog)
+        self.assertFalse(os.path.exists(parsed.catalog_path))
+        self.assertEqual(parsed.write_catalog(), parsed.catalog_path)
+
+        with mock.patch.object(SurveyDataLoader, "_read_rows_csv", side_effect=AssertionError("CSV 재파싱")):
+            cached = SurveyDataLoader(self.csv_path)
+        self.assertTrue(cached.loaded_from_catalog)
+        self.assertEqual(cached.items, parsed.items)
+        self.assertEqual(cached.get_groups(), parsed.get_groups())
+        self.assertEqual(cached.get_selected_sequences(), parsed.get_selected_sequences())
+
+        # SBI_ITEM_CATALOG=0 이면 카탈로그가 있어도 CSV 를 읽음
+        with mock.patch.object(data_loader, "_CATALOG_ENABLED", False):
+            self.assertFalse(SurveyDataLoader(self.csv_path).loaded_from_catalog)
+
+    def test_stale_catalog_is_ignored_and_rewritten(self):
+        original = SurveyDataLoader(self.csv_path)
+        original.write_catalog()
+        self._rewrite_csv(lambda text: text.replace("창업", "기업", 1).encode("cp949"))
+
+        with mock.patch.object(data_loader, "_CATALOG_WRITE", True):
+            changed = SurveyDataLoader(self.csv_path)
+        self.assertFalse(changed.loaded_from_catalog)
+        self.assertNotEqual(changed.items, original.items)
+        with open(changed.catalog_path, encoding="utf-8") as f:
+            self.assertEqual(json.load(f)["source_sha256"], changed.source_sha256)
+        reloaded = SurveyDataLoader(self.csv_path)
+        self.assertTrue(reloaded.loaded_from_catalog)
+        self.assertEqual(reloaded.items, changed.items)
+
+        # 깨진 카탈로그도 무시 (CSV 로 대체)
+        with open(changed.catalog_path, "w", encoding="utf-8") as f:
+            f.write("{")
+        self.assertFalse(SurveyDataLoader(self.csv_path).loaded_from_catalog)
+
+    def test_shared_loader_reloads_changed_csv(self):
+        self.addCleanup(data_loader._shared_catalogs.pop, os.path.abspath(self.csv_path), None)
+        with mock.patch.object(data_loader, "SHARED_RELOAD_CHECK_SECONDS", 0):
+            first = get_shared_loader(self.csv_path)
+            self.assertIs(get_shared_loader(self.csv_path), first)
+            self._rewrite_csv(lambda text: (text + "\n").encode("cp949"))
+            second = get_shared_loader(self.csv_path)
+        self.assertIsNot(second, first)
+        self.assertEqual(second.items, first.items)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,127 @@
+"""
+유닛 테스트: 스키마 마이그레이션 (schema_version 기록, 재실행 시 생략, 기존 DB 컬럼 보강)
+"""
+import os
+import re
+import sqlite3
+import unittest
+from unittest import mock
+
+import db_migrations
+from db_migrations import MIGRATIONS, current_version, ensure_schema, migrate
+
+
+class TestDbMigrations(unittest.TestCase):
+    def setUp(self):
+        self.path = f":memory:{id(self)}"  # ensure_schema 대상 키 (테스트마다 다르게)
+        self.conn = sqlite3.connect(":memory:")
+        self.conn.row_factory = sqlite3.Row
+
+    def tearDown(self):
+        self.conn.close()
+
+    def test_fresh_database(self):
+        applied = migrate(self.conn, "sqlite")
+        self.assertEqual(applied, [m.version for m in MIGRATIONS])
+        self.assertEqual(current_version(self.conn, "sqlite"), MIGRATIONS[-1].version)
+        tables = {r[0] for r in self.conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+        self.assertTrue({"users", "survey_saves", "board", "schema_version"} <= tables)
+        self.assertEqual(migrate(self.conn, "sqlite"), [])
+
+    def test_existing_database_gets_profile_columns(self):
+        """schema_version 없는 예전 DB: 초기 스키마는 무해하게 통과, 프로필 컬럼만 추가"""
+        self.conn.execute("CREATE TABLE users (id INTEGER PRIMARY KEY AUTOINCREMENT, email TEXT NOT NULL UNIQUE, password_hash TEXT NOT NULL, created_at TEXT NOT NULL)")
+        self.conn.execute("INSERT INTO users (email, password_hash, created_at) VALUES ('a@b.c', 'x', 'now')")
+        self.conn.commit()
+        migrate(self.conn, "sqlite")
+        cols = [r[1] for r in self.conn.execute("PRAGMA table_info(users)")]
+        self.assertIn("exercise_habit", cols)
+        self.assertEqual(self.conn.execute("SELECT COUNT(*) FROM users").fetchone()[0], 1)
+
+    def test_survey_rows_backfilled_to_packed(self):
+        """응답 JSON 행 → responses_packed 추가. 왕복이 정확한 행만 JSON 비움 (순서가 있는 행은 JSON 유지, 표현할 수 없는 행은 packed 없음)"""
+        migrate(self.conn, "sqlite", MIGRATIONS[:2])
+        insert = ("INSERT INTO survey_saves (user_email, title, responses_json, required_sequences_json, excluded_sequences_json, created_at) "
+                  "VALUES ('a@b.c', 't', ?, ?, ?, '2024-01-01 00:00:00')")
+        self.conn.execute(insert, ('{"1": 5, "2": 3}', "[2, 1]", "[3]"))
+        self.conn.execute(insert, ('{"1": 0}', "[1]", "[]"))
+        self.conn.execute(insert, ('{"1": 4, "3": 2}', "[1, 3]", "[]"))
+        self.conn.commit()
+        migrate(self.conn, "sqlite")
+        rows = self.conn.execute("SELECT * FROM survey_saves ORDER BY id").fetchall()
+        self.assertEqual(rows[0]["responses_json"], '{"1": 5, "2": 3}')
+        from response_codec import unpack
+        self.assertEqual(unpack(rows[0]["responses_packed"]), ({1: 5, 2: 3}, [1, 2], [3]))
+        self.assertIsNone(rows[1]["responses_packed"])
+        self.assertEqual(rows[1]["responses_json"], '{"1": 0}')
+        self.assertEqual(unpack(rows[2]["responses_packed"]), ({1: 4, 3: 2}, [1, 3], []))
+        self.assertEqual((rows[2]["responses_json"], rows[2]["required_sequences_json"], rows[2]["excluded_sequences_json"]), ("", "", ""))
+
+    def test_ensure_schema_runs_once_per_target(self):
+        ensure_schema(self.conn, "sqlite", self.path)
+        self.conn.execute("DELETE FROM schema_version")
+        self.conn.commit()
+        ensure_schema(self.conn, "sqlite", self.path)  # 같은 프로세스·같은 DB → 다시 확인하지 않음
+        self.assertEqual(current_version(self.conn, "sqlite"), 0)
+        db_migrations._migrated.discard(self.path)
+
+    def test_schema_docs_match_migrated_schema(self):
+        """create_tables_mysql.sql / supabase_schema.sql (참고용 최종 스키마) 에 마이그레이션 결과 테이블·컬럼이 모두 있음"""
+        migrate(self.conn, "sqlite")
+        tables = [r[0] for r in self.conn.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'table' AND sql LIKE 'CREATE TABLE%' "
+            "AND name NOT IN ('schema_version', 'sqlite_sequence') AND name NOT LIKE '%\\_fts%' ESCAPE '\\'"  # FTS5 내부 테이블 제외
+        )]
+        base = os.path.dirname(os.path.abspath(__file__))
+        for doc in ("create_tables_mysql.sql", "supabase_schema.sql"):
+            with open(os.path.join(base, doc), encoding="utf-8") as f:
+                text = f.read()
+            for table in tables:
+                block = re.search(rf"CREATE TABLE IF NOT EXISTS {table} \((.*?)\n\)", text, re.S)
+                self.assertIsNotNone(block, f"{doc}: {table}")
+                documented = {line.split()[0] for line in block.group(1).strip().splitlines()}
+                columns = {r[1] for r in self.conn.execute(f"PRAGMA table_info({table})")}
+                self.assertLessEqual(columns, documented, f"{doc}: {table}")
+
+    def test_mysql_initial_schema_is_frozen(self):
+        """마이그레이션 1 (MySQL) 은 문서 파일이 아닌 고정된 DDL: 나중에 추가된 테이블·컬럼 없음"""
+        statements = MIGRATIONS[0].steps["mysql"]
+        self.assertEqual(len(statements), 6)
+        self.assertFalse(any("responses_packed" in s or "survey_daily_stats" in s for s in statements))
+
+    def test_survey_packer_is_frozen(self):
+        """마이그레이션 3 은 고정된 포맷 1 사본으로 기록: 현재 코덱과 같은 bytes, 코덱은 포맷 1 을 계속 읽음"""
+        from db_migrations import _pack_v1
+        from response_codec import pack, unpack
+        cases = [
+            ({seq: (seq % 5) + 1 for seq in range(1, 97)}, list(range(1, 97)), [4, 50]),
+            ({3: 2, 96: 5}, [96, 3], []),
+            ({}, [], []),
+        ]
+        for responses, required, excluded in cases:
+            blob = _pack_v1(responses, required, excluded)
+            self.assertEqual(blob[0], 1)
+            self.assertEqual(blob, pack(responses, required, excluded))
+            self.assertEqual(unpack(blob), (responses, sorted(required), excluded))
+        self.assertIsNone(_pack_v1({1: 0}, [1], []))
+        self.assertIsNone(_pack_v1({1: 3}, [1, 1], []))
+
+    def test_mysql_fulltext_without_ngram_parser(self):
+        """ngram 파서 없는 MySQL/MariaDB: ALTER 실패를 기록만 하고 마이그레이션은 통과"""
+        statements = []
+
+        def fake_execute(conn, engine, sql, args=()):
+            statements.append(sql)
+            if sql.startswith("ALTER TABLE"):
+                raise RuntimeError("Unknown parser ngram")
+            return []
+
+        with mock.patch.object(db_migrations, "_execute", fake_execute), \
+                self.assertLogs(db_migrations.logger, "WARNING") as logs:
+            db_migrations._mysql_fulltext(None, "mysql")
+        self.assertEqual(sum(s.startswith("ALTER TABLE") for s in statements), 2)
+        self.assertEqual(len(logs.records), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
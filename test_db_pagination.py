@@ -0,0 +1,69 @@
+"""
+유닛 테스트: keyset 페이지 (id 커서, sort_column 커서, 조건) 와 전체 건수 추정 (SQLite 메모리 DB)
+"""
+import unittest
+
+from db import keyset_page, total_estimate
+from db_testing import SqliteDbTestCase
+
+
+class TestKeysetPage(SqliteDbTestCase):
+    migrated = False
+
+    def setUp(self):
+        super().setUp()
+        self.conn.execute("CREATE TABLE t (id INTEGER PRIMARY KEY, kind TEXT, sort_order INTEGER, body TEXT)")
+        self.conn.executemany(
+            "INSERT INTO t (id, kind, sort_order, body) VALUES (?, ?, ?, 'x')",
+            [(i, "a" if i % 3 else "b", i % 4) for i in range(1, 24)],
+        )
+
+    def _all_pages(self, **kwargs):
+        ids, after_id, after_value, pages = [], None, None, 0
+        while True:
+            if kwargs.get("sort_column"):
+                kwargs["after_value"] = after_value
+            rows, after_id = keyset_page(self.conn, "t", ("id", "kind", "sort_order"), after_id=after_id, page_size=5, **kwargs)
+            ids += [r["id"] for r in rows]
+            if kwargs.get("sort_column") and rows:
+                after_value = rows[-1][kwargs["sort_column"]]
+            pages += 1
+            if after_id is None:
+                return ids, pages
+
+    def test_id_desc_pages(self):
+        ids, pages = self._all_pages()
+        self.assertEqual(ids, list(range(23, 0, -1)))
+        self.assertEqual(pages, 5)
+        rows, next_id = keyset_page(self.conn, "t", ("id",), page_size=23)
+        self.assertEqual((len(rows), next_id), (23, None))
+
+    def test_conditions_and_sort_column(self):
+        ids, _ = self._all_pages(conditions=["kind = %s"], args=["b"])
+        self.assertEqual(ids, [21, 18, 15, 12, 9, 6, 3])
+        ids, _ = self._all_pages(descending=False, sort_column="sort_order")
+        expected = [r[0] for r in self.conn.execute("SELECT id FROM t ORDER BY sort_order, id")]
+        self.assertEqual(ids, expected)
+
+    def test_sort_column_cursor_survives_deleted_row(self):
+        """커서 행을 삭제해도 (after_value, after_id) 로 다음 페이지가 이어짐"""
+        columns = ("id", "sort_order")
+        rows, after_id = keyset_page(self.conn, "t", columns, page_size=5, descending=False, sort_column="sort_order")
+        after_value = rows[-1]["sort_order"]
+        self.conn.execute("DELETE FROM t WHERE id = ?", (after_id,))
+        rest, _ = keyset_page(self.conn, "t", columns, after_id=after_id, page_size=5, descending=False,
+                              sort_column="sort_order", after_value=after_value)
+        expected = [r[0] for r in self.conn.execute("SELECT id FROM t ORDER BY sort_order, id")][4:9]
+        self.assertEqual([r["id"] for r in rest], expected)
+        with self.assertRaises(ValueError):
+            keyset_page(self.conn, "t", columns, after_id=after_id, sort_column="sort_order")
+
+    def test_page_size_clamped_and_total(self):
+        rows, _ = keyset_page(self.conn, "t", ("id",), page_size=10_000)
+        self.assertEqual(len(rows), 23)
+        self.assertEqual(total_estimate(self.conn, "t"), (23, True))
+        self.assertEqual(total_estimate(self.conn, "t", ["kind = %s"], ["b"]), (7, True))
+
+
+if __name__ == "__main__":
+    unittest.main()
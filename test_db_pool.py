@@ -0,0 +1,91 @@
+"""
+유닛 테스트: DB 연결 풀 (최대 연결 수, 대기 timeout, 수명 초과 재연결, health check)
+"""
+import sqlite3
+import threading
+import time
+import unittest
+from db_pool import ConnectionPool, PoolTimeout, ThreadLocalConnections
+
+
+def _connect():
+    return sqlite3.connect(":memory:", check_same_thread=False)
+
+
+class TestConnectionPool(unittest.TestCase):
+    def test_reuses_idle_connection(self):
+        pool = ConnectionPool(_connect, max_size=2)
+        first = pool.acquire()
+        pool.release(first)
+        second = pool.acquire()
+        self.assertIs(first.conn, second.conn)
+        pool.release(second)
+        stats = pool.stats()
+        self.assertEqual((stats["created"], stats["in_use"], stats["idle"]), (1, 0, 1))
+
+    def test_bounded_with_wait_timeout(self):
+        pool = ConnectionPool(_connect, max_size=1, timeout=0.05)
+        held = pool.acquire()
+        with self.assertRaises(PoolTimeout):
+            pool.acquire()
+        self.assertEqual(pool.stats()["wait_timeouts"], 1)
+
+        # 다른 스레드가 반납하면 대기 중인 스레드가 그 연결을 받음
+        pool.timeout = 2
+        threading.Timer(0.05, pool.release, args=(held,)).start()
+        entry = pool.acquire()
+        self.assertIs(entry.conn, held.conn)
+        self.assertEqual(pool.stats()["waits"], 2)
+        pool.release(entry)
+
+    def test_max_lifetime_and_health_check(self):
+        pool = ConnectionPool(_connect, max_size=2, max_lifetime=0.01)
+        entry = pool.acquire()
+        time.sleep(0.02)
+        pool.release(entry)  # 수명 초과 → 풀에 남기지 않음
+        self.assertEqual(pool.stats()["idle"], 0)
+        self.assertEqual(pool.stats()["recycled"], 1)
+
+        def bad_ping(conn):
+            raise RuntimeError("gone")
+
+        pool = ConnectionPool(_connect, ping=bad_ping, max_size=2, ping_interval=0)
+        entry = pool.acquire()
+        pool.release(entry)
+        replaced = pool.acquire()
+        self.assertIsNot(replaced.conn, entry.conn)
+        self.assertEqual(pool.stats()["health_check_failures"], 1)
+        pool.release(replaced, discard=True)
+        self.assertEqual(pool.stats()["total"], 0)
+
+
+class TestThreadLocalConnections(unittest.TestCase):
+    def test_reuse_per_thread_and_nested(self):
+        conns = ThreadLocalConnections(lambda: sqlite3.connect(":memory:"))
+        outer = conns.acquire()
+        nested = conns.acquire()  # 같은 스레드 중첩 → 임시 연결
+        self.assertIsNot(nested.conn, outer.conn)
+        conns.release(nested)
+        conns.release(outer)
+        again = conns.acquire()
+        self.assertIs(again.conn, outer.conn)
+        conns.release(again)
+
+        other = []
+
+        def worker():
+            entry = conns.acquire()
+            other.append(entry.conn)
+            entry.conn.execute("SELECT 1")  # check_same_thread 기본값: 만든 스레드에서만 사용
+            conns.release(entry)
+
+        t = threading.Thread(target=worker)
+        t.start()
+        t.join()
+        self.assertIsNot(other[0], outer.conn)
+        stats = conns.stats()
+        self.assertEqual((stats["created"], stats["temporary"], stats["in_use"]), (3, 1, 0))
+
+
+if __name__ == "__main__":
+    unittest.main()
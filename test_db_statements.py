@@ -0,0 +1,26 @@
+"""
+유닛 테스트: SQL 문장 변환 캐시 (엔진별 플레이스홀더, PostgreSQL RETURNING id)
+"""
+import unittest
+from db import compile_sql
+
+
+class TestCompileSql(unittest.TestCase):
+    def test_dialects(self):
+        sql = "INSERT INTO board (type, title) VALUES (%s, %s)"
+        self.assertEqual(compile_sql(sql, "sqlite"), "INSERT INTO board (type, title) VALUES (?, ?)")
+        self.assertEqual(compile_sql(sql, "mysql", returning_id=True), sql)
+        self.assertEqual(compile_sql(sql, "postgres", returning_id=True), sql + " RETURNING id")
+        self.assertEqual(compile_sql(sql + " RETURNING id", "postgres", returning_id=True), sql + " RETURNING id")
+        self.assertEqual(compile_sql("SELECT 1 FROM t WHERE id = %s", "postgres"), "SELECT 1 FROM t WHERE id = %s")
+
+    def test_cached(self):
+        sql = "SELECT id FROM survey_saves WHERE user_email = %s"
+        before = compile_sql.cache_info().hits
+        first = compile_sql(sql, "sqlite")
+        self.assertIs(compile_sql(sql, "sqlite"), first)
+        self.assertGreater(compile_sql.cache_info().hits, before)
+
+
+if __name__ == "__main__":
+    unittest.main()
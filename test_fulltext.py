@@ -0,0 +1,68 @@
+"""
+유닛 테스트: 전문 검색 (SQLite FTS5 trigram 색인 동기화, 순위, 짧은 검색어 LIKE 대체, 페이지)
+"""
+import unittest
+
+import fulltext
+from db_testing import SqliteDbTestCase
+from fulltext import BOARD_SEARCH, SURVEY_TITLE_SEARCH, search
+
+COLUMNS = ("id", "type", "title", "content")
+
+
+class TestFulltext(SqliteDbTestCase):
+    def setUp(self):
+        super().setUp()
+        self.addCleanup(fulltext.reset_cache)
+        fulltext.reset_cache()
+        rows = [
+            ("board", "창업가 역량 안내", "공지 내용"),
+            ("resource", "자료실", "창업가 역량 진단 방법 설명"),
+            ("board", "모임 공지", "다음 주 모임"),
+            ("board", "50% 할인_안내", "특수문자 제목"),
+        ]
+        self.conn.executemany(
+            "INSERT INTO board (type, title, content, created_at, updated_at) VALUES (?, ?, ?, 'now', 'now')", rows,
+        )
+        self.conn.commit()
+
+    def _ids(self, q, **kwargs):
+        rows, _ = search(self.conn, BOARD_SEARCH, q, COLUMNS, **kwargs)
+        return [r["id"] for r in rows]
+
+    def test_ranked_and_filtered(self):
+        self.assertEqual(self._ids("창업가"), [1, 2])  # 제목 일치가 먼저 (bm25 가중치)
+        self.assertEqual(self._ids("창업가 진단 방법"), [2])
+        self.assertEqual(self._ids("창업가", conditions=["type = %s"], args=["resource"]), [2])
+        self.assertEqual(self._ids("없는단어"), [])
+
+    def test_index_follows_writes(self):
+        self.conn.execute("UPDATE board SET content = '창업가 모임' WHERE id = 3")
+        self.conn.execute("DELETE FROM board WHERE id = 1")
+        self.assertEqual(sorted(self._ids("창업가")), [2, 3])
+
+    def test_short_terms_fall_back_to_like(self):
+        self.assertEqual(self._ids("공지"), [3, 1])  # 2글자: trigram 불가 → LIKE, id 최신순
+        self.assertEqual(self._ids("창업가 역량"), [2, 1])  # 단어마다 AND
+        self.assertEqual(self._ids("50%"), [4])
+        self.assertEqual(self._ids("_"), [4])
+
+    def test_pages(self):
+        for i in range(7):
+            self.conn.execute(
+                "INSERT INTO survey_saves (user_email, title, responses_json, required_sequences_json, created_at) "
+                "VALUES ('a@b.c', ?, '', '', 'now')",
+                (f"[전체설문] 창업가 {i}",),
+            )
+        seen, page = [], 1
+        while True:
+            rows, has_more = search(self.conn, SURVEY_TITLE_SEARCH, "창업가", ("id", "title"), page=page, page_size=3)
+            seen += [r["id"] for r in rows]
+            if not has_more:
+                break
+            page += 1
+        self.assertEqual((sorted(seen), page), (list(range(1, 8)), 3))
+
+
+if __name__ == "__main__":
+    unittest.main()
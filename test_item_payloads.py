@@ -0,0 +1,58 @@
+"""
+유닛 테스트: /items 응답 사전 계산 (간편 설문 시드 추첨 재현성)
+"""
+import json
+import unittest
+from data_loader import get_shared_loader
+from item_payloads import ItemPayloads, item_to_dict, etag_matches
+
+
+class TestItemPayloads(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.loader = get_shared_loader()
+        cls.payloads = ItemPayloads(cls.loader)
+
+    def test_full_order_json(self):
+        """번호순 전체 목록 JSON이 문항 dict 목록과 같음"""
+        data = json.loads(self.payloads.full_order_json)
+        self.assertEqual(data["total_items"], 96)
+        self.assertEqual(data["items"], [item_to_dict(i) for i in self.loader.items])
+
+    def test_short_survey_seed_reproducible(self):
+        """같은 시드 → 같은 간편 설문 문항, 하위요소당 최대 2문항"""
+        data = json.loads(self.payloads.short_json(seed=12345))
+        self.assertEqual(data["seed"], 12345)
+        self.assertEqual(data["required_sequences"], [i["전체순번"] for i in data["items"]])
+        self.assertEqual(data["required_sequences"], self.payloads.short_sequences(12345))
+        self.assertEqual(json.loads(self.payloads.short_json(seed=12345)), data)
+
+        per_group = {}
+        for item in data["items"]:
+            key = (item["영역"], item["하위역량"], item["하위요소"])
+            per_group[key] = per_group.get(key, 0) + 1
+        self.assertEqual(set(per_group), set(self.loader.get_groups()))
+        self.assertTrue(all(n <= 2 for n in per_group.values()))
+
+    def test_random_domain_keeps_all_items(self):
+        """역량별 랜덤: 모든 문항 포함, 영역끼리 연속"""
+        data = json.loads(self.payloads.random_domain_json(seed=7))
+        self.assertEqual(sorted(i["전체순번"] for i in data["items"]), list(range(1, 97)))
+        domains = [i["영역"] for i in data["items"]]
+        changes = sum(1 for a, b in zip(domains, domains[1:]) if a != b)
+        self.assertEqual(changes, len(set(domains)) - 1)
+
+    def test_etags(self):
+        """강한 ETag: 같은 카탈로그면 같은 값, If-None-Match 파싱"""
+        self.assertEqual(ItemPayloads(self.loader).full_order_etag, self.payloads.full_order_etag)
+        self.assertEqual(json.loads(self.payloads.health_json)["validation"]["검증_결과"], True)
+        etag = self.payloads.health_etag
+        self.assertTrue(etag_matches(etag, etag))
+        self.assertTrue(etag_matches('"other", W/' + etag, etag))
+        self.assertTrue(etag_matches("*", etag))
+        self.assertFalse(etag_matches(None, etag))
+        self.assertFalse(etag_matches('"other"', etag))
+
+
+if __name__ == "__main__":
+    unittest.main()
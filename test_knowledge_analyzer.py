@@ -0,0 +1,69 @@
+"""
+유닛 테스트: 지식 검색 분석기 (조사 떼기, 글자 n-gram, 토큰 캐시, 분석기 변경 시 색인 다시 fit)
+"""
+import os
+import unittest
+from unittest import mock
+
+import knowledge_analyzer
+import knowledge_db
+import knowledge_index
+from knowledge_analyzer import TokenCache, analyze_char_ngram, analyze_particle, analyze_word, strip_particle
+from knowledge_testing import KnowledgeDbTestCase
+
+
+class TestAnalyzers(unittest.TestCase):
+    def test_particle_stripping(self):
+        self.assertEqual(strip_particle("회복탄력성을"), "회복탄력성")
+        self.assertEqual(strip_particle("창업에서는"), "창업")
+        self.assertEqual(strip_particle("아이"), "아이")  # 어간 1자는 그대로
+        self.assertEqual(strip_particle("brain"), "brain")
+        self.assertEqual(analyze_particle("회복탄력성을 키우는 Brain 훈련"), ["회복탄력성", "키우", "brain", "훈련"])
+        self.assertEqual(analyze_word("회복탄력성을 키우는"), ["회복탄력성을", "키우는"])
+
+    def test_char_ngram(self):
+        self.assertEqual(analyze_char_ngram("뇌교육 sbi 뇌"), ["뇌교", "교육", "뇌교육", "sbi", "뇌"])
+        self.assertTrue(set(analyze_char_ngram("회복탄력성")) <= set(analyze_char_ngram("회복탄력성을")))
+
+    def test_token_cache(self):
+        cache = TokenCache(max_tokens=5)
+        self.assertEqual(cache.tokens("word", "a b c"), ("a", "b", "c"))
+        cache.tokens("word", "a b c")
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+        cache.tokens("word", "d e f")  # 합계 6 > 5: 오래된 문서 버림
+        cache.tokens("word", "a b c")
+        self.assertEqual((cache.hits, cache.misses), (1, 3))
+
+
+class TestIndexAnalyzer(KnowledgeDbTestCase):
+    rows = [
+        (knowledge_db.SOURCE_BLOG, "회복탄력성 기르기", "위기 상황의 회복탄력성", "https://b/1"),
+        (knowledge_db.SOURCE_BLOG, "명상 안내", "호흡과 명상", "https://b/2"),
+    ]
+
+    def setUp(self):
+        patcher = mock.patch.dict(os.environ, {"KNOWLEDGE_ANALYZER": "particle"})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        knowledge_analyzer.token_cache.clear()
+        super().setUp()
+
+    def test_inflected_query_matches(self):
+        self.assertEqual([r.url for r in knowledge_db.search_tfidf("회복탄력성을", limit=2)], ["https://b/1"])
+
+    def test_analyzer_change_refits_with_cached_tokens(self):
+        knowledge_db.search_tfidf("명상")
+        path = knowledge_index.index_dir(knowledge_db.DB_PATH)
+        self.assertEqual(knowledge_index.load(path).analyzer, "particle")
+        misses = knowledge_analyzer.token_cache.misses
+        with mock.patch.dict(os.environ, {"KNOWLEDGE_ANALYZER": "char_ngram"}):
+            self.assertEqual([r.url for r in knowledge_db.search_tfidf("탄력", limit=2)], ["https://b/1"])
+            self.assertEqual(knowledge_index.load(path).analyzer, "char_ngram")
+        hits = knowledge_analyzer.token_cache.hits
+        knowledge_db.search_tfidf("명상")  # particle 로 다시 fit: 문서 토큰은 캐시에서
+        self.assertEqual(knowledge_analyzer.token_cache.misses, misses + 2)
+        self.assertGreaterEqual(knowledge_analyzer.token_cache.hits, hits + 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
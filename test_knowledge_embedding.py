@@ -0,0 +1,95 @@
+"""
+유닛 테스트: 지식 DB 임베딩 색인 (해시 특성 임베딩, float16 메모리 맵, IVF 근사 검색, 다음 검색 때 증분 추가, 하이브리드 검색)
+"""
+import unittest
+from unittest import mock
+
+import numpy as np
+
+import knowledge_db
+import knowledge_embedding
+from knowledge_embedding import hash_embed
+from knowledge_testing import KnowledgeDbTestCase
+
+ROWS = [
+    (knowledge_db.SOURCE_BLOG, "회복탄력성 기르기", "위기 상황에서 회복탄력성을 키우는 방법", "https://b/1"),
+    (knowledge_db.SOURCE_BLOG, "명상 안내", "호흡과 명상으로 뇌를 쉬게 하기", "https://b/2"),
+    (knowledge_db.SOURCE_YOUTUBE, "창업 강의", "창업 아이디어 검증과 시장 조사", "https://y/1"),
+]
+
+
+class TestHashEmbedding(unittest.TestCase):
+    def test_deterministic_and_similar_forms_closer(self):
+        a, b, c = hash_embed(["회복탄력성을 키우는 방법", "회복력이 높아지는 법", "시장 조사 보고서"])
+        np.testing.assert_array_equal(hash_embed(["회복탄력성을 키우는 방법"])[0], a)
+        self.assertAlmostEqual(float(np.linalg.norm(a)), 1.0, places=5)
+        self.assertGreater(float(a @ b), float(a @ c))
+
+
+class TestEmbeddingIndex(KnowledgeDbTestCase):
+    rows = ROWS
+
+    def setUp(self):
+        super().setUp()
+        self.path = knowledge_embedding.index_dir(knowledge_db.DB_PATH)
+
+    def _build(self):
+        conn = knowledge_db.get_connection()
+        try:
+            return knowledge_embedding.current(conn, knowledge_db.DB_PATH)
+        finally:
+            conn.close()
+
+    def test_missing_index_built_in_background(self):
+        """색인이 없으면 요청은 어휘 검색으로 바로 응답, 임베딩은 백그라운드 스레드에서"""
+        with mock.patch.object(knowledge_embedding, "build", wraps=knowledge_embedding.build) as build:
+            self.assertEqual(knowledge_db.search_knowledge("탄력성 키우기", top_k=2), [])
+            knowledge_embedding.wait_for_builds()
+        self.assertEqual(build.call_count, 1)
+        self.assertEqual(knowledge_db.search_knowledge("탄력성 키우기", top_k=2)[0].url, "https://b/1")
+
+    def test_hybrid_finds_paraphrase(self):
+        self._build()
+        self.assertEqual(knowledge_db.search_tfidf("탄력성 키우기", limit=2), [])
+        rows = knowledge_db.search_knowledge("탄력성 키우기", top_k=2)
+        self.assertEqual(rows[0].url, "https://b/1")
+        rows = knowledge_db.search_knowledge("명상", top_k=1)
+        self.assertEqual([r.url for r in rows], ["https://b/2"])
+        self.assertIn("명상", rows[0].snippet)
+
+    def test_float16_memmap_and_append(self):
+        self._build()
+        index = knowledge_embedding.load(self.path)
+        self.assertEqual(index.vectors.dtype, np.float16)
+        self.assertIsInstance(index.vectors, np.memmap)
+        self.assertEqual(index.embedder, "hash-%d" % knowledge_embedding.HASH_DIM)
+        knowledge_db.insert(knowledge_db.SOURCE_BLOG, "집중 훈련", "집중력과 명상", "https://b/3")
+        self.assertEqual(knowledge_embedding.load(self.path).generation, index.generation)  # 삽입 중엔 임베딩 안 함
+        knowledge_db.search_knowledge("집중", top_k=1)
+        appended = knowledge_embedding.load(self.path)
+        self.assertEqual(appended.generation, index.generation + 1)
+        self.assertEqual(list(appended.row_ids), [1, 2, 3, 4])
+        self.assertEqual(appended.meta["trained_docs"], 3)
+
+    def test_ivf_lists_and_exact_probe(self):
+        topics = ["창업 시장 고객", "뇌 명상 호흡", "위기 회복 도전", "협업 공감 소통"]
+        knowledge_db.insert_many([
+            (knowledge_db.SOURCE_BLOG, f"{topics[i % 4]} {i}", f"{topics[i % 4]} 사례 {i}", f"https://n/{i}") for i in range(60)
+        ])
+        with mock.patch.object(knowledge_embedding, "IVF_MIN_DOCS", 30):
+            conn = knowledge_db.get_connection()
+            index = knowledge_embedding.build(conn, self.path)
+            conn.close()
+        nlist = len(index.centroids)
+        self.assertEqual(nlist, int(np.sqrt(63)))
+        self.assertEqual(sorted(index._list_rows.tolist()), list(range(63)))
+        query = "명상 호흡 사례"
+        brute = index.score(query, index.row_ids)
+        expected = [int(index.row_ids[i]) for i in np.argsort(-brute, kind="stable")[:5]]
+        self.assertEqual([i for i, _ in index.search(query, 5, nprobe=nlist)], expected)
+        approx = [i for i, _ in index.search(query, 5, nprobe=2)]
+        self.assertGreaterEqual(len(set(approx) & set(expected)), 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,82 @@
+"""
+유닛 테스트: 지식 DB 전문 색인 (FTS5 트리거 동기화, bm25 키워드 검색·발췌, 후보만 TF-IDF 재정렬, LIKE 대체)
+"""
+import unittest
+from unittest import mock
+
+import knowledge_db
+import knowledge_index
+from knowledge_testing import KnowledgeDbTestCase
+
+ROWS = [
+    (knowledge_db.SOURCE_BLOG, "회복탄력성 기르기", "위기 상황에서 회복탄력성을 키우는 방법. " + "일상 " * 50, "https://b/1"),
+    (knowledge_db.SOURCE_BLOG, "명상 안내", "호흡과 명상으로 뇌를 쉬게 하기", "https://b/2"),
+    (knowledge_db.SOURCE_YOUTUBE, "창업 강의", "창업가의 위기 극복 사례", "https://y/1"),
+]
+
+
+class TestKnowledgeFts(KnowledgeDbTestCase):
+    rows = ROWS
+
+    def _execute(self, sql, args=()):
+        conn = knowledge_db.get_connection()
+        conn.execute(sql, args)
+        conn.commit()
+        conn.close()
+
+    def _urls(self, rows):
+        return [r.url for r in rows]
+
+    def test_keyword_search_ranked_with_snippet(self):
+        rows = knowledge_db.search_keyword("회복탄력성을")
+        self.assertEqual(self._urls(rows), ["https://b/1"])
+        self.assertIn("회복탄력성을", rows[0].snippet)
+        self.assertLess(len(rows[0].snippet), len(rows[0].content))
+        # bm25: 긴 본문(b/1)보다 짧은 본문(y/1)이 먼저
+        self.assertEqual(self._urls(knowledge_db.search_keyword("위기")), ["https://y/1", "https://b/1"])
+        self.assertEqual(self._urls(knowledge_db.search_keyword("위기 창업")), ["https://y/1"])
+        self.assertEqual(knowledge_db.search_keyword("!!"), [])
+
+    def test_triggers_follow_writes(self):
+        self._execute("UPDATE knowledge SET title = '집중', content = '집중 훈련' WHERE url = 'https://b/2'")
+        self.assertEqual(knowledge_db.search_keyword("명상"), [])
+        self.assertEqual(self._urls(knowledge_db.search_keyword("집중")), ["https://b/2"])
+        self._execute("DELETE FROM knowledge WHERE url = 'https://b/2'")
+        self.assertEqual(knowledge_db.search_keyword("집중"), [])
+        knowledge_db.init_db()  # 재실행해도 색인·트리거 유지
+        knowledge_db.insert(knowledge_db.SOURCE_BLOG, "집중력", "집중 명상", "https://b/3")
+        self.assertEqual(self._urls(knowledge_db.search_keyword("집중")), ["https://b/3"])
+
+    def test_tfidf_scores_only_candidates(self):
+        with mock.patch.object(knowledge_index.TfidfIndex, "search_many", side_effect=AssertionError("전체 스캔")):
+            rows = knowledge_db.search_knowledge("위기", top_k=2)
+        self.assertEqual(sorted(self._urls(rows)), ["https://b/1", "https://y/1"])
+        self.assertTrue(all(r.snippet for r in rows))
+        # 후보가 부족하면 전체 행렬로
+        self.assertEqual(self._urls(knowledge_db.search_tfidf("없는단어", limit=2)), [])
+
+    def test_prefix_only_candidates_not_returned(self):
+        """FTS 접두어로만 걸린 후보(TF-IDF 0)는 결과에 넣지 않음: search 와 같은 '코사인 > 0' 조건"""
+        knowledge_db.insert_many([
+            (knowledge_db.SOURCE_BLOG, f"리더십 {i}", "리더십 코칭", f"https://l/{i}") for i in range(6)
+        ] + [(knowledge_db.SOURCE_YOUTUBE, "리더십 강의", "리더십 특강", "https://l/y")])
+        conn = knowledge_db.get_connection()
+        index = knowledge_index.current(conn, knowledge_db.DB_PATH)
+        conn.close()
+        self.assertEqual(index.search("리더", 10), [])
+        self.assertEqual(knowledge_db.search_tfidf("리더", limit=10), [])
+        self.assertEqual(knowledge_db.search_for_report(["리더"]), {"blog": [], "youtube": []})
+        self.assertEqual(len(knowledge_db.search_tfidf("리더십", limit=10)), 7)
+
+    def test_like_fallback_without_fts(self):
+        self._execute("DROP TABLE knowledge_fts")
+        for trigger in ("knowledge_fts_ai", "knowledge_fts_ad", "knowledge_fts_au"):
+            self._execute(f"DROP TRIGGER {trigger}")
+        with mock.patch.object(knowledge_db, "_init_fts"):
+            knowledge_db.insert(knowledge_db.SOURCE_BLOG, "호흡", "호흡 훈련", "https://b/4")
+        self.assertEqual(self._urls(knowledge_db.search_keyword("호흡")), ["https://b/4", "https://b/2"])
+        self.assertEqual(self._urls(knowledge_db.search_tfidf("호흡", limit=1)), ["https://b/4"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,108 @@
+"""
+유닛 테스트: 지식 DB TF-IDF 색인 (저장·메모리 맵 재사용, 다음 검색 때 증분 추가, 프로세스 간 세대 잠금, 삭제·어휘 이탈 시 다시 fit,
+여러 질의 한 번에 검색, 리포트용 출처별 할당·url 중복 제외)
+"""
+import os
+import threading
+import unittest
+
+import knowledge_db
+import knowledge_index
+from knowledge_testing import KnowledgeDbTestCase
+
+ROWS = [
+    (knowledge_db.SOURCE_BLOG, "위기극복 이야기", "위기 극복 회복탄력성 사례", "https://b/1"),
+    (knowledge_db.SOURCE_BLOG, "뇌 유연화 훈련", "뇌 유연화 명상 호흡", "https://b/2"),
+    (knowledge_db.SOURCE_YOUTUBE, "창업 강의", "창업 아이디어 검증 방법", "https://y/1"),
+    (knowledge_db.SOURCE_YOUTUBE, "명상 강의", "호흡 명상 집중", "https://y/2"),
+]
+
+
+class TestKnowledgeIndex(KnowledgeDbTestCase):
+    rows = ROWS
+
+    def setUp(self):
+        super().setUp()
+        self.path = knowledge_index.index_dir(knowledge_db.DB_PATH)
+
+    def _titles(self, query, limit=3):
+        return [r.title for r in knowledge_db.search_tfidf(query, limit=limit)]
+
+    def test_built_once_and_reused(self):
+        self.assertFalse(os.path.exists(self.path))  # 삽입만으로는 만들지 않음
+        self.assertEqual(self._titles("뇌 유연화")[0], "뇌 유연화 훈련")
+        generation = knowledge_index.load(self.path).generation
+        self.assertEqual(self._titles("호흡 명상", limit=2), ["명상 강의", "뇌 유연화 훈련"])
+        self.assertEqual(knowledge_index.load(self.path).generation, generation)
+        self.assertEqual(self._titles("없는단어"), [])
+
+    def test_insert_appends_rows(self):
+        self._titles("창업")
+        index = knowledge_index.load(self.path)
+        knowledge_db.insert(knowledge_db.SOURCE_BLOG, "창업 준비", "창업 아이디어 검증", "https://b/3")
+        # 한 건 삽입은 색인을 쓰지 않고, 다음 검색이 그때까지 쌓인 행을 한 세대로 붙임
+        self.assertEqual(knowledge_index.load(self.path).generation, index.generation)
+        self.assertIn("창업 준비", self._titles("창업 아이디어"))
+        appended = knowledge_index.load(self.path)
+        self.assertEqual(appended.generation, index.generation + 1)
+        self.assertEqual(len(appended.row_ids), 5)
+        self.assertEqual(appended.meta["fitted_docs"], 4)
+        self.assertEqual(appended.vocabulary, index.vocabulary)
+        # 파일은 현재 세대만 남음
+        self.assertEqual(len([f for f in os.listdir(self.path) if f.endswith(".npy")]), len(knowledge_index._ARRAYS))
+
+    def test_refit_on_drift_and_delete(self):
+        self._titles("창업")
+        knowledge_db.insert_many([
+            (knowledge_db.SOURCE_BLOG, "새 주제 %d" % i, "전혀 다른 어휘 목록 %d" % i, "https://n/%d" % i) for i in range(3)
+        ])
+        index = knowledge_index.load(self.path)
+        self.assertEqual(index.meta["fitted_docs"], 7)
+        self.assertIn("어휘", index.vocabulary)
+        conn = knowledge_db.get_connection()
+        conn.execute("DELETE FROM knowledge WHERE url = 'https://y/2'")
+        conn.commit()
+        conn.close()
+        self.assertNotIn("명상 강의", self._titles("호흡 명상"))
+        self.assertEqual(knowledge_index.load(self.path).meta["fitted_docs"], 6)
+
+    def test_sync_waits_for_other_process_generation(self):
+        self._titles("창업")
+        generation = knowledge_index.load(self.path).generation
+        done = threading.Event()
+        rows = [(knowledge_db.SOURCE_BLOG, "창업 준비", "창업 아이디어 검증", "https://b/3")]
+        worker = threading.Thread(target=lambda: (knowledge_db.insert_many(rows), done.set()))
+        conn = knowledge_db.get_connection()
+        self.addCleanup(conn.close)
+        with knowledge_index._generation_lock(self.path):  # 다른 프로세스가 색인을 쓰는 중
+            worker.start()
+            self.assertFalse(done.wait(0.3))
+            knowledge_index.build(conn, self.path, generation)
+        worker.join(5)
+        # 기다린 쪽은 먼저 쓴 세대를 읽고 (새 행이 이미 들어 있어) 같은 세대를 다시 쓰지 않음
+        index = knowledge_index.load(self.path)
+        self.assertEqual(index.generation, generation + 1)
+        self.assertEqual(len(index.row_ids), 5)
+        self.assertIn("창업 준비", self._titles("창업 아이디어"))
+
+    def test_search_many_matches_single_queries(self):
+        queries = ["명상", "창업 방법", "없는단어", "위기 극복"]
+        batched = knowledge_db.search_many(queries, limit=2)
+        for query, rows in zip(queries, batched):
+            self.assertEqual([r.url for r in rows], [r.url for r in knowledge_db.search_tfidf(query, limit=2)])
+
+    def test_search_for_report_quotas(self):
+        knowledge_db.insert(knowledge_db.SOURCE_BLOG, "명상 일기", "호흡 명상 기록", "https://b/4")
+        result = knowledge_db.search_for_report(["명상", "호흡", "창업"], limit_per_source=1)
+        self.assertEqual(set(result), {"blog", "youtube"})
+        self.assertEqual([r.url for r in result["youtube"]], ["https://y/2"])
+        self.assertEqual(len(result["blog"]), 1)
+        result = knowledge_db.search_for_report(["명상", "호흡", "창업"], quotas={"blog": 3, "youtube": 0})
+        self.assertEqual(result["youtube"], [])
+        urls = [r.url for r in result["blog"]]
+        self.assertEqual(len(urls), len(set(urls)))
+        self.assertTrue(all(r.source_type == knowledge_db.SOURCE_BLOG for r in result["blog"]))
+
+
+if __name__ == "__main__":
+    unittest.main()
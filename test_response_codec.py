@@ -0,0 +1,131 @@
+"""
+유닛 테스트: 설문 응답 이진 포맷 (왕복, 크기, 표현 불가 입력, 배치 행렬 디코드, survey_saves 저장 컬럼·집단 채점 행렬)
+"""
+import json
+import unittest
+
+import numpy as np
+
+import survey_storage
+from db_testing import SqliteDbTestCase
+from response_codec import PackedSurvey, decode_matrix, pack, roundtrips, unpack
+from scoring import get_shared_engine
+
+
+class TestResponseCodec(unittest.TestCase):
+    def test_roundtrip_full_survey(self):
+        responses = {seq: (seq % 5) + 1 for seq in range(1, 97)}
+        blob = pack(responses, list(range(1, 97)), [])
+        self.assertEqual(len(blob), 3 + 48 + 12 + 12)
+        self.assertEqual(unpack(blob), (responses, list(range(1, 97)), []))
+
+    def test_partial_and_sets(self):
+        blob = pack({3: 2, 96: 5}, [96, 3, 10], [1, 2])
+        p = PackedSurvey(memoryview(blob))
+        self.assertEqual(p.responses, {3: 2, 96: 5})
+        self.assertEqual(p.required_sequences, [3, 10, 96])
+        self.assertEqual(p.excluded_sequences, [1, 2])
+        self.assertEqual(unpack(pack({}, [], None)), ({}, [], []))
+
+    def test_unrepresentable(self):
+        self.assertIsNone(pack({1: 0}, [1]))
+        self.assertIsNone(pack({1: 16}, [1]))
+        self.assertIsNone(pack({1: True}, [1]))
+        self.assertIsNone(pack({1: 3}, [1, 1]))
+        self.assertIsNone(pack({70000: 3}, []))
+        with self.assertRaises(ValueError):
+            PackedSurvey(b"\x02\x00\x00")
+
+    def test_decode_matrix_matches_to_matrix(self):
+        plan = get_shared_engine().plan
+        rows = [
+            ({seq: (seq * 7) % 5 + 1 for seq in range(1, 97)}, list(range(1, 97)), [4, 50]),
+            ({1: 5, 2: 4}, [1, 2], []),
+        ]
+        matrix, mask = decode_matrix([pack(*r) for r in rows], plan.n_columns)
+        np.testing.assert_array_equal(matrix, plan.to_matrix([r[0] for r in rows]))
+        np.testing.assert_array_equal(mask, plan.exclusion_mask([r[2] for r in rows]))
+        batch = plan.score_matrix(matrix, mask)
+        expected = plan.score(rows[0][0], rows[0][2])
+        self.assertAlmostEqual(batch.overall_means[0], expected.전체평균)
+
+    def test_roundtrips(self):
+        self.assertTrue(roundtrips(pack({1: 5}, [1, 3], [2]), {1: 5}, [1, 3], [2]))
+        self.assertFalse(roundtrips(pack({1: 5}, [3, 1], [2]), {1: 5}, [3, 1], [2]))
+
+
+class TestSurveyStorageColumns(SqliteDbTestCase):
+    """packed 만으로 되살릴 수 있으면 JSON 은 비워 저장, 순서가 있는 간편 설문은 JSON 도 함께 (순서 유지)"""
+
+    def setUp(self):
+        super().setUp()
+        self.use_conn(survey_storage)
+
+    def _json(self, save_id):
+        return self.conn.execute("SELECT responses_json FROM survey_saves WHERE id = ?", (save_id,)).fetchone()[0]
+
+    def _insert_legacy(self, responses_json, required_json, excluded_json, packed=None):
+        """JSON 을 함께 남기던 때(또는 packed 이전) 저장된 행."""
+        cur = self.conn.execute(
+            "INSERT INTO survey_saves (user_email, title, responses_json, required_sequences_json, excluded_sequences_json, "
+            "responses_packed, created_at) VALUES ('a@x.com', 't', ?, ?, ?, ?, datetime('now'))",
+            (responses_json, required_json, excluded_json, packed),
+        )
+        return cur.lastrowid
+
+    def test_save_writes_packed_only_when_exact(self):
+        shuffled = survey_storage.save_survey("a@x.com", {7: 4, 2: 5}, [7, 2], [9, 4])["id"]
+        ordered = survey_storage.save_survey("a@x.com", {1: 3, 2: 5}, [1, 2], [])["id"]
+        self.assertNotEqual(self._json(shuffled), "")
+        self.assertEqual(self._json(ordered), "")
+        saved = survey_storage.get_saved("a@x.com", shuffled)
+        self.assertEqual((saved["responses"], saved["required_sequences"], saved["excluded_sequences"]),
+                         ({2: 5, 7: 4}, [7, 2], [9, 4]))
+        saved = survey_storage.get_saved("a@x.com", ordered)
+        self.assertEqual((saved["responses"], saved["required_sequences"], saved["excluded_sequences"]),
+                         ({1: 3, 2: 5}, [1, 2], []))
+        survey_storage.update_survey(shuffled, "a@x.com", {7: 4, 2: 5}, [2, 7], [4, 9])
+        self.assertEqual(self._json(shuffled), "")
+        self.assertEqual(survey_storage.get_saved("a@x.com", shuffled)["required_sequences"], [2, 7])
+
+    def test_compact_legacy_rows(self):
+        exact = self._insert_legacy('{"1": 3}', "[1]", "[]", pack({1: 3}, [1], []))
+        ordered = self._insert_legacy('{"1": 3}', "[3, 1]", "[]", pack({1: 3}, [3, 1], []))
+        self.assertEqual(survey_storage.compact_json_columns(), 1)
+        self.assertEqual(self._json(exact), "")
+        self.assertNotEqual(self._json(ordered), "")
+        self.assertEqual(survey_storage.get_saved("a@x.com", exact)["responses"], {1: 3})
+        self.assertEqual(survey_storage.compact_json_columns(), 0)
+
+    def test_load_response_matrix_matches_per_row_scoring(self):
+        """packed 만 / JSON+packed / JSON 만(옛 행) 섞여도 행별 calculate_score 와 같은 결과, 최신순"""
+        engine = get_shared_engine()
+        full = {seq: (seq * 3) % 5 + 1 for seq in range(1, 97)}
+        cases = [
+            (full, list(range(1, 97)), [5, 40]),
+            ({seq: 4 for seq in range(1, 60, 2)}, [59, 1, 3], [96, 2]),
+            ({1: 5, 2: 1, 50: 3}, [1, 2, 50], []),
+        ]
+        for responses, required, excluded in cases:
+            survey_storage.save_survey("a@x.com", responses, required, excluded)
+        legacy = {seq: 2 for seq in range(10, 30)}
+        self._insert_legacy(json.dumps({str(k): v for k, v in legacy.items()}), "[]", "[12, 13]")
+        cases.append((legacy, [], [12, 13]))
+
+        ids, matrix, mask, truncated = survey_storage.load_response_matrix(engine.plan.n_columns)
+        self.assertFalse(truncated)
+        self.assertEqual(ids, sorted(ids, reverse=True))
+        batch = engine.calculate_batch(matrix, mask)
+        for row, (responses, _, excluded) in enumerate(reversed(cases)):
+            expected = engine.calculate_score(responses, excluded)
+            self.assertAlmostEqual(batch.overall_means[row], expected.전체평균)
+            self.assertEqual(int(batch.used_counts[row]), expected.사용된_문항수)
+
+        ids2, matrix2, _, truncated = survey_storage.load_response_matrix(engine.plan.n_columns, limit=2)
+        self.assertTrue(truncated)
+        self.assertEqual(ids2, ids[:2])
+        np.testing.assert_array_equal(matrix2, matrix[:2])
+
+
+if __name__ == "__main__":
+    unittest.main()
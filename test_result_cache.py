@@ -0,0 +1,67 @@
+"""
+유닛 테스트: 분석 결과 캐시 (canonical fingerprint, LRU/TTL, 시드 기반 캐시 여부)
+"""
+import time
+import unittest
+from result_cache import (
+    ResultCache, fingerprint, normalize_exclusions, cached_detailed_score, score_cache,
+)
+from scoring import get_shared_engine
+
+
+class TestResultCache(unittest.TestCase):
+    def test_fingerprint_canonical(self):
+        """dict 순서, 정수/실수 표기, 제외 순번 순서·중복과 무관하게 같은 키"""
+        a = fingerprint({1: 5, 2: 3}, normalize_exclusions([3, 1, 3]), {"w": 0.6})
+        b = fingerprint({2: 3.0, 1: 5}, normalize_exclusions([1, 3]), {"w": 0.6})
+        self.assertEqual(a, b)
+        self.assertNotEqual(a, fingerprint({1: 5, 2: 4}, normalize_exclusions([1, 3]), {"w": 0.6}))
+
+    def test_lru_eviction_and_counters(self):
+        cache = ResultCache("t", maxsize=2, ttl_seconds=60)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        self.assertEqual(cache.get("a"), 1)  # a 최근 사용 → b 가 퇴출 대상
+        cache.put("c", 3)
+        self.assertIsNone(cache.get("b"))
+        stats = cache.stats()
+        self.assertEqual((stats["size"], stats["hits"], stats["misses"], stats["evictions"]), (2, 1, 1, 1))
+
+    def test_ttl_and_uncacheable(self):
+        cache = ResultCache("t", maxsize=4, ttl_seconds=0.01)
+        cache.put("a", 1)
+        time.sleep(0.02)
+        self.assertIsNone(cache.get("a"))
+        calls = []
+        cache.get_or_compute("x", lambda: calls.append(1), cacheable=False)
+        cache.get_or_compute("x", lambda: calls.append(1), cacheable=False)
+        self.assertEqual(len(calls), 2)
+        self.assertEqual(cache.stats()["size"], 0)
+
+    def test_cached_detailed_score_reuses_result(self):
+        engine = get_shared_engine()
+        responses = {seq: (seq % 5) + 1 for seq in range(1, 97)}
+        key1, first = cached_detailed_score(engine, responses, [5, 2])
+        hits = score_cache.hits
+        key2, second = cached_detailed_score(engine, dict(reversed(list(responses.items()))), [2, 5, 5])
+        self.assertEqual(key1, key2)
+        self.assertIs(first.survey.영역별점수, second.survey.영역별점수)
+        self.assertEqual(score_cache.hits, hits + 1)
+        self.assertEqual(first, engine.calculate_detailed(responses, excluded_sequences=[2, 5]))
+        self.assertEqual(second, engine.calculate_detailed(responses, excluded_sequences=[2, 5, 5]))
+
+    def test_cached_detailed_score_keeps_requested_exclusions(self):
+        """제외_순번은 캐시 없을 때처럼 호출자 목록을 정렬한 값 (중복 포함), 캐시 값은 첫 호출자 목록에 물들지 않음"""
+        engine = get_shared_engine()
+        responses = {seq: (seq % 4) + 1 for seq in range(1, 97)}
+        _, first = cached_detailed_score(engine, responses, [7, 3, 7])
+        _, second = cached_detailed_score(engine, responses, iter([3, 7]))
+        self.assertEqual(first.survey.제외된_순번, [3, 7, 7])
+        self.assertEqual(second.survey.제외된_순번, [3, 7])
+        self.assertEqual(second, engine.calculate_detailed(responses, excluded_sequences=[3, 7]))
+        _, third = cached_detailed_score(engine, responses, [3, 7])
+        self.assertIs(third, second)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,9 +1,51 @@
 """
 유닛 테스트: 채점 로직 검증
 """
+import random
 import unittest
 from data_loader import SurveyDataLoader
-from scoring import ScoringEngine
+from scoring import ScoringEngine, _domain_sort_key
+from models import DomainScore, SurveyResult
+
+
+def _reference_score(items, responses, excluded_sequences):
+    """채점 계획 도입 전 calculate_score 로직 (결과 동일성 비교용)."""
+    excluded_set = set(excluded_sequences)
+    filtered_items = [item for item in items if item.전체순번 not in excluded_set]
+    domain_scores = []
+    all_scores = []
+    for domain_name in sorted(set(item.영역 for item in filtered_items)):
+        scores, included = [], []
+        for item in filtered_items:
+            if item.영역 == domain_name and item.전체순번 in responses:
+                score = responses[item.전체순번]
+                if 1 <= score <= 5:
+                    scores.append(score)
+                    included.append(item.전체순번)
+                    all_scores.append(score)
+        if scores:
+            domain_scores.append(DomainScore(domain_name, round(sum(scores) / len(scores), 2), len(scores), included))
+    domain_scores.sort(key=lambda d: _domain_sort_key(d.영역명))
+    overall = round(sum(all_scores) / len(all_scores), 2) if all_scores else 0.0
+    return SurveyResult(overall, domain_scores, len(all_scores), sorted(excluded_sequences))
+
+
+def _reference_sub_scores(items, responses, excluded_sequences):
+    """엔진 이전 /analyze-sbi 의 하위역량별 점수 로직 (결과 동일성 비교용)."""
+    excluded_set = set(excluded_sequences)
+    all_items = sorted(items, key=lambda x: x.전체순번)
+    order_sub = []
+    for it in all_items:
+        key = (it.하위역량 or "").strip()
+        if key and key not in order_sub:
+            order_sub.append(key)
+    out = []
+    for sub_name in order_sub:
+        group_items = [it for it in all_items if (it.하위역량 or "").strip() == sub_name and it.전체순번 not in excluded_set]
+        scores = [responses[it.전체순번] for it in group_items if it.전체순번 in responses and 1 <= responses[it.전체순번] <= 5]
+        점수 = round((sum(scores) / len(scores) - 1) / 4 * 100, 1) if scores else None
+        out.append({"하위역량": sub_name, "점수_0_100": 점수})
+    return out
 
 
 class TestScoring(unittest.TestCase):
@@ -28,6 +70,30 @@ class TestScoring(unittest.TestCase):
         domains = set(item.영역 for item in self.data_loader.items)
         self.assertEqual(len(domains), 4, "4대 영역이 모두 존재해야 합니다")
     
+    def test_loader_indexes(self):
+        """문항 인덱스 조회 결과가 전체 목록 탐색 결과와 같은지 검증"""
+        items = self.data_loader.items
+        for item in items:
+            self.assertIs(self.data_loader.get_item_by_sequence(item.전체순번), item)
+        self.assertIsNone(self.data_loader.get_item_by_sequence(0))
+        for domain in set(item.영역 for item in items):
+            self.assertEqual(
+                list(self.data_loader.get_items_by_domain(domain)),
+                [item for item in items if item.영역 == domain],
+            )
+        groups = self.data_loader.get_groups()
+        self.assertEqual(sum(len(g) for g in groups.values()), 96)
+        for (영역, 하위역량, 하위요소), group in groups.items():
+            self.assertEqual(self.data_loader.get_items_by_group(영역, 하위역량, 하위요소), group)
+        self.assertEqual(
+            list(self.data_loader.get_selected_sequences()),
+            [item.전체순번 for item in items if (item.비고 or "").strip() == "선택"],
+        )
+        self.assertEqual(
+            list(self.data_loader.get_excluded_sequences()),
+            [item.전체순번 for item in items if (item.비고 or "").strip() == "제외"],
+        )
+    
     def test_full_survey_scoring(self):
         """전체 문항 분석 테스트"""
         # 예시문항 데이터로 전체 문항 점수 계산
@@ -121,6 +187,105 @@ class TestScoring(unittest.TestCase):
         print(f"사용된 문항수: {result.사용된_문항수}")
         print(f"제외된 순번: {result.제외된_순번}")
 
+    def test_scoring_plan_matches_reference(self):
+        """채점 계획(ScoringPlan) 결과가 기존 로직과 완전히 동일한지 검증"""
+        plan = self.scoring_engine.plan
+        self.assertEqual(len(plan.domain_names), 4)
+        self.assertEqual(sum(len(s) for s in plan.domain_sequences), 96)
+
+        rng = random.Random(20240101)
+        items = self.data_loader.items
+        for _ in range(200):
+            # 일부 미응답·범위 밖 점수·제외 문항을 섞어 비교
+            responses = {}
+            for item in items:
+                r = rng.random()
+                if r < 0.1:
+                    continue
+                responses[item.전체순번] = rng.choice([0, 6]) if r < 0.15 else rng.randint(1, 5)
+            excluded = rng.sample(range(1, 97), rng.randint(0, 40))
+            self.assertEqual(
+                self.scoring_engine.calculate_score(responses, excluded),
+                _reference_score(items, responses, excluded),
+            )
+        self.assertEqual(
+            self.scoring_engine.calculate_score({}, None),
+            _reference_score(items, {}, []),
+        )
+
+    def test_batch_scoring_matches_per_row(self):
+        """배치 채점(calculate_batch) 결과가 행별 calculate_score 와 동일한지 검증"""
+        import math
+        plan = self.scoring_engine.plan
+        rng = random.Random(7)
+        responses_list, excluded_list = [], []
+        for _ in range(300):
+            responses_list.append({seq: rng.randint(0, 6) for seq in range(1, 97) if rng.random() > 0.2})
+            excluded_list.append(rng.sample(range(1, 97), rng.randint(0, 48)))
+        responses_list.append({})
+        excluded_list.append([])
+
+        batch = self.scoring_engine.calculate_batch(
+            plan.to_matrix(responses_list), plan.exclusion_mask(excluded_list)
+        )
+        for i, (responses, excluded) in enumerate(zip(responses_list, excluded_list)):
+            result = self.scoring_engine.calculate_score(responses, excluded)
+            by_name = {d.영역명: d for d in result.영역별점수}
+            self.assertEqual(float(batch.overall_means[i]), result.전체평균)
+            self.assertEqual(int(batch.used_counts[i]), result.사용된_문항수)
+            for j, name in enumerate(batch.domain_names):
+                if name in by_name:
+                    self.assertEqual(float(batch.domain_means[i, j]), by_name[name].평균점수)
+                    self.assertEqual(int(batch.item_counts[i, j]), by_name[name].문항수)
+                else:
+                    self.assertTrue(math.isnan(batch.domain_means[i, j]))
+                    self.assertEqual(int(batch.item_counts[i, j]), 0)
+
+    def test_shared_loader_reuse_and_reload(self):
+        """공유 카탈로그: 같은 CSV는 재사용, 파일이 바뀌면 다시 로드"""
+        import os
+        import shutil
+        import tempfile
+        import data_loader as data_loader_module
+        from scoring import get_shared_engine
+
+        tmp_dir = tempfile.mkdtemp()
+        try:
+            csv_path = os.path.join(tmp_dir, "survey_items.csv")
+            shutil.copy(self.data_loader.csv_path, csv_path)
+            first = data_loader_module.get_shared_loader(csv_path)
+            self.assertIs(first, data_loader_module.get_shared_loader(csv_path))
+            self.assertIs(get_shared_engine(csv_path).data_loader, first)
+
+            st = os.stat(csv_path)
+            os.utime(csv_path, ns=(st.st_atime_ns, st.st_mtime_ns + 5_000_000_000))
+            old_interval = data_loader_module.SHARED_RELOAD_CHECK_SECONDS
+            data_loader_module.SHARED_RELOAD_CHECK_SECONDS = 0
+            try:
+                second = data_loader_module.get_shared_loader(csv_path)
+            finally:
+                data_loader_module.SHARED_RELOAD_CHECK_SECONDS = old_interval
+            self.assertIsNot(first, second)
+            self.assertEqual(len(second.items), 96)
+            self.assertIs(get_shared_engine(csv_path).data_loader, second)
+        finally:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    def test_detailed_scoring_matches_reference(self):
+        """하위역량 점수(calculate_detailed)가 기존 /analyze-sbi 로직·calculate_score 와 동일한지 검증"""
+        rng = random.Random(99)
+        items = self.data_loader.items
+        for _ in range(100):
+            responses = {seq: rng.randint(0, 6) for seq in range(1, 97) if rng.random() > 0.3}
+            excluded = rng.sample(range(1, 97), rng.randint(0, 60))
+            detailed = self.scoring_engine.calculate_detailed(responses, excluded)
+            self.assertEqual(detailed.survey, self.scoring_engine.calculate_score(responses, excluded))
+            self.assertEqual(
+                [{"하위역량": s.하위역량, "점수_0_100": s.점수_0_100} for s in detailed.하위역량별점수],
+                _reference_sub_scores(items, responses, excluded),
+            )
+            self.assertEqual(sum(e.문항수 for e in detailed.하위요소별점수), detailed.survey.사용된_문항수)
+
 
 def run_tests():
     """테스트 실행 및 결과 보고"""
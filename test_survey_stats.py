@@ -0,0 +1,78 @@
+"""
+유닛 테스트: 설문진단 통계 (일별 롤업 갱신·재계산, 롤업 / 단일 집계 쿼리 경로, 최근 7일)
+"""
+import unittest
+from datetime import datetime, timedelta
+
+import fulltext
+import survey_stats
+import survey_storage
+from db_testing import SqliteDbTestCase
+
+
+def _day(days_ago: int) -> str:
+    return (datetime.utcnow() - timedelta(days=days_ago)).strftime("%Y-%m-%d")
+
+
+class TestSurveyStats(SqliteDbTestCase):
+    def setUp(self):
+        super().setUp()
+        rows = [
+            ("a@x.com", "창업 진단 1", _day(0)),
+            ("a@x.com", "창업 진단 2", _day(0)),
+            ("b@x.com", "모의 설문", _day(3)),
+            ("b@x.com", "창업 진단 3", _day(10)),
+        ]
+        for user, title, day in rows:
+            self.conn.execute(
+                "INSERT INTO survey_saves (user_email, title, update_count, responses_json, required_sequences_json, created_at) "
+                "VALUES (?, ?, 0, '', '', ?)",
+                (user, title, day + " 09:00:00"),
+            )
+            survey_stats.bump(self.conn, day + " 09:00:00", 1)
+
+    def _rollup(self):
+        return {r["day"]: r["saves"] for r in self.conn.execute("SELECT day, saves FROM survey_daily_stats WHERE saves > 0")}
+
+    def test_rollup_path(self):
+        stats = survey_stats.diagnosis_stats(self.conn)
+        self.assertEqual(stats["source"], "rollup")
+        self.assertEqual((stats["total_count"], stats["last_7_days_count"]), (4, 3))
+        self.assertEqual(stats["daily"], [{"day": _day(10), "count": 1}, {"day": _day(3), "count": 1}, {"day": _day(0), "count": 2}])
+        stats = survey_stats.diagnosis_stats(self.conn, date_from=_day(5), date_to=_day(1))
+        self.assertEqual((stats["total_count"], stats["last_7_days_count"]), (1, 1))
+
+    def test_scan_path_matches_filters(self):
+        stats = survey_stats.diagnosis_stats(self.conn, q="창업")
+        self.assertEqual(stats["source"], "scan")
+        self.assertEqual((stats["total_count"], stats["last_7_days_count"]), (3, 2))
+        stats = survey_stats.diagnosis_stats(self.conn, user_email="b@x.com", date_from=_day(5))
+        self.assertEqual(stats["daily"], [{"day": _day(3), "count": 1}])
+
+    def test_scan_counts_same_rows_as_list(self):
+        """여러 단어 q: 통계도 목록(전문 검색)과 같은 단어별 조건 — 문구 전체 LIKE 가 아님"""
+        self.use_conn(survey_storage)
+        fulltext.reset_cache()
+        self.addCleanup(fulltext.reset_cache)
+        self.conn.execute(
+            "INSERT INTO survey_saves (user_email, title, update_count, responses_json, required_sequences_json, created_at) "
+            "VALUES ('c@x.com', '회복탄력성 점검', 0, '', '', ?)",
+            (_day(1) + " 09:00:00",),
+        )
+        # 2자 단어는 단어별 LIKE, 3자 이상은 FTS5 색인
+        for q in ("진단 창업", "창업 진단 3", "모의", "탄력성 회복탄"):
+            listed = survey_storage.list_saved_page(q=q)["items"]
+            stats = survey_stats.diagnosis_stats(self.conn, q=q)
+            self.assertEqual(stats["total_count"], len(listed), q)
+        self.assertEqual(survey_stats.diagnosis_stats(self.conn, q="진단 창업")["total_count"], 3)
+
+    def test_bump_and_rebuild(self):
+        survey_stats.bump(self.conn, _day(0) + " 10:00:00", -2)
+        survey_stats.bump(self.conn, _day(1) + " 10:00:00", 1)
+        self.assertEqual(self._rollup(), {_day(10): 1, _day(3): 1, _day(1): 1})
+        self.assertEqual(survey_stats.rebuild(self.conn), 3)
+        self.assertEqual(self._rollup(), {_day(10): 1, _day(3): 1, _day(0): 2})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,185 @@
+"""upload_sqlite_to_remote: id 순 묶음 읽기, 체크포인트 재개, COPY 용 CSV 변환 (대상 DB 없이 SQLite 만 사용)."""
+import csv
+import io
+import os
+import sqlite3
+import tempfile
+import unittest
+from unittest import mock
+
+import upload_sqlite_to_remote as up
+from db_migrations import migrate
+
+
+class _ListWriter:
+    """전송된 묶음을 기록하는 대상. fail_after 번째 묶음에서 예외 (중단 상황 재현)."""
+
+    engine = None
+
+    def __init__(self, sink, fail_after=None):
+        self.sink = sink
+        self.fail_after = fail_after
+        self.finished = False
+
+    def write(self, rows):
+        if self.fail_after is not None and len(self.sink) >= self.fail_after:
+            raise RuntimeError("connection lost")
+        self.sink.append(list(rows))
+        return len(rows)
+
+    def finish(self):
+        self.finished = True
+
+    def close(self):
+        pass
+
+
+class TestUpload(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.tmp.name, "src.db")
+        self.cp_path = os.path.join(self.tmp.name, "cp.json")
+        conn = sqlite3.connect(self.db_path)
+        conn.execute("CREATE TABLE board (id INTEGER PRIMARY KEY, type TEXT, title TEXT, content TEXT, created_at TEXT, updated_at TEXT)")
+        conn.executemany(
+            "INSERT INTO board (id, type, title, content, created_at, updated_at) VALUES (?, 'notice', ?, '', '2024-01-01', NULL)",
+            [(i * 2, f"t{i}") for i in range(1, 26)],  # id 가 띄엄띄엄이어도 keyset 으로 읽힘
+        )
+        conn.commit()
+        conn.close()
+        self.columns = dict(up._TABLES)["board"]
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_iter_chunks_keyset(self):
+        conn = sqlite3.connect(self.db_path)
+        chunks = list(up.iter_chunks(conn, "board", self.columns, 10, 7))
+        conn.close()
+        ids = [r[0] for chunk in chunks for r in chunk]
+        self.assertEqual(ids, list(range(12, 51, 2)))
+        self.assertEqual([len(c) for c in chunks], [7, 7, 6])
+
+    def test_resume_from_checkpoint(self):
+        sink = []
+        cp = up.Checkpoint(self.cp_path, "t")
+        with self.assertRaises(RuntimeError):
+            up.transfer_table(self.db_path, "board", self.columns, lambda t, c: _ListWriter(sink, fail_after=2), cp, 10)
+        self.assertEqual(up.Checkpoint(self.cp_path, "t").get("board")["last_id"], 40)
+
+        # 다시 실행: 파일에서 체크포인트를 읽어 id > 40 부터
+        cp = up.Checkpoint(self.cp_path, "t")
+        result = up.transfer_table(self.db_path, "board", self.columns, lambda t, c: _ListWriter(sink), cp, 10)
+        self.assertEqual(result["resumed_from"], 40)
+        self.assertEqual(result["rows"], 5)
+        ids = [r[0] for chunk in sink for r in chunk]
+        self.assertEqual(ids, list(range(2, 51, 2)))
+        state = up.Checkpoint(self.cp_path, "t").get("board")
+        self.assertEqual((state["last_id"], state["rows"]), (50, 25))
+
+        # 끝난 테이블도 건너뛰지 않고 last_id 다음부터 (그 뒤 로컬에 저장된 행), reset 이면 처음부터
+        conn = sqlite3.connect(self.db_path)
+        conn.execute("INSERT INTO board (id, type, title, content, created_at, updated_at) VALUES (60, 'notice', 'new', '', '2024-01-02', NULL)")
+        conn.commit()
+        conn.close()
+        new_rows = []
+        again = up.transfer_table(self.db_path, "board", self.columns, lambda t, c: _ListWriter(new_rows), up.Checkpoint(self.cp_path, "t"), 10)
+        self.assertEqual((again["rows"], new_rows[0][0][0]), (1, 60))
+        fresh = up.Checkpoint(self.cp_path, "t", reset=True)
+        self.assertEqual(fresh.get("board")["last_id"], 0)
+
+    def test_completed_run_clears_checkpoint(self):
+        """오류 없이 끝나면 체크포인트 파일 삭제 → 다음 실행은 전체를 다시 보냄 (update 모드면 바뀐 행도)"""
+        sink = []
+        up.run_transfer(self.db_path, lambda t, c: _ListWriter(sink), up.Checkpoint(self.cp_path, "t"), tables=["board"])
+        self.assertFalse(os.path.exists(self.cp_path))
+        up.run_transfer(self.db_path, lambda t, c: _ListWriter(sink), up.Checkpoint(self.cp_path, "t"), tables=["board"])
+        self.assertEqual(sum(len(chunk) for chunk in sink), 50)
+
+        # 실패한 테이블이 있으면 체크포인트 유지
+        up.run_transfer(self.db_path, lambda t, c: _ListWriter([], fail_after=2), up.Checkpoint(self.cp_path, "t"),
+                        tables=["board"], chunk_size=10)
+        self.assertEqual(up.Checkpoint(self.cp_path, "t").get("board")["last_id"], 40)
+
+    def test_survey_saves_rebuilds_target_rollup(self):
+        src = sqlite3.connect(self.db_path)
+        migrate(src, "sqlite")
+        src.executemany(
+            "INSERT INTO survey_saves (user_email, title, responses_json, required_sequences_json, created_at) VALUES ('a', 't', '{}', '[]', ?)",
+            [("2024-01-01 09:00:00",), ("2024-01-01 10:00:00",), ("2024-01-02 09:00:00",)],
+        )
+        src.commit()
+        src.close()
+        target = sqlite3.connect(":memory:")
+        migrate(target, "sqlite")
+        self.addCleanup(target.close)
+
+        class _SqliteTarget(_ListWriter):
+            engine = "sqlite"
+
+            def write(self, rows):
+                target.executemany(f"INSERT INTO survey_saves ({', '.join(cols)}) VALUES ({', '.join('?' * len(cols))})", rows)
+                return len(rows)
+
+            def execute(self, statements):
+                for stmt in statements:
+                    target.execute(stmt)
+
+        cols = dict(up._TABLES)["survey_saves"]
+        up.transfer_table(self.db_path, "survey_saves", cols, lambda t, c: _SqliteTarget([]), up.Checkpoint(None, "t"), 10)
+        rollup = target.execute("SELECT day, saves FROM survey_daily_stats ORDER BY day").fetchall()
+        self.assertEqual(rollup, [("2024-01-01", 2), ("2024-01-02", 1)])
+
+    def test_run_transfer_dry_run_skips_missing_tables(self):
+        results = up.run_transfer(self.db_path, up.DryRunWriter, up.Checkpoint(None, "dry"), chunk_size=4, jobs=3)
+        by_table = {r["table"]: r for r in results}
+        self.assertEqual(by_table["board"]["rows"], 25)
+        self.assertIn("skipped", by_table["users"])
+        self.assertFalse(os.path.exists(self.cp_path))
+
+    def test_mysql_counts_new_rows_not_affected_rows(self):
+        """MySQL affected rows (신규 1, 덮어씀 2, 같은 값 0) 대신 실제 신규 행 수"""
+        remote = {2: "old", 4: "same"}
+
+        class _Cursor:
+            def __enter__(self):
+                return self
+
+            def __exit__(self, *exc):
+                return False
+
+            def execute(self, sql, ids):
+                self.count = sum(1 for i in ids if i in remote)
+
+            def fetchone(self):
+                return (self.count,)
+
+            def executemany(self, sql, rows):
+                affected = 0
+                for row_id, title in rows:
+                    if row_id not in remote:
+                        affected += 1
+                    elif "VALUES(title)" in sql and remote[row_id] != title:
+                        affected += 2
+                    else:
+                        continue
+                    remote[row_id] = title
+                return affected
+
+        conn = mock.Mock()
+        conn.cursor.side_effect = _Cursor
+        rows = [(2, "new"), (4, "same"), (6, "x")]
+        with mock.patch("pymysql.connect", return_value=conn):
+            self.assertEqual(up.MySQLWriter({}, "board", ["id", "title"], "update").write(rows), 1)
+            self.assertEqual(remote, {2: "new", 4: "same", 6: "x"})
+            self.assertEqual(up.MySQLWriter({}, "board", ["id", "title"], "skip").write(rows + [(8, "y")]), 1)
+
+    def test_copy_csv_distinguishes_null_and_empty(self):
+        buf = up.PostgresWriter._to_csv([(1, "", None, 'a,"b"\nc')])
+        line = buf.getvalue()
+        self.assertTrue(line.startswith('1,"",,'))
+        self.assertEqual(next(csv.reader(io.StringIO(line)))[3], 'a,"b"\nc')
+
+
+if __name__ == "__main__":
+    unittest.main()
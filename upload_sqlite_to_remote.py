@@ -1,6 +1,14 @@
 #!/usr/bin/env python3
 """
-로컬 SQLite(sbi.db) 데이터를 배포 DB(PostgreSQL/Supabase 또는 MySQL)로 업로드하는 일회성 스크립트.
+로컬 SQLite(sbi.db) 데이터를 배포 DB(PostgreSQL/Supabase 또는 MySQL)로 업로드하는 대량 전송 도구.
+- SQLite 를 id 순 묶음(chunk) 단위로 읽음 (테이블 전체를 메모리에 올리지 않음)
+- PostgreSQL: 묶음마다 임시 테이블로 COPY 후 INSERT ... SELECT ... ON CONFLICT (id)
+- MySQL: 묶음마다 다중 행 INSERT ... ON DUPLICATE KEY
+- 테이블별 재개 체크포인트 (마지막으로 커밋한 id) → 중단 후 다시 실행하면 그 id 다음부터 이어서 전송.
+  모든 테이블이 끝나면 체크포인트를 지우므로, 다음 실행은 예전처럼 전체를 다시 보냄
+  (--mode skip 은 새 행만 들어가고, --mode update 는 바뀐 행도 덮어씀)
+- survey_saves 를 보낸 뒤 대상 DB 의 일별 통계 롤업(survey_daily_stats)을 다시 계산
+- 여러 테이블을 병렬 전송, 테이블별·전체 처리량(rows/s) 출력
 
 사용법 (Postgres/Supabase):
   1. 배포 DB의 연결 URL을 환경변수로 설정:
@@ -15,17 +23,45 @@
   2. create_tables_mysql.sql 로 테이블 생성해 두기.
   3. python upload_sqlite_to_remote.py
 
+옵션:
+  --chunk-size 2000     묶음당 행 수
+  --jobs 3              동시에 전송할 테이블 수
+  --tables a,b          일부 테이블만
+  --mode skip|update    같은 id 가 있으면 건너뜀(기본) / 덮어씀
+  --reset               중단된 실행의 체크포인트를 무시하고 처음부터
+  --dry-run             대상 DB 없이 읽기만 (읽기 처리량 확인)
+
 로컬 SQLite 파일 경로:
   환경변수 SQLITE_DB_PATH 가 없으면 프로젝트 루트의 sbi.db 사용.
+체크포인트 파일:
+  <SQLite 경로>.upload_checkpoint.json (UPLOAD_CHECKPOINT 환경변수 또는 --checkpoint 로 변경)
 """
+import argparse
+import io
+import json
 import os
-import sys
 import sqlite3
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence
+from urllib.parse import urlparse
+
+from db_migrations import survey_daily_stats_rebuild_sql
 
 # 프로젝트 루트
 _SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 _DEFAULT_SQLITE = os.path.join(_SCRIPT_DIR, "sbi.db")
 
+DEFAULT_CHUNK_SIZE = 2000
+DEFAULT_JOBS = 3
+
+# 테이블 전송 뒤 대상 DB 에서 실행할 문장 (엔진 → SQL 목록)
+_AFTER_TABLE: Dict[str, Callable[[str], List[str]]] = {
+    "survey_saves": survey_daily_stats_rebuild_sql,
+}
+
 # 업로드할 테이블 및 컬럼 (SQLite와 동일 순서)
 _TABLES = [
     (
@@ -36,7 +72,7 @@ _TABLES = [
     (
         "survey_saves",
         ["id", "user_email", "title", "update_count", "responses_json", "required_sequences_json",
-         "excluded_sequences_json", "created_at"],
+         "excluded_sequences_json", "responses_packed", "created_at"],
     ),
     (
         "chat_saves",
@@ -70,109 +106,400 @@ def connect_sqlite(path: str):
     return conn
 
 
-def upload_to_postgres(sqlite_path: str):
-    import psycopg2
-    from psycopg2.extras import execute_batch
+# --- 읽기 (SQLite, id 순 묶음) ---
+
+def iter_chunks(conn: sqlite3.Connection, table: str, columns: Sequence[str], after_id: int, chunk_size: int) -> Iterator[List[tuple]]:
+    """id > after_id 인 행을 id 순으로 chunk_size 개씩. 커서를 끝까지 열어 두지 않고 묶음마다 다시 조회 (keyset)."""
+    sql = f"SELECT {', '.join(columns)} FROM {table} WHERE id > ? ORDER BY id LIMIT ?"
+    last_id = after_id
+    while True:
+        rows = [tuple(row) for row in conn.execute(sql, (last_id, chunk_size)).fetchall()]
+        if not rows:
+            return
+        yield rows
+        last_id = rows[-1][0]
+        if len(rows) < chunk_size:
+            return
+
+
+# --- 체크포인트 ---
+
+class Checkpoint:
+    """
+    {대상: {테이블: {"last_id", "rows"}}} JSON. 묶음 커밋마다 원자적으로 저장 (tmp 후 rename).
+    실행이 오류 없이 끝나면 clear() 로 대상 항목을 지움 (남은 대상이 없으면 파일 삭제).
+    path=None 이면 파일 없이 메모리에만 유지 (--dry-run).
+    """
+
+    def __init__(self, path: Optional[str], target_key: str, reset: bool = False):
+        self.path = path
+        self.target_key = target_key
+        self._lock = threading.Lock()
+        self._data: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        if path and not reset and os.path.isfile(path):
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    self._data = json.load(f)
+            except (OSError, ValueError):
+                self._data = {}
+        self._data.setdefault(target_key, {})
+        if reset:
+            self._data[target_key] = {}
+
+    def get(self, table: str) -> Dict[str, Any]:
+        with self._lock:
+            return dict(self._data[self.target_key].get(table) or {"last_id": 0, "rows": 0})
+
+    def update(self, table: str, **values: Any) -> None:
+        with self._lock:
+            state = self._data[self.target_key].setdefault(table, {"last_id": 0, "rows": 0})
+            state.update(values)
+            self._save()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data[self.target_key] = {}
+            if not self.path:
+                return
+            if any(self._data.values()):
+                self._save()
+            elif os.path.exists(self.path):
+                os.remove(self.path)
+
+    def _save(self) -> None:
+        if not self.path:
+            return
+        tmp = self.path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self._data, f, ensure_ascii=False, indent=2)
+        os.replace(tmp, self.path)
+
+
+# --- 쓰기 (대상 DB 별) ---
+
+def _execute_all(conn, statements: Sequence[str]) -> None:
+    """문장들을 한 트랜잭션으로 실행."""
+    try:
+        with conn.cursor() as cur:
+            for stmt in statements:
+                cur.execute(stmt)
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+
+
+class PostgresWriter:
+    """임시 테이블로 COPY 후 INSERT ... SELECT ... ON CONFLICT (id). 묶음 하나 = 트랜잭션 하나."""
+
+    engine = "postgres"
+
+    def __init__(self, url: str, table: str, columns: Sequence[str], mode: str):
+        import psycopg2
+
+        self.conn = psycopg2.connect(url)
+        self.table = table
+        self.columns = list(columns)
+        cols = ", ".join(self.columns)
+        stage = f"_upload_stage_{table}"
+        if mode == "update":
+            updates = ", ".join(f"{c} = EXCLUDED.{c}" for c in self.columns if c != "id")
+            conflict = f"ON CONFLICT (id) DO UPDATE SET {updates}"
+        else:
+            conflict = "ON CONFLICT (id) DO NOTHING"
+        with self.conn.cursor() as cur:
+            # 세션 임시 테이블: 커밋마다 비워짐
+            cur.execute(f"CREATE TEMP TABLE IF NOT EXISTS {stage} (LIKE {table} INCLUDING DEFAULTS) ON COMMIT DELETE ROWS")
+        self.conn.commit()
+        self._copy_sql = f"COPY {stage} ({cols}) FROM STDIN WITH (FORMAT csv)"
+        self._merge_sql = f"INSERT INTO {table} ({cols}) SELECT {cols} FROM {stage} {conflict}"
+        # update 모드의 rowcount 는 덮어쓴 행도 셈 → 신규 = 묶음 행 수 - 이미 있던 id 수
+        self._existing_sql = f"SELECT COUNT(*) FROM {table} WHERE id IN (SELECT id FROM {stage})" if mode == "update" else None
+
+    @staticmethod
+    def _csv_field(value: Any) -> str:
+        # COPY csv: 따옴표 없는 빈 칸 = NULL, "" = 빈 문자열. 문자열은 항상 따옴표로 감쌈
+        if value is None:
+            return ""
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            return repr(value)
+        if isinstance(value, bytes):
+            return "\\x" + value.hex()  # bytea hex 입력 형식
+        return '"' + str(value).replace('"', '""') + '"'
+
+    @classmethod
+    def _to_csv(cls, rows: Sequence[tuple]) -> io.StringIO:
+        field = cls._csv_field
+        buf = io.StringIO()
+        buf.writelines(",".join(map(field, row)) + "\n" for row in rows)
+        buf.seek(0)
+        return buf
+
+    def write(self, rows: Sequence[tuple]) -> int:
+        try:
+            with self.conn.cursor() as cur:
+                cur.copy_expert(self._copy_sql, self._to_csv(rows))
+                if self._existing_sql:
+                    cur.execute(self._existing_sql)
+                    existing = cur.fetchone()[0]
+                cur.execute(self._merge_sql)
+                inserted = len(rows) - existing if self._existing_sql else cur.rowcount
+            self.conn.commit()
+            return inserted
+        except Exception:
+            self.conn.rollback()
+            raise
+
+    def finish(self) -> None:
+        # 시퀀스 보정 (SERIAL): 이후 앱에서 넣는 행의 id 가 겹치지 않도록
+        with self.conn.cursor() as cur:
+            cur.execute(
+                f"SELECT setval(pg_get_serial_sequence(%s, 'id'), COALESCE((SELECT MAX(id) FROM {self.table}), 1))",
+                (self.table,),
+            )
+        self.conn.commit()
+
+    def execute(self, statements: Sequence[str]) -> None:
+        _execute_all(self.conn, statements)
+
+    def close(self) -> None:
+        self.conn.close()
+
+
+class MySQLWriter:
+    """다중 행 INSERT ... ON DUPLICATE KEY (pymysql executemany 가 한 문장으로 합쳐 전송)."""
+
+    engine = "mysql"
+
+    def __init__(self, params: Dict[str, str], table: str, columns: Sequence[str], mode: str):
+        import pymysql
+
+        self.conn = pymysql.connect(charset="utf8mb4", autocommit=False, **params)
+        self.table = table
+        self.mode = mode
+        cols = ", ".join(columns)
+        placeholders = ", ".join(["%s"] * len(columns))
+        if mode == "update":
+            updates = ", ".join(f"{c} = VALUES({c})" for c in columns if c != "id")
+        else:
+            updates = "id = id"  # 같은 id 는 건너뜀 (INSERT IGNORE 와 달리 다른 오류는 숨기지 않음)
+        self._sql = f"INSERT INTO {table} ({cols}) VALUES ({placeholders}) ON DUPLICATE KEY UPDATE {updates}"
+
+    def write(self, rows: Sequence[tuple]) -> int:
+        try:
+            with self.conn.cursor() as cur:
+                if self.mode == "update":
+                    # affected rows 는 새 행 1, 덮어쓴 행 2, 값이 같은 행 0 이라 신규 수가 아님 → 이미 있던 id 를 먼저 셈
+                    ids = [row[0] for row in rows]
+                    cur.execute(f"SELECT COUNT(*) FROM {self.table} WHERE id IN ({', '.join(['%s'] * len(ids))})", ids)
+                    existing = cur.fetchone()[0]
+                affected = cur.executemany(self._sql, rows) or 0
+            self.conn.commit()
+            # skip 모드: 새로 넣은 행 = 1, 같은 id 로 건너뛴 행 = 0
+            return len(rows) - existing if self.mode == "update" else affected
+        except Exception:
+            self.conn.rollback()
+            raise
+
+    def finish(self) -> None:
+        pass
+
+    def execute(self, statements: Sequence[str]) -> None:
+        _execute_all(self.conn, statements)
+
+    def close(self) -> None:
+        self.conn.close()
+
+
+class DryRunWriter:
+    """대상 DB 없이 읽기 처리량만 확인."""
+
+    engine = None
+
+    def __init__(self, *args: Any, **kwargs: Any):
+        pass
+
+    def write(self, rows: Sequence[tuple]) -> int:
+        return len(rows)
+
+    def finish(self) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+
+# --- 전송 ---
+
+def transfer_table(
+    sqlite_path: str,
+    table: str,
+    columns: Sequence[str],
+    make_writer: Callable[[str, Sequence[str]], Any],
+    checkpoint: Checkpoint,
+    chunk_size: int,
+) -> Dict[str, Any]:
+    """
+    테이블 하나를 체크포인트 다음 id 부터 전송 (체크포인트 없으면 처음부터).
+    결과: rows(읽은 행), inserted, seconds, rows_per_sec.
+    """
+    state = checkpoint.get(table)
+    result = {"table": table, "rows": 0, "inserted": 0, "seconds": 0.0, "rows_per_sec": 0.0, "resumed_from": state["last_id"]}
+
+    src = sqlite3.connect(sqlite_path)
+    try:
+        existing = {row[1] for row in src.execute(f"PRAGMA table_info({table})")}
+        if not existing:
+            result["skipped"] = "SQLite에 없음"
+            return result
+        # 마이그레이션 전 SQLite 파일이면 나중에 추가된 컬럼(예: responses_packed)은 빼고 전송
+        columns = [c for c in columns if c in existing]
+        writer = make_writer(table, columns)
+        t0 = time.perf_counter()
+        try:
+            total_rows = state.get("rows", 0)
+            for rows in iter_chunks(src, table, columns, state["last_id"], chunk_size):
+                result["inserted"] += writer.write(rows)
+                result["rows"] += len(rows)
+                total_rows += len(rows)
+                checkpoint.update(table, last_id=rows[-1][0], rows=total_rows)
+            writer.finish()
+            after = _AFTER_TABLE.get(table)
+            if after and writer.engine:
+                writer.execute(after(writer.engine))
+        finally:
+            writer.close()
+        elapsed = time.perf_counter() - t0
+        result["seconds"] = round(elapsed, 3)
+        result["rows_per_sec"] = round(result["rows"] / elapsed, 1) if elapsed > 0 else 0.0
+        return result
+    finally:
+        src.close()
+
+
+def run_transfer(
+    sqlite_path: str,
+    make_writer: Callable[[str, Sequence[str]], Any],
+    checkpoint: Checkpoint,
+    tables: Optional[Sequence[str]] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    jobs: int = DEFAULT_JOBS,
+) -> List[Dict[str, Any]]:
+    """여러 테이블을 jobs 개까지 병렬 전송하고 테이블별 결과와 처리량을 출력."""
+    selected = [(t, cols) for t, cols in _TABLES if not tables or t in tables]
+    results: List[Dict[str, Any]] = []
+    t0 = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max(1, jobs)) as pool:
+        futures = {
+            pool.submit(transfer_table, sqlite_path, t, cols, make_writer, checkpoint, chunk_size): t
+            for t, cols in selected
+        }
+        for fut in as_completed(futures):
+            table = futures[fut]
+            try:
+                r = fut.result()
+            except Exception as e:
+                r = {"table": table, "error": str(e)}
+                print(f"  {table}: 실패 ({e}) — 다시 실행하면 체크포인트부터 이어서 전송")
+            else:
+                if r.get("skipped"):
+                    print(f"  {table}: 건너뜀 ({r['skipped']})")
+                else:
+                    resumed = f", id>{r['resumed_from']} 부터 재개" if r["resumed_from"] else ""
+                    print(
+                        f"  {table}: {r['rows']}행 전송 (신규 {r['inserted']}) "
+                        f"{r['seconds']}s, {r['rows_per_sec']} rows/s{resumed}"
+                    )
+            results.append(r)
+    if any("error" in r for r in results):
+        print(f"체크포인트 유지: {checkpoint.path}" if checkpoint.path else "일부 테이블 실패")
+    else:
+        checkpoint.clear()
+    elapsed = time.perf_counter() - t0
+    total = sum(r.get("rows", 0) for r in results)
+    rate = round(total / elapsed, 1) if elapsed > 0 else 0.0
+    print(f"전체: {total}행, {elapsed:.2f}s, {rate} rows/s")
+    return results
+
 
+def _postgres_url() -> str:
     url = os.environ.get("DATABASE_URL") or os.environ.get("SUPABASE_DB_URL") or ""
     if not url.strip():
         print("Postgres 연결을 위해 DATABASE_URL 또는 SUPABASE_DB_URL 환경변수를 설정하세요.")
         sys.exit(1)
     if url.startswith("postgres://"):
         url = "postgresql://" + url[11:]
-
-    sqlite_conn = connect_sqlite(sqlite_path)
-    pg_conn = psycopg2.connect(url)
-
-    try:
-        with sqlite_conn, pg_conn:
-            cur = pg_conn.cursor()
-            for table, columns in _TABLES:
-                # SQLite에서 읽기 (테이블 없으면 건너뜀)
-                try:
-                    c = sqlite_conn.execute(f"SELECT {', '.join(columns)} FROM {table}")
-                    rows = [tuple(row) for row in c.fetchall()]
-                except sqlite3.OperationalError as e:
-                    print(f"  {table}: 건너뜀 (SQLite에 없음: {e})")
-                    continue
-                if not rows:
-                    print(f"  {table}: 건너뜀 (데이터 없음)")
-                    continue
-                placeholders = ", ".join(["%s"] * len(columns))
-                cols_str = ", ".join(columns)
-                sql = f"INSERT INTO {table} ({cols_str}) VALUES ({placeholders})"
-                try:
-                    sql_on_conflict = f"INSERT INTO {table} ({cols_str}) VALUES ({placeholders}) ON CONFLICT (id) DO NOTHING"
-                    execute_batch(cur, sql_on_conflict, rows, page_size=100)
-                    pg_conn.commit()
-                    print(f"  {table}: {len(rows)}행 업로드")
-                except (psycopg2.ProgrammingError, psycopg2.IntegrityError):
-                    pg_conn.rollback()
-                    inserted = 0
-                    for row in rows:
-                        try:
-                            cur.execute(sql, row)
-                            inserted += 1
-                        except psycopg2.IntegrityError:
-                            pass
-                    pg_conn.commit()
-                    print(f"  {table}: {inserted}/{len(rows)}행 업로드")
-                # 시퀀스 보정 (SERIAL)
-                try:
-                    cur.execute(
-                        f"SELECT setval(pg_get_serial_sequence(%s, 'id'), COALESCE((SELECT MAX(id) FROM {table}), 1))",
-                        (table,),
-                    )
-                    pg_conn.commit()
-                except Exception:
-                    pass
-    finally:
-        sqlite_conn.close()
-        pg_conn.close()
-    print("Postgres 업로드 완료.")
+    return url
 
 
-def upload_to_mysql(sqlite_path: str):
-    import pymysql
-
-    host = os.environ.get("TARGET_DB_HOST", "localhost")
-    user = os.environ.get("TARGET_DB_USER", "")
-    password = os.environ.get("TARGET_DB_PASSWORD", "")
-    database = os.environ.get("TARGET_DB_NAME", "")
-    if not user or not database:
+def _mysql_params() -> Dict[str, str]:
+    params = {
+        "host": os.environ.get("TARGET_DB_HOST", "localhost"),
+        "user": os.environ.get("TARGET_DB_USER", ""),
+        "password": os.environ.get("TARGET_DB_PASSWORD", ""),
+        "database": os.environ.get("TARGET_DB_NAME", ""),
+    }
+    if not params["user"] or not params["database"]:
         print("MySQL 업로드: TARGET_DB_USER, TARGET_DB_NAME 환경변수를 설정하세요.")
         sys.exit(1)
+    return params
 
-    sqlite_conn = connect_sqlite(sqlite_path)
-    mysql_conn = pymysql.connect(
-        host=host, user=user, password=password, database=database,
-        charset="utf8mb4", cursorclass=pymysql.cursors.DictCursor, autocommit=False
-    )
 
-    try:
-        with sqlite_conn, mysql_conn:
-            cur = mysql_conn.cursor()
-            for table, columns in _TABLES:
-                c = sqlite_conn.execute(f"SELECT {', '.join(columns)} FROM {table}")
-                rows = [tuple(row) for row in c.fetchall()]
-                if not rows:
-                    print(f"  {table}: 건너뜀 (데이터 없음)")
-                    continue
-                placeholders = ", ".join(["%s"] * len(columns))
-                cols_str = ", ".join(columns)
-                sql = f"INSERT IGNORE INTO {table} ({cols_str}) VALUES ({placeholders})"
-                cur.executemany(sql, rows)
-                mysql_conn.commit()
-                print(f"  {table}: {len(rows)}행 업로드")
-    finally:
-        sqlite_conn.close()
-        mysql_conn.close()
+def upload_to_postgres(sqlite_path: str, **options: Any):
+    url = _postgres_url()
+    parsed = urlparse(url)
+    target_key = f"postgres://{parsed.hostname}:{parsed.port or 5432}{parsed.path}"  # 비밀번호는 기록하지 않음
+    mode = options.pop("mode", "skip")
+    checkpoint = _checkpoint(sqlite_path, target_key, options)
+    run_transfer(sqlite_path, lambda t, cols: PostgresWriter(url, t, cols, mode), checkpoint, **options)
+    print("Postgres 업로드 완료.")
+
+
+def upload_to_mysql(sqlite_path: str, **options: Any):
+    params = _mysql_params()
+    target_key = f"mysql://{params['host']}/{params['database']}"
+    mode = options.pop("mode", "skip")
+    checkpoint = _checkpoint(sqlite_path, target_key, options)
+    run_transfer(sqlite_path, lambda t, cols: MySQLWriter(params, t, cols, mode), checkpoint, **options)
     print("MySQL 업로드 완료.")
 
 
+def _checkpoint(sqlite_path: str, target_key: str, options: Dict[str, Any]) -> Checkpoint:
+    path = options.pop("checkpoint_path", None) or os.environ.get("UPLOAD_CHECKPOINT") or sqlite_path + ".upload_checkpoint.json"
+    return Checkpoint(path, target_key, reset=options.pop("reset", False))
+
+
 def main():
+    parser = argparse.ArgumentParser(description="로컬 SQLite → PostgreSQL/MySQL 대량 전송 (재개·병렬)")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument("--jobs", type=int, default=DEFAULT_JOBS)
+    parser.add_argument("--tables", default="", help="쉼표로 구분한 테이블 이름 (기본: 전체)")
+    parser.add_argument("--mode", choices=("skip", "update"), default="skip")
+    parser.add_argument("--reset", action="store_true")
+    parser.add_argument("--checkpoint", default=None)
+    parser.add_argument("--dry-run", action="store_true")
+    args = parser.parse_args()
+
     sqlite_path = get_sqlite_path()
     print(f"소스 SQLite: {sqlite_path}")
+    if not os.path.isfile(sqlite_path):
+        print(f"SQLite 파일 없음: {sqlite_path}")
+        sys.exit(1)
+    options = {
+        "chunk_size": args.chunk_size,
+        "jobs": args.jobs,
+        "tables": [t.strip() for t in args.tables.split(",") if t.strip()] or None,
+        "mode": args.mode,
+        "reset": args.reset,
+        "checkpoint_path": args.checkpoint,
+    }
+
+    if args.dry_run:
+        # 읽기만 하므로 체크포인트는 파일로 남기지 않음
+        for key in ("mode", "reset", "checkpoint_path"):
+            options.pop(key)
+        run_transfer(sqlite_path, DryRunWriter, Checkpoint(None, "dry-run"), **options)
+        return
 
     target = (os.environ.get("TARGET_DB_ENGINE") or "").strip().lower()
     if not target:
@@ -183,9 +510,9 @@ def main():
             sys.exit(1)
 
     if target == "postgres":
-        upload_to_postgres(sqlite_path)
+        upload_to_postgres(sqlite_path, **options)
     elif target == "mysql":
-        upload_to_mysql(sqlite_path)
+        upload_to_mysql(sqlite_path, **options)
     else:
         print("TARGET_DB_ENGINE 은 postgres 또는 mysql 이어야 합니다.")
         sys.exit(1)